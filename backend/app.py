@@ -22,7 +22,7 @@ os.environ['GLOG_vmodule'] = 'gpu_resources=5'  # Suppress Paddle CUDNN version
 import cv2
 import numpy as np
 import pytesseract
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, jsonify, request
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit
 from PIL import Image
@@ -1591,7 +1591,7 @@ def process_document_image(input_path, output_path, filename=None):
     7. Transform - Perspective correction
     8. Process - Grayscale conversion
     9-10. Enhance - Background estimation and shadow removal
-    11. OCR - Text extraction and filename generation
+    11. OCR - Queue text extraction and filename generation (background)
     12. Save - Final save and completion
     """
     try:
@@ -1654,129 +1654,34 @@ def process_document_image(input_path, output_path, filename=None):
         enhanced = enhance_document_quality(gray)
         print(f"  ✓ Enhanced")
 
-        # STEP 11: OCR - Text extraction and filename generation
-        print(f"[11/12] OCR and filename generation...")
-        emit_progress(11, "OCR", "Running OCR for text extraction...")
-        
-        # Basic OCR (Tesseract)
-        text = ""
-        try:
-            text = pytesseract.image_to_string(enhanced, lang="eng", config="--oem 3 --psm 3")
-        except:
-            pass
-
-        # PaddleOCR + Ollama Filename Generation (part of OCR step)
-        ocr_filename = None
-        text_output_path = None
-        
-        # Save text first
-        if text.strip():
-            text_path = output_path.replace(".jpg", ".txt").replace(".png", ".txt").replace(".jpeg", ".txt")
-            text_path = text_path.replace("/processed/", "/processed_text/")
-            os.makedirs(os.path.dirname(text_path), exist_ok=True)
-            with open(text_path, "w", encoding="utf-8") as f:
-                f.write(text)
-            text_output_path = text_path
-
-        try:
-            from app.modules.ocr.paddle_ocr import get_ocr_processor, OCRResult
-            
-            ocr_result = None
-            ocr_processor = None
-            
-            # Skip OCR for very small images (likely corrupt, thumbnails, or test images)
-            img_height, img_width = enhanced.shape[:2]
-            if img_width < 200 or img_height < 200:
-                print(f"  ⚠ Skipping OCR: Image too small ({img_width}x{img_height}), likely corrupt or test image")
-                # Just save the image
-                cv2.imwrite(output_path, enhanced, [cv2.IMWRITE_JPEG_QUALITY, 95])
-            else:
-                print(f"  Running PaddleOCR for intelligent filename...")
-                
-                # Initialize OCR processor
-                ocr_data_dir = os.path.join(os.path.dirname(output_path), '..', 'ocr_results')
-                ocr_processor = get_ocr_processor(ocr_data_dir)
-                
-                # Run PaddleOCR on the enhanced image (save it first temporarily)
-                cv2.imwrite(output_path, enhanced, [cv2.IMWRITE_JPEG_QUALITY, 95])
-                ocr_result = ocr_processor.process_image(output_path)
-                
-                if ocr_result and ocr_result.word_count > 0:
-                    # Get timestamp from filename if available
-                    timestamp = None
-                    if filename:
-                        import re
-                        match = re.search(r'_(\d{8}_\d{6})_', filename)
-                        if match:
-                            timestamp = match.group(1)
-                    
-                    # Generate filename using Ollama
-                    suggested_filename = ocr_processor.generate_filename_from_ocr(ocr_result, timestamp)
-                    
-                    if suggested_filename and suggested_filename != "untitled":
-                        # Rename the file
-                        output_dir = os.path.dirname(output_path)
-                        ext = os.path.splitext(output_path)[1]
-                        new_filename = f"{suggested_filename}{ext}"
-                        new_output_path = os.path.join(output_dir, new_filename)
-                        old_basename = os.path.basename(output_path)
-                        
-                        # Avoid overwriting existing files
-                        counter = 1
-                        while os.path.exists(new_output_path):
-                            new_filename = f"{suggested_filename}_{counter}{ext}"
-                            new_output_path = os.path.join(output_dir, new_filename)
-                            counter += 1
-                        
-                        # Rename the processed image
-                        os.rename(output_path, new_output_path)
-                        
-                        output_path = new_output_path
-                        ocr_filename = new_filename
-                        
-                        # Also rename the text file if it exists
-                        if text_output_path and os.path.exists(text_output_path):
-                            new_text_filename = f"{suggested_filename}.txt"
-                            new_text_path = os.path.join(os.path.dirname(text_output_path), new_text_filename)
-                            if not os.path.exists(new_text_path):
-                                os.rename(text_output_path, new_text_path)
-                                text_output_path = new_text_path
-                        
-                        print(f"  ✓ File renamed based on OCR content: {new_filename}")
-                    
-                    # Save OCR result with the correct filename
-                    ocr_result_filename = os.path.basename(output_path)
-                    ocr_processor.save_result(ocr_result_filename, ocr_result)
-                    print(f"  ✓ OCR result saved ({ocr_result.word_count} words)")
-                else:
-                    print(f"  ⚠ No text detected by PaddleOCR, keeping original filename")
-                
-        except Exception as paddle_ocr_error:
-            print(f"  [WARN] PaddleOCR/Ollama step failed: {paddle_ocr_error}")
-            # Save image if not already saved
-            if not os.path.exists(output_path):
-                cv2.imwrite(output_path, enhanced, [cv2.IMWRITE_JPEG_QUALITY, 95])
+        # STEP 11: OCR - deferred to the enrichment queue
+        # OCR, LLM naming and renaming run after the page has been announced;
+        # callers hand the saved page to enqueue_enrichment() once they have
+        # emitted processing_complete
+        print(f"[11/12] OCR and filename generation queued for background enrichment")
+        emit_progress(11, "OCR", "Queuing text extraction and naming...")
 
         # STEP 12: Save - Final completion
         print(f"[12/12] Finalizing...")
         emit_progress(12, "Save", "Saving processed document...")
         
-        # Ensure image is saved (if PaddleOCR didn't save it)
-        if not os.path.exists(output_path):
-            cv2.imwrite(output_path, enhanced, [cv2.IMWRITE_JPEG_QUALITY, 95])
+        cv2.imwrite(output_path, enhanced, [cv2.IMWRITE_JPEG_QUALITY, 95])
         print(f"  ✓ Saved: {output_path}")
 
+        # Thumb/preview renditions straight from the in-memory page (no re-decode)
+        try:
+            thumbnail_store.build_renditions(output_path, image=enhanced)
+        except Exception as rendition_error:
+            print(f"  [WARN] Could not build renditions: {rendition_error}")
+
         print(f"\n{'='*60}")
         print(f"[OK] PROCESSING COMPLETE!")
         print(f"   Input: {input_path}")
         print(f"   Output: {output_path}")
-        if ocr_filename:
-            print(f"   OCR-derived filename: {ocr_filename}")
-        print(f"   Text extracted: {len(text)} characters")
         print(f"{'='*60}\n")
 
-        # Return the new filename if renamed
-        return True, text, ocr_filename if ocr_filename else filename
+        # Text and the OCR-derived name arrive later via ocr_complete / document_renamed
+        return True, "", None
 
     except Exception as e:
         print(f"[ERROR] Processing error: {str(e)}")
@@ -1791,6 +1696,21 @@ def process_document_image(input_path, output_path, filename=None):
 app.config['process_document_image'] = process_document_image
 
 
+def enqueue_enrichment(processed_path, timestamp=None):
+    """
+    Queue OCR, LLM structuring and OCR-based renaming for a processed page.
+    Call after processing_complete so the page is visible before naming finishes;
+    the queue emits ocr_complete and document_renamed when done.
+    """
+    try:
+        enrichment_queue.submit(processed_path, timestamp)
+    except Exception as e:
+        print(f"  [WARN] Could not queue OCR enrichment: {e}")
+
+
+app.config['enqueue_enrichment'] = enqueue_enrichment
+
+
 # ============================================================================
 # API ENDPOINTS
 # ============================================================================
@@ -1841,36 +1761,46 @@ def favicon():
     return "", 204  # No Content response
 
 
+# Shared file responses: strong ETags, 304s, Range and CORS for every document route
+from app.core.middleware.file_serving import (
+    CACHE_NONE,
+    add_file_cors_headers,
+    file_not_found,
+    file_options_response,
+    serve_file,
+    serve_from_directory,
+)
+
+
 # Public folder routes for serving data files
 @app.route("/public/processed/<path:filename>", methods=["GET", "OPTIONS"])
 def serve_public_processed(filename):
-    """Serve processed files from public/data/processed directory"""
-    # Get origin from request or use localhost
-    origin = request.headers.get('Origin', 'http://localhost:3000')
-    
-    # Handle OPTIONS request for CORS preflight
+    """
+    Serve processed files from public/data/processed directory
+    Accepts ?size=thumb|preview|full or ?w=<px> like /processed
+    """
+    # Handle OPTIONS request for CORS preflight (origin echoed, credentials allowed)
     if request.method == "OPTIONS":
-        response = jsonify({"status": "ok"})
-        response.headers["Access-Control-Allow-Origin"] = origin
-        response.headers["Access-Control-Allow-Methods"] = "GET, HEAD, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization, ngrok-skip-browser-warning, X-Requested-With"
-        response.headers["Access-Control-Allow-Credentials"] = "true"
-        response.headers["Access-Control-Max-Age"] = "86400"
-        return response, 200
+        return file_options_response(credentials=True)
     
     try:
-        response = send_from_directory(PROCESSED_DIR, filename)
-        response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-        response.headers["Pragma"] = "no-cache"
-        response.headers["Expires"] = "0"
-        # Add explicit CORS headers with actual origin (not wildcard when credentials)
-        response.headers["Access-Control-Allow-Origin"] = origin
-        response.headers["Access-Control-Allow-Methods"] = "GET, HEAD, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization, ngrok-skip-browser-warning, X-Requested-With"
-        response.headers["Access-Control-Allow-Credentials"] = "true"
-        response.headers["Access-Control-Expose-Headers"] = "Content-Length, Content-Type, Content-Disposition"
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        return response
+        rendition = None
+        if ".." not in filename:
+            try:
+                rendition = thumbnail_store.negotiate(
+                    os.path.join(PROCESSED_DIR, filename), request.args.get("size"), request.args.get("w", type=int)
+                )
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+        if rendition:
+            rendition_path, etag, rendition_name = rendition
+            return serve_file(
+                rendition_path,
+                mimetype="image/jpeg" if rendition_name != RENDITION_FULL else None,
+                etag=etag,
+                credentials=True,
+            )
+        return serve_from_directory(PROCESSED_DIR, filename, credentials=True)
     except Exception as e:
         logger.error(f"Error serving processed file {filename}: {e}")
         return jsonify({"error": "File not found"}), 404
@@ -1879,32 +1809,12 @@ def serve_public_processed(filename):
 @app.route("/public/uploads/<path:filename>", methods=["GET", "OPTIONS"])
 def serve_public_uploads(filename):
     """Serve uploaded files from public/data/uploads directory"""
-    # Get origin from request or use localhost
-    origin = request.headers.get('Origin', 'http://localhost:3000')
-    
-    # Handle OPTIONS request for CORS preflight
+    # Handle OPTIONS request for CORS preflight (origin echoed, credentials allowed)
     if request.method == "OPTIONS":
-        response = jsonify({"status": "ok"})
-        response.headers["Access-Control-Allow-Origin"] = origin
-        response.headers["Access-Control-Allow-Methods"] = "GET, HEAD, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization, ngrok-skip-browser-warning, X-Requested-With"
-        response.headers["Access-Control-Allow-Credentials"] = "true"
-        response.headers["Access-Control-Max-Age"] = "86400"
-        return response, 200
+        return file_options_response(credentials=True)
     
     try:
-        response = send_from_directory(UPLOAD_DIR, filename)
-        response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-        response.headers["Pragma"] = "no-cache"
-        response.headers["Expires"] = "0"
-        # Add explicit CORS headers with actual origin (not wildcard when credentials)
-        response.headers["Access-Control-Allow-Origin"] = origin
-        response.headers["Access-Control-Allow-Methods"] = "GET, HEAD, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization, ngrok-skip-browser-warning, X-Requested-With"
-        response.headers["Access-Control-Allow-Credentials"] = "true"
-        response.headers["Access-Control-Expose-Headers"] = "Content-Length, Content-Type, Content-Disposition"
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        return response
+        return serve_from_directory(UPLOAD_DIR, filename, credentials=True)
     except Exception as e:
         logger.error(f"Error serving uploaded file {filename}: {e}")
         return jsonify({"error": "File not found"}), 404
@@ -1913,32 +1823,12 @@ def serve_public_uploads(filename):
 @app.route("/public/converted/<path:filename>", methods=["GET", "OPTIONS"])
 def serve_public_converted(filename):
     """Serve converted files from public/data/converted directory"""
-    # Get origin from request or use localhost
-    origin = request.headers.get('Origin', 'http://localhost:3000')
-    
-    # Handle OPTIONS request for CORS preflight
+    # Handle OPTIONS request for CORS preflight (origin echoed, credentials allowed)
     if request.method == "OPTIONS":
-        response = jsonify({"status": "ok"})
-        response.headers["Access-Control-Allow-Origin"] = origin
-        response.headers["Access-Control-Allow-Methods"] = "GET, HEAD, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization, ngrok-skip-browser-warning, X-Requested-With"
-        response.headers["Access-Control-Allow-Credentials"] = "true"
-        response.headers["Access-Control-Max-Age"] = "86400"
-        return response, 200
+        return file_options_response(credentials=True)
     
     try:
-        response = send_from_directory(CONVERTED_DIR, filename)
-        response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-        response.headers["Pragma"] = "no-cache"
-        response.headers["Expires"] = "0"
-        # Add explicit CORS headers with actual origin (not wildcard when credentials)
-        response.headers["Access-Control-Allow-Origin"] = origin
-        response.headers["Access-Control-Allow-Methods"] = "GET, HEAD, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization, ngrok-skip-browser-warning, X-Requested-With"
-        response.headers["Access-Control-Allow-Credentials"] = "true"
-        response.headers["Access-Control-Expose-Headers"] = "Content-Length, Content-Type, Content-Disposition"
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        return response
+        return serve_from_directory(CONVERTED_DIR, filename, credentials=True)
     except Exception as e:
         logger.error(f"Error serving converted file {filename}: {e}")
         return jsonify({"error": "File not found"}), 404
@@ -1947,9 +1837,11 @@ def serve_public_converted(filename):
 @app.route("/public/static/<path:filename>", methods=["GET", "OPTIONS"])
 def serve_public_static(filename):
     """Serve static files from public/static directory"""
+    if request.method == "OPTIONS":
+        return file_options_response()
+
     try:
-        response = send_from_directory(STATIC_DIR, filename)
-        return response
+        return serve_from_directory(STATIC_DIR, filename)
     except Exception as e:
         logger.error(f"Error serving static file {filename}: {e}")
         return jsonify({"error": "File not found"}), 404
@@ -2077,25 +1969,12 @@ def clear_test_captures():
 
 @app.route("/public/test_captures/<path:filename>", methods=["GET", "OPTIONS"])
 def serve_test_captures(filename):
-    """Serve test capture files"""
-    origin = request.headers.get('Origin', 'http://localhost:3000')
-    
+    """Serve test capture files (temporary, never cached)"""
     if request.method == "OPTIONS":
-        response = jsonify({"status": "ok"})
-        response.headers["Access-Control-Allow-Origin"] = origin
-        response.headers["Access-Control-Allow-Methods"] = "GET, HEAD, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
-        response.headers["Access-Control-Allow-Credentials"] = "true"
-        return response, 200
+        return file_options_response(credentials=True)
     
     try:
-        response = send_from_directory(TEST_CAPTURES_DIR, filename)
-        response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-        response.headers["Pragma"] = "no-cache"
-        response.headers["Expires"] = "0"
-        response.headers["Access-Control-Allow-Origin"] = origin
-        response.headers["Access-Control-Allow-Credentials"] = "true"
-        return response
+        return serve_from_directory(TEST_CAPTURES_DIR, filename, cache=CACHE_NONE, credentials=True)
     except Exception as e:
         logger.error(f"Error serving test capture {filename}: {e}")
         return jsonify({"error": "File not found"}), 404
@@ -2119,6 +1998,8 @@ def handle_options(path):
 @app.route("/health")
 def health():
     """Detailed health check"""
+    from app.modules.llm_client import get_llm_client
+
     tesseract_available = True
     try:
         pytesseract.get_tesseract_version()
@@ -2169,6 +2050,7 @@ def health():
                 "auto_naming": MODULES_AVAILABLE,
                 "compression": MODULES_AVAILABLE,
             },
+            "llm": get_llm_client().metrics(),
         }
     )
 
@@ -2411,6 +2293,9 @@ def upload_file():
     Expects: multipart/form-data with 'file' or 'photo' field
     """
     try:
+        # Refuse oversized bodies before the multipart form is parsed
+        check_upload_length(request.content_length)
+
         # Accept both 'file' and 'photo' field names
         file = request.files.get("file") or request.files.get("photo")
 
@@ -2434,24 +2319,33 @@ def upload_file():
         print(f"\n{'='*70}")
         print(f"[UPLOAD] UPLOAD INITIATED")
         print(f"  Filename: {filename}")
-        print(f"  Size: {len(file.read())} bytes")
-        file.seek(0)  # Reset file pointer
         print(f"{'='*70}")
 
-        # Step 1: Save uploaded file immediately
+        # Step 1: Stream the upload to disk in chunks; header, size limit and hash are checked on the way
         print("\n[UPLOAD] Saving uploaded file...")
         upload_path = os.path.join(UPLOAD_DIR, filename)
-        file.save(upload_path)
-        print(f"  [OK] File saved: {upload_path}")
-
-        # Validate file exists and is readable
-        if not os.path.exists(upload_path):
-            error_msg = "File upload failed - file not found on disk"
-            print(f"  [ERROR] {error_msg}")
-            return jsonify({"error": error_msg, "success": False}), 500
+        ingested = ingest_upload(file.stream, upload_path)
+        content_hash = ingested["content_hash"]
+        print(f"  [OK] File saved: {upload_path} ({ingested['size']} bytes, {ingested['image_type']})")
 
-        file_size = os.path.getsize(upload_path)
-        print(f"  ? Verified on disk: {file_size} bytes")
+        # Same bytes as an earlier upload: answer with that document instead of reprocessing
+        existing = document_catalog.find_or_claim_content(content_hash, processed_filename)
+        if existing:
+            os.remove(upload_path)
+            print(f"  [OK] Duplicate of {existing['filename']}, processing skipped")
+            return jsonify(
+                {
+                    "status": "duplicate",
+                    "success": True,
+                    "duplicate": True,
+                    "message": "Identical file already uploaded",
+                    "filename": existing["filename"],
+                    "original": file.filename,
+                    "timestamp": timestamp,
+                    "processing": existing.get("processing", False),
+                    "has_text": existing.get("has_text", False),
+                }
+            )
 
         # Initialize processing status
         update_processing_status(processed_filename, 0, 12, "Initializing", is_complete=False)
@@ -2515,16 +2409,20 @@ def upload_file():
                     )
                     return
 
-                # Save extracted text
-                text_filename = f"{os.path.splitext(final_filename)[0]}.txt"
-                text_path = os.path.join(TEXT_DIR, text_filename)
+                # Save extracted text (OCR text normally arrives later from enrichment)
+                if text_or_error:
+                    text_filename = f"{os.path.splitext(final_filename)[0]}.txt"
+                    text_path = os.path.join(TEXT_DIR, text_filename)
 
-                try:
-                    with open(text_path, "w", encoding="utf-8") as f:
-                        f.write(text_or_error)
-                    print(f"  ✓ Text saved: {text_path}")
-                except Exception as text_error:
-                    print(f"  [WARN] Warning: Failed to save text file: {str(text_error)}")
+                    try:
+                        with open(text_path, "w", encoding="utf-8") as f:
+                            f.write(text_or_error)
+                        print(f"  ✓ Text saved: {text_path}")
+                    except Exception as text_error:
+                        print(f"  [WARN] Warning: Failed to save text file: {str(text_error)}")
+
+                document_catalog.add(final_filename, has_text=bool(text_or_error), content_hash=content_hash)
+                thumbnail_store.pregenerate(os.path.join(PROCESSED_DIR, final_filename))
 
                 # Mark as complete (on the original filename to clear that progress bar)
                 update_processing_status(processed_filename, 12, 12, "Complete", is_complete=True)
@@ -2541,6 +2439,9 @@ def upload_file():
                     },
                 )
 
+                # Page is visible now; OCR + naming continue in the enrichment queue
+                enqueue_enrichment(os.path.join(PROCESSED_DIR, final_filename))
+
                 print(f"\n[OK] Background processing completed for {processed_filename}")
 
                 # Clear status after 60 seconds
@@ -2555,6 +2456,9 @@ def upload_file():
                 socketio.emit(
                     "processing_error", {"filename": processed_filename, "error": error_msg}
                 )
+            finally:
+                # Failed uploads must not block a retry of the same bytes
+                document_catalog.release_content(content_hash)
 
         # Start processing in background thread
         thread = threading.Thread(target=background_process)
@@ -2564,6 +2468,10 @@ def upload_file():
         print(f"\n[OK] Upload response sent, processing started in background")
         return jsonify(response)
 
+    except UploadRejected as rejected:
+        print(f"[ERROR] Upload rejected: {rejected}")
+        return jsonify({"error": str(rejected), "success": False}), rejected.status
+
     except Exception as e:
         error_msg = f"Unexpected error: {str(e)}"
         print(f"\n[ERROR] {error_msg}")
@@ -2603,17 +2511,30 @@ def upload_file():
 
 @app.route("/files")
 def list_files():
-    """List all processed files with processing status"""
+    """
+    List processed files with processing status
+
+    Query params (optional):
+        limit, cursor: page through documents newest first (next_cursor)
+        since: sync_cursor from an earlier response; returns only documents
+               added or changed since then, plus deleted filenames
+    """
     try:
-        from app.modules.ocr.paddle_ocr import get_ocr_processor
-        
-        # Get OCR processor to check for OCR results
-        ocr_processor = get_ocr_processor(OCR_DATA_DIR)
-        
+        try:
+            listing = document_catalog.listing(
+                limit=request.args.get("limit", type=int),
+                cursor=request.args.get("cursor"),
+                since=request.args.get("since"),
+            )
+        except CatalogCursorError as e:
+            return jsonify({"error": str(e)}), 400
+
         files = []
 
         # First, add files that are currently being processed (uploaded but not yet in processed dir)
-        for filename in list(processing_status.keys()):
+        # Later pages skip them; they belong at the top of the list
+        in_progress = list(processing_status.keys()) if not request.args.get("cursor") else []
+        for filename in in_progress:
             status = get_processing_status(filename)
             if status and not status["is_complete"]:
                 # Get the upload filename (without "processed_" prefix)
@@ -2636,48 +2557,26 @@ def list_files():
                         }
                     )
 
-        # Then add all processed files
-        for filename in os.listdir(PROCESSED_DIR):
-            if filename.lower().endswith((".png", ".jpg", ".jpeg")):
-                file_path = os.path.join(PROCESSED_DIR, filename)
-                # Verify file still exists (it may have been deleted)
-                if not os.path.exists(file_path):
-                    print(f"[WARN] File listed but doesn't exist: {file_path}")
-                    continue
-                file_stat = os.stat(file_path)
-
-                # Check if text file exists
-                text_filename = f"{os.path.splitext(filename)[0]}.txt"
-                text_path = os.path.join(TEXT_DIR, text_filename)
-                has_text = os.path.exists(text_path)
-                
-                # Check if OCR result exists
-                has_ocr = ocr_processor.has_ocr_result(filename)
-
-                # Check if still processing (edge case where file exists but processing not complete)
-                status = get_processing_status(filename)
-                is_processing = status and not status["is_complete"]
-
-                file_info = {
-                    "filename": filename,
-                    "size": file_stat.st_size,
-                    "created": datetime.fromtimestamp(file_stat.st_ctime).isoformat(),
-                    "has_text": has_text,
-                    "has_ocr": has_ocr,
-                    "processing": is_processing,
-                }
+        # Then add processed files from the catalog (one indexed query)
+        for file_info in listing.pop("items"):
+            filename = file_info["filename"]
 
-                if is_processing:
-                    file_info["processing_step"] = status["step"]
-                    file_info["processing_total"] = status["total_steps"]
-                    file_info["processing_stage"] = status["stage_name"]
+            # Check if still processing (edge case where file exists but processing not complete)
+            status = get_processing_status(filename)
+            is_processing = status and not status["is_complete"]
+            file_info["processing"] = is_processing
+
+            if is_processing:
+                file_info["processing_step"] = status["step"]
+                file_info["processing_total"] = status["total_steps"]
+                file_info["processing_stage"] = status["stage_name"]
 
-                files.append(file_info)
+            files.append(file_info)
 
         # Sort by creation time (newest first)
         files.sort(key=lambda x: x["created"], reverse=True)
 
-        return jsonify({"files": files, "count": len(files)})
+        return jsonify({"files": files, "count": len(files), **listing})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -2708,17 +2607,16 @@ def get_file_processing_status(filename):
 
 @app.route("/processed/<filename>", methods=["GET", "OPTIONS"])
 def get_processed_file(filename):
-    """Serve processed image file with CORS headers and caching support"""
+    """
+    Serve processed image file with CORS headers and caching support
+
+    ?size=thumb|preview|full (or ?w=<display width px>) serves a downscaled
+    rendition instead of the full page. Both carry an ETag and are
+    revalidated, so a reprocessed page is never served stale.
+    """
     # Handle OPTIONS request
     if request.method == "OPTIONS":
-        response = jsonify({"status": "ok"})
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        response.headers["Access-Control-Allow-Methods"] = "GET, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = (
-            "Content-Type, Authorization, ngrok-skip-browser-warning"
-        )
-        response.headers["Access-Control-Max-Age"] = "3600"
-        return response, 200
+        return file_options_response()
 
     try:
         # Security: prevent directory traversal
@@ -2729,30 +2627,24 @@ def get_processed_file(filename):
         file_path = os.path.join(PROCESSED_DIR, filename)
         if not os.path.exists(file_path):
             print(f"[ERROR] File not found: {file_path}")
-            return jsonify({"error": "File not found"}), 404
+            return file_not_found()
 
-        print(f"[OK] Serving processed file: {filename}")
-        response = send_from_directory(PROCESSED_DIR, filename)
-
-        # Add comprehensive CORS and cache headers
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        response.headers["Access-Control-Allow-Methods"] = "GET, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = (
-            "Content-Type, Authorization, ngrok-skip-browser-warning"
-        )
-        response.headers["Access-Control-Expose-Headers"] = "Content-Length, Content-Type"
-        response.headers["Cache-Control"] = "public, max-age=3600"
-        response.headers["X-Content-Type-Options"] = "nosniff"
-
-        # Detect image type from extension
-        if filename.lower().endswith(".png"):
-            response.headers["Content-Type"] = "image/png"
-        elif filename.lower().endswith(".jpg") or filename.lower().endswith(".jpeg"):
-            response.headers["Content-Type"] = "image/jpeg"
-        else:
-            response.headers["Content-Type"] = "image/jpeg"  # Default to JPEG
+        try:
+            rendition = thumbnail_store.negotiate(
+                file_path, request.args.get("size"), request.args.get("w", type=int)
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if rendition:
+            rendition_path, etag, rendition_name = rendition
+            return serve_file(
+                rendition_path,
+                mimetype="image/jpeg" if rendition_name != RENDITION_FULL else None,
+                etag=etag,
+            )
 
-        return response
+        print(f"[OK] Serving processed file: {filename}")
+        return serve_file(file_path)
     except Exception as e:
         print(f"[ERROR] File serving error: {str(e)}")
         traceback.print_exc()
@@ -2777,18 +2669,8 @@ def get_document_info(filename):
         if ".." in filename or "/" in filename.replace("\\", "/"):
             return jsonify({"error": "Invalid filename"}), 400
 
-        # Check different directories for the file
-        possible_paths = [
-            os.path.join(PROCESSED_DIR, filename),
-            os.path.join(CONVERTED_DIR, filename),
-            os.path.join(UPLOAD_DIR, filename),
-        ]
-
-        file_path = None
-        for path in possible_paths:
-            if os.path.exists(path):
-                file_path = path
-                break
+        # Processed, converted or uploaded file, from the in-memory name map
+        file_path = file_locator.resolve(filename)
 
         if not file_path:
             return jsonify({"error": "File not found"}), 404
@@ -2803,17 +2685,15 @@ def get_document_info(filename):
         # Get page count and thumbnails for PDFs
         if file_ext == '.pdf':
             try:
-                import PyPDF2
-                with open(file_path, 'rb') as pdf_file:
-                    pdf_reader = PyPDF2.PdfReader(pdf_file)
-                    page_count = len(pdf_reader.pages)
-                    
-                    # Generate page info with thumbnail URLs
-                    for page_num in range(1, page_count + 1):
-                        doc_info["pages"].append({
-                            "pageNumber": page_num,
-                            "thumbnailUrl": f"/document/page/{filename}/{page_num}"
-                        })
+                # Served from the renderer's open document after the first request
+                page_count = pdf_renderer.page_count(file_path)
+
+                # Generate page info with thumbnail URLs
+                for page_num in range(1, page_count + 1):
+                    doc_info["pages"].append({
+                        "pageNumber": page_num,
+                        "thumbnailUrl": f"/document/page/{filename}/{page_num}"
+                    })
             except Exception as e:
                 print(f"[WARN] Error reading PDF pages: {str(e)}")
                 # Fallback: assume single page
@@ -2843,32 +2723,15 @@ def get_document_info(filename):
 def get_pdf_page_thumbnail(filename, page_num):
     """Generate and serve thumbnail for a specific PDF page"""
     if request.method == "OPTIONS":
-        response = jsonify({"status": "ok"})
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        response.headers["Access-Control-Allow-Methods"] = "GET, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = (
-            "Content-Type, Authorization, ngrok-skip-browser-warning"
-        )
-        response.headers["Access-Control-Max-Age"] = "3600"
-        return response, 200
+        return file_options_response()
 
     try:
         # Security: prevent directory traversal
         if ".." in filename or "/" in filename.replace("\\", "/"):
             return jsonify({"error": "Invalid filename"}), 400
 
-        # Check different directories for the file
-        possible_paths = [
-            os.path.join(PROCESSED_DIR, filename),
-            os.path.join(CONVERTED_DIR, filename),
-            os.path.join(UPLOAD_DIR, filename),
-        ]
-
-        file_path = None
-        for path in possible_paths:
-            if os.path.exists(path):
-                file_path = path
-                break
+        # Processed, converted or uploaded file, from the in-memory name map
+        file_path = file_locator.resolve(filename)
 
         if not file_path:
             return jsonify({"error": "File not found"}), 404
@@ -2878,43 +2741,31 @@ def get_pdf_page_thumbnail(filename, page_num):
         if file_ext != '.pdf':
             return jsonify({"error": "Not a PDF file"}), 400
 
-        # Generate thumbnail for specific page
+        # Rendered in-process from a cached open document; neighbouring pages are prefetched
+        etag = pdf_renderer.etag(file_path, page_num)
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = "no-cache"
+            return add_file_cors_headers(response)
+
         try:
-            from pdf2image import convert_from_path
-            images = convert_from_path(
-                file_path, 
-                first_page=page_num, 
-                last_page=page_num, 
-                dpi=150,  # Higher DPI for better quality
-                poppler_path=POPPLER_PATH
-            )
-            
-            if images:
-                img = images[0]
-                # Resize to larger thumbnail for preview
-                img.thumbnail((800, 1132), Image.Resampling.LANCZOS)  # A4 ratio
-                
-                # Convert to bytes
-                thumb_io = io.BytesIO()
-                img.save(thumb_io, format='JPEG', quality=90)
-                thumbnail_data = thumb_io.getvalue()
-                
+            thumbnail_data = pdf_renderer.render_page(file_path, page_num)
+            if thumbnail_data:
                 response = app.response_class(
                     response=thumbnail_data,
                     status=200,
                     mimetype="image/jpeg"
                 )
-                response.headers["Access-Control-Allow-Origin"] = "*"
-                response.headers["Access-Control-Allow-Methods"] = "GET, HEAD, OPTIONS"
-                response.headers["Access-Control-Expose-Headers"] = "Content-Length, Content-Type"
-                response.headers["Cache-Control"] = "public, max-age=86400"
-                response.headers["Content-Type"] = "image/jpeg"
-                return response
+                response.set_etag(etag)
+                # Same URL after the PDF is replaced, so revalidate rather than trust max-age
+                response.headers["Cache-Control"] = "no-cache"
+                return add_file_cors_headers(response)
             else:
                 return jsonify({"error": "Could not extract page"}), 500
                 
         except ImportError:
-            return jsonify({"error": "pdf2image not available"}), 500
+            return jsonify({"error": "No PDF renderer available (install PyMuPDF or pdf2image)"}), 500
         except Exception as e:
             print(f"[ERROR] PDF page extraction error: {str(e)}")
             return jsonify({"error": f"Page extraction error: {str(e)}"}), 500
@@ -2929,117 +2780,50 @@ def get_pdf_page_thumbnail(filename, page_num):
 def get_thumbnail(filename):
     """Generate and serve thumbnail images for documents and PDFs"""
     if request.method == "OPTIONS":
-        response = jsonify({"status": "ok"})
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        response.headers["Access-Control-Allow-Methods"] = "GET, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = (
-            "Content-Type, Authorization, ngrok-skip-browser-warning"
-        )
-        response.headers["Access-Control-Max-Age"] = "3600"
-        return response, 200
+        return file_options_response()
 
     try:
         # Security: prevent directory traversal
         if ".." in filename or "/" in filename.replace("\\", "/"):
             return jsonify({"error": "Invalid filename"}), 400
 
-        # Check different directories for the file
-        possible_paths = [
-            os.path.join(PROCESSED_DIR, filename),  # Processed images
-            os.path.join(CONVERTED_DIR, filename),  # Converted PDFs
-            os.path.join(UPLOAD_DIR, filename),     # Uploaded files
-        ]
-
-        file_path = None
-        for path in possible_paths:
-            if os.path.exists(path):
-                file_path = path
-                break
+        # Processed, converted or uploaded file, from the in-memory name map
+        file_path = file_locator.resolve(filename)
 
         if not file_path:
             print(f"[ERROR] Thumbnail source file not found: {filename}")
-            return jsonify({"error": "File not found"}), 404
-
-        # Generate thumbnail based on file type
-        file_ext = os.path.splitext(filename)[1].lower()
-        thumbnail_data = None
+            return file_not_found()
 
-        try:
-            if file_ext in ['.pdf']:
-                # For PDFs, try to convert first page to image using pdf2image or similar
-                try:
-                    from pdf2image import convert_from_path
-                    images = convert_from_path(file_path, first_page=1, last_page=1, dpi=100, poppler_path=POPPLER_PATH)
-                    if images:
-                        img = images[0]
-                        # Resize to thumbnail size
-                        img.thumbnail((200, 250), Image.Resampling.LANCZOS)
-                        # Convert to bytes
-                        thumb_io = io.BytesIO()
-                        img.save(thumb_io, format='JPEG', quality=85)
-                        thumbnail_data = thumb_io.getvalue()
-                except ImportError:
-                    # Fallback: return a placeholder
-                    print(f"[WARN] pdf2image not available, using placeholder for {filename}")
-                    placeholder = Image.new('RGB', (200, 250), color=(100, 100, 100))
-                    thumb_io = io.BytesIO()
-                    placeholder.save(thumb_io, format='JPEG', quality=85)
-                    thumbnail_data = thumb_io.getvalue()
-
-            elif file_ext in ['.png', '.jpg', '.jpeg', '.bmp', '.gif']:
-                # For image files, read and resize
-                img = Image.open(file_path)
-                # Convert RGBA to RGB if needed
-                if img.mode == 'RGBA':
-                    rgb_img = Image.new('RGB', img.size, (255, 255, 255))
-                    rgb_img.paste(img, mask=img.split()[3])
-                    img = rgb_img
-                elif img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                # Resize to thumbnail size while maintaining aspect ratio
-                img.thumbnail((200, 250), Image.Resampling.LANCZOS)
-                # Convert to bytes
-                thumb_io = io.BytesIO()
-                img.save(thumb_io, format='JPEG', quality=85)
-                thumbnail_data = thumb_io.getvalue()
-
-            elif file_ext in ['.txt']:
-                # For text files, create a text-based thumbnail
-                text_preview = Image.new('RGB', (200, 250), color=(255, 255, 255))
-                thumb_io = io.BytesIO()
-                text_preview.save(thumb_io, format='JPEG', quality=85)
-                thumbnail_data = thumb_io.getvalue()
+        # Cached thumbnail: rendered once per file version, usually ahead of time
+        cached = thumbnail_store.get(file_path) if thumbnail_store.supports(file_path) else None
+        if cached:
+            thumb_path, etag = cached
+            # The ETag follows the source version; revalidation answers 304 until it changes
+            return serve_file(thumb_path, mimetype="image/jpeg", etag=etag)
 
-            else:
-                # Unknown file type, return placeholder
-                placeholder = Image.new('RGB', (200, 250), color=(200, 200, 200))
-                thumb_io = io.BytesIO()
-                placeholder.save(thumb_io, format='JPEG', quality=85)
-                thumbnail_data = thumb_io.getvalue()
-
-        except Exception as e:
-            print(f"[WARN] Error generating thumbnail: {str(e)}")
-            # Return a gray placeholder on error
-            placeholder = Image.new('RGB', (200, 250), color=(180, 180, 180))
-            thumb_io = io.BytesIO()
-            placeholder.save(thumb_io, format='JPEG', quality=85)
-            thumbnail_data = thumb_io.getvalue()
-
-        if thumbnail_data:
-            response = app.response_class(
-                response=thumbnail_data,
-                status=200,
-                mimetype="image/jpeg"
-            )
-            response.headers["Access-Control-Allow-Origin"] = "*"
-            response.headers["Access-Control-Allow-Methods"] = "GET, HEAD, OPTIONS"
-            response.headers["Access-Control-Expose-Headers"] = "Content-Length, Content-Type"
-            response.headers["Cache-Control"] = "public, max-age=86400"
-            response.headers["Content-Type"] = "image/jpeg"
-            return response
-
-        return jsonify({"error": "Failed to generate thumbnail"}), 500
+        # Placeholders: white for text files, grey for other types and failed renders
+        file_ext = os.path.splitext(filename)[1].lower()
+        if file_ext == ".txt":
+            color = (255, 255, 255)
+        elif thumbnail_store.supports(file_path):
+            print(f"[WARN] Could not render thumbnail for {filename}, using placeholder")
+            color = (180, 180, 180)
+        else:
+            color = (200, 200, 200)
+        placeholder = Image.new('RGB', (200, 250), color=color)
+        thumb_io = io.BytesIO()
+        placeholder.save(thumb_io, format='JPEG', quality=85)
+
+        response = app.response_class(
+            response=thumb_io.getvalue(),
+            status=200,
+            mimetype="image/jpeg"
+        )
+        add_file_cors_headers(response)
+        # Short lifetime so the real thumbnail shows up once it can be rendered
+        response.headers["Cache-Control"] = "public, max-age=300"
+        response.headers["Content-Type"] = "image/jpeg"
+        return response
 
     except Exception as e:
         print(f"[ERROR] Thumbnail generation error: {str(e)}")
@@ -3052,14 +2836,7 @@ def get_upload_file(filename):
     """Serve uploaded (preview) image file with CORS headers"""
     # Handle OPTIONS request
     if request.method == "OPTIONS":
-        response = jsonify({"status": "ok"})
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        response.headers["Access-Control-Allow-Methods"] = "GET, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = (
-            "Content-Type, Authorization, ngrok-skip-browser-warning"
-        )
-        response.headers["Access-Control-Max-Age"] = "3600"
-        return response, 200
+        return file_options_response()
 
     try:
         # Security: prevent directory traversal
@@ -3073,30 +2850,10 @@ def get_upload_file(filename):
         file_path = os.path.join(UPLOAD_DIR, upload_filename)
         if not os.path.exists(file_path):
             print(f"[ERROR] Upload file not found: {file_path}")
-            return jsonify({"error": "File not found"}), 404
+            return file_not_found()
 
         print(f"[OK] Serving upload file: {upload_filename}")
-        response = send_from_directory(UPLOAD_DIR, upload_filename)
-
-        # Add comprehensive CORS headers
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        response.headers["Access-Control-Allow-Methods"] = "GET, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = (
-            "Content-Type, Authorization, ngrok-skip-browser-warning"
-        )
-        response.headers["Access-Control-Expose-Headers"] = "Content-Length, Content-Type"
-        response.headers["Cache-Control"] = "public, max-age=300"  # 5 min cache for previews
-        response.headers["X-Content-Type-Options"] = "nosniff"
-
-        # Detect image type from extension
-        if upload_filename.lower().endswith(".png"):
-            response.headers["Content-Type"] = "image/png"
-        elif upload_filename.lower().endswith(".jpg") or upload_filename.lower().endswith(".jpeg"):
-            response.headers["Content-Type"] = "image/jpeg"
-        else:
-            response.headers["Content-Type"] = "image/jpeg"  # Default to JPEG
-
-        return response
+        return serve_file(file_path)
     except Exception as e:
         print(f"[ERROR] Upload file serving error: {str(e)}")
         traceback.print_exc()
@@ -3124,6 +2881,21 @@ def delete_file(filename):
         if os.path.exists(upload_path):
             os.remove(upload_path)
 
+        document_catalog.remove(filename)
+        thumbnail_store.purge(image_path)
+        file_locator.discard(image_path)
+        file_locator.discard(upload_path)
+
+        # Drop it from the OCR search index
+        try:
+            from app.modules.ocr.search_index import get_search_index
+
+            index = get_search_index(os.path.join(OCR_DATA_DIR, "cache"))
+            if index:
+                index.delete(filename)
+        except Exception as index_error:
+            print(f"[WARN] Search index delete failed: {index_error}")
+
         # Notify via Socket.IO
         socketio.emit("file_deleted", {"filename": filename})
 
@@ -3134,8 +2906,19 @@ def delete_file(filename):
 
 @app.route("/ocr/<filename>")
 def get_ocr_text(filename):
-    """Get extracted OCR text for a file"""
+    """Get extracted OCR text for a file (?fields=... returns just those OCR result fields)"""
     try:
+        from app.modules.ocr.paddle_ocr import get_ocr_processor
+        from app.modules.ocr.result_store import RESULT_FIELDS
+
+        fields = [f.strip() for f in request.args.get("fields", "").split(",") if f.strip()]
+        unknown = [f for f in fields if f not in RESULT_FIELDS]
+        if unknown:
+            return jsonify({"error": f"Unknown OCR result fields: {', '.join(unknown)}", "fields": list(RESULT_FIELDS)}), 400
+        if fields:
+            result = get_ocr_processor(OCR_DATA_DIR).load_result(filename, fields=fields)
+            return jsonify({"filename": filename, "ocr_result": result, "ocr_ready": result is not None})
+
         text_filename = f"{os.path.splitext(filename)[0]}.txt"
         text_path = os.path.join(TEXT_DIR, text_filename)
 
@@ -3143,8 +2926,13 @@ def get_ocr_text(filename):
             with open(text_path, "r", encoding="utf-8") as f:
                 text = f.read()
             return jsonify({"filename": filename, "text": text, "length": len(text)})
-        else:
-            return jsonify({"filename": filename, "text": "", "message": "No text extracted"})
+
+        # Fall back to the OCR store's text member (no region data is decoded)
+        result = get_ocr_processor(OCR_DATA_DIR).load_result(filename, fields=["full_text"])
+        if result and result.get("full_text"):
+            text = result["full_text"]
+            return jsonify({"filename": filename, "text": text, "length": len(text)})
+        return jsonify({"filename": filename, "text": "", "message": "No text extracted"})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -3272,22 +3060,10 @@ def print_single_document():
         
         logger.info(f"[PRINT_DOC] Print request for: {filename}")
         
-        # Search for file in multiple directories
-        search_dirs = [
-            PROCESSED_DIR,
-            CONVERTED_DIR,
-            UPLOAD_DIR,
-            PDF_DIR,
-            os.path.join(DATA_DIR, "ocr_results"),
-        ]
-        
-        file_path = None
-        for search_dir in search_dirs:
-            candidate = os.path.join(search_dir, filename)
-            if os.path.exists(candidate):
-                file_path = candidate
-                logger.info(f"[PRINT_DOC] Found file in: {search_dir}")
-                break
+        # Search processed, converted, uploads, pdfs and ocr_results
+        file_path = file_locator.resolve(filename, PRINT_FOLDERS)
+        if file_path:
+            logger.info(f"[PRINT_DOC] Found file in: {os.path.dirname(file_path)}")
         
         if not file_path:
             logger.error(f"[PRINT_DOC] File not found: {filename}")
@@ -3724,8 +3500,8 @@ def export_pdf():
 
 @app.route("/pdf/<filename>")
 def serve_pdf(filename):
-    """Serve generated PDF files"""
-    return send_from_directory(PDF_DIR, filename)
+    """Serve generated PDF files (Range requests supported)"""
+    return serve_from_directory(PDF_DIR, filename)
 
 
 @app.route("/pipeline/info")
@@ -3976,6 +3752,126 @@ def batch_process():
 # OCR data directory
 OCR_DATA_DIR = os.path.join(DATA_DIR, "ocr_results")
 os.makedirs(OCR_DATA_DIR, exist_ok=True)
+app.config['OCR_DATA_DIR'] = OCR_DATA_DIR
+
+# Persistent catalog of processed documents backing /files
+from app.modules.document.catalog import (
+    CATALOG_FILE,
+    COLLECTION_CONVERTED,
+    CatalogCursorError,
+    DocumentCatalog,
+)
+
+document_catalog = DocumentCatalog(
+    os.path.join(DATA_DIR, CATALOG_FILE), PROCESSED_DIR, TEXT_DIR, OCR_DATA_DIR, converted_dir=CONVERTED_DIR
+)
+app.config['document_catalog'] = document_catalog
+# Pick up files added or removed while the server was down
+threading.Thread(target=document_catalog.reconcile, name="catalog-reconcile", daemon=True).start()
+
+# Uploads are streamed to disk, validated and hashed (repeats resolve to the catalogued document)
+from app.modules.document.storage import UploadRejected, check_upload_length, ingest_upload
+
+# Persistent thumbnail cache backing /thumbnail (pre-generated when processing/conversion completes)
+from app.modules.document.thumbnails import RENDITION_FULL, THUMBNAIL_DIR, get_thumbnail_store
+
+thumbnail_store = get_thumbnail_store(os.path.join(DATA_DIR, THUMBNAIL_DIR), poppler_path=POPPLER_PATH)
+app.config['thumbnail_store'] = thumbnail_store
+
+# In-process PDF page rendering with open-document and page caches (/document/page, /document/info)
+from app.modules.document.pdf_renderer import get_pdf_renderer
+
+pdf_renderer = get_pdf_renderer(poppler_path=POPPLER_PATH)
+app.config['pdf_renderer'] = pdf_renderer
+
+# Document name -> path map, kept current by a filesystem watcher
+from app.modules.document.locator import PRINT_FOLDERS, get_file_locator
+
+file_locator = get_file_locator(DATA_DIR)
+app.config['file_locator'] = file_locator
+
+# Background OCR/naming for freshly processed pages (see enqueue_enrichment)
+from app.modules.ocr.enrichment import EnrichmentQueue
+
+enrichment_queue = EnrichmentQueue(
+    OCR_DATA_DIR,
+    TEXT_DIR,
+    emit=socketio.emit,
+    catalog=document_catalog,
+    thumbnails=thumbnail_store,
+    locator=file_locator,
+)
+
+# Background retention, recompression, dedupe and quota enforcement for DATA_DIR
+from app.modules.document.lifecycle import OCR_SUFFIXES, StorageLifecycle
+
+
+def _on_storage_removed(path):
+    """Drop caches and index entries for a file the lifecycle job deleted"""
+    thumbnail_store.purge(path)
+    file_locator.discard(path)
+    pdf_renderer.evict(path)
+    folder = os.path.dirname(os.path.abspath(path))
+    name = os.path.basename(path)
+    if folder == os.path.abspath(PROCESSED_DIR):
+        document_catalog.remove(name)
+
+    # Deleted documents and OCR results must stop matching /search
+    if folder in (os.path.abspath(PROCESSED_DIR), os.path.abspath(UPLOAD_DIR), os.path.abspath(OCR_DATA_DIR)):
+        for suffix in OCR_SUFFIXES:
+            if name.endswith(suffix):
+                # delete() keys on the image's base name; any extension will do
+                name = f"{name[: -len(suffix)]}.jpg"
+                break
+        try:
+            from app.modules.ocr.search_index import get_search_index
+
+            index = get_search_index(os.path.join(OCR_DATA_DIR, "cache"))
+            if index:
+                index.delete(name)
+        except Exception as index_error:
+            print(f"[WARN] Search index delete failed: {index_error}")
+
+
+storage_lifecycle = StorageLifecycle(DATA_DIR, on_removed=_on_storage_removed, emit=socketio.emit)
+app.config['storage_lifecycle'] = storage_lifecycle
+if storage_lifecycle.config.get("enabled", True):
+    storage_lifecycle.start()
+
+
+@app.route("/storage/lifecycle", methods=["GET", "POST", "OPTIONS"])
+def storage_lifecycle_route():
+    """
+    Storage lifecycle status and manual runs
+    GET: schedule, policies, current usage and the last run report
+    POST: start a pass in the background (202), or ?dry_run=1 to get
+    the report of what a pass would reclaim without changing anything
+    """
+    if request.method == "OPTIONS":
+        response = jsonify({"status": "ok"})
+        response.headers["Access-Control-Allow-Origin"] = "*"
+        response.headers["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS"
+        response.headers["Access-Control-Allow-Headers"] = (
+            "Content-Type, Authorization, ngrok-skip-browser-warning"
+        )
+        response.headers["Access-Control-Max-Age"] = "3600"
+        return response, 200
+
+    try:
+        if request.method == "GET":
+            return jsonify({"success": True, **storage_lifecycle.status(), "usage": storage_lifecycle.usage()})
+
+        if request.args.get("dry_run", "").lower() in ("1", "true", "yes"):
+            report = storage_lifecycle.run(dry_run=True)
+            if report is None:
+                return jsonify({"success": False, "error": "A storage lifecycle pass is already running"}), 409
+            return jsonify({"success": True, "report": report})
+
+        if not storage_lifecycle.trigger():
+            return jsonify({"success": False, "error": "A storage lifecycle pass is already running"}), 409
+        return jsonify({"success": True, "status": "scheduled"}), 202
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
 
 
 @app.route("/ocr/<path:filename>", methods=["POST", "OPTIONS"])
@@ -4018,11 +3914,12 @@ def run_ocr(filename):
         # Get or create OCR processor
         processor = get_ocr_processor(OCR_DATA_DIR)
         
-        # Run OCR
-        result = processor.process_image(image_path)
+        # Run OCR (optional ?strategy=paddle|tesseract|paddle-then-tesseract-fallback|fast-preview)
+        result = processor.process_image(image_path, strategy=request.args.get("strategy"))
         
         # Save result
         json_path = processor.save_result(filename, result)
+        document_catalog.update(filename, has_ocr=result.word_count > 0, derived_title=result.derived_title or None)
         
         # Prepare response
         response_data = {
@@ -4068,6 +3965,7 @@ def get_ocr_result(filename):
     """
     try:
         from app.modules.ocr.paddle_ocr import get_ocr_processor
+        from app.modules.ocr.result_store import RESULT_FIELDS
         
         # Security: prevent directory traversal
         if ".." in filename:
@@ -4076,8 +3974,16 @@ def get_ocr_result(filename):
         # Get OCR processor
         processor = get_ocr_processor(OCR_DATA_DIR)
         
-        # Check if OCR result exists
-        result = processor.load_result(filename)
+        # Check if OCR result exists (?fields=derived_title,full_text limits what is decoded)
+        fields = [f.strip() for f in request.args.get("fields", "").split(",") if f.strip()]
+        unknown = [f for f in fields if f not in RESULT_FIELDS]
+        if unknown:
+            return jsonify({
+                "success": False,
+                "error": f"Unknown OCR result fields: {', '.join(unknown)}",
+                "fields": list(RESULT_FIELDS),
+            }), 400
+        result = processor.load_result(filename, fields=fields or None)
         
         if result:
             return jsonify({
@@ -4114,15 +4020,90 @@ def get_ocr_status(filename):
         processor = get_ocr_processor(OCR_DATA_DIR)
         has_ocr = processor.has_ocr_result(filename)
         
-        return jsonify({
+        response = {
             "filename": filename,
             "ocr_ready": has_ocr,
-        })
+        }
+        
+        # Stage timings and region confidence stats come from the small result header
+        if has_ocr:
+            header = processor.load_header(filename) or {}
+            response["processing_time_ms"] = header.get("processing_time_ms")
+            response["strategy"] = header.get("strategy")
+            response["timings"] = header.get("timings") or {}
+            response["confidence_stats"] = header.get("confidence_stats") or {}
+        
+        return jsonify(response)
 
     except Exception as e:
         return jsonify({"filename": filename, "ocr_ready": False})
 
 
+@app.route("/ocr/metrics", methods=["GET"])
+def get_ocr_metrics():
+    """
+    Aggregate OCR stage timings over recent results
+    Shows which stage (load, prepare, inference, parse, sort, llm) dominates latency
+    """
+    try:
+        from app.modules.ocr.profiling import ocr_metrics
+
+        slowest = request.args.get("slowest", 10, type=int)
+        return jsonify({"success": True, "metrics": ocr_metrics.snapshot(slowest=slowest)})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route("/ocr-regions/<path:filename>", methods=["POST", "OPTIONS"])
+def run_region_ocr(filename):
+    """
+    Re-run OCR on parts of a page
+    Body: {"regions": [{"x", "y", "width", "height"}], "unit_ids": [0, 3]}
+    Regions covered by a saved OCR result reuse its detection boxes
+    """
+    if request.method == "OPTIONS":
+        response = jsonify({"status": "ok"})
+        response.headers["Access-Control-Allow-Origin"] = "*"
+        response.headers["Access-Control-Allow-Methods"] = "POST, OPTIONS"
+        response.headers["Access-Control-Allow-Headers"] = (
+            "Content-Type, Authorization, ngrok-skip-browser-warning"
+        )
+        response.headers["Access-Control-Max-Age"] = "3600"
+        return response, 200
+
+    try:
+        from app.modules.ocr.paddle_ocr import get_ocr_processor
+
+        if ".." in filename:
+            return jsonify({"error": "Invalid filename"}), 400
+
+        image_path = os.path.join(PROCESSED_DIR, filename)
+        if not os.path.exists(image_path):
+            image_path = os.path.join(UPLOAD_DIR, filename)
+        if not os.path.exists(image_path):
+            return jsonify({"error": f"File not found: {filename}"}), 404
+
+        data = request.get_json(silent=True) or {}
+        processor = get_ocr_processor(OCR_DATA_DIR)
+        try:
+            result = processor.process_regions(
+                image_path,
+                regions=data.get("regions"),
+                unit_ids=data.get("unit_ids"),
+                strategy=request.args.get("strategy"),
+            )
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+
+        return jsonify({"success": True, "filename": filename, **result})
+
+    except Exception as e:
+        error_msg = f"Region OCR error: {str(e)}"
+        print(f"[ERROR] {error_msg}")
+        traceback.print_exc()
+        return jsonify({"success": False, "error": error_msg}), 500
+
+
 @app.route("/ocr-batch-status", methods=["POST"])
 def get_batch_ocr_status():
     """
@@ -4142,12 +4123,12 @@ def get_batch_ocr_status():
                 has_ocr = processor.has_ocr_result(filename)
                 status_info = {"has_ocr": has_ocr}
                 
-                # If OCR exists, try to get the derived title
+                # If OCR exists, read the derived title from the result header
                 if has_ocr:
                     try:
-                        result = processor.load_result(filename)
-                        if result and result.derived_title:
-                            status_info["derived_title"] = result.derived_title
+                        header = processor.load_header(filename)
+                        if header and header.get("derived_title"):
+                            status_info["derived_title"] = header["derived_title"]
                     except:
                         pass
                 
@@ -4159,6 +4140,44 @@ def get_batch_ocr_status():
         return jsonify({"success": False, "statuses": {}, "error": str(e)})
 
 
+@app.route("/search", methods=["GET"])
+def search_documents():
+    """
+    Full-text search over OCR titles and text
+    Query params: q (required), limit (default 20, max 100), offset
+    """
+    try:
+        import time
+
+        from app.modules.ocr.search_index import DEFAULT_SEARCH_LIMIT, get_search_index, resolve_hits
+
+        query = request.args.get("q", "").strip()
+        if not query:
+            return jsonify({"success": False, "error": "Missing query parameter 'q'"}), 400
+
+        limit = request.args.get("limit", DEFAULT_SEARCH_LIMIT, type=int)
+        offset = request.args.get("offset", 0, type=int)
+
+        index = get_search_index(os.path.join(OCR_DATA_DIR, "cache"))
+        if index is None:
+            return jsonify({"success": False, "error": "Search index unavailable"}), 503
+
+        start = time.time()
+        hits = resolve_hits(index.search(query, limit=limit, offset=offset), PROCESSED_DIR)
+        return jsonify({
+            "success": True,
+            "query": query,
+            "results": hits,
+            "count": len(hits),
+            "took_ms": round((time.time() - start) * 1000, 2),
+        })
+
+    except Exception as e:
+        error_msg = f"Search error: {str(e)}"
+        print(f"[ERROR] {error_msg}")
+        return jsonify({"success": False, "error": error_msg}), 500
+
+
 # ============================================================================
 # FILE CONVERSION ENDPOINTS
 # ============================================================================
@@ -4258,6 +4277,7 @@ def convert_files():
             print(f"{'='*70}\n")
 
             if success:
+                thumbnail_store.pregenerate(merged_path)
                 results = [
                     {
                         "input": ", ".join([os.path.basename(f) for f in files]),
@@ -4296,6 +4316,10 @@ def convert_files():
             input_paths, converted_dir, target_format
         )
 
+        for result in results:
+            if result.get("success") and result.get("output"):
+                thumbnail_store.pregenerate(os.path.join(converted_dir, result["output"]))
+
         print(f"\n{'='*70}")
         print(f"[OK] CONVERSION COMPLETED")
         print(f"  Success: {success_count}")
@@ -4333,9 +4357,9 @@ def convert_files():
 
 @app.route("/converted/<path:filename>")
 def serve_converted_file(filename):
-    """Serve converted files"""
+    """Serve converted files (Range requests supported)"""
     try:
-        return send_from_directory(CONVERTED_DIR, filename)
+        return serve_from_directory(CONVERTED_DIR, filename)
     except Exception as e:
         print(f"Error serving converted file: {e}")
         return jsonify({"error": str(e)}), 404
@@ -4346,7 +4370,7 @@ def serve_converted_page(filepath):
     """Serve extracted PDF pages from converted documents"""
     try:
         # filepath format: filename_pages/filename_page_001.jpg
-        return send_from_directory(CONVERTED_DIR, filepath)
+        return serve_from_directory(CONVERTED_DIR, filepath)
     except Exception as e:
         print(f"Error serving converted page: {e}")
         return jsonify({"error": str(e)}), 404
@@ -4354,48 +4378,28 @@ def serve_converted_page(filepath):
 
 @app.route("/get-converted-files", methods=["GET"])
 def get_converted_files():
-    """Get list of converted files with extracted pages info"""
+    """
+    Get list of converted files with extracted pages info
+
+    Accepts the same limit/cursor/since parameters as /files
+    """
     try:
         if not os.path.exists(CONVERTED_DIR):
             return jsonify({"files": []})
 
-        files = []
-        for filename in os.listdir(CONVERTED_DIR):
-            filepath = os.path.join(CONVERTED_DIR, filename)
-            # Only include files, not directories
-            if os.path.isfile(filepath):
-                stat = os.stat(filepath)
-                file_info = {
-                    "filename": filename,
-                    "size": stat.st_size,
-                    "created": datetime.fromtimestamp(stat.st_ctime).isoformat(),
-                    "url": f"/converted/{filename}",
-                    "pages": [],  # Will be populated if pages are extracted
-                }
-                
-                # Check if extracted pages exist for this file
-                base_name = os.path.splitext(filename)[0]
-                pages_dir = os.path.join(CONVERTED_DIR, f"{base_name}_pages")
-                
-                if os.path.isdir(pages_dir):
-                    # List extracted pages
-                    page_files = sorted([f for f in os.listdir(pages_dir) if f.endswith('.jpg')])
-                    for page_file in page_files:
-                        page_path = os.path.join(pages_dir, page_file)
-                        page_size = os.path.getsize(page_path)
-                        file_info["pages"].append({
-                            "filename": page_file,
-                            "path": f"{base_name}_pages/{page_file}",
-                            "size": page_size,
-                            "url": f"/converted-page/{base_name}_pages/{page_file}",
-                        })
-                
-                files.append(file_info)
-
-        # Sort by creation time (newest first)
-        files.sort(key=lambda x: x["created"], reverse=True)
+        try:
+            listing = document_catalog.listing(
+                COLLECTION_CONVERTED,
+                limit=request.args.get("limit", type=int),
+                cursor=request.args.get("cursor"),
+                since=request.args.get("since"),
+            )
+        except CatalogCursorError as e:
+            return jsonify({"error": str(e)}), 400
 
-        return jsonify({"files": files})
+        # Newest first; pages are only re-listed for files that changed
+        files = listing.pop("items")
+        return jsonify({"files": files, **listing})
 
     except Exception as e:
         print(f"Error listing converted files: {e}")
@@ -4431,8 +4435,11 @@ def delete_converted_file(filename):
         if not os.path.abspath(file_path).startswith(os.path.abspath(CONVERTED_DIR)):
             return jsonify({"error": "Invalid file path"}), 400
 
-        # Delete the file
+        # Delete the file (close it in the PDF renderer first; Windows can't delete open files)
+        pdf_renderer.evict(file_path)
         os.remove(file_path)
+        thumbnail_store.purge(file_path)
+        file_locator.discard(file_path)
         print(f"[OK] Deleted converted file: {filename}")
 
         return jsonify({"success": True, "message": f"Successfully deleted {filename}"})
@@ -5848,20 +5855,12 @@ def orchestrate_print():
         # Helper function to find file in multiple directories
         def find_file(filename):
             """Search for file in multiple possible directories"""
-            search_dirs = [
-                PROCESSED_DIR,
-                CONVERTED_DIR,
-                UPLOAD_DIR,
-                PDF_DIR,
-                os.path.join(DATA_DIR, "ocr_results"),
-            ]
-            for search_dir in search_dirs:
-                file_path = os.path.join(search_dir, filename)
-                if os.path.exists(file_path):
-                    logger.info(f"[PRINT] Found {filename} in {search_dir}")
-                    return file_path
+            file_path = file_locator.resolve(filename, PRINT_FOLDERS)
+            if file_path:
+                logger.info(f"[PRINT] Found {filename} in {os.path.dirname(file_path)}")
+                return file_path
             logger.warning(f"[PRINT] File not found: {filename}")
-            logger.warning(f"[PRINT]   Searched in: {search_dirs}")
+            logger.warning(f"[PRINT]   Searched in: {', '.join(PRINT_FOLDERS)}")
             return None
 
         # Add converted PDFs from converted directory
@@ -8,9 +8,18 @@ import uuid
 import threading
 import traceback
 from datetime import datetime
-from flask import Blueprint, request, jsonify, send_from_directory, current_app
+from flask import Blueprint, request, jsonify, current_app
 from PIL import Image
 
+from app.core.middleware.file_serving import (
+    add_file_cors_headers,
+    file_not_found,
+    file_options_response,
+    serve_file,
+    serve_from_directory,
+)
+from app.modules.document.storage import UploadRejected, check_upload_length, ingest_upload
+
 # Create Blueprint
 document_bp = Blueprint('document', __name__)
 
@@ -59,6 +68,51 @@ def get_process_document_image():
     return current_app.config.get('process_document_image')
 
 
+def get_document_catalog():
+    """Get the DocumentCatalog (processed-file index) from app"""
+    from flask import current_app
+    return current_app.config.get('document_catalog')
+
+
+def get_thumbnail_store():
+    """Get the ThumbnailStore (persistent thumbnail cache) from app"""
+    from flask import current_app
+    store = current_app.config.get('thumbnail_store')
+    if store is None and current_app.config.get('DATA_DIR'):
+        from app.modules.document.thumbnails import THUMBNAIL_DIR, get_thumbnail_store as shared_store
+        store = shared_store(
+            os.path.join(current_app.config['DATA_DIR'], THUMBNAIL_DIR),
+            poppler_path=current_app.config.get('POPPLER_PATH'),
+        )
+    return store
+
+
+def get_pdf_renderer():
+    """Get the PDFPageRenderer (cached in-process PDF page rendering) from app"""
+    from flask import current_app
+    renderer = current_app.config.get('pdf_renderer')
+    if renderer is None:
+        from app.modules.document.pdf_renderer import get_pdf_renderer as shared_renderer
+        renderer = shared_renderer(poppler_path=current_app.config.get('POPPLER_PATH'))
+    return renderer
+
+
+def get_file_locator():
+    """Get the FileLocator (watched document name -> path map) from app"""
+    from flask import current_app
+    locator = current_app.config.get('file_locator')
+    if locator is None:
+        from app.modules.document.locator import get_file_locator as shared_locator
+        locator = shared_locator(current_app.config['DATA_DIR'])
+    return locator
+
+
+def get_enqueue_enrichment():
+    """Get enqueue_enrichment (background OCR + naming) function from app"""
+    from flask import current_app
+    return current_app.config.get('enqueue_enrichment')
+
+
 # ============================================================================
 # DOCUMENT UPLOAD ENDPOINT
 # ============================================================================
@@ -73,6 +127,9 @@ def upload_file():
     socketio = get_socketio()
     funcs = get_processing_funcs()
     process_document_image = get_process_document_image()
+    enqueue_enrichment = get_enqueue_enrichment()
+    catalog = get_document_catalog()
+    thumbnails = get_thumbnail_store()
     
     UPLOAD_DIR = dirs['UPLOAD_DIR']
     PROCESSED_DIR = dirs['PROCESSED_DIR']
@@ -81,6 +138,9 @@ def upload_file():
     clear_processing_status = funcs['clear']
     
     try:
+        # Refuse oversized bodies before the multipart form is parsed
+        check_upload_length(request.content_length)
+
         # Accept both 'file' and 'photo' field names
         file = request.files.get("file") or request.files.get("photo")
 
@@ -104,24 +164,33 @@ def upload_file():
         print(f"\n{'='*70}")
         print(f"[UPLOAD] UPLOAD INITIATED")
         print(f"  Filename: {filename}")
-        print(f"  Size: {len(file.read())} bytes")
-        file.seek(0)  # Reset file pointer
         print(f"{'='*70}")
 
-        # Step 1: Save uploaded file immediately
+        # Step 1: Stream the upload to disk in chunks; header, size limit and hash are checked on the way
         print("\n[UPLOAD] Saving uploaded file...")
         upload_path = os.path.join(UPLOAD_DIR, filename)
-        file.save(upload_path)
-        print(f"  [OK] File saved: {upload_path}")
-
-        # Validate file exists and is readable
-        if not os.path.exists(upload_path):
-            error_msg = "File upload failed - file not found on disk"
-            print(f"  [ERROR] {error_msg}")
-            return jsonify({"error": error_msg, "success": False}), 500
+        ingested = ingest_upload(file.stream, upload_path)
+        content_hash = ingested["content_hash"]
+        print(f"  [OK] File saved: {upload_path} ({ingested['size']} bytes, {ingested['image_type']})")
 
-        file_size = os.path.getsize(upload_path)
-        print(f"  ✓ Verified on disk: {file_size} bytes")
+        # Same bytes as an earlier upload: answer with that document instead of reprocessing
+        existing = catalog.find_or_claim_content(content_hash, processed_filename) if catalog else None
+        if existing:
+            os.remove(upload_path)
+            print(f"  [OK] Duplicate of {existing['filename']}, processing skipped")
+            return jsonify(
+                {
+                    "status": "duplicate",
+                    "success": True,
+                    "duplicate": True,
+                    "message": "Identical file already uploaded",
+                    "filename": existing["filename"],
+                    "original": file.filename,
+                    "timestamp": timestamp,
+                    "processing": existing.get("processing", False),
+                    "has_text": existing.get("has_text", False),
+                }
+            )
 
         # Initialize processing status
         if update_processing_status:
@@ -209,6 +278,11 @@ def upload_file():
                     except Exception as text_error:
                         print(f"  [WARN] Warning: Failed to save text file: {str(text_error)}")
 
+                if catalog:
+                    catalog.add(final_filename, has_text=os.path.exists(text_path), content_hash=content_hash)
+                if thumbnails:
+                    thumbnails.pregenerate(os.path.join(PROCESSED_DIR, final_filename))
+
                 # Mark as complete - clear the original filename's status
                 if update_processing_status:
                     update_processing_status(processed_filename, 12, 12, "Complete", is_complete=True)
@@ -230,6 +304,10 @@ def upload_file():
                         },
                     )
 
+                # Page is visible now; OCR + naming continue in the enrichment queue
+                if enqueue_enrichment:
+                    enqueue_enrichment(os.path.join(PROCESSED_DIR, final_filename))
+
                 print(f"\n[OK] Background processing completed for {final_filename}")
                 if new_filename:
                     print(f"    (OCR-renamed from {processed_filename})")
@@ -249,6 +327,10 @@ def upload_file():
                     socketio.emit(
                         "processing_error", {"filename": processed_filename, "error": error_msg}
                     )
+            finally:
+                # Failed uploads must not block a retry of the same bytes
+                if catalog:
+                    catalog.release_content(content_hash)
 
         # Start processing in background thread
         thread = threading.Thread(target=background_process)
@@ -258,6 +340,10 @@ def upload_file():
         print(f"\n[OK] Upload response sent, processing started in background")
         return jsonify(response)
 
+    except UploadRejected as rejected:
+        print(f"[ERROR] Upload rejected: {rejected}")
+        return jsonify({"error": str(rejected), "success": False}), rejected.status
+
     except Exception as e:
         error_msg = f"Unexpected error: {str(e)}"
         print(f"\n[ERROR] {error_msg}")
@@ -271,7 +357,12 @@ def upload_file():
 
 @document_bp.route("/files")
 def list_files():
-    """List all processed files with processing status"""
+    """
+    List processed files with processing status
+
+    With a catalog configured, accepts limit/cursor (paging, newest first)
+    and since=<sync_cursor> (only changes) like the main /files route
+    """
     dirs = get_dirs()
     funcs = get_processing_funcs()
     
@@ -281,23 +372,44 @@ def list_files():
     get_processing_status = funcs['get']
     processing_status = funcs['processing_status'] or {}
     clear_processing_status = funcs['clear']
+    catalog = get_document_catalog()
     
     try:
         files = []
         processed_files_set = set()
+        listing = {}
 
-        # First, get list of all actual processed files on disk
-        for filename in os.listdir(PROCESSED_DIR):
-            if filename.lower().endswith((".png", ".jpg", ".jpeg")):
-                processed_files_set.add(filename)
+        # First, get list of all actual processed files
+        # (one catalog query; a directory scan when no catalog is configured)
+        catalog_entries = None
+        if catalog:
+            from app.modules.document.catalog import CatalogCursorError
+
+            try:
+                listing = catalog.listing(
+                    limit=request.args.get("limit", type=int),
+                    cursor=request.args.get("cursor"),
+                    since=request.args.get("since"),
+                )
+            except CatalogCursorError as e:
+                return jsonify({"error": str(e)}), 400
+            catalog_entries = listing.pop("items")
+            processed_files_set = {entry["filename"] for entry in catalog_entries}
+        else:
+            for filename in os.listdir(PROCESSED_DIR):
+                if filename.lower().endswith((".png", ".jpg", ".jpeg")):
+                    processed_files_set.add(filename)
 
         # Add files that are currently being processed (uploaded but not yet in processed dir)
         # Only include if the file is NOT already in processed dir (handles rename case)
-        for filename in list(processing_status.keys()):
+        # Later pages skip them; they belong at the top of the list
+        in_progress = list(processing_status.keys()) if not request.args.get("cursor") else []
+        for filename in in_progress:
             status = get_processing_status(filename) if get_processing_status else None
             if status and not status["is_complete"]:
                 # Skip if a processed file already exists with this name
-                if filename in processed_files_set:
+                # (a page or delta only holds part of the catalog, so check the disk too)
+                if filename in processed_files_set or os.path.exists(os.path.join(PROCESSED_DIR, filename)):
                     # Clear stale processing status
                     if clear_processing_status:
                         clear_processing_status(filename)
@@ -327,36 +439,42 @@ def list_files():
                         clear_processing_status(filename)
 
         # Then add all processed files
-        for filename in processed_files_set:
-            file_path = os.path.join(PROCESSED_DIR, filename)
-            # Verify file still exists (it may have been deleted)
-            if not os.path.exists(file_path):
-                print(f"[WARN] File listed but doesn't exist: {file_path}")
-                continue
-            file_stat = os.stat(file_path)
-
-            # Check if text file exists
-            text_filename = f"{os.path.splitext(filename)[0]}.txt"
-            text_path = os.path.join(TEXT_DIR, text_filename)
-            has_text = os.path.exists(text_path)
-
-            # Processed files that exist on disk are NOT processing anymore
-            # The only exception is if the file was just created and processing is still running
-            # but in that case, the processing status should be marked complete
-            file_info = {
-                "filename": filename,
-                "size": file_stat.st_size,
-                "created": datetime.fromtimestamp(file_stat.st_ctime).isoformat(),
-                "has_text": has_text,
-                "processing": False,  # File exists on disk = processing is done
-            }
+        # Processed files that exist on disk are NOT processing anymore
+        if catalog_entries is not None:
+            for file_info in catalog_entries:
+                file_info["processing"] = False
+                files.append(file_info)
+        else:
+            for filename in processed_files_set:
+                file_path = os.path.join(PROCESSED_DIR, filename)
+                # Verify file still exists (it may have been deleted)
+                if not os.path.exists(file_path):
+                    print(f"[WARN] File listed but doesn't exist: {file_path}")
+                    continue
+                file_stat = os.stat(file_path)
 
-            files.append(file_info)
+                # Check if text file exists
+                text_filename = f"{os.path.splitext(filename)[0]}.txt"
+                text_path = os.path.join(TEXT_DIR, text_filename)
+                has_text = os.path.exists(text_path)
+
+                # Processed files that exist on disk are NOT processing anymore
+                # The only exception is if the file was just created and processing is still running
+                # but in that case, the processing status should be marked complete
+                file_info = {
+                    "filename": filename,
+                    "size": file_stat.st_size,
+                    "created": datetime.fromtimestamp(file_stat.st_ctime).isoformat(),
+                    "has_text": has_text,
+                    "processing": False,  # File exists on disk = processing is done
+                }
+
+                files.append(file_info)
 
         # Sort by creation time (newest first)
         files.sort(key=lambda x: x["created"], reverse=True)
 
-        return jsonify({"files": files, "count": len(files)})
+        return jsonify({"files": files, "count": len(files), **listing})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -398,20 +516,16 @@ def get_file_processing_status(filename):
 
 @document_bp.route("/processed/<filename>", methods=["GET", "OPTIONS"])
 def get_processed_file(filename):
-    """Serve processed image file with CORS headers and caching support"""
+    """
+    Serve processed image file with CORS headers and caching support
+    ?size=thumb|preview|full or ?w=<px> serves a downscaled rendition
+    """
     dirs = get_dirs()
     PROCESSED_DIR = dirs['PROCESSED_DIR']
     
     # Handle OPTIONS request
     if request.method == "OPTIONS":
-        response = jsonify({"status": "ok"})
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        response.headers["Access-Control-Allow-Methods"] = "GET, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = (
-            "Content-Type, Authorization, ngrok-skip-browser-warning"
-        )
-        response.headers["Access-Control-Max-Age"] = "3600"
-        return response, 200
+        return file_options_response()
 
     try:
         # Security: prevent directory traversal
@@ -422,30 +536,27 @@ def get_processed_file(filename):
         file_path = os.path.join(PROCESSED_DIR, filename)
         if not os.path.exists(file_path):
             print(f"[ERROR] File not found: {file_path}")
-            return jsonify({"error": "File not found"}), 404
+            return file_not_found()
 
-        print(f"[OK] Serving processed file: {filename}")
-        response = send_from_directory(PROCESSED_DIR, filename)
-
-        # Add comprehensive CORS and cache headers
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        response.headers["Access-Control-Allow-Methods"] = "GET, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = (
-            "Content-Type, Authorization, ngrok-skip-browser-warning"
-        )
-        response.headers["Access-Control-Expose-Headers"] = "Content-Length, Content-Type"
-        response.headers["Cache-Control"] = "public, max-age=3600"
-        response.headers["X-Content-Type-Options"] = "nosniff"
-
-        # Detect image type from extension
-        if filename.lower().endswith(".png"):
-            response.headers["Content-Type"] = "image/png"
-        elif filename.lower().endswith(".jpg") or filename.lower().endswith(".jpeg"):
-            response.headers["Content-Type"] = "image/jpeg"
-        else:
-            response.headers["Content-Type"] = "image/jpeg"  # Default to JPEG
+        thumbnails = get_thumbnail_store()
+        try:
+            rendition = thumbnails.negotiate(
+                file_path, request.args.get("size"), request.args.get("w", type=int)
+            ) if thumbnails else None
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if rendition:
+            from app.modules.document.thumbnails import RENDITION_FULL
+
+            rendition_path, etag, rendition_name = rendition
+            return serve_file(
+                rendition_path,
+                mimetype="image/jpeg" if rendition_name != RENDITION_FULL else None,
+                etag=etag,
+            )
 
-        return response
+        print(f"[OK] Serving processed file: {filename}")
+        return serve_file(file_path)
     except Exception as e:
         print(f"[ERROR] File serving error: {str(e)}")
         traceback.print_exc()
@@ -460,14 +571,7 @@ def get_upload_file(filename):
     
     # Handle OPTIONS request
     if request.method == "OPTIONS":
-        response = jsonify({"status": "ok"})
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        response.headers["Access-Control-Allow-Methods"] = "GET, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = (
-            "Content-Type, Authorization, ngrok-skip-browser-warning"
-        )
-        response.headers["Access-Control-Max-Age"] = "3600"
-        return response, 200
+        return file_options_response()
 
     try:
         # Security: prevent directory traversal
@@ -481,30 +585,10 @@ def get_upload_file(filename):
         file_path = os.path.join(UPLOAD_DIR, upload_filename)
         if not os.path.exists(file_path):
             print(f"[ERROR] Upload file not found: {file_path}")
-            return jsonify({"error": "File not found"}), 404
+            return file_not_found()
 
         print(f"[OK] Serving upload file: {upload_filename}")
-        response = send_from_directory(UPLOAD_DIR, upload_filename)
-
-        # Add comprehensive CORS headers
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        response.headers["Access-Control-Allow-Methods"] = "GET, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = (
-            "Content-Type, Authorization, ngrok-skip-browser-warning"
-        )
-        response.headers["Access-Control-Expose-Headers"] = "Content-Length, Content-Type"
-        response.headers["Cache-Control"] = "public, max-age=300"  # 5 min cache for previews
-        response.headers["X-Content-Type-Options"] = "nosniff"
-
-        # Detect image type from extension
-        if upload_filename.lower().endswith(".png"):
-            response.headers["Content-Type"] = "image/png"
-        elif upload_filename.lower().endswith(".jpg") or upload_filename.lower().endswith(".jpeg"):
-            response.headers["Content-Type"] = "image/jpeg"
-        else:
-            response.headers["Content-Type"] = "image/jpeg"  # Default to JPEG
-
-        return response
+        return serve_file(file_path)
     except Exception as e:
         print(f"[ERROR] Upload file serving error: {str(e)}")
         traceback.print_exc()
@@ -518,11 +602,6 @@ def get_upload_file(filename):
 @document_bp.route("/document/info/<path:filename>", methods=["GET", "OPTIONS"])
 def get_document_info(filename):
     """Get document information including page count for PDFs"""
-    dirs = get_dirs()
-    UPLOAD_DIR = dirs['UPLOAD_DIR']
-    PROCESSED_DIR = dirs['PROCESSED_DIR']
-    CONVERTED_DIR = dirs['CONVERTED_DIR']
-    
     if request.method == "OPTIONS":
         response = jsonify({"status": "ok"})
         response.headers["Access-Control-Allow-Origin"] = "*"
@@ -538,18 +617,8 @@ def get_document_info(filename):
         if ".." in filename or "/" in filename.replace("\\", "/"):
             return jsonify({"error": "Invalid filename"}), 400
 
-        # Check different directories for the file
-        possible_paths = [
-            os.path.join(PROCESSED_DIR, filename),
-            os.path.join(CONVERTED_DIR, filename),
-            os.path.join(UPLOAD_DIR, filename),
-        ]
-
-        file_path = None
-        for path in possible_paths:
-            if os.path.exists(path):
-                file_path = path
-                break
+        # Processed, converted or uploaded file, from the in-memory name map
+        file_path = get_file_locator().resolve(filename)
 
         if not file_path:
             return jsonify({"error": "File not found"}), 404
@@ -564,17 +633,15 @@ def get_document_info(filename):
         # Get page count and thumbnails for PDFs
         if file_ext == '.pdf':
             try:
-                import PyPDF2
-                with open(file_path, 'rb') as pdf_file:
-                    pdf_reader = PyPDF2.PdfReader(pdf_file)
-                    page_count = len(pdf_reader.pages)
-                    
-                    # Generate page info with thumbnail URLs
-                    for page_num in range(1, page_count + 1):
-                        doc_info["pages"].append({
-                            "pageNumber": page_num,
-                            "thumbnailUrl": f"/document/page/{filename}/{page_num}"
-                        })
+                # Served from the renderer's open document after the first request
+                page_count = get_pdf_renderer().page_count(file_path)
+
+                # Generate page info with thumbnail URLs
+                for page_num in range(1, page_count + 1):
+                    doc_info["pages"].append({
+                        "pageNumber": page_num,
+                        "thumbnailUrl": f"/document/page/{filename}/{page_num}"
+                    })
             except Exception as e:
                 print(f"[WARN] Error reading PDF pages: {str(e)}")
                 # Fallback: assume single page
@@ -603,39 +670,16 @@ def get_document_info(filename):
 @document_bp.route("/document/page/<path:filename>/<int:page_num>", methods=["GET", "OPTIONS"])
 def get_pdf_page_thumbnail(filename, page_num):
     """Generate and serve thumbnail for a specific PDF page"""
-    dirs = get_dirs()
-    UPLOAD_DIR = dirs['UPLOAD_DIR']
-    PROCESSED_DIR = dirs['PROCESSED_DIR']
-    CONVERTED_DIR = dirs['CONVERTED_DIR']
-    POPPLER_PATH = dirs['POPPLER_PATH']
-    
     if request.method == "OPTIONS":
-        response = jsonify({"status": "ok"})
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        response.headers["Access-Control-Allow-Methods"] = "GET, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = (
-            "Content-Type, Authorization, ngrok-skip-browser-warning"
-        )
-        response.headers["Access-Control-Max-Age"] = "3600"
-        return response, 200
+        return file_options_response()
 
     try:
         # Security: prevent directory traversal
         if ".." in filename or "/" in filename.replace("\\", "/"):
             return jsonify({"error": "Invalid filename"}), 400
 
-        # Check different directories for the file
-        possible_paths = [
-            os.path.join(PROCESSED_DIR, filename),
-            os.path.join(CONVERTED_DIR, filename),
-            os.path.join(UPLOAD_DIR, filename),
-        ]
-
-        file_path = None
-        for path in possible_paths:
-            if os.path.exists(path):
-                file_path = path
-                break
+        # Processed, converted or uploaded file, from the in-memory name map
+        file_path = get_file_locator().resolve(filename)
 
         if not file_path:
             return jsonify({"error": "File not found"}), 404
@@ -645,43 +689,32 @@ def get_pdf_page_thumbnail(filename, page_num):
         if file_ext != '.pdf':
             return jsonify({"error": "Not a PDF file"}), 400
 
-        # Generate thumbnail for specific page
+        # Rendered in-process from a cached open document; neighbouring pages are prefetched
+        renderer = get_pdf_renderer()
+        etag = renderer.etag(file_path, page_num)
+        if request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = "no-cache"
+            return add_file_cors_headers(response)
+
         try:
-            from pdf2image import convert_from_path
-            images = convert_from_path(
-                file_path, 
-                first_page=page_num, 
-                last_page=page_num, 
-                dpi=150,  # Higher DPI for better quality
-                poppler_path=POPPLER_PATH
-            )
-            
-            if images:
-                img = images[0]
-                # Resize to larger thumbnail for preview
-                img.thumbnail((800, 1132), Image.Resampling.LANCZOS)  # A4 ratio
-                
-                # Convert to bytes
-                thumb_io = io.BytesIO()
-                img.save(thumb_io, format='JPEG', quality=90)
-                thumbnail_data = thumb_io.getvalue()
-                
+            thumbnail_data = renderer.render_page(file_path, page_num)
+            if thumbnail_data:
                 response = current_app.response_class(
                     response=thumbnail_data,
                     status=200,
                     mimetype="image/jpeg"
                 )
-                response.headers["Access-Control-Allow-Origin"] = "*"
-                response.headers["Access-Control-Allow-Methods"] = "GET, HEAD, OPTIONS"
-                response.headers["Access-Control-Expose-Headers"] = "Content-Length, Content-Type"
-                response.headers["Cache-Control"] = "public, max-age=86400"
-                response.headers["Content-Type"] = "image/jpeg"
-                return response
+                response.set_etag(etag)
+                # Same URL after the PDF is replaced, so revalidate rather than trust max-age
+                response.headers["Cache-Control"] = "no-cache"
+                return add_file_cors_headers(response)
             else:
                 return jsonify({"error": "Could not extract page"}), 500
                 
         except ImportError:
-            return jsonify({"error": "pdf2image not available"}), 500
+            return jsonify({"error": "No PDF renderer available (install PyMuPDF or pdf2image)"}), 500
         except Exception as e:
             print(f"[ERROR] PDF page extraction error: {str(e)}")
             return jsonify({"error": f"Page extraction error: {str(e)}"}), 500
@@ -699,124 +732,53 @@ def get_pdf_page_thumbnail(filename, page_num):
 @document_bp.route("/thumbnail/<path:filename>", methods=["GET", "OPTIONS"])
 def get_thumbnail(filename):
     """Generate and serve thumbnail images for documents and PDFs"""
-    dirs = get_dirs()
-    UPLOAD_DIR = dirs['UPLOAD_DIR']
-    PROCESSED_DIR = dirs['PROCESSED_DIR']
-    CONVERTED_DIR = dirs['CONVERTED_DIR']
-    POPPLER_PATH = dirs['POPPLER_PATH']
-    
     if request.method == "OPTIONS":
-        response = jsonify({"status": "ok"})
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        response.headers["Access-Control-Allow-Methods"] = "GET, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = (
-            "Content-Type, Authorization, ngrok-skip-browser-warning"
-        )
-        response.headers["Access-Control-Max-Age"] = "3600"
-        return response, 200
+        return file_options_response()
 
     try:
         # Security: prevent directory traversal
         if ".." in filename or "/" in filename.replace("\\", "/"):
             return jsonify({"error": "Invalid filename"}), 400
 
-        # Check different directories for the file
-        possible_paths = [
-            os.path.join(PROCESSED_DIR, filename),  # Processed images
-            os.path.join(CONVERTED_DIR, filename),  # Converted PDFs
-            os.path.join(UPLOAD_DIR, filename),     # Uploaded files
-        ]
-
-        file_path = None
-        for path in possible_paths:
-            if os.path.exists(path):
-                file_path = path
-                break
+        # Processed, converted or uploaded file, from the in-memory name map
+        file_path = get_file_locator().resolve(filename)
 
         if not file_path:
             print(f"[ERROR] Thumbnail source file not found: {filename}")
-            return jsonify({"error": "File not found"}), 404
-
-        # Generate thumbnail based on file type
+            return file_not_found()
+
+        # Cached thumbnail: rendered once per file version, usually ahead of time
+        thumbnails = get_thumbnail_store()
+        supported = thumbnails is not None and thumbnails.supports(file_path)
+        cached = thumbnails.get(file_path) if supported else None
+        if cached:
+            thumb_path, etag = cached
+            # The ETag follows the source version; revalidation answers 304 until it changes
+            return serve_file(thumb_path, mimetype="image/jpeg", etag=etag)
+
+        # Placeholders: white for text files, grey for other types and failed renders
         file_ext = os.path.splitext(filename)[1].lower()
-        thumbnail_data = None
-
-        try:
-            if file_ext in ['.pdf']:
-                # For PDFs, try to convert first page to image using pdf2image or similar
-                try:
-                    from pdf2image import convert_from_path
-                    images = convert_from_path(file_path, first_page=1, last_page=1, dpi=100, poppler_path=POPPLER_PATH)
-                    if images:
-                        img = images[0]
-                        # Resize to thumbnail size
-                        img.thumbnail((200, 250), Image.Resampling.LANCZOS)
-                        # Convert to bytes
-                        thumb_io = io.BytesIO()
-                        img.save(thumb_io, format='JPEG', quality=85)
-                        thumbnail_data = thumb_io.getvalue()
-                except ImportError:
-                    # Fallback: return a placeholder
-                    print(f"[WARN] pdf2image not available, using placeholder for {filename}")
-                    placeholder = Image.new('RGB', (200, 250), color=(100, 100, 100))
-                    thumb_io = io.BytesIO()
-                    placeholder.save(thumb_io, format='JPEG', quality=85)
-                    thumbnail_data = thumb_io.getvalue()
-
-            elif file_ext in ['.png', '.jpg', '.jpeg', '.bmp', '.gif']:
-                # For image files, read and resize
-                img = Image.open(file_path)
-                # Convert RGBA to RGB if needed
-                if img.mode == 'RGBA':
-                    rgb_img = Image.new('RGB', img.size, (255, 255, 255))
-                    rgb_img.paste(img, mask=img.split()[3])
-                    img = rgb_img
-                elif img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                # Resize to thumbnail size while maintaining aspect ratio
-                img.thumbnail((200, 250), Image.Resampling.LANCZOS)
-                # Convert to bytes
-                thumb_io = io.BytesIO()
-                img.save(thumb_io, format='JPEG', quality=85)
-                thumbnail_data = thumb_io.getvalue()
-
-            elif file_ext in ['.txt']:
-                # For text files, create a text-based thumbnail
-                text_preview = Image.new('RGB', (200, 250), color=(255, 255, 255))
-                thumb_io = io.BytesIO()
-                text_preview.save(thumb_io, format='JPEG', quality=85)
-                thumbnail_data = thumb_io.getvalue()
-
-            else:
-                # Unknown file type, return placeholder
-                placeholder = Image.new('RGB', (200, 250), color=(200, 200, 200))
-                thumb_io = io.BytesIO()
-                placeholder.save(thumb_io, format='JPEG', quality=85)
-                thumbnail_data = thumb_io.getvalue()
-
-        except Exception as e:
-            print(f"[WARN] Error generating thumbnail: {str(e)}")
-            # Return a gray placeholder on error
-            placeholder = Image.new('RGB', (200, 250), color=(180, 180, 180))
-            thumb_io = io.BytesIO()
-            placeholder.save(thumb_io, format='JPEG', quality=85)
-            thumbnail_data = thumb_io.getvalue()
-
-        if thumbnail_data:
-            response = current_app.response_class(
-                response=thumbnail_data,
-                status=200,
-                mimetype="image/jpeg"
-            )
-            response.headers["Access-Control-Allow-Origin"] = "*"
-            response.headers["Access-Control-Allow-Methods"] = "GET, HEAD, OPTIONS"
-            response.headers["Access-Control-Expose-Headers"] = "Content-Length, Content-Type"
-            response.headers["Cache-Control"] = "public, max-age=86400"
-            response.headers["Content-Type"] = "image/jpeg"
-            return response
-
-        return jsonify({"error": "Failed to generate thumbnail"}), 500
+        if file_ext == ".txt":
+            color = (255, 255, 255)
+        elif supported:
+            print(f"[WARN] Could not render thumbnail for {filename}, using placeholder")
+            color = (180, 180, 180)
+        else:
+            color = (200, 200, 200)
+        placeholder = Image.new('RGB', (200, 250), color=color)
+        thumb_io = io.BytesIO()
+        placeholder.save(thumb_io, format='JPEG', quality=85)
+
+        response = current_app.response_class(
+            response=thumb_io.getvalue(),
+            status=200,
+            mimetype="image/jpeg"
+        )
+        add_file_cors_headers(response)
+        # Short lifetime so the real thumbnail shows up once it can be rendered
+        response.headers["Cache-Control"] = "public, max-age=300"
+        response.headers["Content-Type"] = "image/jpeg"
+        return response
 
     except Exception as e:
         print(f"[ERROR] Thumbnail generation error: {str(e)}")
@@ -856,6 +818,16 @@ def delete_file(filename):
         if os.path.exists(upload_path):
             os.remove(upload_path)
 
+        catalog = get_document_catalog()
+        if catalog:
+            catalog.remove(filename)
+        thumbnails = get_thumbnail_store()
+        if thumbnails:
+            thumbnails.purge(image_path)
+        locator = get_file_locator()
+        locator.discard(image_path)
+        locator.discard(upload_path)
+
         # Notify via Socket.IO
         if socketio:
             socketio.emit("file_deleted", {"filename": filename})
@@ -871,11 +843,23 @@ def delete_file(filename):
 
 @document_bp.route("/ocr/<filename>")
 def get_ocr_text(filename):
-    """Get extracted OCR text for a file"""
+    """Get extracted OCR text for a file (?fields=... returns just those OCR result fields)"""
     dirs = get_dirs()
     TEXT_DIR = dirs['TEXT_DIR']
     
     try:
+        from app.modules.ocr.paddle_ocr import get_ocr_processor
+        from app.modules.ocr.result_store import RESULT_FIELDS
+
+        ocr_data_dir = current_app.config.get('OCR_DATA_DIR')
+        fields = [f.strip() for f in request.args.get("fields", "").split(",") if f.strip()]
+        unknown = [f for f in fields if f not in RESULT_FIELDS]
+        if unknown:
+            return jsonify({"error": f"Unknown OCR result fields: {', '.join(unknown)}", "fields": list(RESULT_FIELDS)}), 400
+        if fields:
+            result = get_ocr_processor(ocr_data_dir).load_result(filename, fields=fields)
+            return jsonify({"filename": filename, "ocr_result": result, "ocr_ready": result is not None})
+
         text_filename = f"{os.path.splitext(filename)[0]}.txt"
         text_path = os.path.join(TEXT_DIR, text_filename)
 
@@ -883,8 +867,13 @@ def get_ocr_text(filename):
             with open(text_path, "r", encoding="utf-8") as f:
                 text = f.read()
             return jsonify({"filename": filename, "text": text, "length": len(text)})
-        else:
-            return jsonify({"filename": filename, "text": "", "message": "No text extracted"})
+
+        # Fall back to the OCR store's text member (no region data is decoded)
+        result = get_ocr_processor(ocr_data_dir).load_result(filename, fields=["full_text"])
+        if result and result.get("full_text"):
+            text = result["full_text"]
+            return jsonify({"filename": filename, "text": text, "length": len(text)})
+        return jsonify({"filename": filename, "text": "", "message": "No text extracted"})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -946,10 +935,10 @@ def export_pdf():
 
 @document_bp.route("/pdf/<filename>")
 def serve_pdf(filename):
-    """Serve generated PDF files"""
+    """Serve generated PDF files (Range requests supported)"""
     dirs = get_dirs()
     PDF_DIR = dirs['PDF_DIR']
-    return send_from_directory(PDF_DIR, filename)
+    return serve_from_directory(PDF_DIR, filename)
 
 
 # ============================================================================
@@ -1047,6 +1036,9 @@ def convert_files():
 
             # Merge all images into single PDF
             success, message = FileConverter.merge_images_to_pdf(input_paths, merged_path)
+            thumbnails = get_thumbnail_store()
+            if success and thumbnails:
+                thumbnails.pregenerate(merged_path)
 
             print(f"\n{'='*70}")
             print(f"[OK] MERGE CONVERSION COMPLETED")
@@ -1092,6 +1084,12 @@ def convert_files():
             input_paths, converted_dir, target_format
         )
 
+        thumbnails = get_thumbnail_store()
+        if thumbnails:
+            for result in results:
+                if result.get("success") and result.get("output"):
+                    thumbnails.pregenerate(os.path.join(converted_dir, result["output"]))
+
         print(f"\n{'='*70}")
         print(f"[OK] CONVERSION COMPLETED")
         print(f"  Success: {success_count}")
@@ -1130,11 +1128,11 @@ def convert_files():
 
 @document_bp.route("/converted/<path:filename>")
 def serve_converted_file(filename):
-    """Serve converted files"""
+    """Serve converted files (Range requests supported)"""
     dirs = get_dirs()
     CONVERTED_DIR = dirs['CONVERTED_DIR']
     try:
-        return send_from_directory(CONVERTED_DIR, filename)
+        return serve_from_directory(CONVERTED_DIR, filename)
     except Exception as e:
         print(f"Error serving converted file: {e}")
         return jsonify({"error": str(e)}), 404
@@ -1142,14 +1140,30 @@ def serve_converted_file(filename):
 
 @document_bp.route("/get-converted-files", methods=["GET"])
 def get_converted_files():
-    """Get list of converted files"""
+    """Get list of converted files (limit/cursor/since as for /files)"""
     dirs = get_dirs()
     CONVERTED_DIR = dirs['CONVERTED_DIR']
+    catalog = get_document_catalog()
     
     try:
         if not os.path.exists(CONVERTED_DIR):
             return jsonify({"files": []})
 
+        if catalog and catalog.converted_dir:
+            from app.modules.document.catalog import COLLECTION_CONVERTED, CatalogCursorError
+
+            try:
+                listing = catalog.listing(
+                    COLLECTION_CONVERTED,
+                    limit=request.args.get("limit", type=int),
+                    cursor=request.args.get("cursor"),
+                    since=request.args.get("since"),
+                )
+            except CatalogCursorError as e:
+                return jsonify({"error": str(e)}), 400
+            files = listing.pop("items")
+            return jsonify({"files": files, **listing})
+
         files = []
         for filename in os.listdir(CONVERTED_DIR):
             filepath = os.path.join(CONVERTED_DIR, filename)
@@ -1206,8 +1220,13 @@ def delete_converted_file(filename):
         if not os.path.abspath(file_path).startswith(os.path.abspath(CONVERTED_DIR)):
             return jsonify({"error": "Invalid file path"}), 400
 
-        # Delete the file
+        # Delete the file (close it in the PDF renderer first; Windows can't delete open files)
+        get_pdf_renderer().evict(file_path)
         os.remove(file_path)
+        thumbnails = get_thumbnail_store()
+        if thumbnails:
+            thumbnails.purge(file_path)
+        get_file_locator().discard(file_path)
         print(f"[OK] Deleted converted file: {filename}")
 
         return jsonify({"success": True, "message": f"Successfully deleted {filename}"})
@@ -100,6 +100,35 @@ OCR_CONFIG = {
         ("PSM 6 (Block)", "--oem 3 --psm 6"),
         ("PSM 4 (Column)", "--oem 3 --psm 4"),
     ],
+    # Engine selection: paddle | tesseract | paddle-then-tesseract-fallback | fast-preview
+    "strategy": env("OCR_STRATEGY", "paddle-then-tesseract-fallback"),
+    "fast_preview_max_side": int(env("OCR_FAST_PREVIEW_MAX_SIDE", "1280")),
+    # Background OCR/naming workers for uploaded pages (LLM calls are serialised anyway)
+    "enrichment_workers": int(env("OCR_ENRICHMENT_WORKERS", "1")),
+    # Concurrent documents in batch OCR jobs (app/features/document/ocr/batch_engine.py)
+    "batch_workers": int(env("OCR_BATCH_WORKERS", str(min(4, os.cpu_count() or 1)))),
+    # Max tokens Ollama may generate per post-processing prompt (streams stop earlier when done)
+    "llm_num_predict": {
+        "analyze": int(env("OCR_ANALYZE_NUM_PREDICT", "2000")),
+        "structure": int(env("OCR_STRUCTURE_NUM_PREDICT", "2000")),
+        "title": int(env("OCR_TITLE_NUM_PREDICT", "50")),
+        "filename": int(env("OCR_FILENAME_NUM_PREDICT", "30")),
+    },
+    # Persistent Ollama answer cache (keyed by model, prompt version and OCR text hash)
+    "llm_cache": {
+        "enabled": env_bool("OCR_LLM_CACHE", True),
+        "ttl_seconds": int(env("OCR_LLM_CACHE_TTL", str(30 * 24 * 3600))),
+        "max_entries": int(env("OCR_LLM_CACHE_MAX_ENTRIES", "5000")),
+    },
+    # Pre-OCR rescaling so text reaches the height the recogniser was trained on
+    "input_resolution": {
+        "enabled": env_bool("OCR_ADAPTIVE_RESOLUTION", True),
+        "target_text_height": int(env("OCR_TARGET_TEXT_HEIGHT", "32")),  # Pixels per glyph
+        "min_scale": 0.25,
+        "max_scale": 2.0,
+        "max_side": int(env("OCR_MAX_SIDE", "4000")),  # Never feed a larger page
+        "crop_to_text": env_bool("OCR_CROP_TO_TEXT", True),
+    },
 }
 
 # Image Enhancement Configuration
@@ -109,6 +138,64 @@ ENHANCEMENT_CONFIG = {
     "clahe": {"clip_limits": [2.0, 3.0], "tile_grid_size": (8, 8)},
 }
 
+# Thumbnail store and renditions (app/modules/document/thumbnails.py)
+THUMBNAIL_CONFIG = {
+    "size": (200, 250),  # Max width, height of grid thumbnails
+    # Downscaled renditions built next to each processed page; "full" is the page itself
+    "renditions": {
+        "thumb": (200, 250),
+        "preview": (800, 1132),  # A4 ratio, enough for the preview modal on phones
+    },
+    "jpeg_quality": 85,
+    "pdf_dpi": 100,  # Rasterisation DPI for PDF first pages
+    # Render thumbnails as soon as processing/conversion finishes
+    "pregenerate": env_bool("THUMBNAIL_PREGENERATE", True),
+    "workers": int(env("THUMBNAIL_WORKERS", "2")),
+}
+
+# PDF page rendering for /document/page (app/modules/document/pdf_renderer.py)
+PDF_RENDER_CONFIG = {
+    "dpi": 150,
+    "max_size": (800, 1132),  # Pages are rasterised straight at this size (A4 ratio)
+    "jpeg_quality": 90,
+    "max_open_documents": int(env("PDF_RENDER_MAX_OPEN", "8")),
+    "cache_mb": int(env("PDF_RENDER_CACHE_MB", "64")),  # Rendered page LRU budget
+    "prefetch_pages": int(env("PDF_RENDER_PREFETCH", "2")),  # Pages rendered ahead of the reader
+}
+
+# Document name -> path map (app/modules/document/locator.py)
+FILE_LOCATOR_CONFIG = {
+    "watch": env_bool("FILE_LOCATOR_WATCH", True),  # Keep the map current with a filesystem watcher
+    "poll_interval": float(env("FILE_LOCATOR_POLL_INTERVAL", "2.0")),  # Seconds, when watchdog isn't installed
+    "rescan_interval": float(env("FILE_LOCATOR_RESCAN_INTERVAL", "300")),  # Seconds; full rescan behind watchdog
+}
+
+# Storage lifecycle: retention, recompression, dedupe and quota (app/modules/document/lifecycle.py)
+STORAGE_LIFECYCLE_CONFIG = {
+    "enabled": env_bool("STORAGE_LIFECYCLE", True),
+    "interval_hours": float(env("STORAGE_LIFECYCLE_INTERVAL_HOURS", "6")),
+    "initial_delay_s": 300,  # First pass after startup settles
+    "min_age_minutes": 60,  # Never touch files newer than this (in-flight uploads/conversions)
+    "pause_ms": 5,  # Sleep between file operations to stay out of the way
+    "recompress_quality": 85,  # JPEG quality for cold originals
+    "dedupe": env_bool("STORAGE_DEDUPE", True),
+    "dedupe_artefacts": ("uploads", "converted", "pdfs"),  # Write-once folders only (hardlinks)
+    "quota_mb": int(env("STORAGE_QUOTA_MB", "0")),  # 0 = no quota
+    "quota_evict_order": ("test_captures", "thumbnails", "converted_pages", "pdfs", "uploads"),  # Oldest first within each
+    # Per artefact type: retention_days (delete), recompress_after_days, orphans (delete when the document is gone)
+    "policies": {
+        "uploads": {"retention_days": int(env("STORAGE_UPLOAD_RETENTION_DAYS", "0")), "recompress_after_days": 14},
+        "processed": {"retention_days": 0},
+        "processed_text": {"orphans": True},
+        "ocr_results": {"orphans": True},
+        "converted": {"retention_days": 0},
+        "converted_pages": {"retention_days": 30, "orphans": True},  # Previews render from the PDF (/document/page)
+        "pdfs": {"retention_days": int(env("STORAGE_PDF_RETENTION_DAYS", "0"))},  # User exports: opt-in only
+        "test_captures": {"retention_days": 1},
+        "thumbnails": {"orphans": True},  # Source gone or changed since rendering; rebuilt on demand
+    },
+}
+
 # Export Configuration
 EXPORT_CONFIG = {"jpeg_quality": 95, "pdf_page_size": "A4", "compression_quality": 85}
 
@@ -128,6 +215,11 @@ API_CONFIG = {
     "socket_io": {"ping_timeout": 120, "ping_interval": 30, "max_http_buffer_size": 1e7},
 }
 
+# Upload ingestion (/upload): per-file size cap, same default as app/core/config.py MAX_CONTENT_LENGTH
+UPLOAD_CONFIG = {
+    "max_bytes": int(env("UPLOAD_MAX_MB", "50")) * 1024 * 1024,
+}
+
 # Connection + AI runtime configuration
 _ollama_base = (env("OLLAMA_BASE_URL", "http://localhost:11434") or "").rstrip("/")
 if not _ollama_base:
@@ -142,6 +234,11 @@ CONNECTION_CONFIG = {
         "tags_endpoint": env("OLLAMA_TAGS_ENDPOINT", "/api/tags"),
         "timeout": int(env("OLLAMA_TIMEOUT", "15")),
         "verify_ssl": env_bool("OLLAMA_VERIFY_SSL", False),
+        # Shared client (app/modules/llm_client.py): pooling, concurrency cap, circuit breaker
+        "max_concurrency": int(env("OLLAMA_MAX_CONCURRENCY", "2")),
+        "pool_size": int(env("OLLAMA_POOL_SIZE", "4")),
+        "breaker_failure_threshold": int(env("OLLAMA_BREAKER_FAILURES", "3")),
+        "breaker_reset_seconds": float(env("OLLAMA_BREAKER_RESET_SECONDS", "30")),
     },
 }
 
@@ -4,5 +4,6 @@ PrintChakra Backend - Core Middleware Package
 
 from app.core.middleware.error_handler import register_error_handlers
 from app.core.middleware.cors import add_cors_headers
+from app.core.middleware.file_serving import serve_file, serve_from_directory
 
-__all__ = ['register_error_handlers', 'add_cors_headers']
+__all__ = ['register_error_handlers', 'add_cors_headers', 'serve_file', 'serve_from_directory']
@@ -0,0 +1,150 @@
+"""
+PrintChakra Backend - File Serving
+
+Shared response builder for the routes that serve stored documents
+(/processed, /uploads, /converted, /pdf, /public/*, thumbnails).
+
+Every file response carries a strong ETag built from the file's inode,
+size and mtime. If-None-Match / If-Modified-Since are answered with
+304 Not Modified, and Range requests get 206 Partial Content, so large
+PDFs can be streamed and resumed. Files that can change in place
+(reprocessing, OCR renames) are sent with "no-cache": browsers keep
+them but revalidate, and a repeat view costs a 304 with no body.
+"""
+
+import os
+from typing import Optional, Union
+
+from flask import Response, jsonify, request, send_file
+from werkzeug.security import safe_join
+
+CORS_ALLOW_HEADERS = "Content-Type, Authorization, ngrok-skip-browser-warning, X-Requested-With, Range, If-None-Match"
+CORS_EXPOSE_HEADERS = (
+    "Content-Length, Content-Type, Content-Disposition, Content-Range, Accept-Ranges, ETag, Last-Modified"
+)
+FILE_METHODS = "GET, HEAD, OPTIONS"
+
+# Cache policies
+CACHE_REVALIDATE = "revalidate"  # Stored by the browser, revalidated with the ETag on every use
+CACHE_NONE = "none"  # Never stored (temporary files such as calibration captures)
+
+
+def file_etag(stat: os.stat_result) -> str:
+    """Strong ETag for a file version: inode, size and mtime (ns)"""
+    return f"{stat.st_ino:x}-{stat.st_size:x}-{stat.st_mtime_ns:x}"
+
+
+def add_file_cors_headers(response: Response, credentials: bool = False) -> Response:
+    """
+    Add CORS headers for file responses (including 206 and 304).
+
+    Args:
+        response: Flask response object
+        credentials: Echo the request Origin and allow credentials
+            (the /public routes, used by <img crossorigin="use-credentials">)
+
+    Returns:
+        Response with CORS headers
+    """
+    if credentials:
+        response.headers["Access-Control-Allow-Origin"] = request.headers.get("Origin", "http://localhost:3000")
+        response.headers["Access-Control-Allow-Credentials"] = "true"
+        response.vary.add("Origin")
+    else:
+        response.headers["Access-Control-Allow-Origin"] = "*"
+    response.headers["Access-Control-Allow-Methods"] = FILE_METHODS
+    response.headers["Access-Control-Allow-Headers"] = CORS_ALLOW_HEADERS
+    response.headers["Access-Control-Expose-Headers"] = CORS_EXPOSE_HEADERS
+    return response
+
+
+def file_options_response(credentials: bool = False) -> tuple:
+    """
+    Create a response for OPTIONS preflight requests on file routes.
+
+    Returns:
+        Tuple of (response, status_code)
+    """
+    response = add_file_cors_headers(jsonify({"status": "ok"}), credentials)
+    response.headers["Access-Control-Max-Age"] = "86400"
+    return response, 200
+
+
+def file_not_found(credentials: bool = False) -> tuple:
+    """JSON 404 with CORS headers, so the browser can read the error"""
+    return add_file_cors_headers(jsonify({"error": "File not found"}), credentials), 404
+
+
+def serve_file(
+    path: str,
+    mimetype: Optional[str] = None,
+    etag: Optional[str] = None,
+    cache: Union[str, int] = CACHE_REVALIDATE,
+    credentials: bool = False,
+    as_attachment: bool = False,
+    download_name: Optional[str] = None,
+) -> Union[Response, tuple]:
+    """
+    Send a file with validators, conditional GET, Range and CORS.
+
+    Args:
+        path: File to send
+        mimetype: Content type (default: guessed from the file name)
+        etag: ETag to use instead of the inode/size/mtime one
+            (e.g. a cache key that already identifies the version)
+        cache: CACHE_REVALIDATE, CACHE_NONE, or a max-age in seconds
+            for responses whose ETag changes with their content
+        credentials: See add_file_cors_headers
+        as_attachment: Send Content-Disposition: attachment
+        download_name: File name for Content-Disposition
+
+    Returns:
+        200, 206 or 304 response, or a JSON 404 when the file is missing
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return file_not_found(credentials)
+    if not os.path.isfile(path):
+        return file_not_found(credentials)
+
+    # send_file(conditional=True) answers If-None-Match / If-Modified-Since with
+    # 304 and Range with 206; max_age=None leaves Cache-Control to us
+    response = send_file(
+        path,
+        mimetype=mimetype,
+        etag=etag or file_etag(stat),
+        last_modified=stat.st_mtime,
+        conditional=True,
+        max_age=None,
+        as_attachment=as_attachment,
+        download_name=download_name,
+    )
+    if cache == CACHE_NONE:
+        response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
+        response.headers["Pragma"] = "no-cache"
+        response.headers["Expires"] = "0"
+    elif cache == CACHE_REVALIDATE:
+        response.headers["Cache-Control"] = "no-cache"
+    else:
+        response.headers["Cache-Control"] = f"public, max-age={int(cache)}"
+    response.headers["X-Content-Type-Options"] = "nosniff"
+    return add_file_cors_headers(response, credentials)
+
+
+def serve_from_directory(directory: str, filename: str, **kwargs) -> Union[Response, tuple]:
+    """
+    serve_file for a path inside directory; paths escaping it are 404s.
+
+    Args:
+        directory: Base directory
+        filename: Relative path from the request (may contain subdirectories)
+        **kwargs: Passed to serve_file
+
+    Returns:
+        See serve_file
+    """
+    path = safe_join(directory, filename)
+    if path is None:
+        return file_not_found(kwargs.get("credentials", False))
+    return serve_file(path, **kwargs)
@@ -367,8 +367,9 @@ def validate_ollama():
     
     try:
         import requests
+        from app.modules.llm_client import LLMUnavailableError, get_llm_client
         
-        response = requests.get("http://localhost:11434/api/tags", timeout=5)
+        response = get_llm_client().get("/api/tags", name="connection.validate", timeout=5)
         
         if response.status_code == 200:
             data = response.json()
@@ -392,6 +393,12 @@ def validate_ollama():
             "message": "Ollama not running. Start with 'ollama serve'"
         })
     
+    except LLMUnavailableError:
+        return jsonify({
+            "available": False,
+            "message": "Ollama failed recently, retrying shortly"
+        })
+    
     except Exception as e:
         return jsonify({
             "available": False,
@@ -430,12 +437,8 @@ def get_connection_status():
         pass
     
     # Check Ollama
-    try:
-        import requests
-        response = requests.get("http://localhost:11434/api/tags", timeout=2)
-        status["ollama"] = response.status_code == 200
-    except:
-        pass
+    from app.modules.llm_client import check_ollama_available
+    status["ollama"] = check_ollama_available(name="connection.status", timeout=2)
     
     return jsonify({
         "success": True,
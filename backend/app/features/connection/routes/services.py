@@ -61,8 +61,8 @@ def get_services_status():
         
         # Check Ollama
         try:
-            import requests
-            ollama_response = requests.get("http://localhost:11434/api/tags", timeout=2)
+            from app.modules.llm_client import get_llm_client
+            ollama_response = get_llm_client().get("/api/tags", name="services.status", timeout=2)
             services["ollama"] = {
                 "name": "Ollama LLM",
                 "status": "running" if ollama_response.status_code == 200 else "error",
@@ -113,9 +113,10 @@ def check_ollama_status():
     
     try:
         import requests
+        from app.modules.llm_client import LLMUnavailableError, get_llm_client
         
         # Check if Ollama is running
-        response = requests.get("http://localhost:11434/api/tags", timeout=5)
+        response = get_llm_client().get("/api/tags", name="services.ollama", timeout=5)
         
         if response.status_code == 200:
             data = response.json()
@@ -147,6 +148,15 @@ def check_ollama_status():
             }
         })
     
+    except LLMUnavailableError:
+        return jsonify({
+            "success": True,
+            "ollama": {
+                "running": False,
+                "error": "Ollama failed recently, retrying shortly"
+            }
+        })
+    
     except Exception as e:
         return jsonify({
             "success": True,
@@ -0,0 +1,363 @@
+"""
+PrintChakra Backend - Batch OCR Job Engine
+
+Local job engine for batch OCR. Jobs and their documents live in a SQLite
+table, a pool of worker threads claims pending documents, progress is pushed
+over Socket.IO, cancellation stops pending documents immediately, and jobs
+interrupted by a restart resume where they left off.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from werkzeug.utils import secure_filename
+
+logger = logging.getLogger(__name__)
+
+BATCH_DB_FILE = "batch_jobs.sqlite3"
+SEARCH_FOLDERS = ("uploads", "pdfs", "processed")
+
+# Job states
+QUEUED = "queued"
+PROCESSING = "processing"
+COMPLETED = "completed"
+COMPLETED_WITH_ERRORS = "completed_with_errors"
+FAILED = "failed"
+CANCELLED = "cancelled"
+ACTIVE_STATES = (QUEUED, PROCESSING)
+
+# Document states
+ITEM_PENDING = "pending"
+ITEM_RUNNING = "running"
+ITEM_DONE = "done"
+ITEM_FAILED = "failed"
+ITEM_CANCELLED = "cancelled"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS batch_jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    finished_at TEXT,
+    language TEXT NOT NULL,
+    use_ollama INTEGER NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS batch_items (
+    batch_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    document TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    PRIMARY KEY (batch_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_batch_items_status ON batch_items(status);
+"""
+
+
+def _default_workers() -> int:
+    try:
+        from app.config.settings import OCR_CONFIG
+
+        configured = OCR_CONFIG.get("batch_workers")
+    except Exception:
+        configured = None
+    return max(1, int(configured or min(4, os.cpu_count() or 1)))
+
+
+class BatchJobEngine:
+    """SQLite-backed batch OCR queue with a fixed pool of worker threads."""
+
+    def __init__(
+        self,
+        data_dir: str,
+        ocr_func: Callable[..., Dict[str, Any]],
+        emit: Optional[Callable[[str, Dict[str, Any]], Any]] = None,
+        workers: Optional[int] = None,
+    ):
+        """
+        Initialize the engine and requeue documents interrupted by a restart.
+
+        Args:
+            data_dir: Data directory holding uploads/pdfs/processed and the job database
+            ocr_func: perform_ocr(path, language=..., use_ollama=...) -> result dict
+            emit: Socket.IO style emit(event, payload) callback
+            workers: Worker thread count (default: OCR_CONFIG["batch_workers"])
+        """
+        self.data_dir = data_dir
+        self.db_path = os.path.join(data_dir, BATCH_DB_FILE)
+        self.ocr_func = ocr_func
+        self.emit = emit
+        self.workers = workers or _default_workers()
+
+        self._lock = threading.Lock()
+        self._work_available = threading.Condition(self._lock)
+        self._threads: List[threading.Thread] = []
+
+        os.makedirs(data_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            # Anything "running" when the process died never finished
+            resumed = conn.execute(
+                "UPDATE batch_items SET status = ? WHERE status = ?", (ITEM_PENDING, ITEM_RUNNING)
+            ).rowcount
+            pending = conn.execute(
+                "SELECT COUNT(*) FROM batch_items i JOIN batch_jobs j ON j.id = i.batch_id "
+                "WHERE i.status = ? AND j.status IN (?, ?)",
+                (ITEM_PENDING, *ACTIVE_STATES),
+            ).fetchone()[0]
+
+        if pending:
+            logger.info(f"[OK] Resuming batch OCR: {pending} pending documents ({resumed} interrupted)")
+            self._ensure_workers()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(self, documents: List[str], language: str = "en", use_ollama: bool = True) -> str:
+        """
+        Queue a batch of documents for OCR.
+
+        Args:
+            documents: Document filenames
+            language: OCR language code
+            use_ollama: Post-process with Ollama
+
+        Returns:
+            Batch job ID
+        """
+        batch_id = str(uuid.uuid4())
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO batch_jobs (id, status, total, created_at, language, use_ollama) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (batch_id, QUEUED, len(documents), datetime.now().isoformat(), language, int(bool(use_ollama))),
+            )
+            conn.executemany(
+                "INSERT INTO batch_items (batch_id, position, document, status) VALUES (?, ?, ?, ?)",
+                [(batch_id, i, doc, ITEM_PENDING) for i, doc in enumerate(documents)],
+            )
+            self._work_available.notify_all()
+        self._ensure_workers()
+        return batch_id
+
+    def cancel(self, batch_id: str) -> bool:
+        """
+        Cancel a job: pending documents are dropped at once, documents already
+        being OCR'd finish but are not counted.
+
+        Returns:
+            False if the job does not exist
+        """
+        with self._lock, self._connect() as conn:
+            job = conn.execute("SELECT status FROM batch_jobs WHERE id = ?", (batch_id,)).fetchone()
+            if job is None:
+                return False
+            was_active = job["status"] in ACTIVE_STATES
+            if was_active:
+                conn.execute(
+                    "UPDATE batch_jobs SET status = ?, finished_at = ? WHERE id = ?",
+                    (CANCELLED, datetime.now().isoformat(), batch_id),
+                )
+                conn.execute(
+                    "UPDATE batch_items SET status = ? WHERE batch_id = ? AND status = ?",
+                    (ITEM_CANCELLED, batch_id, ITEM_PENDING),
+                )
+        if was_active:
+            self._emit("batch_ocr_complete", {"batch_id": batch_id, "status": CANCELLED})
+        return True
+
+    def get_job(self, batch_id: str, include_results: bool = True) -> Optional[Dict[str, Any]]:
+        """Job row as a dict (plus per-document results), or None if unknown."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM batch_jobs WHERE id = ?", (batch_id,)).fetchone()
+            if row is None:
+                return None
+            job = self._job_dict(row)
+            if include_results:
+                items = conn.execute(
+                    "SELECT document, status, result FROM batch_items WHERE batch_id = ? "
+                    "AND status IN (?, ?) ORDER BY position",
+                    (batch_id, ITEM_DONE, ITEM_FAILED),
+                ).fetchall()
+                job["results"] = [json.loads(item["result"]) for item in items if item["result"]]
+        return job
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """All jobs, newest first (without per-document results)."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM batch_jobs ORDER BY created_at DESC").fetchall()
+        return [self._job_dict(row) for row in rows]
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def _ensure_workers(self) -> None:
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            for i in range(len(self._threads), self.workers):
+                thread = threading.Thread(target=self._worker, name=f"batch-ocr-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _claim(self) -> Optional[sqlite3.Row]:
+        """Mark the next pending document as running (oldest job first). Caller holds _lock."""
+        with self._connect() as conn:
+            item = conn.execute(
+                "SELECT i.batch_id, i.position, i.document, j.language, j.use_ollama "
+                "FROM batch_items i JOIN batch_jobs j ON j.id = i.batch_id "
+                "WHERE i.status = ? AND j.status IN (?, ?) "
+                "ORDER BY j.created_at, i.position LIMIT 1",
+                (ITEM_PENDING, *ACTIVE_STATES),
+            ).fetchone()
+            if item is None:
+                return None
+            conn.execute(
+                "UPDATE batch_items SET status = ? WHERE batch_id = ? AND position = ?",
+                (ITEM_RUNNING, item["batch_id"], item["position"]),
+            )
+            conn.execute(
+                "UPDATE batch_jobs SET status = ? WHERE id = ? AND status = ?",
+                (PROCESSING, item["batch_id"], QUEUED),
+            )
+            return item
+
+    def _worker(self) -> None:
+        while True:
+            with self._work_available:
+                item = self._claim()
+                while item is None:
+                    self._work_available.wait(timeout=30)
+                    item = self._claim()
+            try:
+                result = self._process(item["document"], item["language"], bool(item["use_ollama"]))
+            except Exception as e:
+                logger.error(f"Batch OCR error on {item['document']}: {e}")
+                result = {"document": item["document"], "success": False, "error": str(e)}
+            self._record(item, result)
+
+    def _find_document(self, doc_id: str) -> Optional[str]:
+        from app.modules.document.locator import get_file_locator
+
+        return get_file_locator(self.data_dir).resolve(secure_filename(doc_id), SEARCH_FOLDERS)
+
+    def _process(self, doc_id: str, language: str, use_ollama: bool) -> Dict[str, Any]:
+        document_path = self._find_document(doc_id)
+        if not document_path:
+            return {"document": doc_id, "success": False, "error": "Document not found"}
+
+        result = self.ocr_func(document_path, language=language, use_ollama=use_ollama)
+        if result.get("success"):
+            return {
+                "document": doc_id,
+                "success": True,
+                "text": result.get("text", ""),
+                "character_count": result.get("character_count", 0),
+            }
+        return {"document": doc_id, "success": False, "error": result.get("error", "Unknown error")}
+
+    def _record(self, item: sqlite3.Row, result: Dict[str, Any]) -> None:
+        """Store a document result, update job counters and finish the job if nothing is left."""
+        batch_id = item["batch_id"]
+        success = bool(result.get("success"))
+        finished_status = None
+
+        with self._lock, self._connect() as conn:
+            job = conn.execute("SELECT * FROM batch_jobs WHERE id = ?", (batch_id,)).fetchone()
+            cancelled = job is None or job["status"] == CANCELLED
+            conn.execute(
+                "UPDATE batch_items SET status = ?, result = ? WHERE batch_id = ? AND position = ?",
+                (
+                    ITEM_CANCELLED if cancelled else (ITEM_DONE if success else ITEM_FAILED),
+                    json.dumps(result, ensure_ascii=False),
+                    batch_id,
+                    item["position"],
+                ),
+            )
+            if cancelled:
+                return
+
+            column = "completed" if success else "failed"
+            conn.execute(f"UPDATE batch_jobs SET {column} = {column} + 1 WHERE id = ?", (batch_id,))
+            job = conn.execute("SELECT * FROM batch_jobs WHERE id = ?", (batch_id,)).fetchone()
+
+            remaining = conn.execute(
+                "SELECT COUNT(*) FROM batch_items WHERE batch_id = ? AND status IN (?, ?)",
+                (batch_id, ITEM_PENDING, ITEM_RUNNING),
+            ).fetchone()[0]
+            if remaining == 0:
+                if job["failed"] == job["total"]:
+                    finished_status = FAILED
+                elif job["failed"] > 0:
+                    finished_status = COMPLETED_WITH_ERRORS
+                else:
+                    finished_status = COMPLETED
+                conn.execute(
+                    "UPDATE batch_jobs SET status = ?, finished_at = ? WHERE id = ?",
+                    (finished_status, datetime.now().isoformat(), batch_id),
+                )
+
+        self._emit("batch_ocr_progress", {
+            "batch_id": batch_id,
+            "document": item["document"],
+            "index": item["position"],
+            "success": success,
+            "error": result.get("error"),
+            "completed": job["completed"],
+            "failed": job["failed"],
+            "total": job["total"],
+        })
+        if finished_status:
+            logger.info(f"[OK] Batch OCR completed: {batch_id} ({job['completed']}/{job['total']} successful)")
+            self._emit("batch_ocr_complete", {
+                "batch_id": batch_id,
+                "status": finished_status,
+                "completed": job["completed"],
+                "failed": job["failed"],
+                "total": job["total"],
+            })
+
+    def _emit(self, event: str, payload: Dict[str, Any]) -> None:
+        if not self.emit:
+            return
+        try:
+            self.emit(event, payload)
+        except Exception as e:
+            logger.warning(f"Socket.IO emit '{event}' failed: {e}")
+
+    @staticmethod
+    def _job_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "id": row["id"],
+            "status": row["status"],
+            "total": row["total"],
+            "completed": row["completed"],
+            "failed": row["failed"],
+            "created_at": row["created_at"],
+            "finished_at": row["finished_at"],
+            "language": row["language"],
+            "use_ollama": bool(row["use_ollama"]),
+            "error": row["error"],
+        }
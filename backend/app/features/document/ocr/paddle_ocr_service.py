@@ -6,7 +6,6 @@ This module provides a clean interface to the existing OCR processor.
 """
 
 import os
-import json
 import logging
 from typing import Optional, Dict, Any
 from datetime import datetime
@@ -131,62 +130,35 @@ class PaddleOCRService:
     
     def save_result(self, filename: str, result: OCRResult) -> str:
         """
-        Save OCR result to JSON file.
+        Save OCR result to the compact OCR store.
         
         Args:
             filename: Original filename (used to generate result filename)
             result: OCR result to save
             
         Returns:
-            Path to saved JSON file
+            Path to saved result file
         """
         try:
-            # Generate result filename
-            base_name = os.path.splitext(filename)[0]
-            json_filename = f"{base_name}_ocr.json"
-            json_path = os.path.join(self.ocr_data_dir, json_filename)
-            
-            # Convert result to dict
-            if hasattr(result, 'to_dict'):
-                data = result.to_dict()
-            else:
-                data = result
-            
-            # Add metadata
-            data['source_filename'] = filename
-            data['saved_at'] = datetime.now().isoformat()
-            
-            # Save to file
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
-            logger.info(f"OCR result saved: {json_path}")
-            return json_path
+            return self._get_processor().save_result(filename, result)
         
         except Exception as e:
             logger.error(f"Failed to save OCR result: {e}")
             raise
     
-    def load_result(self, filename: str) -> Optional[Dict[str, Any]]:
+    def load_result(self, filename: str, fields: Optional[list] = None) -> Optional[Dict[str, Any]]:
         """
         Load existing OCR result.
         
         Args:
             filename: Original filename
+            fields: Only decode these fields (None loads everything)
             
         Returns:
             OCR result dict or None if not found
         """
         try:
-            base_name = os.path.splitext(filename)[0]
-            json_filename = f"{base_name}_ocr.json"
-            json_path = os.path.join(self.ocr_data_dir, json_filename)
-            
-            if not os.path.exists(json_path):
-                return None
-            
-            with open(json_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return self._get_processor().load_result(filename, fields=fields)
         
         except Exception as e:
             logger.warning(f"Failed to load OCR result: {e}")
@@ -202,10 +174,7 @@ class PaddleOCRService:
         Returns:
             True if OCR result exists
         """
-        base_name = os.path.splitext(filename)[0]
-        json_filename = f"{base_name}_ocr.json"
-        json_path = os.path.join(self.ocr_data_dir, json_filename)
-        return os.path.exists(json_path)
+        return self._get_processor().has_ocr_result(filename)
     
     def delete_result(self, filename: str) -> bool:
         """
@@ -218,14 +187,7 @@ class PaddleOCRService:
             True if deleted, False if not found
         """
         try:
-            base_name = os.path.splitext(filename)[0]
-            json_filename = f"{base_name}_ocr.json"
-            json_path = os.path.join(self.ocr_data_dir, json_filename)
-            
-            if os.path.exists(json_path):
-                os.remove(json_path)
-                return True
-            return False
+            return self._get_processor().delete_result(filename)
         
         except Exception as e:
             logger.error(f"Failed to delete OCR result: {e}")
@@ -241,9 +203,9 @@ class PaddleOCRService:
         Returns:
             Extracted text or empty string
         """
-        result = self.load_result(filename)
+        result = self.load_result(filename, fields=["full_text"])
         if result:
-            return result.get("full_text", "")
+            return result.get("full_text") or ""
         return ""
     
     def get_title(self, filename: str) -> str:
@@ -256,9 +218,9 @@ class PaddleOCRService:
         Returns:
             Derived title or empty string
         """
-        result = self.load_result(filename)
+        result = self.load_result(filename, fields=["derived_title"])
         if result:
-            return result.get("derived_title", "")
+            return result.get("derived_title") or ""
         return ""
 
 
@@ -2,21 +2,40 @@
 PrintChakra Backend - OCR Batch Routes
 
 Batch OCR processing endpoints.
+Jobs run on the SQLite-backed BatchJobEngine, so they use several OCR workers,
+report per-document progress over Socket.IO and survive a restart.
 """
 
 import os
 import logging
+import threading
 from flask import jsonify, request
-from werkzeug.utils import secure_filename
 from app.features.document.ocr.routes import ocr_bp
+from app.features.document.ocr.batch_engine import BatchJobEngine, CANCELLED
 from app.core.middleware.cors import create_options_response
 
 logger = logging.getLogger(__name__)
 
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))), "data")
 
-# Store for batch job status
-batch_jobs = {}
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def _emit(event, payload):
+    from app.core import socketio
+    socketio.emit(event, payload)
+
+
+def get_batch_engine() -> BatchJobEngine:
+    """Get or create the batch OCR engine (resumes interrupted jobs on first use)."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                from app.features.document.ocr.routes.extraction import perform_ocr
+                _engine = BatchJobEngine(DATA_DIR, perform_ocr, emit=_emit)
+    return _engine
 
 
 @ocr_bp.route("/batch", methods=["POST", "OPTIONS"])
@@ -38,35 +57,7 @@ def start_batch_ocr():
         if not documents:
             return jsonify({"success": False, "error": "Empty document list"}), 400
         
-        # Generate batch job ID
-        import uuid
-        from datetime import datetime
-        
-        batch_id = str(uuid.uuid4())
-        
-        # Create batch job
-        batch_job = {
-            "id": batch_id,
-            "status": "queued",
-            "total": len(documents),
-            "completed": 0,
-            "failed": 0,
-            "results": [],
-            "created_at": datetime.now().isoformat(),
-            "language": language,
-            "use_ollama": use_ollama
-        }
-        
-        batch_jobs[batch_id] = batch_job
-        
-        # Start processing in background (in production, use Celery or similar)
-        import threading
-        
-        def process_batch():
-            process_batch_ocr(batch_id, documents, language, use_ollama)
-        
-        thread = threading.Thread(target=process_batch)
-        thread.start()
+        batch_id = get_batch_engine().submit(documents, language=language, use_ollama=use_ollama)
         
         logger.info(f"[OK] Batch OCR started: {batch_id} ({len(documents)} documents)")
         
@@ -89,11 +80,10 @@ def get_batch_status(batch_id):
         return create_options_response()
     
     try:
-        if batch_id not in batch_jobs:
+        job = get_batch_engine().get_job(batch_id)
+        if job is None:
             return jsonify({"success": False, "error": "Batch job not found"}), 404
         
-        job = batch_jobs[batch_id]
-        
         return jsonify({
             "success": True,
             "batch": job
@@ -110,16 +100,15 @@ def cancel_batch_ocr(batch_id):
         return create_options_response()
     
     try:
-        if batch_id not in batch_jobs:
+        if not get_batch_engine().cancel(batch_id):
             return jsonify({"success": False, "error": "Batch job not found"}), 404
         
-        batch_jobs[batch_id]["status"] = "cancelled"
-        
         logger.info(f"[OK] Batch OCR cancelled: {batch_id}")
         
         return jsonify({
             "success": True,
-            "message": "Batch job cancelled"
+            "message": "Batch job cancelled",
+            "status": CANCELLED
         })
     
     except Exception as e:
@@ -133,11 +122,10 @@ def get_batch_results(batch_id):
         return create_options_response()
     
     try:
-        if batch_id not in batch_jobs:
+        job = get_batch_engine().get_job(batch_id)
+        if job is None:
             return jsonify({"success": False, "error": "Batch job not found"}), 404
         
-        job = batch_jobs[batch_id]
-        
         return jsonify({
             "success": True,
             "batch_id": batch_id,
@@ -159,19 +147,17 @@ def list_batch_jobs():
         return create_options_response()
     
     try:
-        jobs = []
-        for batch_id, job in batch_jobs.items():
-            jobs.append({
-                "id": batch_id,
+        jobs = [
+            {
+                "id": job["id"],
                 "status": job["status"],
                 "total": job["total"],
                 "completed": job["completed"],
                 "failed": job["failed"],
                 "created_at": job["created_at"]
-            })
-        
-        # Sort by created_at, newest first
-        jobs.sort(key=lambda x: x["created_at"], reverse=True)
+            }
+            for job in get_batch_engine().list_jobs()  # Newest first
+        ]
         
         return jsonify({
             "success": True,
@@ -183,70 +169,10 @@ def list_batch_jobs():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
-def process_batch_ocr(batch_id: str, documents: list, language: str, use_ollama: bool):
-    """Process batch OCR in background."""
+@ocr_bp.record_once
+def _resume_batch_jobs(state):
+    """Start the engine when the blueprint is registered so interrupted jobs resume without a request."""
     try:
-        from app.features.document.ocr.routes.extraction import perform_ocr
-        
-        job = batch_jobs[batch_id]
-        job["status"] = "processing"
-        
-        for doc_id in documents:
-            # Check if cancelled
-            if job["status"] == "cancelled":
-                break
-            
-            filename = secure_filename(doc_id)
-            
-            # Find document
-            document_path = None
-            for folder in ["uploads", "pdfs", "processed"]:
-                filepath = os.path.join(DATA_DIR, folder, filename)
-                if os.path.exists(filepath):
-                    document_path = filepath
-                    break
-            
-            if not document_path:
-                job["results"].append({
-                    "document": doc_id,
-                    "success": False,
-                    "error": "Document not found"
-                })
-                job["failed"] += 1
-                continue
-            
-            # Perform OCR
-            result = perform_ocr(document_path, language=language, use_ollama=use_ollama)
-            
-            if result.get("success"):
-                job["results"].append({
-                    "document": doc_id,
-                    "success": True,
-                    "text": result.get("text", ""),
-                    "character_count": result.get("character_count", 0)
-                })
-                job["completed"] += 1
-            else:
-                job["results"].append({
-                    "document": doc_id,
-                    "success": False,
-                    "error": result.get("error", "Unknown error")
-                })
-                job["failed"] += 1
-        
-        # Update final status
-        if job["status"] != "cancelled":
-            if job["failed"] == job["total"]:
-                job["status"] = "failed"
-            elif job["failed"] > 0:
-                job["status"] = "completed_with_errors"
-            else:
-                job["status"] = "completed"
-        
-        logger.info(f"[OK] Batch OCR completed: {batch_id} ({job['completed']}/{job['total']} successful)")
-    
+        get_batch_engine()
     except Exception as e:
-        logger.error(f"Batch OCR processing error: {e}")
-        if batch_id in batch_jobs:
-            batch_jobs[batch_id]["status"] = "error"
-            batch_jobs[batch_id]["error"] = str(e)
+        logger.warning(f"Batch OCR engine not started: {e}")
@@ -271,7 +271,7 @@ def perform_ocr(image_path: str, language: str = "en", use_ollama: bool = True)
 def process_with_ollama(text: str) -> str:
     """Process OCR text with Ollama for better formatting."""
     try:
-        import requests
+        from app.modules.llm_client import get_llm_client
         
         prompt = f"""Please clean up and format the following OCR-extracted text. 
 Fix any obvious spelling errors, add proper punctuation, and organize paragraphs.
@@ -280,8 +280,9 @@ Only return the cleaned text, no explanations.
 Text to clean:
 {text}"""
         
-        response = requests.post(
-            "http://localhost:11434/api/generate",
+        response = get_llm_client().post(
+            "/api/generate",
+            name="ocr.cleanup",
             json={
                 "model": "llama2",
                 "prompt": prompt,
@@ -297,5 +298,5 @@ Text to clean:
         return text
     
     except Exception:
-        # Return original text if Ollama fails
+        # Return original text if Ollama fails (or its circuit is open)
         return text
@@ -35,12 +35,8 @@ def get_ocr_status():
             status["error"] = "PaddleOCR not installed"
         
         # Check Ollama
-        try:
-            import requests
-            response = requests.get("http://localhost:11434/api/tags", timeout=2)
-            status["ollama_available"] = response.status_code == 200
-        except:
-            status["ollama_available"] = False
+        from app.modules.llm_client import check_ollama_available
+        status["ollama_available"] = check_ollama_available(name="ocr.status", timeout=2)
         
         return jsonify({
             "success": True,
@@ -214,6 +210,25 @@ def test_ocr():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@ocr_bp.route("/metrics", methods=["GET", "OPTIONS"])
+def get_ocr_metrics():
+    """Aggregate OCR stage timings over recent results."""
+    if request.method == "OPTIONS":
+        return create_options_response()
+    
+    try:
+        from app.modules.ocr.profiling import ocr_metrics
+        
+        slowest = request.args.get("slowest", 10, type=int)
+        return jsonify({
+            "success": True,
+            "metrics": ocr_metrics.snapshot(slowest=slowest)
+        })
+    
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 @ocr_bp.route("/health", methods=["GET", "OPTIONS"])
 def ocr_health():
     """OCR service health check."""
@@ -244,8 +259,8 @@ def ocr_health():
         
         # Check Ollama (optional)
         try:
-            import requests
-            response = requests.get("http://localhost:11434/api/tags", timeout=2)
+            from app.modules.llm_client import get_llm_client
+            response = get_llm_client().get("/api/tags", name="ocr.health", timeout=2)
             if response.status_code == 200:
                 health["checks"]["ollama"] = {"status": "ok", "message": "Ollama available"}
             else:
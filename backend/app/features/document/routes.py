@@ -8,9 +8,11 @@ thumbnails, and document info.
 import os
 import io
 from datetime import datetime
-from flask import Blueprint, request, jsonify, send_from_directory, send_file, current_app
+from flask import Blueprint, request, jsonify, send_file, current_app
 from app.core.config import get_data_dirs
 from app.core.middleware.cors import create_options_response, add_cors_headers
+from app.core.middleware.file_serving import serve_file, serve_from_directory
+from app.modules.document.locator import get_file_locator
 
 document_bp = Blueprint('document', __name__)
 
@@ -21,7 +23,11 @@ document_bp = Blueprint('document', __name__)
 
 @document_bp.route("/processed/<filename>", methods=["GET", "OPTIONS"])
 def get_processed_file(filename):
-    """Serve processed image file with CORS headers and caching support."""
+    """
+    Serve processed image file with CORS headers and caching support.
+    
+    ?size=thumb|preview|full or ?w=<px> serves a downscaled rendition.
+    """
     if request.method == "OPTIONS":
         return create_options_response()
     
@@ -33,13 +39,20 @@ def get_processed_file(filename):
         if not os.path.exists(file_path):
             return jsonify({"error": "File not found"}), 404
         
-        response = send_from_directory(PROCESSED_DIR, filename)
-        response = add_cors_headers(response)
+        from app.features.document.services.thumbnail_service import ThumbnailService
         
-        # Add cache headers
-        response.headers["Cache-Control"] = "public, max-age=3600"
+        try:
+            rendition = ThumbnailService().negotiate_rendition(
+                file_path, request.args.get("size"), request.args.get("w", type=int)
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if rendition:
+            rendition_path, etag, mimetype = rendition
+            return serve_file(rendition_path, mimetype=mimetype, etag=etag)
         
-        return response
+        # ETag + revalidation, so reprocessed pages are never served stale
+        return serve_file(file_path)
     
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -59,10 +72,7 @@ def get_upload_file(filename):
         if not os.path.exists(file_path):
             return jsonify({"error": "File not found"}), 404
         
-        response = send_from_directory(UPLOAD_DIR, filename)
-        response = add_cors_headers(response)
-        
-        return response
+        return serve_from_directory(UPLOAD_DIR, filename)
     
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -79,17 +89,10 @@ def get_thumbnail(filename):
         return create_options_response()
     
     dirs = get_data_dirs()
-    PROCESSED_DIR = dirs['PROCESSED_DIR']
-    CONVERTED_DIR = dirs['CONVERTED_DIR']
     
     try:
-        # Find the file
-        file_path = None
-        for search_dir in [PROCESSED_DIR, CONVERTED_DIR]:
-            candidate = os.path.join(search_dir, filename)
-            if os.path.exists(candidate):
-                file_path = candidate
-                break
+        # Find the file (in-memory name map, no per-folder stat calls)
+        file_path = get_file_locator(dirs['DATA_DIR']).resolve(filename, ("processed", "converted"))
         
         if not file_path:
             return jsonify({"error": "File not found"}), 404
@@ -98,6 +101,12 @@ def get_thumbnail(filename):
         from app.features.document.services.thumbnail_service import ThumbnailService
         
         service = ThumbnailService()
+        cached = service.cached_thumbnail(file_path)
+        if cached:
+            thumb_path, etag = cached
+            # The ETag follows the source version; revalidation answers 304 until it changes
+            return serve_file(thumb_path, mimetype='image/jpeg', etag=etag)
+        
         thumbnail_data = service.generate_thumbnail(file_path)
         
         if thumbnail_data:
@@ -128,17 +137,10 @@ def get_document_info(filename):
         return create_options_response()
     
     dirs = get_data_dirs()
-    PROCESSED_DIR = dirs['PROCESSED_DIR']
-    CONVERTED_DIR = dirs['CONVERTED_DIR']
     
     try:
-        # Find the file
-        file_path = None
-        for search_dir in [PROCESSED_DIR, CONVERTED_DIR]:
-            candidate = os.path.join(search_dir, filename)
-            if os.path.exists(candidate):
-                file_path = candidate
-                break
+        # Find the file (in-memory name map, no per-folder stat calls)
+        file_path = get_file_locator(dirs['DATA_DIR']).resolve(filename, ("processed", "converted"))
         
         if not file_path:
             return jsonify({"error": "File not found"}), 404
@@ -188,17 +190,10 @@ def get_pdf_page(filename, page_num):
         return create_options_response()
     
     dirs = get_data_dirs()
-    PROCESSED_DIR = dirs['PROCESSED_DIR']
-    CONVERTED_DIR = dirs['CONVERTED_DIR']
     
     try:
-        # Find the file
-        file_path = None
-        for search_dir in [PROCESSED_DIR, CONVERTED_DIR]:
-            candidate = os.path.join(search_dir, filename)
-            if os.path.exists(candidate):
-                file_path = candidate
-                break
+        # Find the file (in-memory name map, no per-folder stat calls)
+        file_path = get_file_locator(dirs['DATA_DIR']).resolve(filename, ("processed", "converted"))
         
         if not file_path or not filename.lower().endswith('.pdf'):
             return jsonify({"error": "PDF not found"}), 404
@@ -326,9 +321,7 @@ def serve_converted(filename):
     CONVERTED_DIR = dirs['CONVERTED_DIR']
     
     try:
-        response = send_from_directory(CONVERTED_DIR, filename)
-        response = add_cors_headers(response)
-        return response
+        return serve_from_directory(CONVERTED_DIR, filename)
     except Exception as e:
         return jsonify({"error": str(e)}), 404
 
@@ -6,10 +6,11 @@ Document file management endpoints.
 
 import os
 import logging
-from flask import jsonify, request, send_file
+from flask import jsonify, request
 from werkzeug.utils import secure_filename
 from app.features.document.routes import document_bp
 from app.core.middleware.cors import create_options_response
+from app.core.middleware.file_serving import serve_file
 
 logger = logging.getLogger(__name__)
 
@@ -108,7 +109,8 @@ def download_document(doc_id):
         for folder in ["uploads", "pdfs", "processed", "converted"]:
             filepath = os.path.join(DATA_DIR, folder, filename)
             if os.path.exists(filepath):
-                return send_file(
+                # Range support lets large PDF downloads resume
+                return serve_file(
                     filepath,
                     as_attachment=True,
                     download_name=filename
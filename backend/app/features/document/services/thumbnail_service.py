@@ -2,13 +2,17 @@
 PrintChakra Backend - Thumbnail Service
 
 Service for generating thumbnails for images and PDFs.
+Grid thumbnails are served from the persistent thumbnail store.
 """
 
 import os
 import io
+from typing import Optional, Tuple
 from PIL import Image
 from flask import current_app
 from app.core.config import get_data_dirs
+from app.modules.document.pdf_renderer import get_pdf_renderer
+from app.modules.document.thumbnails import RENDITION_FULL, THUMBNAIL_DIR, ThumbnailStore, get_thumbnail_store
 
 
 class ThumbnailService:
@@ -24,6 +28,51 @@ class ThumbnailService:
         self.max_size = max_size
         self.dirs = get_data_dirs()
     
+    def cached_thumbnail(self, file_path: str) -> Optional[Tuple[str, str]]:
+        """
+        Get the thumbnail from the persistent store, rendering it on a miss.
+        
+        Args:
+            file_path: Path to the source file
+            
+        Returns:
+            (thumbnail path, etag), or None if it cannot be rendered
+        """
+        store = self._store()
+        if not store.supports(file_path):
+            return None
+        return store.get(file_path, size=self.max_size)
+    
+    def negotiate_rendition(
+        self, file_path: str, size: Optional[str] = None, width: Optional[int] = None
+    ) -> Optional[Tuple[str, str, Optional[str]]]:
+        """
+        Resolve ?size= / ?w= to a stored rendition of a processed page.
+        
+        Args:
+            file_path: Path to the processed page
+            size: Rendition name (thumb, preview, full)
+            width: Display width in pixels
+            
+        Returns:
+            (path, etag, mimetype), or None when no size was requested
+            
+        Raises:
+            ValueError: Unknown rendition name
+        """
+        rendition = self._store().negotiate(file_path, size, width)
+        if rendition is None:
+            return None
+        path, etag, name = rendition
+        return path, etag, 'image/jpeg' if name != RENDITION_FULL else None
+    
+    def _store(self) -> ThumbnailStore:
+        """Shared persistent thumbnail store."""
+        return get_thumbnail_store(
+            os.path.join(self.dirs['DATA_DIR'], THUMBNAIL_DIR),
+            poppler_path=self._get_poppler_path(),
+        )
+    
     def generate_thumbnail(self, file_path: str) -> bytes:
         """
         Generate thumbnail for a file.
@@ -103,43 +152,16 @@ class ThumbnailService:
         """
         Render a PDF page to an image.
         
-        Uses pdf2image with poppler for rendering.
+        Uses the shared PDF renderer, which keeps the document open and
+        caches rendered pages.
         """
         try:
-            from pdf2image import convert_from_path
-            
-            # Get poppler path
-            poppler_path = self._get_poppler_path()
-            
-            # Convert specific page
-            images = convert_from_path(
-                file_path,
-                first_page=page + 1,  # pdf2image uses 1-indexed pages
-                last_page=page + 1,
-                dpi=150,
-                poppler_path=poppler_path
-            )
-            
-            if not images:
-                return None
-            
-            # Create thumbnail
-            img = images[0]
-            img.thumbnail(self.max_size, Image.Resampling.LANCZOS)
-            
-            # Convert to RGB if necessary
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
-            
-            # Save to bytes
-            buffer = io.BytesIO()
-            img.save(buffer, format='JPEG', quality=85, optimize=True)
-            buffer.seek(0)
-            
-            return buffer.read()
+            renderer = get_pdf_renderer(poppler_path=self._get_poppler_path())
+            # The renderer uses 1-indexed pages
+            return renderer.render_page(file_path, page + 1, max_size=self.max_size)
         
         except ImportError:
-            current_app.logger.error("pdf2image not installed")
+            current_app.logger.error("No PDF renderer installed (PyMuPDF or pdf2image)")
             return None
         except Exception as e:
             current_app.logger.error(f"PDF page render failed: {e}")
@@ -171,9 +193,7 @@ class ThumbnailService:
     def get_pdf_page_count(self, file_path: str) -> int:
         """Get the number of pages in a PDF."""
         try:
-            from PyPDF2 import PdfReader
-            reader = PdfReader(file_path)
-            return len(reader.pages)
+            return get_pdf_renderer(poppler_path=self._get_poppler_path()).page_count(file_path)
         except Exception as e:
             current_app.logger.error(f"Could not get page count: {e}")
             return 0
@@ -63,21 +63,10 @@ class PrintJobService:
         Returns:
             Full path to file or None
         """
-        search_dirs = [
-            self.dirs.get('PROCESSED_DIR'),
-            self.dirs.get('CONVERTED_DIR'),
-            self.dirs.get('UPLOAD_DIR'),
-            self.dirs.get('PDF_DIR'),
-            self.dirs.get('OCR_DATA_DIR'),
-        ]
-        
-        for search_dir in search_dirs:
-            if search_dir:
-                candidate = os.path.join(search_dir, filename)
-                if os.path.exists(candidate):
-                    return candidate
+        from app.modules.document.locator import PRINT_FOLDERS, get_file_locator
         
-        return None
+        # Processed, converted, uploads, pdfs, then ocr_results
+        return get_file_locator(self.dirs['DATA_DIR']).resolve(filename, PRINT_FOLDERS)
     
     def _find_blank_pdf(self) -> Optional[str]:
         """Find blank.pdf for test printing."""
@@ -1,5 +1,5 @@
 """
-Document processing module for detection, conversion, scanning, storage, and export.
+Document processing module for detection, conversion, scanning, storage, export, cataloguing, thumbnails, PDF page rendering, file lookup and storage lifecycle.
 """
 
 from .detection import *
@@ -7,5 +7,10 @@ from .converter import *
 from .scanning import *
 from .storage import *
 from .export import *
+from .catalog import *
+from .thumbnails import *
+from .pdf_renderer import *
+from .locator import *
+from .lifecycle import *
 
-__all__ = ["detection", "converter", "scanning", "storage", "export"]
+__all__ = ["detection", "converter", "scanning", "storage", "export", "catalog", "thumbnails", "pdf_renderer", "locator", "lifecycle"]
@@ -0,0 +1,707 @@
+"""
+Document Catalog
+Persistent SQLite index of processed documents (size, created time, text and
+OCR flags) so /files is one indexed query instead of a directory scan plus
+several stats per file.
+
+The catalog is updated where documents change (upload, OCR, rename, delete).
+A reconciliation pass rebuilds it from the filesystem at startup, and again
+whenever the processed directory changes through a path that doesn't update
+the catalog. Only one stat of the directory is needed to detect that.
+
+Every write stamps the row with a change sequence number, and deletions leave
+a tombstone. Listings can then be paged with a (created, filename) cursor and
+synced incrementally with since=<sequence>. Converted files get the same
+treatment in a second table.
+
+Documents also record the SHA-256 of the upload they were made from, so a
+repeat upload of the same bytes can be answered with the existing document
+(find_or_claim_content) instead of running the pipeline again.
+"""
+
+import base64
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "DocumentCatalog",
+    "CatalogCursorError",
+    "CATALOG_FILE",
+    "IMAGE_EXTENSIONS",
+    "COLLECTION_DOCUMENTS",
+    "COLLECTION_CONVERTED",
+]
+
+CATALOG_FILE = "document_catalog.sqlite3"
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+# Deletions remembered for delta sync; older clients get reset=True
+MAX_TOMBSTONES = 10000
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+COLLECTION_DOCUMENTS = "documents"
+COLLECTION_CONVERTED = "converted"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    filename TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    modified REAL NOT NULL,
+    has_text INTEGER NOT NULL DEFAULT 0,
+    has_ocr INTEGER NOT NULL DEFAULT 0,
+    derived_title TEXT,
+    updated REAL NOT NULL,
+    seq INTEGER NOT NULL DEFAULT 0,
+    content_hash TEXT
+)
+"""
+
+_CONVERTED_SCHEMA = """
+CREATE TABLE IF NOT EXISTS converted_files (
+    filename TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    signature TEXT NOT NULL,
+    pages TEXT NOT NULL,
+    seq INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+_TOMBSTONE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tombstones (
+    collection TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (collection, filename)
+)
+"""
+
+_META_SCHEMA = "CREATE TABLE IF NOT EXISTS catalog_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+
+_COLUMNS = ("filename", "size", "created", "modified", "has_text", "has_ocr", "derived_title")
+_CONVERTED_COLUMNS = ("filename", "size", "created", "pages")
+
+
+class CatalogCursorError(ValueError):
+    """Raised for malformed page cursors"""
+
+
+def encode_cursor(created: float, filename: str) -> str:
+    """Opaque page cursor pointing just past (created, filename)"""
+    raw = json.dumps([created, filename], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created, filename = json.loads(raw)
+        return float(created), str(filename)
+    except Exception:
+        raise CatalogCursorError(f"Invalid cursor: {cursor!r}")
+
+
+class DocumentCatalog:
+    """SQLite catalog of processed documents"""
+
+    def __init__(
+        self,
+        db_path: str,
+        processed_dir: str,
+        text_dir: str,
+        ocr_data_dir: str,
+        converted_dir: Optional[str] = None,
+    ):
+        """
+        Args:
+            db_path: SQLite database file
+            processed_dir: Directory of processed page images
+            text_dir: Directory of extracted .txt files
+            ocr_data_dir: Directory of stored OCR results
+            converted_dir: Directory of converted files (PDF/DOCX/...), optional
+        """
+        self.db_path = db_path
+        self.processed_dir = processed_dir
+        self.text_dir = text_dir
+        self.ocr_data_dir = ocr_data_dir
+        self.converted_dir = converted_dir
+        self._lock = threading.RLock()
+        # content_hash -> processed filename for uploads still in the pipeline
+        self._pending_hashes: Dict[str, str] = {}
+        # processed_dir mtime after the catalog's own last change; None = never reconciled
+        self._dir_mtime: Optional[int] = None
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+            # Catalogs created before change tracking lack the seq column
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(documents)")}
+            if "seq" not in columns:
+                conn.execute("ALTER TABLE documents ADD COLUMN seq INTEGER NOT NULL DEFAULT 0")
+            # ... and catalogs created before ingest dedupe lack content_hash
+            if "content_hash" not in columns:
+                conn.execute("ALTER TABLE documents ADD COLUMN content_hash TEXT")
+            conn.execute(_CONVERTED_SCHEMA)
+            conn.execute(_TOMBSTONE_SCHEMA)
+            conn.execute(_META_SCHEMA)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_documents_created ON documents(created)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_documents_seq ON documents(seq)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_documents_hash ON documents(content_hash)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_converted_seq ON converted_files(seq)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tombstones_seq ON tombstones(seq)")
+            conn.execute("INSERT OR IGNORE INTO catalog_meta (key, value) VALUES ('seq', 0), ('pruned_seq', 0)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            with conn:  # commit / rollback
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _next_seq(conn: sqlite3.Connection) -> int:
+        conn.execute("UPDATE catalog_meta SET value = value + 1 WHERE key = 'seq'")
+        return conn.execute("SELECT value FROM catalog_meta WHERE key = 'seq'").fetchone()[0]
+
+    def _tombstone(self, conn: sqlite3.Connection, collection: str, filenames: List[str]) -> None:
+        """Record deletions for delta sync, keeping the newest MAX_TOMBSTONES"""
+        for filename in filenames:
+            conn.execute(
+                "INSERT OR REPLACE INTO tombstones (collection, filename, seq) VALUES (?, ?, ?)",
+                (collection, filename, self._next_seq(conn)),
+            )
+        if not filenames:
+            return
+        row = conn.execute(
+            "SELECT seq FROM tombstones ORDER BY seq DESC LIMIT 1 OFFSET ?", (MAX_TOMBSTONES,)
+        ).fetchone()
+        if row:
+            conn.execute("DELETE FROM tombstones WHERE seq <= ?", (row[0],))
+            conn.execute("UPDATE catalog_meta SET value = MAX(value, ?) WHERE key = 'pruned_seq'", (row[0],))
+
+    @staticmethod
+    def _clear_tombstone(conn: sqlite3.Connection, collection: str, filename: str) -> None:
+        conn.execute("DELETE FROM tombstones WHERE collection = ? AND filename = ?", (collection, filename))
+
+    def _processed_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.processed_dir).st_mtime_ns
+        except OSError:
+            return None
+
+    def _mark_dir_synced(self) -> None:
+        """Remember the directory state after a change the catalog knows about"""
+        if self._dir_mtime is not None:
+            self._dir_mtime = self._processed_mtime()
+
+    @staticmethod
+    def _is_document(filename: str) -> bool:
+        return filename.lower().endswith(IMAGE_EXTENSIONS)
+
+    def _ocr_names(self) -> set:
+        """Base names with stored OCR results"""
+        from app.modules.ocr.result_store import LEGACY_JSON_SUFFIX, OCR_STORE_SUFFIX
+
+        names = set()
+        if not os.path.isdir(self.ocr_data_dir):
+            return names
+        with os.scandir(self.ocr_data_dir) as entries:
+            for entry in entries:
+                for suffix in (OCR_STORE_SUFFIX, LEGACY_JSON_SUFFIX):
+                    if entry.name.endswith(suffix):
+                        names.add(entry.name[:-len(suffix)])
+        return names
+
+    def reconcile(self) -> Dict[str, int]:
+        """
+        Bring the catalog in line with the filesystem
+
+        One scan of each directory; only rows whose size, times or flags
+        differ are written.
+
+        Returns:
+            Counts of added, updated and removed documents
+        """
+        with self._lock:
+            dir_mtime = self._processed_mtime()
+            text_names = set()
+            if os.path.isdir(self.text_dir):
+                with os.scandir(self.text_dir) as entries:
+                    text_names = {os.path.splitext(e.name)[0] for e in entries if e.name.endswith(".txt")}
+            ocr_names = self._ocr_names()
+
+            on_disk: Dict[str, tuple] = {}
+            if os.path.isdir(self.processed_dir):
+                with os.scandir(self.processed_dir) as entries:
+                    for entry in entries:
+                        if not self._is_document(entry.name) or not entry.is_file():
+                            continue
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        base_name = os.path.splitext(entry.name)[0]
+                        on_disk[entry.name] = (
+                            stat.st_size,
+                            stat.st_ctime,
+                            stat.st_mtime,
+                            int(base_name in text_names),
+                            int(base_name in ocr_names),
+                        )
+
+            added = updated = 0
+            now = time.time()
+            with self._connect() as conn:
+                known = {
+                    row[0]: tuple(row[1:])
+                    for row in conn.execute("SELECT filename, size, created, modified, has_text, has_ocr FROM documents")
+                }
+                removed = [name for name in known if name not in on_disk]
+                conn.executemany("DELETE FROM documents WHERE filename = ?", [(name,) for name in removed])
+                self._tombstone(conn, COLLECTION_DOCUMENTS, removed)
+
+                for filename, values in on_disk.items():
+                    current = known.get(filename)
+                    if current == values:
+                        continue
+                    if current is None:
+                        added += 1
+                    else:
+                        updated += 1
+                    conn.execute(
+                        "INSERT INTO documents (filename, size, created, modified, has_text, has_ocr, updated, seq) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                        "ON CONFLICT(filename) DO UPDATE SET size = excluded.size, created = excluded.created, "
+                        "modified = excluded.modified, has_text = excluded.has_text, has_ocr = excluded.has_ocr, "
+                        "updated = excluded.updated, seq = excluded.seq",
+                        (filename, *values, now, self._next_seq(conn)),
+                    )
+                    self._clear_tombstone(conn, COLLECTION_DOCUMENTS, filename)
+
+            self._dir_mtime = dir_mtime
+
+        if added or updated or removed:
+            logger.info(f"[CATALOG] Reconciled: {added} added, {updated} updated, {len(removed)} removed")
+        return {"added": added, "updated": updated, "removed": len(removed), "total": len(on_disk)}
+
+    def ensure_fresh(self) -> None:
+        """Reconcile if the processed directory changed behind the catalog's back"""
+        mtime = self._processed_mtime()
+        if self._dir_mtime is None or mtime != self._dir_mtime:
+            self.reconcile()
+
+    def add(
+        self,
+        filename: str,
+        has_text: Optional[bool] = None,
+        derived_title: Optional[str] = None,
+        content_hash: Optional[str] = None,
+    ) -> None:
+        """
+        Record a new or rewritten processed document
+
+        Args:
+            filename: Image filename inside processed_dir
+            has_text: Whether a text file exists (None = check)
+            derived_title: OCR-derived title, if known
+            content_hash: SHA-256 of the upload the document was made from
+        """
+        path = os.path.join(self.processed_dir, filename)
+        try:
+            stat = os.stat(path) if self._is_document(filename) else None
+        except OSError:
+            stat = None
+        if stat is None:
+            if content_hash:
+                self.release_content(content_hash)
+            return
+        base_name = os.path.splitext(filename)[0]
+        if has_text is None:
+            has_text = os.path.exists(os.path.join(self.text_dir, f"{base_name}.txt"))
+
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO documents "
+                "(filename, size, created, modified, has_text, has_ocr, derived_title, updated, seq, content_hash) "
+                "VALUES (?, ?, ?, ?, ?, 0, ?, ?, ?, ?) "
+                "ON CONFLICT(filename) DO UPDATE SET size = excluded.size, created = excluded.created, "
+                "modified = excluded.modified, has_text = excluded.has_text, "
+                "derived_title = COALESCE(excluded.derived_title, documents.derived_title), "
+                "updated = excluded.updated, seq = excluded.seq, "
+                "content_hash = COALESCE(excluded.content_hash, documents.content_hash)",
+                (
+                    filename, stat.st_size, stat.st_ctime, stat.st_mtime, int(has_text), derived_title,
+                    time.time(), self._next_seq(conn), content_hash,
+                ),
+            )
+            self._clear_tombstone(conn, COLLECTION_DOCUMENTS, filename)
+            if content_hash:
+                # The row now answers find_by_hash
+                self._pending_hashes.pop(content_hash, None)
+            self._mark_dir_synced()
+
+    def update(self, filename: str, **fields: Any) -> bool:
+        """
+        Update flags of a catalogued document (has_text, has_ocr, derived_title)
+
+        Returns:
+            True if the document is in the catalog
+        """
+        fields = {k: v for k, v in fields.items() if k in ("has_text", "has_ocr", "derived_title")}
+        if not fields:
+            return False
+        values = [int(v) if isinstance(v, bool) else v for v in fields.values()]
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._connect() as conn:
+            if conn.execute("SELECT 1 FROM documents WHERE filename = ?", (filename,)).fetchone() is None:
+                return False
+            conn.execute(
+                f"UPDATE documents SET {assignments}, updated = ?, seq = ? WHERE filename = ?",
+                (*values, time.time(), self._next_seq(conn), filename),
+            )
+            return True
+
+    def rename(self, old_filename: str, new_filename: str) -> None:
+        """Move a document's row to its new filename (after the file was renamed)"""
+        try:
+            stat = os.stat(os.path.join(self.processed_dir, new_filename))
+        except OSError:
+            self.remove(old_filename)
+            return
+        with self._lock:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM documents WHERE filename = ?", (new_filename,))
+                # Renaming touches st_ctime, which /files reports as "created"
+                cursor = conn.execute(
+                    "UPDATE documents SET filename = ?, size = ?, created = ?, modified = ?, updated = ?, seq = ? "
+                    "WHERE filename = ?",
+                    (
+                        new_filename, stat.st_size, stat.st_ctime, stat.st_mtime, time.time(),
+                        self._next_seq(conn), old_filename,
+                    ),
+                )
+                renamed = cursor.rowcount > 0
+                if renamed:
+                    self._tombstone(conn, COLLECTION_DOCUMENTS, [old_filename])
+                    self._clear_tombstone(conn, COLLECTION_DOCUMENTS, new_filename)
+            if not renamed:
+                self.add(new_filename)
+            self._mark_dir_synced()
+
+    def remove(self, filename: str) -> None:
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute("DELETE FROM documents WHERE filename = ?", (filename,))
+            if cursor.rowcount:
+                self._tombstone(conn, COLLECTION_DOCUMENTS, [filename])
+            self._mark_dir_synced()
+
+    def find_by_hash(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Newest catalogued document made from an upload with this SHA-256
+
+        Rows whose file has gone from processed_dir are skipped (the next
+        reconcile drops them).
+        """
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM documents WHERE content_hash = ? ORDER BY created DESC",
+                (content_hash,),
+            ).fetchall()
+        for row in rows:
+            if os.path.isfile(os.path.join(self.processed_dir, row[0])):
+                return self._to_file_info(row)
+        return None
+
+    def find_or_claim_content(self, content_hash: str, filename: str) -> Optional[Dict[str, Any]]:
+        """
+        Dedupe check for a new upload
+
+        Returns the document already made from the same bytes, or the one
+        still being processed from them ("processing": True). Otherwise
+        claims the hash for `filename` and returns None; the claim ends with
+        add(..., content_hash=...) or release_content().
+        """
+        with self._lock:
+            pending = self._pending_hashes.get(content_hash)
+            if pending:
+                return {"filename": pending, "processing": True}
+            existing = self.find_by_hash(content_hash)
+            if existing is None:
+                self._pending_hashes[content_hash] = filename
+            return existing
+
+    def release_content(self, content_hash: str) -> None:
+        """Drop an upload's claim on its hash (processing finished or failed)"""
+        with self._lock:
+            self._pending_hashes.pop(content_hash, None)
+
+    def get(self, filename: str) -> Optional[Dict[str, Any]]:
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM documents WHERE filename = ?", (filename,)
+            ).fetchone()
+        return self._to_file_info(row) if row else None
+
+    def list_documents(self) -> List[Dict[str, Any]]:
+        """
+        All catalogued documents, newest first, in the /files entry shape
+
+        Returns:
+            Dicts with filename, size, created (ISO), has_text, has_ocr, derived_title
+        """
+        self.ensure_fresh()
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM documents ORDER BY created DESC, filename"
+            ).fetchall()
+        return [self._to_file_info(row) for row in rows]
+
+    def page_documents(self, limit: int, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        One page of documents, newest first
+
+        Args:
+            limit: Page size (capped at MAX_PAGE_SIZE)
+            cursor: next_cursor from the previous page (None = first page)
+
+        Returns:
+            Dict with items, next_cursor (None on the last page) and sync_cursor
+        """
+        self.ensure_fresh()
+        return self._page("documents", _COLUMNS, self._to_file_info, limit, cursor)
+
+    def document_changes(self, since: int) -> Dict[str, Any]:
+        """
+        Documents added or changed, and filenames deleted, after sync cursor `since`
+
+        Returns:
+            Dict with items, deleted, sync_cursor and reset (True when `since`
+            predates the remembered deletions and the client must reload)
+        """
+        self.ensure_fresh()
+        return self._changes("documents", COLLECTION_DOCUMENTS, _COLUMNS, self._to_file_info, since)
+
+    def sync_cursor(self) -> int:
+        """Current change sequence; pass back as since= to get later changes"""
+        with self._lock, self._connect() as conn:
+            return conn.execute("SELECT value FROM catalog_meta WHERE key = 'seq'").fetchone()[0]
+
+    def _page(
+        self,
+        table: str,
+        columns: Tuple[str, ...],
+        to_info: Callable[[tuple], Dict[str, Any]],
+        limit: int,
+        cursor: Optional[str],
+    ) -> Dict[str, Any]:
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        select = f"SELECT {', '.join(columns)} FROM {table}"
+        with self._lock, self._connect() as conn:
+            if cursor:
+                created, filename = decode_cursor(cursor)
+                rows = conn.execute(
+                    f"{select} WHERE created < ? OR (created = ? AND filename > ?) "
+                    "ORDER BY created DESC, filename LIMIT ?",
+                    (created, created, filename, limit + 1),
+                ).fetchall()
+            else:
+                rows = conn.execute(f"{select} ORDER BY created DESC, filename LIMIT ?", (limit + 1,)).fetchall()
+            sync_cursor = conn.execute("SELECT value FROM catalog_meta WHERE key = 'seq'").fetchone()[0]
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][2], rows[-1][0]) if has_more else None
+        return {"items": [to_info(row) for row in rows], "next_cursor": next_cursor, "sync_cursor": sync_cursor}
+
+    def _changes(
+        self,
+        table: str,
+        collection: str,
+        columns: Tuple[str, ...],
+        to_info: Callable[[tuple], Dict[str, Any]],
+        since: int,
+    ) -> Dict[str, Any]:
+        since = int(since)
+        with self._lock, self._connect() as conn:
+            meta = dict(conn.execute("SELECT key, value FROM catalog_meta"))
+            sync_cursor, pruned_seq = meta.get("seq", 0), meta.get("pruned_seq", 0)
+            if since < pruned_seq or since > sync_cursor:
+                # Deletions the client missed are gone (or the cursor is from another catalog)
+                return {"items": [], "deleted": [], "sync_cursor": sync_cursor, "reset": True}
+            rows = conn.execute(
+                f"SELECT {', '.join(columns)} FROM {table} WHERE seq > ? ORDER BY created DESC, filename", (since,)
+            ).fetchall()
+            deleted = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT filename FROM tombstones WHERE collection = ? AND seq > ? ORDER BY seq", (collection, since)
+                )
+            ]
+        return {"items": [to_info(row) for row in rows], "deleted": deleted, "sync_cursor": sync_cursor, "reset": False}
+
+    def reconcile_converted(self) -> Dict[str, int]:
+        """
+        Sync the converted_files table with converted_dir
+
+        A file's signature covers its size, mtime and its _pages directory's
+        mtime, so extracted pages are only re-listed for files that changed.
+        """
+        if not self.converted_dir:
+            return {"added": 0, "updated": 0, "removed": 0, "total": 0}
+
+        entries: Dict[str, os.DirEntry] = {}
+        page_dirs: Dict[str, int] = {}
+        if os.path.isdir(self.converted_dir):
+            with os.scandir(self.converted_dir) as scan:
+                for entry in scan:
+                    try:
+                        if entry.is_file():
+                            entries[entry.name] = entry
+                        elif entry.is_dir() and entry.name.endswith("_pages"):
+                            page_dirs[entry.name[:-len("_pages")]] = entry.stat().st_mtime_ns
+                    except OSError:
+                        continue
+
+        added = updated = 0
+        with self._lock, self._connect() as conn:
+            known = dict(conn.execute("SELECT filename, signature FROM converted_files"))
+            removed = [name for name in known if name not in entries]
+            conn.executemany("DELETE FROM converted_files WHERE filename = ?", [(name,) for name in removed])
+            self._tombstone(conn, COLLECTION_CONVERTED, removed)
+
+            for filename, entry in entries.items():
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                base_name = os.path.splitext(filename)[0]
+                signature = f"{stat.st_size}:{stat.st_mtime_ns}:{page_dirs.get(base_name, '')}"
+                if known.get(filename) == signature:
+                    continue
+                if filename in known:
+                    updated += 1
+                else:
+                    added += 1
+                pages = self._list_pages(base_name) if base_name in page_dirs else []
+                conn.execute(
+                    "INSERT OR REPLACE INTO converted_files (filename, size, created, signature, pages, seq) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (filename, stat.st_size, stat.st_ctime, signature, json.dumps(pages), self._next_seq(conn)),
+                )
+                self._clear_tombstone(conn, COLLECTION_CONVERTED, filename)
+
+        return {"added": added, "updated": updated, "removed": len(removed), "total": len(entries)}
+
+    def _list_pages(self, base_name: str) -> List[Dict[str, Any]]:
+        pages_dir = os.path.join(self.converted_dir, f"{base_name}_pages")
+        pages = []
+        for page_file in sorted(f for f in os.listdir(pages_dir) if f.endswith(".jpg")):
+            pages.append({
+                "filename": page_file,
+                "path": f"{base_name}_pages/{page_file}",
+                "size": os.path.getsize(os.path.join(pages_dir, page_file)),
+                "url": f"/converted-page/{base_name}_pages/{page_file}",
+            })
+        return pages
+
+    def list_converted(self) -> List[Dict[str, Any]]:
+        """All converted files, newest first, in the /get-converted-files entry shape"""
+        self.reconcile_converted()
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(_CONVERTED_COLUMNS)} FROM converted_files ORDER BY created DESC, filename"
+            ).fetchall()
+        return [self._to_converted_info(row) for row in rows]
+
+    def page_converted(self, limit: int, cursor: Optional[str] = None) -> Dict[str, Any]:
+        self.reconcile_converted()
+        return self._page("converted_files", _CONVERTED_COLUMNS, self._to_converted_info, limit, cursor)
+
+    def converted_changes(self, since: int) -> Dict[str, Any]:
+        self.reconcile_converted()
+        return self._changes(
+            "converted_files", COLLECTION_CONVERTED, _CONVERTED_COLUMNS, self._to_converted_info, since
+        )
+
+    def listing(
+        self,
+        collection: str = COLLECTION_DOCUMENTS,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        since: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Shared query behind /files and /get-converted-files
+
+        Args:
+            collection: COLLECTION_DOCUMENTS or COLLECTION_CONVERTED
+            limit: Page size; with cursor, pages newest first
+            cursor: next_cursor from the previous page
+            since: sync_cursor from an earlier response; returns only changes
+
+        Returns:
+            Dict with items and sync_cursor, plus next_cursor/has_more when
+            paging or deleted/reset/delta when syncing
+
+        Raises:
+            CatalogCursorError: malformed cursor or since value
+        """
+        converted = collection == COLLECTION_CONVERTED
+        if since is not None:
+            try:
+                since_seq = int(since)
+            except (TypeError, ValueError):
+                raise CatalogCursorError(f"Invalid since: {since!r}")
+            result = self.converted_changes(since_seq) if converted else self.document_changes(since_seq)
+            result["delta"] = True
+            return result
+        if limit or cursor:
+            page_size = limit or DEFAULT_PAGE_SIZE
+            result = self.page_converted(page_size, cursor) if converted else self.page_documents(page_size, cursor)
+            result["has_more"] = result["next_cursor"] is not None
+            return result
+        # Sync first, then take the cursor before listing so changes made meanwhile show up in the next delta
+        self.reconcile_converted() if converted else self.ensure_fresh()
+        sync_cursor = self.sync_cursor()
+        items = self.list_converted() if converted else self.list_documents()
+        return {"items": items, "sync_cursor": sync_cursor}
+
+    def count(self) -> int:
+        with self._lock, self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    @staticmethod
+    def _to_converted_info(row: tuple) -> Dict[str, Any]:
+        filename, size, created, pages = row
+        return {
+            "filename": filename,
+            "size": size,
+            "created": datetime.fromtimestamp(created).isoformat(),
+            "url": f"/converted/{filename}",
+            "pages": json.loads(pages),
+        }
+
+    @staticmethod
+    def _to_file_info(row: tuple) -> Dict[str, Any]:
+        filename, size, created, _modified, has_text, has_ocr, derived_title = row
+        info = {
+            "filename": filename,
+            "size": size,
+            "created": datetime.fromtimestamp(created).isoformat(),
+            "has_text": bool(has_text),
+            "has_ocr": bool(has_ocr),
+        }
+        if derived_title:
+            info["derived_title"] = derived_title
+        return info
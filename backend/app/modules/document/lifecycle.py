@@ -0,0 +1,598 @@
+"""
+Storage Lifecycle
+Background housekeeping for DATA_DIR. Uploads, processed pages, text and
+OCR results, converted PDFs with their *_pages folders, exports, test
+captures and cached thumbnails otherwise accumulate forever. Each pass:
+
+    expire      - deletes artefacts older than their retention period
+    orphans     - deletes text, OCR results and *_pages folders whose
+                  document is gone, and thumbnails whose source is gone
+                  or has changed since they were rendered
+    recompress  - re-encodes cold original uploads (JPEG quality, PNG
+                  optimisation), keeping names and mtimes
+    dedupe      - hardlinks byte-identical write-once files (uploads,
+                  converted, pdfs) to a single copy; each link keeps its
+                  own age in the state file, since it shares the
+                  original's inode (and mtime)
+    quota       - evicts the oldest files of the expendable artefact types
+                  until DATA_DIR fits the disk quota
+
+Files younger than min_age_minutes are never touched, so in-flight uploads
+and conversions are safe. The job runs on a low-priority daemon thread,
+pauses between file operations, and reports the bytes reclaimed per action.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from app.modules.document.thumbnails import THUMBNAIL_DIR, is_stale_entry
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["StorageLifecycle", "ARTEFACT_DIRS", "LIFECYCLE_STATE_FILE"]
+
+# Artefact type -> folder under DATA_DIR ("converted_pages" are the *_pages folders in converted/,
+# "thumbnails" the files in the thumbnail cache's bucket folders)
+ARTEFACT_DIRS = {
+    "uploads": "uploads",
+    "processed": "processed",
+    "processed_text": "processed_text",
+    "ocr_results": "ocr_results",
+    "converted": "converted",
+    "converted_pages": "converted",
+    "pdfs": "pdfs",
+    "test_captures": "test_captures",
+    "thumbnails": THUMBNAIL_DIR,
+}
+# Recompression, hashing and hardlink-age state (so nothing is recompressed twice or rehashed
+# unchanged, and deduplicated files keep their own age)
+LIFECYCLE_STATE_FILE = ".storage_lifecycle.json"
+PAGES_SUFFIX = "_pages"
+OCR_SUFFIXES = ("_ocr.ocrz", "_ocr.json")
+RECOMPRESS_EXTENSIONS = (".jpg", ".jpeg", ".png")
+# Recompressed files are kept only when they shrink by at least this much
+MIN_RECOMPRESS_SAVING = 0.1
+# Files smaller than this are not worth hashing for dedupe
+MIN_DEDUPE_SIZE = 64 * 1024
+HASH_CHUNK = 1024 * 1024
+
+ACTIONS = ("expired", "orphans", "recompressed", "deduplicated", "quota")
+
+
+def _lifecycle_config() -> Dict[str, Any]:
+    try:
+        from app.config.settings import STORAGE_LIFECYCLE_CONFIG
+
+        return STORAGE_LIFECYCLE_CONFIG
+    except Exception:
+        return {}
+
+
+class _Item:
+    """One artefact: a file, or a *_pages folder counted as a unit"""
+
+    __slots__ = ("artefact", "path", "size", "mtime", "is_dir", "inode")
+
+    def __init__(self, artefact: str, path: str, size: int, mtime: float, is_dir: bool = False, inode: Tuple = ()):
+        self.artefact = artefact
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.is_dir = is_dir
+        self.inode = inode
+
+
+class StorageLifecycle:
+    """Retention, recompression, dedupe and quota enforcement for DATA_DIR"""
+
+    def __init__(
+        self,
+        data_dir: str,
+        config: Optional[Dict[str, Any]] = None,
+        on_removed: Optional[Callable[[str], None]] = None,
+        emit: Optional[Callable[[str, Dict[str, Any]], Any]] = None,
+    ):
+        """
+        Args:
+            data_dir: DATA_DIR holding the artefact folders
+            config: Overrides STORAGE_LIFECYCLE_CONFIG
+            on_removed: Called with each deleted file path (catalog, thumbnails, locator)
+            emit: Socket.IO style emit(event, payload) for run reports
+        """
+        self.data_dir = os.path.abspath(data_dir)
+        self.config = dict(_lifecycle_config(), **(config or {}))
+        self.policies: Dict[str, Dict[str, Any]] = self.config.get("policies", {})
+        self.on_removed = on_removed
+        self.emit = emit
+        self.state_path = os.path.join(self.data_dir, LIFECYCLE_STATE_FILE)
+
+        self._run_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_report: Optional[Dict[str, Any]] = None
+        self.next_run_at: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # Inventory
+    # ------------------------------------------------------------------
+
+    def _dir(self, artefact: str) -> str:
+        return os.path.join(self.data_dir, ARTEFACT_DIRS[artefact])
+
+    def _inventory(self) -> Dict[str, List[_Item]]:
+        """Files (and *_pages folders) per artefact type"""
+        inventory: Dict[str, List[_Item]] = {artefact: [] for artefact in ARTEFACT_DIRS}
+        for artefact in ARTEFACT_DIRS:
+            if artefact == "converted_pages":
+                continue
+            folders = [self._dir(artefact)]
+            while folders:
+                try:
+                    with os.scandir(folders.pop()) as entries:
+                        for entry in entries:
+                            if entry.is_file():
+                                # os.stat, not entry.stat: Windows leaves st_ino 0 in scandir results
+                                stat = os.stat(entry.path)
+                                inventory[artefact].append(
+                                    _Item(artefact, entry.path, stat.st_size, stat.st_mtime, inode=(stat.st_dev, stat.st_ino))
+                                )
+                            elif artefact == "converted" and entry.is_dir() and entry.name.endswith(PAGES_SUFFIX):
+                                size, mtime = self._tree_size(entry.path)
+                                inventory["converted_pages"].append(_Item("converted_pages", entry.path, size, mtime, True))
+                            elif artefact == "thumbnails" and entry.is_dir():
+                                folders.append(entry.path)
+                except OSError:
+                    continue
+        return inventory
+
+    @staticmethod
+    def _tree_size(path: str) -> Tuple[int, float]:
+        """Total size and newest mtime of a folder"""
+        size, mtime = 0, os.stat(path).st_mtime
+        for dirpath, _, filenames in os.walk(path):
+            for name in filenames:
+                try:
+                    stat = os.stat(os.path.join(dirpath, name))
+                except OSError:
+                    continue
+                size += stat.st_size
+                mtime = max(mtime, stat.st_mtime)
+        return size, mtime
+
+    @staticmethod
+    def _usage(inventory: Dict[str, List[_Item]]) -> int:
+        """Bytes on disk, counting hardlinked files once"""
+        seen = set()
+        total = 0
+        for items in inventory.values():
+            for item in items:
+                if item.inode:
+                    if item.inode in seen:
+                        continue
+                    seen.add(item.inode)
+                total += item.size
+        return total
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        state.setdefault("recompressed", {})
+        state.setdefault("hashes", {})
+        state.setdefault("ages", {})
+        return state
+
+    def _apply_ages(self, inventory: Dict[str, List[_Item]], state: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Give deduplicated files their own mtime back
+
+        A hardlink shares the inode, and so the mtime, of the copy it was
+        linked to; retention and quota must judge it by when it was written.
+        A record only applies while the path is still that hardlink.
+        """
+        ages = state["ages"]
+        for items in inventory.values():
+            for item in items:
+                rel = self._rel(item.path)
+                record = ages.get(rel)
+                if record is None:
+                    continue
+                if item.inode and tuple(record[:2]) == item.inode:
+                    item.mtime = record[2]
+                else:
+                    del ages[rel]
+
+    def _save_state(self, state: Dict[str, Dict[str, Any]], inventory: Dict[str, List[_Item]]) -> None:
+        live = {self._rel(item.path) for items in inventory.values() for item in items}
+        for section in ("recompressed", "hashes", "ages"):
+            state[section] = {rel: value for rel, value in state[section].items() if rel in live}
+        tmp_path = f"{self.state_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            logger.warning(f"[WARN] Could not save storage lifecycle state: {e}")
+
+    def _rel(self, path: str) -> str:
+        return os.path.relpath(path, self.data_dir).replace(os.sep, "/")
+
+    @staticmethod
+    def _signature(path: str) -> str:
+        stat = os.stat(path)
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _policy(self, artefact: str, key: str) -> Any:
+        return self.policies.get(artefact, {}).get(key)
+
+    def _pause(self) -> None:
+        """Yield between file operations so foreground requests keep the disk"""
+        pause_ms = self.config.get("pause_ms", 5)
+        if pause_ms:
+            time.sleep(pause_ms / 1000.0)
+
+    def _remove(self, item: _Item, report: Dict[str, Any], action: str, dry_run: bool) -> bool:
+        if not dry_run:
+            try:
+                if item.is_dir:
+                    shutil.rmtree(item.path)
+                else:
+                    os.remove(item.path)
+            except OSError as e:
+                report["errors"].append(f"{action}: {self._rel(item.path)}: {e}")
+                return False
+            # Thumbnails are cache files, not documents anything else indexes
+            if self.on_removed and not item.is_dir and item.artefact != "thumbnails":
+                try:
+                    self.on_removed(item.path)
+                except Exception as e:
+                    logger.debug(f"[WARN] on_removed failed for {item.path}: {e}")
+            self._pause()
+        self._count(report, action, item.size)
+        return True
+
+    @staticmethod
+    def _count(report: Dict[str, Any], action: str, reclaimed: int) -> None:
+        report["actions"][action]["files"] += 1
+        report["actions"][action]["bytes"] += reclaimed
+        report["reclaimed_bytes"] += reclaimed
+
+    # ------------------------------------------------------------------
+    # Actions
+    # ------------------------------------------------------------------
+
+    def _expire(self, inventory, cutoff_young: float, now: float, report, dry_run: bool) -> None:
+        for artefact, items in inventory.items():
+            days = self._policy(artefact, "retention_days")
+            if not days:
+                continue
+            cutoff = now - days * 86400
+            for item in list(items):
+                if item.mtime < min(cutoff, cutoff_young) and self._remove(item, report, "expired", dry_run):
+                    items.remove(item)
+
+    def _orphans(self, inventory, cutoff_young: float, report, dry_run: bool) -> None:
+        def stems(*artefacts: str) -> set:
+            return {os.path.splitext(os.path.basename(item.path))[0] for a in artefacts for item in inventory[a]}
+
+        processed_stems = stems("processed")
+        converted_stems = stems("converted")
+        # /ocr and batch OCR also run on originals in uploads/ (and converted files)
+        ocr_stems = stems("processed", "uploads", "converted")
+
+        def owner(artefact: str, name: str) -> Tuple[Optional[str], set]:
+            if artefact == "processed_text" and name.endswith(".txt"):
+                return name[: -len(".txt")], processed_stems
+            if artefact == "ocr_results":
+                for suffix in OCR_SUFFIXES:
+                    if name.endswith(suffix):
+                        return name[: -len(suffix)], ocr_stems
+            if artefact == "converted_pages":
+                return name[: -len(PAGES_SUFFIX)], converted_stems
+            return None, set()
+
+        for artefact in ("processed_text", "ocr_results", "converted_pages", "thumbnails"):
+            if not self._policy(artefact, "orphans"):
+                continue
+            items = inventory[artefact]
+            for item in list(items):
+                if item.mtime >= cutoff_young:
+                    continue
+                if artefact == "thumbnails":
+                    if not is_stale_entry(item.path):
+                        continue
+                else:
+                    stem, owners = owner(artefact, os.path.basename(item.path))
+                    if stem is None or stem in owners:
+                        continue
+                if self._remove(item, report, "orphans", dry_run):
+                    items.remove(item)
+
+    def _recompress(self, inventory, now: float, state, report, dry_run: bool) -> None:
+        quality = int(self.config.get("recompress_quality", 85))
+        for artefact, items in inventory.items():
+            days = self._policy(artefact, "recompress_after_days")
+            if not days:
+                continue
+            cutoff = now - days * 86400
+            for item in items:
+                ext = os.path.splitext(item.path)[1].lower()
+                rel = self._rel(item.path)
+                if ext not in RECOMPRESS_EXTENSIONS or item.mtime >= cutoff:
+                    continue
+                try:
+                    signature = self._signature(item.path)
+                    if state["recompressed"].get(rel) == signature:
+                        continue
+                    saved = self._recompress_file(item, ext, quality, dry_run)
+                except Exception as e:
+                    report["errors"].append(f"recompressed: {rel}: {e}")
+                    continue
+                if saved is None:
+                    # Already compact; remember so it isn't decoded again next pass
+                    if not dry_run:
+                        state["recompressed"][rel] = signature
+                    continue
+                if not dry_run:
+                    state["recompressed"][rel] = self._signature(item.path)
+                    item.size -= saved
+                    self._pause()
+                self._count(report, "recompressed", saved)
+
+    @staticmethod
+    def _recompress_file(item: _Item, ext: str, quality: int, dry_run: bool) -> Optional[int]:
+        """Re-encode in place; returns bytes saved, or None when not worth it"""
+        with Image.open(item.path) as img:
+            buffer = io.BytesIO()
+            if ext == ".png":
+                img.save(buffer, format="PNG", optimize=True)
+            else:
+                exif = img.info.get("exif")
+                img = img.convert("RGB") if img.mode not in ("RGB", "L") else img
+                options = {"quality": quality, "optimize": True, "progressive": True}
+                if exif:
+                    options["exif"] = exif
+                img.save(buffer, format="JPEG", **options)
+        data = buffer.getvalue()
+        saved = item.size - len(data)
+        if saved < item.size * MIN_RECOMPRESS_SAVING:
+            return None
+        if not dry_run:
+            stat = os.stat(item.path)
+            tmp_path = f"{item.path}.recompress.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, item.path)
+            # Keep the original timestamps so retention and sort order are unchanged
+            # (item.mtime: a replaced hardlink's own age, not its inode's)
+            mtime_ns = stat.st_mtime_ns if stat.st_nlink == 1 else int(item.mtime * 1e9)
+            os.utime(item.path, ns=(stat.st_atime_ns, mtime_ns))
+        return saved
+
+    def _hash(self, path: str, state) -> str:
+        rel = self._rel(path)
+        signature = self._signature(path)
+        cached = state["hashes"].get(rel)
+        if cached and cached[0] == signature:
+            return cached[1]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+                digest.update(chunk)
+        state["hashes"][rel] = [signature, digest.hexdigest()]
+        return digest.hexdigest()
+
+    def _dedupe(self, inventory, cutoff_young: float, state, report, dry_run: bool) -> None:
+        # Only write-once artefacts: a hardlinked file rewritten in place would change every copy
+        by_size: Dict[int, List[_Item]] = {}
+        for artefact in self.config.get("dedupe_artefacts", ("uploads", "converted", "pdfs")):
+            for item in inventory.get(artefact, []):
+                if item.size >= MIN_DEDUPE_SIZE and item.mtime < cutoff_young:
+                    by_size.setdefault(item.size, []).append(item)
+
+        for size, candidates in by_size.items():
+            if len({item.inode for item in candidates}) < 2:
+                continue
+            by_hash: Dict[str, List[_Item]] = {}
+            for item in candidates:
+                try:
+                    by_hash.setdefault(self._hash(item.path, state), []).append(item)
+                except OSError as e:
+                    report["errors"].append(f"deduplicated: {self._rel(item.path)}: {e}")
+                self._pause()
+            for group in by_hash.values():
+                group.sort(key=lambda item: item.mtime)
+                keeper = group[0]
+                for item in group[1:]:
+                    if item.inode == keeper.inode:
+                        continue
+                    if not dry_run:
+                        tmp_path = f"{item.path}.dedupe.tmp"
+                        try:
+                            os.link(keeper.path, tmp_path)
+                            os.replace(tmp_path, item.path)
+                        except OSError as e:
+                            report["errors"].append(f"deduplicated: {self._rel(item.path)}: {e}")
+                            continue
+                        item.inode = keeper.inode
+                        state["hashes"].pop(self._rel(item.path), None)
+                        state["ages"][self._rel(item.path)] = [*keeper.inode, item.mtime]
+                        logger.debug(f"Deduplicated {self._rel(item.path)} -> {self._rel(keeper.path)}")
+                    self._count(report, "deduplicated", size)
+
+    def _enforce_quota(self, inventory, cutoff_young: float, report, dry_run: bool) -> None:
+        quota_mb = self.config.get("quota_mb") or 0
+        if quota_mb <= 0:
+            return
+        quota = quota_mb * 1024 * 1024
+        usage = self._usage(inventory)
+        if usage <= quota:
+            return
+        for artefact in self.config.get("quota_evict_order", ()):
+            items = sorted(inventory.get(artefact, []), key=lambda item: item.mtime)
+            for item in items:
+                if usage <= quota:
+                    return
+                if item.mtime >= cutoff_young:
+                    continue
+                shared = item.inode and any(
+                    other is not item and other.inode == item.inode
+                    for other_items in inventory.values()
+                    for other in other_items
+                )
+                if self._remove(item, report, "quota", dry_run):
+                    inventory[artefact].remove(item)
+                    # A hardlinked copy frees nothing until its last link goes
+                    if not shared:
+                        usage -= item.size
+        if usage > quota:
+            logger.warning(
+                f"[WARN] DATA_DIR still {usage / 1048576:.1f} MB over a {quota_mb} MB quota "
+                "after evicting every expendable artefact"
+            )
+
+    # ------------------------------------------------------------------
+    # Running
+    # ------------------------------------------------------------------
+
+    def run(self, dry_run: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        One lifecycle pass
+
+        Args:
+            dry_run: Report what would be reclaimed without changing anything
+
+        Returns:
+            Report with bytes and files per action, usage before and after,
+            and errors; None when another pass is already running
+        """
+        if not self._run_lock.acquire(blocking=False):
+            return None
+        try:
+            started = time.time()
+            now = started
+            cutoff_young = now - float(self.config.get("min_age_minutes", 60)) * 60
+            report: Dict[str, Any] = {
+                "started_at": datetime.fromtimestamp(started).isoformat(),
+                "dry_run": dry_run,
+                "actions": {action: {"files": 0, "bytes": 0} for action in ACTIONS},
+                "reclaimed_bytes": 0,
+                "errors": [],
+            }
+            inventory = self._inventory()
+            report["usage_before"] = self._usage(inventory)
+            state = self._load_state()
+            self._apply_ages(inventory, state)
+
+            self._expire(inventory, cutoff_young, now, report, dry_run)
+            self._orphans(inventory, cutoff_young, report, dry_run)
+            if not self._stop.is_set():
+                self._recompress(inventory, now, state, report, dry_run)
+            if self.config.get("dedupe", True) and not self._stop.is_set():
+                self._dedupe(inventory, cutoff_young, state, report, dry_run)
+            self._enforce_quota(inventory, cutoff_young, report, dry_run)
+
+            if not dry_run:
+                self._save_state(state, inventory)
+            report["usage_after"] = self._usage(inventory)
+            report["duration_s"] = round(time.time() - started, 2)
+            report["errors"] = report["errors"][:50]
+            if not dry_run:
+                self.last_report = report
+            logger.info(
+                f"[OK] Storage lifecycle{' (dry run)' if dry_run else ''}: "
+                f"reclaimed {report['reclaimed_bytes'] / 1048576:.1f} MB in {report['duration_s']}s "
+                + ", ".join(f"{a} {v['files']}" for a, v in report["actions"].items() if v["files"])
+            )
+            if self.emit and not dry_run:
+                try:
+                    self.emit("storage_lifecycle_complete", report)
+                except Exception:
+                    pass
+            return report
+        finally:
+            self._run_lock.release()
+
+    @property
+    def running(self) -> bool:
+        return self._run_lock.locked()
+
+    def start(self) -> "StorageLifecycle":
+        """Run passes every interval_hours on a low-priority background thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="storage-lifecycle", daemon=True)
+            self._thread.start()
+        return self
+
+    def trigger(self) -> bool:
+        """Start a pass now on the background thread; False when one is running"""
+        if self.running:
+            return False
+        self.start()
+        self._wake.set()
+        return True
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def _loop(self) -> None:
+        # Linux schedules threads individually, so this thread alone can be niced
+        if sys.platform.startswith("linux"):
+            try:
+                os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+            except (AttributeError, OSError):
+                pass
+        delay = float(self.config.get("initial_delay_s", 300))
+        interval = float(self.config.get("interval_hours", 6)) * 3600
+        while not self._stop.is_set():
+            self.next_run_at = time.time() + delay
+            self._wake.wait(delay)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.run()
+            except Exception as e:
+                logger.error(f"[ERROR] Storage lifecycle pass failed: {e}")
+            delay = interval
+
+    def usage(self) -> Dict[str, Any]:
+        """Current bytes on disk, in total and per artefact type"""
+        inventory = self._inventory()
+        return {
+            "total_bytes": self._usage(inventory),
+            "by_artefact": {artefact: sum(item.size for item in items) for artefact, items in inventory.items()},
+        }
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": bool(self.config.get("enabled", True)),
+            "running": self.running,
+            "next_run_at": datetime.fromtimestamp(self.next_run_at).isoformat() if self.next_run_at else None,
+            "quota_mb": self.config.get("quota_mb") or 0,
+            "policies": self.policies,
+            "last_report": self.last_report,
+        }
@@ -0,0 +1,327 @@
+"""
+File Locator
+In-memory map from document name to path across the data folders
+(processed, converted, uploads, pdfs, ocr_results). Routes used to find a
+document by trying os.path.exists in each folder per request; with the map,
+resolving a known name is a dict lookup plus one stat confirming the file is
+still there (a stale entry is dropped and the folders are searched on disk).
+
+The map is built with one scandir per folder and kept current by a
+filesystem watcher (watchdog when installed, otherwise a poller that
+rescans a folder only when its directory mtime changes). Behind watchdog the
+map is also rebuilt every rescan_interval seconds, which repairs dropped
+events and starts watching folders created after start(). In-process writers
+can also call add/discard/move so the map never lags behind their own
+changes. A name missing from the map is looked up on disk once, so a file
+created between watcher events is still found.
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    HAS_WATCHDOG = True
+except ImportError:
+    FileSystemEventHandler = object
+    HAS_WATCHDOG = False
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "FileLocator",
+    "get_file_locator",
+    "LOCATOR_FOLDERS",
+    "DOCUMENT_FOLDERS",
+    "PRINT_FOLDERS",
+    "HAS_WATCHDOG",
+]
+
+# Folders under DATA_DIR that hold documents, in lookup priority order
+LOCATOR_FOLDERS = ("processed", "converted", "uploads", "pdfs", "ocr_results")
+# Where viewer routes (/thumbnail, /document/info, /document/page) look
+DOCUMENT_FOLDERS = ("processed", "converted", "uploads")
+# Where print routes look
+PRINT_FOLDERS = ("processed", "converted", "uploads", "pdfs", "ocr_results")
+
+
+def _locator_config() -> Dict[str, Any]:
+    try:
+        from app.config.settings import FILE_LOCATOR_CONFIG
+
+        return FILE_LOCATOR_CONFIG
+    except Exception:
+        return {}
+
+
+class _WatchHandler(FileSystemEventHandler):
+    """Forwards watchdog events for one folder to the locator"""
+
+    def __init__(self, locator: "FileLocator", folder: str):
+        super().__init__()
+        self.locator = locator
+        self.folder = folder
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.locator._set(self.folder, event.src_path)
+
+    def on_deleted(self, event):
+        if not event.is_directory:
+            self.locator._unset(self.folder, event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.locator._unset(self.folder, event.src_path)
+            self.locator.add(event.dest_path)
+
+
+class FileLocator:
+    """Resolves document names to paths from an in-memory, watched map"""
+
+    def __init__(
+        self,
+        data_dir: str,
+        folders: Sequence[str] = LOCATOR_FOLDERS,
+        watch: Optional[bool] = None,
+        poll_interval: Optional[float] = None,
+        rescan_interval: Optional[float] = None,
+    ):
+        """
+        Args:
+            data_dir: DATA_DIR containing the document folders
+            folders: Folder names to index, in priority order
+            watch: Keep the map current with a watcher (default: FILE_LOCATOR_CONFIG["watch"])
+            poll_interval: Seconds between directory checks without watchdog
+            rescan_interval: Seconds between full rescans with watchdog (0 = never)
+        """
+        config = _locator_config()
+        self.data_dir = os.path.abspath(data_dir)
+        self.folders = tuple(folders)
+        self.roots = {folder: os.path.join(self.data_dir, folder) for folder in self.folders}
+        self.watch = config.get("watch", True) if watch is None else watch
+        self.poll_interval = float(poll_interval or config.get("poll_interval", 2.0))
+        self.rescan_interval = float(
+            rescan_interval if rescan_interval is not None else config.get("rescan_interval", 300.0)
+        )
+
+        self._lock = threading.Lock()
+        # normcase(name) -> {folder: path}
+        self._names: Dict[str, Dict[str, str]] = {}
+        self._dir_versions: Dict[str, int] = {}
+        self._observer = None
+        self._watched: set = set()
+        self._poller: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+
+    def _folder_of(self, path: str) -> Optional[str]:
+        parent = os.path.normcase(os.path.dirname(os.path.abspath(path)))
+        for folder, root in self.roots.items():
+            if parent == os.path.normcase(root):
+                return folder
+        return None
+
+    def _set(self, folder: str, path: str) -> None:
+        key = os.path.normcase(os.path.basename(path))
+        with self._lock:
+            self._names.setdefault(key, {})[folder] = os.path.abspath(path)
+
+    def _unset(self, folder: str, path: str) -> None:
+        key = os.path.normcase(os.path.basename(path))
+        with self._lock:
+            entry = self._names.get(key)
+            if entry is not None:
+                entry.pop(folder, None)
+                if not entry:
+                    del self._names[key]
+
+    def _scan(self, folder: str) -> None:
+        """Replace one folder's entries with a fresh scandir listing"""
+        root = self.roots[folder]
+        try:
+            version = os.stat(root).st_mtime_ns
+            with os.scandir(root) as entries:
+                paths = {os.path.normcase(e.name): e.path for e in entries if e.is_file()}
+        except OSError:
+            version, paths = 0, {}
+        with self._lock:
+            for key in list(self._names):
+                entry = self._names[key]
+                if folder in entry and key not in paths:
+                    del entry[folder]
+                    if not entry:
+                        del self._names[key]
+            for key, path in paths.items():
+                self._names.setdefault(key, {})[folder] = os.path.abspath(path)
+            self._dir_versions[folder] = version
+
+    def rescan(self, folders: Optional[Iterable[str]] = None) -> None:
+        """Rebuild the map for the given folders (default: all)"""
+        for folder in folders or self.folders:
+            self._scan(folder)
+
+    def add(self, path: str) -> None:
+        """Record a file written by this process (ignored outside the indexed folders)"""
+        folder = self._folder_of(path)
+        if folder:
+            self._set(folder, path)
+
+    def discard(self, path: str) -> None:
+        """Forget a file deleted by this process"""
+        folder = self._folder_of(path)
+        if folder:
+            self._unset(folder, path)
+
+    def move(self, old_path: str, new_path: str) -> None:
+        """Record a rename done by this process"""
+        self.discard(old_path)
+        self.add(new_path)
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def resolve(self, name: str, folders: Sequence[str] = DOCUMENT_FOLDERS) -> Optional[str]:
+        """
+        Path of a document by name, from the first folder in `folders` holding it
+
+        Args:
+            name: Bare file name (no directories)
+            folders: Folder names to consider, in priority order
+
+        Returns:
+            Absolute path, or None when no such file exists
+        """
+        if not name or os.path.basename(name) != name or name in (".", ".."):
+            return None
+        entry = self._names.get(os.path.normcase(name))
+        if entry:
+            for folder in folders:
+                path = entry.get(folder)
+                if path:
+                    if os.path.isfile(path):
+                        self.hits += 1
+                        return path
+                    # Deleted behind the watcher's back (dropped event, unwatched folder)
+                    self._unset(folder, path)
+                    self.stale += 1
+
+        # Not in the map: the file may be newer than the last watcher event
+        self.misses += 1
+        for folder in folders:
+            root = self.roots.get(folder)
+            if root:
+                path = os.path.join(root, name)
+                if os.path.isfile(path):
+                    self._set(folder, path)
+                    return os.path.abspath(path)
+        return None
+
+    def names(self, folder: str) -> List[str]:
+        """Indexed file paths in one folder"""
+        with self._lock:
+            return [entry[folder] for entry in self._names.values() if folder in entry]
+
+    # ------------------------------------------------------------------
+    # Watching
+    # ------------------------------------------------------------------
+
+    def start(self) -> "FileLocator":
+        """Build the map and start keeping it current"""
+        self.rescan()
+        if not self.watch or self._observer or self._poller:
+            return self
+        if HAS_WATCHDOG:
+            try:
+                self._observer = Observer()
+                self._watch_new_folders()
+                self._observer.daemon = True
+                self._observer.start()
+                # Anything created between the scan and the watch starting
+                self.rescan()
+                if self.rescan_interval > 0:
+                    self._poller = threading.Thread(target=self._refresh, name="file-locator", daemon=True)
+                    self._poller.start()
+                logger.info(f"[OK] File locator watching {len(self._watched)} folders ({len(self._names)} files)")
+                return self
+            except Exception as e:
+                logger.warning(f"[WARN] Filesystem watcher unavailable ({e}), polling instead")
+                self._observer = None
+                self._watched.clear()
+        self._poller = threading.Thread(target=self._poll, name="file-locator", daemon=True)
+        self._poller.start()
+        logger.info(f"[OK] File locator polling {len(self.roots)} folders ({len(self._names)} files)")
+        return self
+
+    def _watch_new_folders(self) -> None:
+        """Schedule watches for indexed folders that exist now but aren't watched yet"""
+        for folder, root in self.roots.items():
+            if folder not in self._watched and os.path.isdir(root):
+                self._observer.schedule(_WatchHandler(self, folder), root, recursive=False)
+                self._watched.add(folder)
+
+    def _refresh(self) -> None:
+        """Periodic full rescan behind watchdog, in case events were dropped"""
+        while not self._stop.wait(self.rescan_interval):
+            if self._observer is None:
+                break
+            try:
+                self._watch_new_folders()
+            except Exception as e:
+                logger.warning(f"[WARN] File locator could not watch new folders: {e}")
+            self.rescan()
+
+    def _poll(self) -> None:
+        """Rescan a folder whenever its directory mtime changes (create, delete, rename)"""
+        while not self._stop.wait(self.poll_interval):
+            for folder, root in self.roots.items():
+                try:
+                    version = os.stat(root).st_mtime_ns
+                except OSError:
+                    version = 0
+                if version != self._dir_versions.get(folder):
+                    self._scan(folder)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._observer:
+            self._observer.stop()
+            self._observer = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            files = sum(len(entry) for entry in self._names.values())
+        return {
+            "files": files,
+            "names": len(self._names),
+            "watcher": "watchdog" if self._observer else ("polling" if self._poller else "none"),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+        }
+
+
+_locators: Dict[str, FileLocator] = {}
+_locators_lock = threading.Lock()
+
+
+def get_file_locator(data_dir: str) -> FileLocator:
+    """Shared, started locator for a DATA_DIR (one per directory)"""
+    key = os.path.normcase(os.path.abspath(data_dir))
+    with _locators_lock:
+        locator = _locators.get(key)
+        if locator is None:
+            locator = FileLocator(data_dir).start()
+            _locators[key] = locator
+        return locator
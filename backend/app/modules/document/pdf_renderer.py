@@ -0,0 +1,322 @@
+"""
+PDF Page Renderer
+In-process PDF rasterisation for page previews. Recently used documents stay
+open in PyMuPDF (no pdftoppm subprocess, no reparsing per page), rendered
+pages live in a byte-bounded LRU keyed by (file version, page, dpi, size),
+and the pages after the one requested are rendered ahead so paging through a
+long PDF is served from memory.
+
+Without PyMuPDF, pages are rendered through pdf2image and still cached.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from PIL import Image
+
+try:
+    import fitz  # PyMuPDF
+
+    HAS_PYMUPDF = True
+except ImportError:
+    HAS_PYMUPDF = False
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["PDFPageRenderer", "get_pdf_renderer", "HAS_PYMUPDF"]
+
+# PDF user space is 72 points per inch
+POINTS_PER_INCH = 72.0
+
+
+def _render_config() -> Dict[str, Any]:
+    try:
+        from app.config.settings import PDF_RENDER_CONFIG
+
+        return PDF_RENDER_CONFIG
+    except Exception:
+        return {}
+
+
+class _OpenDocument:
+    """A PyMuPDF document with its own lock (PyMuPDF objects are not thread-safe)"""
+
+    __slots__ = ("doc", "version", "lock", "closed")
+
+    def __init__(self, doc: Any, version: Tuple[int, int]):
+        self.doc = doc
+        self.version = version
+        self.lock = threading.Lock()
+        self.closed = False
+
+    def close(self) -> None:
+        # Waits for a render in progress on this document
+        with self.lock:
+            self.closed = True
+            self.doc.close()
+
+
+class PDFPageRenderer:
+    """Renders PDF pages to JPEG with open-document and rendered-page caches"""
+
+    def __init__(
+        self,
+        dpi: Optional[int] = None,
+        max_size: Optional[Tuple[int, int]] = None,
+        quality: Optional[int] = None,
+        max_open_documents: Optional[int] = None,
+        cache_mb: Optional[int] = None,
+        prefetch_pages: Optional[int] = None,
+        poppler_path: Optional[str] = None,
+    ):
+        """
+        Args:
+            dpi: Default rasterisation DPI (default: PDF_RENDER_CONFIG["dpi"])
+            max_size: Default max (width, height) of a rendered page
+            quality: JPEG quality
+            max_open_documents: PyMuPDF documents kept open
+            cache_mb: Memory budget for rendered pages
+            prefetch_pages: Pages rendered ahead after each request (0 = off)
+            poppler_path: Poppler binaries for the pdf2image fallback
+        """
+        config = _render_config()
+        self.dpi = int(dpi or config.get("dpi", 150))
+        self.max_size = tuple(max_size or config.get("max_size", (800, 1132)))
+        self.quality = int(quality or config.get("jpeg_quality", 90))
+        self.max_open_documents = max(1, int(max_open_documents or config.get("max_open_documents", 8)))
+        self.cache_bytes = max(1, int(cache_mb or config.get("cache_mb", 64))) * 1024 * 1024
+        self.prefetch_pages = int(prefetch_pages if prefetch_pages is not None else config.get("prefetch_pages", 2))
+        self.poppler_path = poppler_path
+
+        # Guards the open-document table only; each document has its own lock,
+        # so renders of different PDFs (e.g. prefetch vs a foreground page) run in parallel
+        self._doc_lock = threading.Lock()
+        self._documents: "OrderedDict[str, _OpenDocument]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._pages: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self._cached_bytes = 0
+        self._inflight: Set[Tuple] = set()
+        self._page_counts: Dict[Tuple[str, Tuple[int, int]], int] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _version(path: str) -> Tuple[int, int]:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def etag(
+        self, path: str, page_num: int, dpi: Optional[int] = None, max_size: Optional[Tuple[int, int]] = None
+    ) -> str:
+        """Strong ETag for a rendered page; changes with the file's mtime or size"""
+        mtime_ns, size = self._version(path)
+        path_key = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+        width, height = max_size or self.max_size
+        return f"{path_key}_{mtime_ns:x}_{size:x}_p{page_num}_{dpi or self.dpi}_{width}x{height}"
+
+    def _document(self, path: str) -> _OpenDocument:
+        """Open (or reuse) a PyMuPDF document; reopened when the file changes"""
+        key = os.path.abspath(path)
+        version = self._version(path)
+        stale: List[_OpenDocument] = []
+        with self._doc_lock:
+            entry = self._documents.get(key)
+            if entry is None or entry.version != version:
+                if entry is not None:
+                    stale.append(entry)
+                entry = _OpenDocument(fitz.open(path), version)
+                self._documents[key] = entry
+            self._documents.move_to_end(key)
+            while len(self._documents) > self.max_open_documents:
+                stale.append(self._documents.popitem(last=False)[1])
+        # Closed outside the table lock: closing waits for renders on those documents
+        for old in stale:
+            old.close()
+        return entry
+
+    def _with_document(self, path: str, fn: Callable[[Any], Any]) -> Any:
+        """Run fn(doc) holding only that document's lock"""
+        while True:
+            entry = self._document(path)
+            with entry.lock:
+                # Evicted between lookup and lock: open it again
+                if not entry.closed:
+                    return fn(entry.doc)
+
+    def page_count(self, path: str) -> int:
+        """Number of pages, remembered per file version"""
+        key = (os.path.abspath(path), self._version(path))
+        count = self._page_counts.get(key)
+        if count is None:
+            if HAS_PYMUPDF:
+                count = self._with_document(path, lambda doc: doc.page_count)
+            else:
+                from PyPDF2 import PdfReader
+
+                with open(path, "rb") as pdf_file:
+                    count = len(PdfReader(pdf_file).pages)
+            if len(self._page_counts) > 1024:
+                self._page_counts.clear()
+            self._page_counts[key] = count
+        return count
+
+    def page_image(
+        self, path: str, page_num: int, dpi: Optional[int] = None, max_size: Optional[Tuple[int, int]] = None
+    ) -> Optional[Image.Image]:
+        """
+        Rasterise one page (1-based) to an RGB PIL image, uncached
+
+        With PyMuPDF the page is rendered directly at the scale that fits
+        max_size instead of at full DPI and then shrunk.
+        """
+        dpi = dpi or self.dpi
+        width, height = max_size or self.max_size
+        if HAS_PYMUPDF:
+
+            def render(doc):
+                if not 1 <= page_num <= doc.page_count:
+                    return None
+                page = doc.load_page(page_num - 1)
+                zoom = min(dpi / POINTS_PER_INCH, width / page.rect.width, height / page.rect.height)
+                pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+                return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+
+            return self._with_document(path, render)
+
+        from pdf2image import convert_from_path
+
+        images = convert_from_path(
+            path, first_page=page_num, last_page=page_num, dpi=dpi, poppler_path=self.poppler_path
+        )
+        if not images:
+            return None
+        img = images[0].convert("RGB")
+        img.thumbnail((width, height), Image.Resampling.LANCZOS)
+        return img
+
+    def render_page(
+        self,
+        path: str,
+        page_num: int,
+        dpi: Optional[int] = None,
+        max_size: Optional[Tuple[int, int]] = None,
+        prefetch: bool = True,
+    ) -> Optional[bytes]:
+        """
+        JPEG bytes of one page (1-based), from the LRU when possible
+
+        Args:
+            path: PDF file
+            page_num: Page number, starting at 1
+            dpi: Rasterisation DPI (default: renderer dpi)
+            max_size: Max (width, height) (default: renderer max_size)
+            prefetch: Render the following pages in the background
+
+        Returns:
+            JPEG bytes, or None when the page doesn't exist
+        """
+        dpi = dpi or self.dpi
+        max_size = tuple(max_size or self.max_size)
+        key = (os.path.abspath(path), self._version(path), page_num, dpi, max_size)
+        with self._cache_lock:
+            data = self._pages.get(key)
+            if data is not None:
+                self._pages.move_to_end(key)
+                self.hits += 1
+        if data is None:
+            with self._cache_lock:
+                self.misses += 1
+            data = self._render_and_cache(key, path, page_num, dpi, max_size)
+        if data is not None and prefetch and self.prefetch_pages > 0:
+            self._prefetch(path, page_num, dpi, max_size)
+        return data
+
+    def _render_and_cache(
+        self, key: Tuple, path: str, page_num: int, dpi: int, max_size: Tuple[int, int]
+    ) -> Optional[bytes]:
+        img = self.page_image(path, page_num, dpi, max_size)
+        if img is None:
+            return None
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=self.quality)
+        data = buffer.getvalue()
+        with self._cache_lock:
+            if key not in self._pages:
+                self._pages[key] = data
+                self._cached_bytes += len(data)
+            while self._cached_bytes > self.cache_bytes and len(self._pages) > 1:
+                _, evicted = self._pages.popitem(last=False)
+                self._cached_bytes -= len(evicted)
+        return data
+
+    def _prefetch(self, path: str, page_num: int, dpi: int, max_size: Tuple[int, int]) -> None:
+        """Queue the next pages (and the previous one) that aren't cached yet"""
+        try:
+            version = self._version(path)
+            page_count = self.page_count(path)
+        except Exception:
+            return
+        abs_path = os.path.abspath(path)
+        neighbours = [page_num + offset for offset in range(1, self.prefetch_pages + 1)] + [page_num - 1]
+        with self._cache_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-prefetch")
+            for neighbour in neighbours:
+                key = (abs_path, version, neighbour, dpi, max_size)
+                if not 1 <= neighbour <= page_count or key in self._pages or key in self._inflight:
+                    continue
+                self._inflight.add(key)
+                self._executor.submit(self._prefetch_page, key, path, neighbour, dpi, max_size)
+
+    def _prefetch_page(self, key: Tuple, path: str, page_num: int, dpi: int, max_size: Tuple[int, int]) -> None:
+        try:
+            self._render_and_cache(key, path, page_num, dpi, max_size)
+        except Exception as e:
+            logger.debug(f"[WARN] Prefetch of page {page_num} of {os.path.basename(path)} failed: {e}")
+        finally:
+            with self._cache_lock:
+                self._inflight.discard(key)
+
+    def evict(self, path: str) -> None:
+        """Close a document and drop its rendered pages (e.g. after deletion)"""
+        abs_path = os.path.abspath(path)
+        with self._doc_lock:
+            entry = self._documents.pop(abs_path, None)
+        if entry:
+            entry.close()
+        with self._cache_lock:
+            for key in [key for key in self._pages if key[0] == abs_path]:
+                self._cached_bytes -= len(self._pages.pop(key))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cache_lock:
+            return {
+                "engine": "pymupdf" if HAS_PYMUPDF else "pdf2image",
+                "open_documents": len(self._documents),
+                "cached_pages": len(self._pages),
+                "cached_bytes": self._cached_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_renderer: Optional[PDFPageRenderer] = None
+_renderer_lock = threading.Lock()
+
+
+def get_pdf_renderer(poppler_path: Optional[str] = None) -> PDFPageRenderer:
+    """Process-wide renderer shared by app.py, the blueprints and the thumbnail store"""
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = PDFPageRenderer(poppler_path=poppler_path)
+        elif poppler_path and not _renderer.poppler_path:
+            _renderer.poppler_path = poppler_path
+        return _renderer
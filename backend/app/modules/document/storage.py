@@ -8,7 +8,7 @@ import logging
 import os
 import re
 from datetime import datetime
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, BinaryIO, Dict, Optional, Tuple
 
 from PIL import Image
 
@@ -25,6 +25,143 @@ except ImportError:
 
 BOTO3_AVAILABLE = _boto3_available
 
+# Chunk size used when copying an upload stream to disk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Allowance for multipart boundaries and the small form fields sent with a file
+MULTIPART_OVERHEAD = 64 * 1024
+# Leading bytes of image formats OpenCV can read; which ones /upload accepts
+# follows API_CONFIG["allowed_extensions"]
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"BM", "bmp"),
+    (b"II*\x00", "tiff"),
+    (b"MM\x00*", "tiff"),
+)
+IMAGE_TYPE_EXTENSIONS = {
+    "jpeg": (".jpg", ".jpeg"),
+    "png": (".png",),
+    "webp": (".webp",),
+    "bmp": (".bmp",),
+    "tiff": (".tif", ".tiff"),
+}
+
+
+class UploadRejected(ValueError):
+    """An upload refused while it was being saved"""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def _api_config() -> Dict[str, Any]:
+    try:
+        from app.config.settings import API_CONFIG
+
+        return API_CONFIG
+    except Exception:
+        return {}
+
+
+def _upload_limit() -> int:
+    """Per-file upload limit in bytes (UPLOAD_CONFIG["max_bytes"], 0 = none)"""
+    try:
+        from app.config.settings import UPLOAD_CONFIG
+
+        return int(UPLOAD_CONFIG.get("max_bytes", 0) or 0)
+    except Exception:
+        return 0
+
+
+def accepted_image_types() -> Tuple[str, ...]:
+    """Image formats whose extensions are in API_CONFIG["allowed_extensions"]"""
+    allowed = {ext.lower() for ext in _api_config().get("allowed_extensions", ())}
+    if not allowed:
+        return tuple(IMAGE_TYPE_EXTENSIONS)
+    return tuple(t for t, extensions in IMAGE_TYPE_EXTENSIONS.items() if allowed.intersection(extensions))
+
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    """Image format from the first bytes of a file, or None if unrecognised"""
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    for signature, image_type in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return image_type
+    return None
+
+
+def check_upload_length(content_length: Optional[int], max_bytes: Optional[int] = None) -> None:
+    """
+    Refuse a request whose body is already over the upload limit, before
+    the multipart body is parsed
+
+    Raises:
+        UploadRejected: 413 when Content-Length exceeds the limit
+    """
+    if max_bytes is None:
+        max_bytes = _upload_limit()
+    if max_bytes and content_length and content_length > max_bytes + MULTIPART_OVERHEAD:
+        raise UploadRejected(f"File too large (limit {max_bytes // (1024 * 1024)} MB)", 413)
+
+
+def ingest_upload(
+    stream: BinaryIO,
+    dest_path: str,
+    max_bytes: Optional[int] = None,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """
+    Stream an upload to disk in chunks, validating and hashing it on the way
+
+    The first chunk must start with the header of an accepted image type
+    and the file may not exceed max_bytes; either failure stops the copy, removes the partial
+    file and raises UploadRejected. Memory use is one chunk whatever the
+    upload size.
+
+    Args:
+        stream: Readable binary stream (e.g. FileStorage.stream)
+        dest_path: Destination file
+        max_bytes: Size limit (default: UPLOAD_CONFIG["max_bytes"], 0 = none)
+        chunk_size: Bytes read per iteration
+
+    Returns:
+        Dict with content_hash (SHA-256 hex), size and image_type
+    """
+    if max_bytes is None:
+        max_bytes = _upload_limit()
+    accepted = accepted_image_types()
+
+    digest = hashlib.sha256()
+    size = 0
+    image_type = None
+    try:
+        with open(dest_path, "wb") as out:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                if image_type is None:
+                    image_type = sniff_image_type(chunk[:16])
+                    if image_type not in accepted:
+                        names = " or ".join(t.upper() for t in accepted)
+                        raise UploadRejected(f"Unsupported file type: expected a {names} image", 415)
+                size += len(chunk)
+                if max_bytes and size > max_bytes:
+                    raise UploadRejected(f"File too large (limit {max_bytes // (1024 * 1024)} MB)", 413)
+                digest.update(chunk)
+                out.write(chunk)
+        if size == 0:
+            raise UploadRejected("Empty file", 400)
+    except Exception:
+        try:
+            os.remove(dest_path)
+        except OSError:
+            pass
+        raise
+    return {"content_hash": digest.hexdigest(), "size": size, "image_type": image_type}
+
 
 class StorageModule:
     """
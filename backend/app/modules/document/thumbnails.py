@@ -0,0 +1,488 @@
+"""
+Thumbnail Store
+On-disk cache of JPEG thumbnails so the dashboard grid costs a static file read
+instead of a decode, resize and encode per request.
+
+Entries are keyed by the source's absolute path, mtime and size plus the
+thumbnail size and quality, so editing or replacing a file produces a new
+entry (and ETag) while renames can carry existing entries along. Each
+source also gets a <path-hash>.src record holding its path, so the storage
+lifecycle job can tell which entries are stale. Thumbnails are rendered
+eagerly when processing or conversion completes and lazily on a cache miss.
+
+Processed pages also get a small pyramid of named renditions (thumb, preview;
+"full" is the page itself), built from one decode, or straight from the
+in-memory image when the page is written, so clients can fetch the size they
+display.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "ThumbnailStore",
+    "get_thumbnail_store",
+    "render_thumbnail",
+    "is_stale_entry",
+    "THUMBNAIL_DIR",
+    "THUMBNAIL_EXTENSIONS",
+    "RENDITION_FULL",
+]
+
+THUMBNAIL_DIR = "thumbnails"
+RENDITION_FULL = "full"
+DEFAULT_RENDITIONS = {"thumb": (200, 250), "preview": (800, 1132)}
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tiff", ".webp")
+THUMBNAIL_EXTENSIONS = IMAGE_EXTENSIONS + (".pdf",)
+# Per-source record (<path-hash>.src) holding the source's absolute path
+SOURCE_SUFFIX = ".src"
+_LOCK_STRIPES = 16
+
+
+def _thumbnail_config() -> Dict:
+    try:
+        from app.config.settings import THUMBNAIL_CONFIG
+
+        return THUMBNAIL_CONFIG
+    except Exception:
+        return {}
+
+
+def _to_rgb(img: Image.Image) -> Image.Image:
+    # Flatten transparency onto white so JPEG output doesn't go black
+    if img.mode in ("RGBA", "LA", "P"):
+        img = img.convert("RGBA")
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.split()[-1])
+        return background
+    if img.mode != "RGB":
+        return img.convert("RGB")
+    return img
+
+
+def render_thumbnail(
+    source_path: str,
+    size: Tuple[int, int],
+    quality: int = 85,
+    pdf_dpi: int = 100,
+    poppler_path: Optional[str] = None,
+) -> Optional[bytes]:
+    """
+    Render a JPEG thumbnail of an image or of a PDF's first page
+
+    Args:
+        source_path: Image or PDF file
+        size: Max (width, height); aspect ratio is kept
+        quality: JPEG quality
+        pdf_dpi: Rasterisation DPI for PDFs
+        poppler_path: Poppler binaries for pdf2image (None = PATH)
+
+    Returns:
+        JPEG bytes, or None for unsupported types and render failures
+    """
+    img = _open_source(source_path, size, pdf_dpi, poppler_path)
+    if img is None:
+        return None
+    try:
+        with img:
+            return _encode(_to_rgb(img), size, quality)
+    except Exception as e:
+        logger.warning(f"[WARN] Thumbnail render failed for {os.path.basename(source_path)}: {e}")
+    return None
+
+
+def _open_source(
+    source_path: str, size: Tuple[int, int], pdf_dpi: int, poppler_path: Optional[str]
+) -> Optional[Image.Image]:
+    """Decode an image (at reduced scale when possible) or a PDF's first page"""
+    ext = os.path.splitext(source_path)[1].lower()
+    try:
+        if ext == ".pdf":
+            from .pdf_renderer import get_pdf_renderer
+
+            # Rendered straight at twice the target size; _encode does the final LANCZOS pass
+            return get_pdf_renderer(poppler_path).page_image(
+                source_path, 1, dpi=pdf_dpi, max_size=(size[0] * 2, size[1] * 2)
+            )
+        if ext in IMAGE_EXTENSIONS:
+            img = Image.open(source_path)
+            # JPEG can decode straight at a reduced scale (1/2 ... 1/8), skipping most of the IDCT work
+            img.draft("RGB", (size[0] * 2, size[1] * 2))
+            return img
+    except ImportError:
+        logger.warning(f"[WARN] No PDF renderer available, no thumbnail for {os.path.basename(source_path)}")
+    except Exception as e:
+        logger.warning(f"[WARN] Could not open {os.path.basename(source_path)} for thumbnails: {e}")
+    return None
+
+
+def _encode(img: Image.Image, size: Tuple[int, int], quality: int) -> bytes:
+    """Downscale an RGB image in place to fit size and encode it as JPEG"""
+    img.thumbnail(size, Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def _from_array(image: np.ndarray) -> Image.Image:
+    """PIL image from an OpenCV array (grayscale, BGR or BGRA)"""
+    if image.ndim == 2:
+        return Image.fromarray(image)
+    if image.shape[2] == 4:
+        return _to_rgb(Image.fromarray(np.ascontiguousarray(image[:, :, [2, 1, 0, 3]]), "RGBA"))
+    return Image.fromarray(np.ascontiguousarray(image[:, :, ::-1]))
+
+
+class ThumbnailStore:
+    """Thumbnails cached under cache_dir/<xx>/<path-hash>_<mtime>_<size>_<variant>.jpg"""
+
+    def __init__(
+        self,
+        cache_dir: str,
+        size: Optional[Tuple[int, int]] = None,
+        quality: Optional[int] = None,
+        pdf_dpi: Optional[int] = None,
+        poppler_path: Optional[str] = None,
+        workers: Optional[int] = None,
+    ):
+        """
+        Args:
+            cache_dir: Directory for cached thumbnails
+            size: Default max (width, height) (default: THUMBNAIL_CONFIG["size"])
+            quality: JPEG quality (default: THUMBNAIL_CONFIG["jpeg_quality"])
+            pdf_dpi: PDF rasterisation DPI (default: THUMBNAIL_CONFIG["pdf_dpi"])
+            poppler_path: Poppler binaries for pdf2image
+            workers: Pre-generation threads (default: THUMBNAIL_CONFIG["workers"])
+        """
+        config = _thumbnail_config()
+        self.cache_dir = cache_dir
+        self.size = tuple(size or config.get("size", (200, 250)))
+        # Largest first, so each rendition is downscaled from the previous one
+        self.renditions: Dict[str, Tuple[int, int]] = dict(
+            sorted(
+                ((name, tuple(dims)) for name, dims in config.get("renditions", DEFAULT_RENDITIONS).items()),
+                key=lambda item: item[1][0] * item[1][1],
+                reverse=True,
+            )
+        )
+        self.quality = int(quality or config.get("jpeg_quality", 85))
+        self.pdf_dpi = int(pdf_dpi or config.get("pdf_dpi", 100))
+        self.poppler_path = poppler_path
+        self.pregenerate_enabled = bool(config.get("pregenerate", True))
+        self.workers = max(1, int(workers or config.get("workers", 2)))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # Striped by source path so two requests don't render the same thumbnail twice
+        self._locks = [threading.Lock() for _ in range(_LOCK_STRIPES)]
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def supports(source_path: str) -> bool:
+        return os.path.splitext(source_path)[1].lower() in THUMBNAIL_EXTENSIONS
+
+    @staticmethod
+    def _path_key(source_path: str) -> str:
+        return hashlib.sha1(os.path.abspath(source_path).encode("utf-8")).hexdigest()[:20]
+
+    def _variant(self, size: Tuple[int, int]) -> str:
+        return f"{size[0]}x{size[1]}q{self.quality}"
+
+    def _entry(self, source_path: str, size: Tuple[int, int]) -> Optional[Tuple[str, str]]:
+        """(cache path, etag) for the current version of source_path, or None if it's gone"""
+        try:
+            stat = os.stat(source_path)
+        except OSError:
+            return None
+        path_key = self._path_key(source_path)
+        etag = f"{path_key}_{stat.st_mtime_ns:x}_{stat.st_size:x}_{self._variant(size)}"
+        return os.path.join(self.cache_dir, path_key[:2], f"{etag}.jpg"), etag
+
+    def _versions(self, source_path: str):
+        """Cached files (any version or size) belonging to source_path"""
+        path_key = self._path_key(source_path)
+        bucket = os.path.join(self.cache_dir, path_key[:2])
+        if not os.path.isdir(bucket):
+            return []
+        return [os.path.join(bucket, name) for name in os.listdir(bucket) if name.startswith(f"{path_key}_")]
+
+    def _source_record(self, source_path: str) -> str:
+        path_key = self._path_key(source_path)
+        return os.path.join(self.cache_dir, path_key[:2], f"{path_key}{SOURCE_SUFFIX}")
+
+    def _record_source(self, source_path: str) -> None:
+        record = self._source_record(source_path)
+        if os.path.exists(record):
+            return
+        os.makedirs(os.path.dirname(record), exist_ok=True)
+        tmp_path = f"{record}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(os.path.abspath(source_path))
+        os.replace(tmp_path, record)
+
+    def lookup(self, source_path: str, size: Optional[Tuple[int, int]] = None) -> Optional[Tuple[str, str]]:
+        """(cache path, etag) if a current thumbnail is cached, without rendering"""
+        entry = self._entry(source_path, tuple(size or self.size))
+        if entry and os.path.exists(entry[0]):
+            return entry
+        return None
+
+    def get(self, source_path: str, size: Optional[Tuple[int, int]] = None) -> Optional[Tuple[str, str]]:
+        """
+        Cached thumbnail for source_path, rendering it on a miss
+
+        Args:
+            source_path: Image or PDF file
+            size: Max (width, height) (default: the store's size)
+
+        Returns:
+            (cache path, etag), or None when the source is missing or can't be rendered
+        """
+        size = tuple(size or self.size)
+        entry = self._entry(source_path, size)
+        if entry is None:
+            return None
+        cache_path, etag = entry
+        if os.path.exists(cache_path):
+            return entry
+
+        with self._locks[int(etag[:4], 16) % _LOCK_STRIPES]:
+            if os.path.exists(cache_path):
+                return entry
+            data = render_thumbnail(source_path, size, self.quality, self.pdf_dpi, self.poppler_path)
+            if data is None:
+                return None
+            self._write(source_path, size, cache_path, data)
+        return entry
+
+    def _write(self, source_path: str, size: Tuple[int, int], cache_path: str, data: bytes) -> None:
+        # Older versions of this source (same size) are stale now
+        suffix = f"_{self._variant(size)}.jpg"
+        for stale in self._versions(source_path):
+            if stale.endswith(suffix) and stale != cache_path:
+                _remove_quietly(stale)
+        # Recorded first, so no entry exists without its source path
+        self._record_source(source_path)
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, cache_path)
+
+    def pick_rendition(self, name: Optional[str] = None, width: Optional[int] = None) -> str:
+        """
+        Resolve a requested size to a rendition name
+
+        Args:
+            name: Rendition name (thumb, preview, full)
+            width: Display width in pixels; picks the smallest rendition at least this wide
+
+        Returns:
+            Rendition name, RENDITION_FULL when nothing smaller fits
+
+        Raises:
+            ValueError: Unknown rendition name
+        """
+        if name:
+            if name != RENDITION_FULL and name not in self.renditions:
+                raise ValueError(f"Unknown size '{name}' (use {', '.join([*self.renditions, RENDITION_FULL])})")
+            return name
+        if width:
+            fitting = [n for n, (w, _) in self.renditions.items() if w >= width]
+            if fitting:
+                return fitting[-1]
+        return RENDITION_FULL
+
+    def negotiate(
+        self, source_path: str, name: Optional[str] = None, width: Optional[int] = None
+    ) -> Optional[Tuple[str, str, str]]:
+        """
+        Resolve ?size=<name> / ?w=<px> for a page
+
+        Returns:
+            (path, etag, rendition name), or None when no size was requested or
+            the source is missing (callers then serve the original as before)
+
+        Raises:
+            ValueError: Unknown rendition name
+        """
+        if not name and not width:
+            return None
+        chosen = self.pick_rendition(name, width)
+        entry = self.rendition(source_path, chosen)
+        if entry is None:
+            return None
+        return entry[0], entry[1], chosen
+
+    def rendition(self, source_path: str, name: str) -> Optional[Tuple[str, str]]:
+        """
+        (path, etag) of a named rendition, building the pyramid on a miss
+
+        "full" is the source file itself; its ETag follows its mtime and size.
+        """
+        if name == RENDITION_FULL:
+            try:
+                stat = os.stat(source_path)
+            except OSError:
+                return None
+            return source_path, f"{self._path_key(source_path)}_{stat.st_mtime_ns:x}_{stat.st_size:x}_full"
+
+        size = self.renditions[name]
+        cached = self.lookup(source_path, size)
+        if cached:
+            return cached
+        if os.path.splitext(source_path)[1].lower() in IMAGE_EXTENSIONS:
+            # One decode serves every rendition
+            return self.build_renditions(source_path).get(name)
+        return self.get(source_path, size)
+
+    def build_renditions(self, source_path: str, image: Optional[Any] = None) -> Dict[str, Tuple[str, str]]:
+        """
+        Build every rendition of a page in one pass
+
+        Args:
+            source_path: Page image as written to disk (keys the cache entries)
+            image: The same page as an OpenCV array, to skip decoding the file
+
+        Returns:
+            {rendition name: (path, etag)} for the renditions that were built or cached
+        """
+        entries = {name: self._entry(source_path, size) for name, size in self.renditions.items()}
+        if any(entry is None for entry in entries.values()):
+            return {}
+        missing = [name for name, (cache_path, _) in entries.items() if not os.path.exists(cache_path)]
+        if not missing:
+            return entries
+
+        largest = self.renditions[missing[0]]
+        with self._locks[int(entries[missing[0]][1][:4], 16) % _LOCK_STRIPES]:
+            img = _from_array(image) if image is not None else _open_source(
+                source_path, largest, self.pdf_dpi, self.poppler_path
+            )
+            if img is None:
+                return {name: entry for name, entry in entries.items() if name not in missing}
+            try:
+                current = _to_rgb(img)
+                for name in missing:
+                    cache_path = entries[name][0]
+                    if os.path.exists(cache_path):
+                        continue
+                    # Each rendition is downscaled from the previous (larger) one
+                    current = current.copy()
+                    data = _encode(current, self.renditions[name], self.quality)
+                    self._write(source_path, self.renditions[name], cache_path, data)
+            except Exception as e:
+                logger.warning(f"[WARN] Rendition build failed for {os.path.basename(source_path)}: {e}")
+                return {name: entry for name, entry in entries.items() if os.path.exists(entry[0])}
+            finally:
+                img.close()
+        return entries
+
+    def pregenerate(self, source_path: str) -> None:
+        """Render the thumbnail in the background (no-op when disabled or unsupported)"""
+        if not self.pregenerate_enabled or not self.supports(source_path):
+            return
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="thumbnail")
+        self._executor.submit(self._pregenerate, source_path)
+
+    def _pregenerate(self, source_path: str) -> None:
+        try:
+            if os.path.splitext(source_path)[1].lower() in IMAGE_EXTENSIONS:
+                self.build_renditions(source_path)
+            if self.get(source_path) is None:
+                logger.debug(f"[WARN] No thumbnail pre-generated for {os.path.basename(source_path)}")
+        except Exception as e:
+            logger.warning(f"[WARN] Thumbnail pre-generation failed for {os.path.basename(source_path)}: {e}")
+
+    def rename(self, old_path: str, new_path: str) -> None:
+        """Carry cached thumbnails over to a renamed source (rename keeps mtime and size)"""
+        old_key, new_key = self._path_key(old_path), self._path_key(new_path)
+        cached_versions = self._versions(old_path)
+        if cached_versions:
+            self._record_source(new_path)
+        _remove_quietly(self._source_record(old_path))
+        for cached in cached_versions:
+            target_dir = os.path.join(self.cache_dir, new_key[:2])
+            os.makedirs(target_dir, exist_ok=True)
+            name = new_key + os.path.basename(cached)[len(old_key):]
+            try:
+                os.replace(cached, os.path.join(target_dir, name))
+            except OSError:
+                _remove_quietly(cached)
+
+    def purge(self, source_path: str) -> None:
+        """Drop every cached thumbnail of a deleted source"""
+        for cached in self._versions(source_path):
+            _remove_quietly(cached)
+        _remove_quietly(self._source_record(source_path))
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _read_source(record: str) -> Optional[str]:
+    try:
+        with open(record, "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def is_stale_entry(cache_path: str) -> bool:
+    """
+    True when a file in the thumbnail cache no longer serves anything
+
+    An entry is stale when its source is gone, when the source has changed
+    since it was rendered (a replaced file nobody requested again), or when
+    it has no .src record (older caches, leftover temp files). A .src record
+    is stale once its source is gone.
+    """
+    name = os.path.basename(cache_path)
+    if name.endswith(SOURCE_SUFFIX):
+        source = _read_source(cache_path)
+        return source is None or not os.path.exists(source)
+    if not name.endswith(".jpg"):
+        return True
+    parts = name[: -len(".jpg")].split("_")
+    if len(parts) != 4:
+        return True
+    source = _read_source(os.path.join(os.path.dirname(cache_path), f"{parts[0]}{SOURCE_SUFFIX}"))
+    if source is None:
+        return True
+    try:
+        stat = os.stat(source)
+    except OSError:
+        return True
+    return parts[1] != f"{stat.st_mtime_ns:x}" or parts[2] != f"{stat.st_size:x}"
+
+
+_stores: Dict[str, ThumbnailStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_thumbnail_store(cache_dir: str, poppler_path: Optional[str] = None) -> ThumbnailStore:
+    """Shared store for cache_dir (one instance per directory)"""
+    key = os.path.abspath(cache_dir)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = ThumbnailStore(cache_dir, poppler_path=poppler_path)
+            _stores[key] = store
+        elif poppler_path and not store.poppler_path:
+            store.poppler_path = poppler_path
+        return store
@@ -0,0 +1,156 @@
+"""
+Persistent LLM Response Cache
+SQLite-backed prompt/response cache so rescans and near-identical documents
+reuse earlier Ollama answers instead of querying the model again.
+
+Keys combine the model name, the prompt template name + version and a hash of
+the normalised input text (case, whitespace and Unicode forms folded), so a
+prompt change only needs a version bump to invalidate old answers.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_FILE = "llm_cache.sqlite3"
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    template TEXT NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    value TEXT NOT NULL
+)
+"""
+
+
+def normalize_text(text: str) -> str:
+    """Fold case, Unicode forms and whitespace so trivially different OCR text hashes the same"""
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def cache_key(model: str, template: str, version: int, text: str) -> str:
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{model}|{template}@{version}|{digest}"
+
+
+class LLMResponseCache:
+    """JSON-serialisable LLM results keyed by (model, template@version, text hash)"""
+
+    def __init__(self, path: str, ttl_seconds: float = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            path: SQLite database file
+            ttl_seconds: Entries older than this are treated as misses and dropped
+            max_entries: Least recently used entries beyond this are evicted
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache(accessed)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:  # commit / rollback
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, model: str, template: str, version: int, text: str) -> Optional[Any]:
+        """Cached value, or None on a miss / expired entry"""
+        key = cache_key(model, template, version, text)
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT created, value FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            created, value = row
+            if self.ttl_seconds and now - created > self.ttl_seconds:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            conn.execute("UPDATE llm_cache SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(value)
+
+    def put(self, model: str, template: str, version: int, text: str, value: Any) -> None:
+        """Store a value and evict expired / least recently used entries over the limit"""
+        key = cache_key(model, template, version, text)
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, template, created, accessed, value) VALUES (?, ?, ?, ?, ?)",
+                (key, template, now, now, payload),
+            )
+            if self.ttl_seconds:
+                conn.execute("DELETE FROM llm_cache WHERE created < ?", (now - self.ttl_seconds,))
+            conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                "SELECT key FROM llm_cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM llm_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock, self._connect() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def open_llm_cache(directory: str) -> Optional[LLMResponseCache]:
+    """
+    Open the cache in `directory` using OCR_CONFIG["llm_cache"] settings
+
+    Returns:
+        LLMResponseCache, or None when disabled or the database cannot be opened
+    """
+    try:
+        from app.config.settings import OCR_CONFIG
+
+        settings = OCR_CONFIG.get("llm_cache", {})
+    except Exception:
+        settings = {}
+    if not settings.get("enabled", True):
+        return None
+    try:
+        os.makedirs(directory, exist_ok=True)
+        return LLMResponseCache(
+            os.path.join(directory, LLM_CACHE_FILE),
+            ttl_seconds=settings.get("ttl_seconds", DEFAULT_TTL_SECONDS),
+            max_entries=settings.get("max_entries", DEFAULT_MAX_ENTRIES),
+        )
+    except Exception as e:
+        logger.warning(f"[WARN] LLM response cache unavailable: {e}")
+        return None
@@ -0,0 +1,477 @@
+"""
+Shared Ollama Client
+One pooled, keep-alive HTTP session for every LLM caller (OCR post-processing,
+voice chat, availability checks) with:
+- a circuit breaker that fails fast to the callers' fallbacks while Ollama is down
+- a concurrency cap so bursts of pages cannot pile requests onto the model
+- per-call latency metrics
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = "http://localhost:11434"
+TAGS_ENDPOINT = "/api/tags"
+DEFAULT_TIMEOUT = 15
+DEFAULT_MAX_CONCURRENCY = 2
+DEFAULT_POOL_SIZE = 4
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_RESET_SECONDS = 30.0
+# Latency samples kept per call name for percentile estimates
+LATENCY_WINDOW = 200
+
+
+class LLMClientError(RuntimeError):
+    """Raised when a request cannot be sent to the LLM backend"""
+
+
+class LLMUnavailableError(LLMClientError):
+    """Circuit breaker is open - callers should use their fallback immediately"""
+
+
+class LLMBusyError(LLMClientError):
+    """Concurrency cap reached and no slot freed up within the timeout"""
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive failures; after
+    `reset_seconds` one probe request is let through (half-open) and its
+    outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD, reset_seconds: float = DEFAULT_RESET_SECONDS):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("[OK] Ollama circuit closed")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(
+                        f"[WARN] Ollama circuit open after {self.failures} failures, "
+                        f"skipping LLM calls for {self.reset_seconds:.0f}s"
+                    )
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            retry_in = 0.0
+            if self.state == self.OPEN:
+                retry_in = max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+            return {"state": self.state, "consecutive_failures": self.failures, "retry_in_seconds": round(retry_in, 1)}
+
+
+class _CallStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rejected = 0
+        self.stopped_early = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def to_dict(self) -> Dict[str, Any]:
+        samples = sorted(self.latencies)
+
+        def percentile(p: float) -> float:
+            if not samples:
+                return 0.0
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))], 1)
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "stopped_early": self.stopped_early,
+            "avg_ms": round(self.total_ms / self.calls, 1) if self.calls else 0.0,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "max_ms": round(self.max_ms, 1),
+        }
+
+
+class OllamaClient:
+    """Pooled Ollama HTTP client shared across the backend"""
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        timeout: float = DEFAULT_TIMEOUT,
+        verify_ssl: bool = False,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_seconds: float = DEFAULT_RESET_SECONDS,
+    ):
+        """
+        Args:
+            base_url: Ollama base URL (relative endpoints are resolved against it)
+            timeout: Default request timeout in seconds
+            verify_ssl: Verify TLS certificates
+            max_concurrency: Max requests in flight at once
+            pool_size: Keep-alive connections kept in the pool
+            failure_threshold: Consecutive failures that open the circuit
+            reset_seconds: Seconds before a half-open probe is allowed
+        """
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip("/")
+        self.timeout = timeout
+        self.verify_ssl = verify_ssl
+        self.max_concurrency = max(1, max_concurrency)
+        self.breaker = CircuitBreaker(failure_threshold, reset_seconds)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(pool_size, self.max_concurrency))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._stats: Dict[str, _CallStats] = {}
+        self._stats_lock = threading.Lock()
+
+    def url(self, endpoint: str) -> str:
+        """Resolve an endpoint path (or pass through an absolute URL)"""
+        if endpoint.startswith("http://") or endpoint.startswith("https://"):
+            return endpoint
+        if not endpoint.startswith("/"):
+            endpoint = f"/{endpoint}"
+        return f"{self.base_url}{endpoint}"
+
+    def is_available(self) -> bool:
+        """False while the circuit is open (no request is made)"""
+        return self.breaker.snapshot()["state"] != CircuitBreaker.OPEN
+
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        name: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """
+        Send a request through the pool, breaker and concurrency cap
+
+        Connection errors, timeouts and 5xx responses count as failures for the
+        breaker; any other response is returned to the caller as-is.
+
+        Args:
+            method: HTTP method
+            endpoint: Endpoint path (e.g. "/api/generate") or absolute URL
+            name: Metric name for this call site (default: endpoint)
+            timeout: Request timeout in seconds (default: client timeout)
+            **kwargs: Passed to requests.Session.request (json, params, ...)
+
+        Returns:
+            requests.Response
+
+        Raises:
+            LLMUnavailableError: circuit is open
+            LLMBusyError: no concurrency slot within the timeout
+            requests.RequestException: transport errors (after being recorded)
+        """
+        timeout = timeout or self.timeout
+        kwargs.setdefault("verify", self.verify_ssl)
+        with self._guarded(name or endpoint, timeout) as outcome:
+            response = self.session.request(method, self.url(endpoint), timeout=timeout, **kwargs)
+            outcome["failed"] = response.status_code >= 500
+            return response
+
+    def stream_generate(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        name: Optional[str] = None,
+        timeout: Optional[float] = None,
+        stop: Optional[Callable[[str], bool]] = None,
+    ) -> str:
+        """
+        Stream a generate/chat request and return the accumulated text
+
+        Ollama's NDJSON chunks are consumed as they arrive; once `stop(chunk)`
+        returns True the connection is closed, which makes Ollama abandon the
+        rest of the generation.
+
+        Args:
+            endpoint: "/api/generate" or "/api/chat" style endpoint
+            payload: Request body ("stream" is forced on)
+            name: Metric name for this call site
+            timeout: Connect/read timeout in seconds
+            stop: Incremental predicate fed each new text chunk (e.g. a fresh
+                stop_after_json_object()); True ends the stream early
+
+        Returns:
+            Generated text (possibly cut short by `stop`)
+
+        Raises:
+            LLMClientError: non-200 response (plus the request() exceptions)
+        """
+        timeout = timeout or self.timeout
+        with self._guarded(name or endpoint, timeout) as outcome:
+            with self.session.post(
+                self.url(endpoint),
+                json=dict(payload, stream=True),
+                timeout=timeout,
+                stream=True,
+                verify=self.verify_ssl,
+            ) as response:
+                if response.status_code != 200:
+                    outcome["failed"] = response.status_code >= 500
+                    raise LLMClientError(f"Ollama returned HTTP {response.status_code} for {name or endpoint}")
+
+                parts = []
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    piece = chunk.get("response") or chunk.get("message", {}).get("content") or ""
+                    parts.append(piece)
+                    if chunk.get("done"):
+                        break
+                    if stop and piece and stop(piece):
+                        outcome["stopped_early"] = True
+                        break
+                outcome["failed"] = False
+                return "".join(parts)
+
+    @contextmanager
+    def _guarded(self, name: str, timeout: float) -> Iterator[Dict[str, Any]]:
+        """Concurrency slot + breaker check around one call, recording its outcome and latency"""
+        stats = self._call_stats(name)
+
+        if not self._slots.acquire(timeout=timeout):
+            with self._stats_lock:
+                stats.rejected += 1
+            raise LLMBusyError(f"Ollama busy ({self.max_concurrency} requests in flight), skipping {name}")
+
+        # Checked after taking a slot so a half-open probe is never stranded
+        if not self.breaker.allow():
+            self._slots.release()
+            with self._stats_lock:
+                stats.rejected += 1
+            raise LLMUnavailableError(f"Ollama circuit open, skipping {name}")
+
+        outcome = {"failed": True, "stopped_early": False}
+        start = time.perf_counter()
+        try:
+            yield outcome
+        finally:
+            self._slots.release()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            failed = outcome["failed"]
+            if failed:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            with self._stats_lock:
+                stats.calls += 1
+                stats.errors += int(failed)
+                stats.stopped_early += int(outcome["stopped_early"])
+                stats.total_ms += elapsed_ms
+                stats.max_ms = max(stats.max_ms, elapsed_ms)
+                stats.latencies.append(elapsed_ms)
+
+    def post(self, endpoint: str, name: Optional[str] = None, timeout: Optional[float] = None, **kwargs: Any) -> requests.Response:
+        return self.request("POST", endpoint, name=name, timeout=timeout, **kwargs)
+
+    def get(self, endpoint: str, name: Optional[str] = None, timeout: Optional[float] = None, **kwargs: Any) -> requests.Response:
+        return self.request("GET", endpoint, name=name, timeout=timeout, **kwargs)
+
+    def _call_stats(self, name: str) -> _CallStats:
+        with self._stats_lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = _CallStats()
+            return stats
+
+    def metrics(self) -> Dict[str, Any]:
+        """Breaker state plus latency/error counters per call name"""
+        with self._stats_lock:
+            calls = {name: stats.to_dict() for name, stats in self._stats.items()}
+        return {
+            "base_url": self.base_url,
+            "max_concurrency": self.max_concurrency,
+            "circuit": self.breaker.snapshot(),
+            "calls": calls,
+        }
+
+
+def first_line(text: str) -> str:
+    """First non-empty line of a generation"""
+    for line in (text or "").splitlines():
+        if line.strip():
+            return line.strip()
+    return ""
+
+
+def stop_after_first_line() -> Callable[[str], bool]:
+    """Stream stop predicate (one per call): a non-empty line has been terminated"""
+    seen_text = False
+
+    def feed(chunk: str) -> bool:
+        nonlocal seen_text
+        if not seen_text:
+            chunk = chunk.lstrip()
+            seen_text = bool(chunk)
+        return seen_text and "\n" in chunk
+
+    return feed
+
+
+def extract_json_object(text: str) -> Optional[str]:
+    """
+    First complete top-level JSON object in `text`, or None if it never closes
+
+    Tracks brace depth outside string literals, so braces inside strings and
+    trailing chatter after the object are handled.
+    """
+    start = (text or "").find("{")
+    if start < 0:
+        return None
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+class JSONObjectScanner:
+    """
+    Incremental form of extract_json_object's scan: keeps brace depth and
+    string state across chunks, so each streamed chunk is scanned once
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+        self.closed = False
+
+    def feed(self, chunk: str) -> bool:
+        """Scan the next chunk; True once the first top-level object has closed"""
+        if self.closed:
+            return True
+        for ch in chunk:
+            if not self.started:
+                if ch == "{":
+                    self.started = True
+                    self.depth = 1
+                continue
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch == "{":
+                self.depth += 1
+            elif ch == "}":
+                self.depth -= 1
+                if self.depth == 0:
+                    self.closed = True
+                    return True
+        return False
+
+
+def stop_after_json_object() -> Callable[[str], bool]:
+    """Stream stop predicate (one per call): the first JSON object has closed"""
+    return JSONObjectScanner().feed
+
+
+_client: Optional[OllamaClient] = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client() -> OllamaClient:
+    """Get or create the process-wide Ollama client (settings from CONNECTION_CONFIG["ollama"])"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                try:
+                    from app.config.settings import CONNECTION_CONFIG
+
+                    settings = CONNECTION_CONFIG.get("ollama", {})
+                except Exception:
+                    settings = {}
+                _client = OllamaClient(
+                    base_url=settings.get("base_url", DEFAULT_BASE_URL),
+                    timeout=settings.get("timeout", DEFAULT_TIMEOUT),
+                    verify_ssl=settings.get("verify_ssl", False),
+                    max_concurrency=settings.get("max_concurrency", DEFAULT_MAX_CONCURRENCY),
+                    pool_size=settings.get("pool_size", DEFAULT_POOL_SIZE),
+                    failure_threshold=settings.get("breaker_failure_threshold", DEFAULT_FAILURE_THRESHOLD),
+                    reset_seconds=settings.get("breaker_reset_seconds", DEFAULT_RESET_SECONDS),
+                )
+    return _client
+
+
+def check_ollama_available(name: str = "tags", timeout: float = 2) -> bool:
+    """True if Ollama lists its models; False on any error or while the circuit is open"""
+    try:
+        return get_llm_client().get(TAGS_ENDPOINT, name=name, timeout=timeout).status_code == 200
+    except Exception:
+        return False
@@ -7,6 +7,7 @@ Includes PaddleOCR for advanced OCR with bounding boxes
 
 import os
 import pickle
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import Dict, List, Optional, Tuple
 
 import cv2
@@ -35,6 +36,12 @@ class OCRModule:
     Based on printchakra_clean.ipynb Section 5
     """
 
+    # Tesseract runs as a subprocess, so threads give real parallelism
+    MULTI_CONFIG_WORKERS = min(4, os.cpu_count() or 1)
+    # A run at least this confident (mean word conf, 0-100) and long ends the search
+    EARLY_EXIT_CONFIDENCE = 85.0
+    EARLY_EXIT_MIN_LENGTH = 40
+
     def __init__(self, language: str = "eng", psm: int = 3, oem: int = 3):
         """
         Initialize OCR module
@@ -53,69 +60,160 @@ class OCRModule:
         self.oem = oem
         self.config = f"--oem {oem} --psm {psm}"
 
-    def extract_text_multi_config(self, image: np.ndarray, debug: bool = False) -> Tuple[str, Dict]:
+    def extract_text_multi_config(
+        self,
+        image: np.ndarray,
+        debug: bool = False,
+        max_workers: Optional[int] = None,
+        min_confidence: Optional[float] = None,
+        min_length: Optional[int] = None,
+    ) -> Tuple[str, Dict]:
         """
         Extract text with multiple OCR configurations and preprocessing variants
         From notebook Section 5 - improved multi-config approach
 
+        Every (variant, PSM) pair runs as one image_to_data call on a worker
+        pool. Evaluation stops early once a result is both confident and long
+        enough, and word/line stats come from the winning run's data instead
+        of a separate Tesseract pass.
+
         Args:
             image: Input image
             debug: Print debug information
+            max_workers: Parallel Tesseract processes (default MULTI_CONFIG_WORKERS)
+            min_confidence: Mean word confidence (0-100) that allows early exit
+            min_length: Minimum stripped text length that allows early exit
 
         Returns:
             Tuple of (best_text, statistics_dict)
         """
-        from .image_enhancement import ImageEnhancer
+        try:
+            best = self._best_multi_config(image, debug, max_workers, min_confidence, min_length)
+            if best is None:
+                return "", {}
+
+            stats = {
+                "chars": len(best["text"]),
+                "words": best["words"],
+                "lines": best["lines"],
+                "config": best["config"],
+                "variant": best["variant"],
+                "confidence": round(best["confidence"], 2),
+            }
+
+            return best["text"], stats
+
+        except Exception as e:
+            if debug:
+                print(f"OCR error: {e}")
+            return "", {}
+
+    def _best_multi_config(
+        self,
+        image: np.ndarray,
+        debug: bool = False,
+        max_workers: Optional[int] = None,
+        min_confidence: Optional[float] = None,
+        min_length: Optional[int] = None,
+    ) -> Optional[Dict]:
+        """Evaluate variant x PSM runs in parallel and return the best run summary"""
+        from ..image.enhancement import ImageEnhancer
 
         configs = [
             ("PSM 3 (Auto)", "--oem 3 --psm 3"),
             ("PSM 6 (Block)", "--oem 3 --psm 6"),
             ("PSM 4 (Column)", "--oem 3 --psm 4"),
         ]
+        workers = max_workers or self.MULTI_CONFIG_WORKERS
+        min_confidence = self.EARLY_EXIT_CONFIDENCE if min_confidence is None else min_confidence
+        min_length = self.EARLY_EXIT_MIN_LENGTH if min_length is None else min_length
 
-        # Get preprocessing variants
+        # Get preprocessing variants (submitted in priority order)
         enhancer = ImageEnhancer()
         variants = enhancer.preprocess_for_ocr(image)
         results = []
 
+        pool = ThreadPoolExecutor(max_workers=workers)
+        pending = {
+            pool.submit(self._run_config, img, variant_name, config_name, config_str)
+            for img, variant_name in variants
+            for config_name, config_str in configs
+        }
+        early_exit = False
         try:
-            for img, variant_name in variants:
-                for config_name, config_str in configs:
-                    text = pytesseract.image_to_string(img, lang=self.language, config=config_str)
-                    results.append(
-                        {
-                            "text": text,
-                            "length": len(text.strip()),
-                            "config": config_name,
-                            "variant": variant_name,
-                        }
-                    )
-
-            # Select best result (longest text)
-            best = max(results, key=lambda x: x["length"])
-
-            if debug:
-                print(f"✅ Best OCR: {best['config']} ({best['variant']}) - {best['length']} chars")
-
-            # Get detailed stats from first variant
-            data = pytesseract.image_to_data(variants[0][0], output_type=pytesseract.Output.DICT)
-            words = [w for w in data["text"] if w.strip()]
-            lines = set(data["line_num"])
+            while pending and not early_exit:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        if debug:
+                            print(f"OCR config failed: {e}")
+                        continue
+                    results.append(result)
+                    if result["confidence"] >= min_confidence and result["length"] >= min_length:
+                        early_exit = True
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        if not results:
+            return None
+
+        # Select best result (longest text, confidence breaks ties)
+        best = max(results, key=lambda x: (x["length"], x["confidence"]))
+
+        if debug:
+            skipped = len(variants) * len(configs) - len(results)
+            print(
+                f"✅ Best OCR: {best['config']} ({best['variant']}) - {best['length']} chars"
+                + (f" (early exit, {skipped} runs skipped)" if early_exit else "")
+            )
 
-            stats = {
-                "chars": len(best["text"]),
-                "words": len(words),
-                "lines": len(lines),
-                "config": best["config"],
-                "variant": best["variant"],
-            }
+        return best
 
-            return best["text"], stats
+    def _run_config(
+        self, image: np.ndarray, variant_name: str, config_name: str, config_str: str
+    ) -> Dict:
+        """Run one Tesseract image_to_data pass and summarise it"""
+        data = pytesseract.image_to_data(
+            image, lang=self.language, config=config_str, output_type=pytesseract.Output.DICT
+        )
 
-        except Exception as e:
-            if debug:
-                print(f"OCR error: {e}")
-            return "", {}
+        # Rebuild image_to_string-style text from the word boxes
+        lines: Dict[Tuple[int, int, int], List[str]] = {}
+        confidences = []
+        for i, word in enumerate(data["text"]):
+            word = (word or "").strip()
+            if not word:
+                continue
+            key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+            lines.setdefault(key, []).append(word)
+            try:
+                conf = float(data["conf"][i])
+            except (TypeError, ValueError):
+                continue
+            if conf >= 0:
+                confidences.append(conf)
+
+        text_lines = []
+        previous_paragraph = None
+        for (block, par, _), words in lines.items():
+            if previous_paragraph is not None and (block, par) != previous_paragraph:
+                text_lines.append("")
+            text_lines.append(" ".join(words))
+            previous_paragraph = (block, par)
+        text = "\n".join(text_lines)
+
+        return {
+            "text": text,
+            "length": len(text.strip()),
+            "words": sum(len(words) for words in lines.values()),
+            "lines": len(lines),
+            "confidence": float(np.mean(confidences)) if confidences else 0.0,
+            "confidences": confidences,
+            "config": config_name,
+            "variant": variant_name,
+        }
 
     def extract_text(self, image: np.ndarray) -> str:
         """
@@ -145,31 +243,20 @@ class OCRModule:
             Dict with text and confidence data
         """
         try:
-            # Use multi-config extraction for better results
-            text, stats = self.extract_text_multi_config(image, debug=False)
-
-            # Get confidence data
-            data = pytesseract.image_to_data(
-                image, lang=self.language, config=self.config, output_type=pytesseract.Output.DICT
-            )
+            # Use multi-config extraction for better results; the winning run
+            # already carries per-word confidences, so no extra Tesseract pass
+            best = self._best_multi_config(image)
+            if best is None:
+                return {"text": "", "confidence": 0, "word_count": 0}
 
             # Filter out low confidence results
-            filtered_text = []
-            confidences = []
-
-            for i in range(len(data["text"])):
-                if int(data["conf"][i]) > 30:  # Confidence threshold
-                    text_word = data["text"][i].strip()
-                    if text_word:
-                        filtered_text.append(text_word)
-                        confidences.append(int(data["conf"][i]))
-
+            confidences = [int(c) for c in best["confidences"] if c > 30]
             avg_confidence = np.mean(confidences) if confidences else 0
 
             return {
-                "text": text,  # Use multi-config text (better quality)
+                "text": best["text"],  # Use multi-config text (better quality)
                 "confidence": float(avg_confidence),
-                "word_count": stats.get("words", len(filtered_text)),
+                "word_count": best["words"],
                 "all_confidences": confidences,
             }
         except Exception as e:
@@ -224,6 +311,13 @@ class DocumentClassifier:
     # Document types
     DOCUMENT_TYPES = ["ID", "BILL", "RECEIPT", "FORM", "NOTE", "OTHER"]
 
+    # Features are computed on a copy whose longest side is this many pixels
+    FEATURE_SIDE = 1000
+    FEATURE_COUNT = 8
+    # Bump when extract_features changes; older saved models need retraining
+    FEATURE_VERSION = 2
+    BATCH_WORKERS = min(4, os.cpu_count() or 1)
+
     def __init__(self, model_path: Optional[str] = None):
         """
         Initialize document classifier
@@ -238,60 +332,62 @@ class DocumentClassifier:
         if model_path and os.path.exists(model_path):
             self.load_model(model_path)
 
+    def _normalize(self, image: np.ndarray) -> np.ndarray:
+        """Grayscale copy scaled so the longest side is FEATURE_SIDE pixels"""
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
+        h, w = gray.shape[:2]
+        longest = max(h, w)
+        if longest and longest != self.FEATURE_SIDE:
+            scale = self.FEATURE_SIDE / float(longest)
+            interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+            gray = cv2.resize(
+                gray, (max(1, round(w * scale)), max(1, round(h * scale))), interpolation=interpolation
+            )
+        return gray
+
     def extract_features(self, image: np.ndarray) -> np.ndarray:
         """
         Extract features from image for classification
 
+        Features are computed on a normalised copy (see FEATURE_SIDE), so
+        they don't depend on scan resolution and cost the same for every page.
+
         Args:
             image: Input image
 
         Returns:
             Feature vector
         """
-        # Convert to grayscale
-        if len(image.shape) == 3:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = image
-
-        # Feature 1: Aspect ratio
-        h, w = gray.shape
+        # Feature 1: Aspect ratio (from the original size)
+        h, w = image.shape[:2]
         aspect_ratio = w / h if h > 0 else 1.0
 
+        gray = self._normalize(image)
+
         # Feature 2: Text density (approximate)
         _, binary = cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY_INV)
-        text_density = np.sum(binary > 0) / binary.size
+        text_density = np.count_nonzero(binary) / binary.size
 
         # Feature 3: Edge density
         edges = cv2.Canny(gray, 50, 150)
-        edge_density = np.sum(edges > 0) / edges.size
+        edge_density = np.count_nonzero(edges) / edges.size
 
-        # Feature 4: Horizontal lines (common in bills/receipts)
+        # Features 4-5: Horizontal lines (bills/receipts) and vertical lines (forms),
+        # classified in one pass over the whole segment array
         lines = cv2.HoughLinesP(
             edges, 1, np.pi / 180, threshold=50, minLineLength=100, maxLineGap=10
         )
-        horizontal_lines = 0
+        horizontal_lines = vertical_lines = 0
         if lines is not None:
-            for line in lines:
-                x1, y1, x2, y2 = line[0]
-                angle = abs(np.degrees(np.arctan2(y2 - y1, x2 - x1)))
-                if angle < 10 or angle > 170:  # Nearly horizontal
-                    horizontal_lines += 1
-
-        # Feature 5: Vertical lines (common in forms)
-        vertical_lines = 0
-        if lines is not None:
-            for line in lines:
-                x1, y1, x2, y2 = line[0]
-                angle = abs(np.degrees(np.arctan2(y2 - y1, x2 - x1)))
-                if 80 < angle < 100:  # Nearly vertical
-                    vertical_lines += 1
-
-        # Feature 6: Mean intensity
-        mean_intensity = np.mean(gray)
+            segments = lines.reshape(-1, 4).astype(np.float32)
+            angles = np.abs(
+                np.degrees(np.arctan2(segments[:, 3] - segments[:, 1], segments[:, 2] - segments[:, 0]))
+            )
+            horizontal_lines = int(np.count_nonzero((angles < 10) | (angles > 170)))
+            vertical_lines = int(np.count_nonzero((angles > 80) & (angles < 100)))
 
-        # Feature 7: Std deviation of intensity
-        std_intensity = np.std(gray)
+        # Features 6-7: Mean and std deviation of intensity
+        mean_intensity, std_intensity = cv2.meanStdDev(gray)
 
         # Feature 8: Contour count (complexity)
         contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
@@ -305,14 +401,27 @@ class DocumentClassifier:
                 edge_density,
                 horizontal_lines,
                 vertical_lines,
-                mean_intensity,
-                std_intensity,
+                float(mean_intensity[0][0]),
+                float(std_intensity[0][0]),
                 contour_count,
             ]
         )
 
         return features
 
+    def extract_features_batch(self, images: List[np.ndarray]) -> np.ndarray:
+        """
+        Extract features for many images into an (N, 8) matrix
+
+        OpenCV releases the GIL, so pages are processed on a thread pool.
+        """
+        if not images:
+            return np.zeros((0, self.FEATURE_COUNT))
+        if len(images) == 1:
+            return self.extract_features(images[0]).reshape(1, -1)
+        with ThreadPoolExecutor(max_workers=min(self.BATCH_WORKERS, len(images))) as executor:
+            return np.vstack(list(executor.map(self.extract_features, images)))
+
     def train(self, images: List[np.ndarray], labels: List[str]):
         """
         Train the classifier
@@ -322,7 +431,7 @@ class DocumentClassifier:
             labels: List of corresponding labels
         """
         # Extract features
-        features = np.array([self.extract_features(img) for img in images])
+        features = self.extract_features_batch(images)
 
         # Scale features
         features_scaled = self.scaler.fit_transform(features)
@@ -341,25 +450,42 @@ class DocumentClassifier:
         Returns:
             Tuple of (predicted_type, confidence)
         """
-        if not self.is_trained:
-            return "OTHER", 0.0
+        return self.predict_batch([image])[0]
 
-        # Extract and scale features
-        features = self.extract_features(image).reshape(1, -1)
-        features_scaled = self.scaler.transform(features)
+    def predict_batch(self, images: List[np.ndarray]) -> List[Tuple[str, float]]:
+        """
+        Predict document types for many images with one scaler/model call
 
-        # Predict
-        prediction = self.model.predict(features_scaled)[0]
+        Args:
+            images: Input images
 
-        # Get probability/confidence
-        proba = self.model.predict_proba(features_scaled)[0]
-        confidence = float(np.max(proba))
+        Returns:
+            (predicted_type, confidence) per image, in input order
+        """
+        if not self.is_trained:
+            return [("OTHER", 0.0) for _ in images]
+        if not images:
+            return []
 
-        return prediction, confidence
+        # Extract and scale features
+        features_scaled = self.scaler.transform(self.extract_features_batch(images))
+
+        # Predict from the probabilities so label and confidence always agree
+        proba = self.model.predict_proba(features_scaled)
+        best = np.argmax(proba, axis=1)
+        return [
+            (self.model.classes_[i], float(proba[row, i]))
+            for row, i in enumerate(best)
+        ]
 
     def save_model(self, path: str):
         """Save trained model"""
-        model_data = {"model": self.model, "scaler": self.scaler, "is_trained": self.is_trained}
+        model_data = {
+            "model": self.model,
+            "scaler": self.scaler,
+            "is_trained": self.is_trained,
+            "feature_version": self.FEATURE_VERSION,
+        }
         with open(path, "wb") as f:
             pickle.dump(model_data, f)
 
@@ -368,6 +494,11 @@ class DocumentClassifier:
         with open(path, "rb") as f:
             model_data = pickle.load(f)
 
+        if model_data.get("feature_version") != self.FEATURE_VERSION:
+            # Scaler statistics from another feature extractor would skew every prediction
+            print(f"⚠️  Classifier model {path} uses old features, retrain it before use")
+            return
+
         self.model = model_data["model"]
         self.scaler = model_data["scaler"]
         self.is_trained = model_data["is_trained"]
@@ -0,0 +1,221 @@
+"""
+Background Document Enrichment
+Runs OCR, LLM structuring and OCR-based renaming after a processed page has
+already been announced, so time-to-first-view never waits on the LLM
+"""
+
+import logging
+import os
+import queue
+import re
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Pages smaller than this on either side only get a fast preview pass
+SMALL_IMAGE_SIDE = 200
+DEFAULT_ENRICHMENT_WORKERS = 1
+
+
+def _enrichment_workers() -> int:
+    try:
+        from app.config.settings import OCR_CONFIG
+
+        return max(1, int(OCR_CONFIG.get("enrichment_workers") or DEFAULT_ENRICHMENT_WORKERS))
+    except Exception:
+        return DEFAULT_ENRICHMENT_WORKERS
+
+
+class EnrichmentQueue:
+    """
+    FIFO queue of processed pages waiting for OCR, naming and renaming
+
+    Each job runs the configured OCR strategy, writes the text file and the
+    OCR result, renames the page after its content and emits:
+        - ocr_complete: text and title are available
+        - document_renamed: the page (and its text file) got a new filename
+    """
+
+    def __init__(
+        self,
+        ocr_data_dir: str,
+        text_dir: str,
+        emit: Optional[Callable[[str, Dict[str, Any]], Any]] = None,
+        workers: Optional[int] = None,
+        catalog: Optional[Any] = None,
+        thumbnails: Optional[Any] = None,
+        locator: Optional[Any] = None,
+    ):
+        """
+        Args:
+            ocr_data_dir: Directory for OCR result files
+            text_dir: Directory for extracted .txt files
+            emit: Socket.IO style emit(event, payload) callback
+            workers: Worker thread count (default: OCR_CONFIG["enrichment_workers"])
+            catalog: DocumentCatalog to keep in step with renames and OCR results
+            thumbnails: ThumbnailStore whose cached thumbnails follow renames
+            locator: FileLocator updated on renames (ahead of its watcher)
+        """
+        self.ocr_data_dir = ocr_data_dir
+        self.text_dir = text_dir
+        self.emit = emit
+        self.catalog = catalog
+        self.thumbnails = thumbnails
+        self.locator = locator
+        self.workers = workers or _enrichment_workers()
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._threads = []
+        self._start_lock = threading.Lock()
+        # Serialises rename collision checks across workers
+        self._rename_lock = threading.Lock()
+
+    def submit(self, image_path: str, timestamp: Optional[str] = None) -> None:
+        """
+        Queue a processed page for enrichment
+
+        Args:
+            image_path: Path of the processed image
+            timestamp: Upload timestamp (YYYYmmdd_HHMMSS) appended to the derived name
+        """
+        self._ensure_started()
+        self._queue.put({"image_path": image_path, "timestamp": timestamp})
+        logger.info(f"[OCR] Queued enrichment for {os.path.basename(image_path)} ({self._queue.qsize()} pending)")
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _ensure_started(self) -> None:
+        with self._start_lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"ocr-enrichment-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _worker(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                self._enrich(job["image_path"], job.get("timestamp"))
+            except Exception as e:
+                logger.error(f"[OCR] Enrichment failed for {os.path.basename(job['image_path'])}: {e}")
+                self._emit("ocr_complete", {
+                    "filename": os.path.basename(job["image_path"]),
+                    "success": False,
+                    "error": str(e),
+                })
+            finally:
+                self._queue.task_done()
+
+    def _emit(self, event: str, payload: Dict[str, Any]) -> None:
+        if not self.emit:
+            return
+        try:
+            self.emit(event, payload)
+        except Exception as e:
+            logger.warning(f"[WARN] Socket.IO emit '{event}' failed: {e}")
+
+    def _enrich(self, image_path: str, timestamp: Optional[str]) -> None:
+        from .paddle_ocr import get_ocr_processor
+        from .strategy import OCR_STRATEGY_FAST_PREVIEW
+
+        if not os.path.exists(image_path):
+            logger.info(f"[OCR] Skipping enrichment, file no longer exists: {image_path}")
+            return
+
+        original_filename = os.path.basename(image_path)
+        processor = get_ocr_processor(self.ocr_data_dir)
+
+        with Image.open(image_path) as img:
+            width, height = img.size
+        is_small_image = width < SMALL_IMAGE_SIDE or height < SMALL_IMAGE_SIDE
+        strategy = OCR_STRATEGY_FAST_PREVIEW if is_small_image else None
+
+        result = processor.process_image(image_path, strategy=strategy)
+        text = result.to_text()
+
+        text_path = None
+        if text.strip():
+            os.makedirs(self.text_dir, exist_ok=True)
+            text_path = os.path.join(self.text_dir, f"{os.path.splitext(original_filename)[0]}.txt")
+            with open(text_path, "w", encoding="utf-8") as f:
+                f.write(text)
+
+        final_path = image_path
+        if result.word_count > 0 and not is_small_image:
+            if timestamp is None:
+                match = re.search(r'_(\d{8}_\d{6})_', original_filename)
+                timestamp = match.group(1) if match else None
+            suggested = processor.generate_filename_from_ocr(result, timestamp)
+            if suggested and suggested != "untitled":
+                final_path, text_path = self._rename(image_path, text_path, suggested)
+
+        final_filename = os.path.basename(final_path)
+        if result.word_count > 0:
+            processor.save_result(final_filename, result)
+        
+        if self.thumbnails and final_filename != original_filename:
+            self.thumbnails.rename(image_path, final_path)
+        if self.locator and final_filename != original_filename:
+            self.locator.move(image_path, final_path)
+
+        if self.catalog:
+            if final_filename != original_filename:
+                self.catalog.rename(original_filename, final_filename)
+            self.catalog.update(
+                final_filename,
+                has_text=text_path is not None,
+                has_ocr=result.word_count > 0,
+                derived_title=result.derived_title or None,
+            )
+
+        if final_filename != original_filename:
+            print(f"  ✓ File renamed based on OCR content: {final_filename}")
+            self._emit("document_renamed", {
+                "filename": final_filename,
+                "original_filename": original_filename,
+                "derived_title": result.derived_title,
+                "has_text": bool(text.strip()),
+                "text_length": len(text),
+            })
+
+        self._emit("ocr_complete", {
+            "filename": final_filename,
+            "success": True,
+            "result": result.to_dict(),
+            "derived_title": result.derived_title,
+            "word_count": result.word_count,
+            "confidence": result.confidence_avg,
+            "has_text": result.word_count > 0,
+            "background": True,
+        })
+
+    def _rename(self, image_path: str, text_path: Optional[str], base_name: str):
+        """Rename the image (and its text file) to base_name without overwriting"""
+        output_dir = os.path.dirname(image_path)
+        ext = os.path.splitext(image_path)[1]
+
+        with self._rename_lock:
+            if not os.path.exists(image_path):
+                return image_path, text_path
+
+            new_path = os.path.join(output_dir, f"{base_name}{ext}")
+            counter = 1
+            while os.path.exists(new_path):
+                new_path = os.path.join(output_dir, f"{base_name}_{counter}{ext}")
+                counter += 1
+            os.rename(image_path, new_path)
+
+            if text_path and os.path.exists(text_path):
+                new_text_path = os.path.join(
+                    os.path.dirname(text_path), f"{os.path.splitext(os.path.basename(new_path))[0]}.txt"
+                )
+                if not os.path.exists(new_text_path):
+                    os.rename(text_path, new_text_path)
+                    text_path = new_text_path
+
+        return new_path, text_path
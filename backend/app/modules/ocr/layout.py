@@ -0,0 +1,209 @@
+"""
+Vectorized OCR Layout Engine
+Groups OCR boxes into lines, blocks and columns with NumPy sweeps instead of
+pairwise Python comparisons, so dense pages (receipts, tables) stay O(n log n)
+"""
+
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+# Line tolerance as a fraction of the median box height
+LINE_TOLERANCE_RATIO = 0.5
+# Vertical gap (in median heights) that starts a new block
+BLOCK_GAP_RATIO = 1.2
+# Horizontal whitespace (in median heights) that counts as a column gutter
+COLUMN_GAP_RATIO = 3.0
+# A gutter only splits columns when both sides hold at least this share of boxes
+COLUMN_MIN_SHARE = 0.2
+
+
+def boxes_to_array(results: Sequence[Dict[str, Any]]) -> np.ndarray:
+    """
+    Convert OCR results to an (N, 4) float array of x, y, width, height
+
+    Args:
+        results: OCR results with a 'bbox' dict (x, y, width, height)
+
+    Returns:
+        Array of shape (N, 4)
+    """
+    if not results:
+        return np.zeros((0, 4), dtype=np.float32)
+    return np.array(
+        [
+            (r["bbox"]["x"], r["bbox"]["y"], r["bbox"]["width"], r["bbox"]["height"])
+            for r in results
+        ],
+        dtype=np.float32,
+    )
+
+
+def _median_height(boxes: np.ndarray) -> float:
+    return max(float(np.median(boxes[:, 3])), 1.0) if len(boxes) else 1.0
+
+
+def assign_lines(boxes: np.ndarray, tolerance: Optional[float] = None) -> np.ndarray:
+    """
+    Assign each box a line id with a single sweep over sorted centre-y
+
+    A new line starts wherever the gap between consecutive sorted centres
+    exceeds the tolerance. Line ids increase top to bottom.
+
+    Args:
+        boxes: (N, 4) array of x, y, width, height
+        tolerance: Max centre-y gap within a line (default: half median height)
+
+    Returns:
+        (N,) int array of line ids aligned with the input boxes
+    """
+    n = len(boxes)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    if tolerance is None:
+        tolerance = LINE_TOLERANCE_RATIO * _median_height(boxes)
+
+    centre_y = boxes[:, 1] + boxes[:, 3] / 2.0
+    order = np.argsort(centre_y, kind="stable")
+    breaks = np.diff(centre_y[order]) > tolerance
+    sorted_ids = np.concatenate(([0], np.cumsum(breaks)))
+
+    line_ids = np.empty(n, dtype=np.int64)
+    line_ids[order] = sorted_ids
+    return line_ids
+
+
+def detect_columns(boxes: np.ndarray, min_gap: Optional[float] = None) -> np.ndarray:
+    """
+    Assign each box a column id by finding vertical whitespace gutters
+
+    Box extents are accumulated into an x-coverage profile with a difference
+    array; empty runs wider than min_gap that split the boxes into
+    substantial groups on both sides become gutters.
+
+    Args:
+        boxes: (N, 4) array of x, y, width, height
+        min_gap: Minimum gutter width in pixels (default: COLUMN_GAP_RATIO median heights)
+
+    Returns:
+        (N,) int array of column ids, numbered left to right
+    """
+    n = len(boxes)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    if min_gap is None:
+        min_gap = COLUMN_GAP_RATIO * _median_height(boxes)
+
+    x0 = np.floor(boxes[:, 0]).astype(np.int64)
+    x1 = np.ceil(boxes[:, 0] + boxes[:, 2]).astype(np.int64)
+    origin = int(x0.min())
+    span = int(x1.max()) - origin + 1
+
+    delta = np.zeros(span + 1, dtype=np.int64)
+    np.add.at(delta, x0 - origin, 1)
+    np.add.at(delta, x1 - origin, -1)
+    empty = np.cumsum(delta)[:span] == 0
+
+    # Start/end of each empty run
+    edges = np.diff(np.concatenate(([0], empty.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    wide = (ends - starts) >= min_gap
+    gutters = (starts[wide] + ends[wide]) / 2.0 + origin
+
+    centre_x = boxes[:, 0] + boxes[:, 2] / 2.0
+    column_ids = np.searchsorted(gutters, centre_x)
+
+    # Drop gutters that leave a near-empty column (e.g. a right-aligned page number)
+    counts = np.bincount(column_ids, minlength=len(gutters) + 1)
+    keep = counts >= max(2, COLUMN_MIN_SHARE * n)
+    if not keep.all():
+        kept_gutters = [g for i, g in enumerate(gutters) if keep[i] and keep[i + 1]]
+        column_ids = np.searchsorted(np.asarray(kept_gutters), centre_x)
+    return column_ids.astype(np.int64)
+
+
+def reading_order(
+    boxes: np.ndarray,
+    tolerance: Optional[float] = None,
+    split_columns: bool = False,
+) -> np.ndarray:
+    """
+    Indices that sort boxes top-to-bottom, left-to-right (optionally per column)
+
+    Args:
+        boxes: (N, 4) array of x, y, width, height
+        tolerance: Line tolerance passed to assign_lines
+        split_columns: Read each detected column fully before the next
+
+    Returns:
+        (N,) int array of indices into boxes
+    """
+    if len(boxes) == 0:
+        return np.zeros(0, dtype=np.int64)
+    line_ids = assign_lines(boxes, tolerance)
+    if split_columns:
+        columns = detect_columns(boxes)
+        return np.lexsort((boxes[:, 0], line_ids, columns))
+    return np.lexsort((boxes[:, 0], line_ids))
+
+
+def analyze_layout(
+    results: Sequence[Dict[str, Any]],
+    tolerance: Optional[float] = None,
+    split_columns: bool = False,
+) -> Dict[str, Any]:
+    """
+    Group OCR results into lines, blocks and columns
+
+    Args:
+        results: OCR results with 'bbox' dicts
+        tolerance: Line tolerance in pixels (default: half median height)
+        split_columns: Read columns one after another
+
+    Returns:
+        Dict with:
+            order: indices of results in reading order
+            lines: list of index lists (reading order within each line)
+            line_blocks: block id per line
+            line_columns: column id per line
+    """
+    boxes = boxes_to_array(results)
+    n = len(boxes)
+    if n == 0:
+        return {"order": [], "lines": [], "line_blocks": [], "line_columns": []}
+
+    line_ids = assign_lines(boxes, tolerance)
+    columns = detect_columns(boxes) if split_columns else np.zeros(n, dtype=np.int64)
+
+    # Lines never span columns: key each line by (column, line)
+    order = np.lexsort((boxes[:, 0], line_ids, columns))
+    line_key = columns[order] * (int(line_ids.max()) + 1) + line_ids[order]
+    splits = np.flatnonzero(np.diff(line_key)) + 1
+    lines = np.split(order, splits)
+
+    # Per-line extents for block grouping
+    starts = np.concatenate(([0], splits))
+    line_top = np.minimum.reduceat(boxes[order, 1], starts)
+    line_bottom = np.maximum.reduceat(boxes[order, 1] + boxes[order, 3], starts)
+    line_columns = columns[order][starts]
+
+    gap = line_top[1:] - line_bottom[:-1]
+    new_block = (gap > BLOCK_GAP_RATIO * _median_height(boxes)) | (np.diff(line_columns) != 0)
+    line_blocks = np.concatenate(([0], np.cumsum(new_block)))
+
+    return {
+        "order": order.tolist(),
+        "lines": [line.tolist() for line in lines],
+        "line_blocks": line_blocks.tolist(),
+        "line_columns": line_columns.tolist(),
+    }
+
+
+def combine_boxes(boxes: np.ndarray) -> Dict[str, int]:
+    """Bounding rectangle of an (N, 4) box array as an OCR bbox dict"""
+    x0 = boxes[:, 0].min()
+    y0 = boxes[:, 1].min()
+    x1 = (boxes[:, 0] + boxes[:, 2]).max()
+    y1 = (boxes[:, 1] + boxes[:, 3]).max()
+    return {"x": int(x0), "y": int(y0), "width": int(x1 - x0), "height": int(y1 - y0)}
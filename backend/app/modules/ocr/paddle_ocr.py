@@ -15,19 +15,101 @@ os.environ['FLAGS_eager_delete_tensor_gb'] = '0.0'  # Memory optimization
 
 import json
 import logging
+import threading
+import time
 import traceback
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
-import requests
 import re
 
 import cv2
 import numpy as np
 from PIL import Image
 
+from ..llm_cache import open_llm_cache
+from ..llm_client import (
+    extract_json_object,
+    first_line,
+    get_llm_client,
+    stop_after_first_line,
+    stop_after_json_object,
+)
+from .profiling import StageTimer, confidence_stats, ocr_metrics
+from .layout import analyze_layout, boxes_to_array, combine_boxes, reading_order
+from .regions import (
+    DEFAULT_LINE_PADDING,
+    MAX_REGIONS,
+    boxes_in_rect,
+    crop,
+    normalize_rect,
+    offset_bbox,
+    recognize_crops,
+)
+from .resolution import load_resolution_config, prepare_ocr_input, to_source_coordinates
+from .result_store import (
+    HEADER_FIELDS,
+    LEGACY_JSON_SUFFIX,
+    OCR_STORE_SUFFIX,
+    RESULT_FIELDS,
+    read_header,
+    read_result,
+    write_result,
+)
+from .search_index import get_search_index
+from .strategy import (
+    OCR_STRATEGY_FALLBACK,
+    OCR_STRATEGY_FAST_PREVIEW,
+    OCR_STRATEGY_PADDLE,
+    OCR_STRATEGY_TESSERACT,
+    fast_preview_max_side,
+    resolve_strategy,
+    run_tesseract,
+    uses_llm,
+)
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Unit types the LLM may assign to a structured unit
+UNIT_TYPES = ("title", "heading", "paragraph", "list_item", "table_cell", "footer", "other")
+
+# Prompt template versions - bump when a prompt changes to invalidate cached answers
+PROMPT_VERSIONS = {"structure": 1, "analyze": 1, "title": 1, "filename": 1}
+# Generation caps per prompt (override via OCR_CONFIG["llm_num_predict"])
+DEFAULT_NUM_PREDICT = {"structure": 2000, "analyze": 2000, "title": 50, "filename": 30}
+
+
+def _num_predict(template: str) -> int:
+    try:
+        from app.config.settings import OCR_CONFIG
+
+        configured = OCR_CONFIG.get("llm_num_predict", {}).get(template)
+    except Exception:
+        configured = None
+    return int(configured or DEFAULT_NUM_PREDICT[template])
+
+# JSON schema for the combined post-processing call (Ollama "format" field)
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "filename": {"type": "string"},
+        "units": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "text": {"type": "string"},
+                    "indices": {"type": "array", "items": {"type": "integer"}},
+                    "type": {"type": "string", "enum": list(UNIT_TYPES)},
+                },
+                "required": ["text", "indices", "type"],
+            },
+        },
+    },
+    "required": ["title", "filename", "units"],
+}
+
 # Lazy load PaddleOCR to avoid import overhead
 _paddle_ocr_instance = None
 
@@ -111,11 +193,21 @@ class OCRResult:
         self.structured_units: List[Dict] = []
         self.full_text: str = ""
         self.derived_title: str = ""
+        self.suggested_filename: str = ""
         self.confidence_avg: float = 0.0
         self.word_count: int = 0
         self.timestamp: str = ""
         self.processing_time_ms: float = 0.0
         self.image_dimensions: Tuple[int, int] = (0, 0)
+        self.strategy: str = ""
+        self.timings: Dict[str, float] = {}  # ms per stage, see profiling.STAGES
+        self.confidence_stats: Dict[str, Any] = {}
+    
+    def to_text(self) -> str:
+        """Plain text with one line per structured unit (for .txt exports)"""
+        if self.structured_units:
+            return "\n".join(unit.get("text", "") for unit in self.structured_units)
+        return self.full_text
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -123,11 +215,15 @@ class OCRResult:
             "structured_units": self.structured_units,
             "full_text": self.full_text,
             "derived_title": self.derived_title,
+            "suggested_filename": self.suggested_filename,
             "confidence_avg": self.confidence_avg,
             "word_count": self.word_count,
             "timestamp": self.timestamp,
             "processing_time_ms": self.processing_time_ms,
             "image_dimensions": list(self.image_dimensions),
+            "strategy": self.strategy,
+            "timings": self.timings,
+            "confidence_stats": self.confidence_stats,
         }
 
 
@@ -136,7 +232,7 @@ class PaddleOCRProcessor:
     PaddleOCR processor with Ollama post-processing for text structuring
     """
     
-    OLLAMA_URL = "http://localhost:11434/api/generate"
+    OLLAMA_URL = "/api/generate"  # Resolved against CONNECTION_CONFIG["ollama"]["base_url"]
     OLLAMA_MODEL = "phi3:mini"  # Using phi3:mini for text structuring
     
     def __init__(self, ocr_data_dir: str):
@@ -148,23 +244,32 @@ class PaddleOCRProcessor:
         """
         self.ocr_data_dir = ocr_data_dir
         os.makedirs(ocr_data_dir, exist_ok=True)
+        self._index: Optional[set] = None
+        self._index_mtime: Optional[int] = None
+        self._index_lock = threading.Lock()
+        # Kept in a subdirectory so cache writes don't invalidate the result index
+        self._llm_cache = open_llm_cache(os.path.join(ocr_data_dir, "cache"))
+        self.search_index = get_search_index(os.path.join(ocr_data_dir, "cache"))
+        if self.search_index:
+            threading.Thread(target=self._backfill_search_index, name="ocr-search-backfill", daemon=True).start()
         logger.info(f"[OK] PaddleOCRProcessor initialized, data dir: {ocr_data_dir}")
     
-    def process_image(self, image_path: str) -> OCRResult:
+    def process_image(self, image_path: str, strategy: Optional[str] = None) -> OCRResult:
         """
-        Run PaddleOCR on an image and return structured results
+        Run OCR on an image and return structured results
         
         Args:
             image_path: Path to the image file
+            strategy: OCR strategy (see strategy.OCR_STRATEGIES); None uses OCR_CONFIG
             
         Returns:
             OCRResult with all extracted data
         """
-        import time
-        start_time = time.time()
+        timer = StageTimer()
         
         result = OCRResult()
         result.timestamp = datetime.now().isoformat()
+        strategy = resolve_strategy(strategy)
         
         try:
             # Validate image exists
@@ -172,7 +277,8 @@ class PaddleOCRProcessor:
                 raise FileNotFoundError(f"Image not found: {image_path}")
             
             # Load image and get dimensions
-            img = cv2.imread(image_path)
+            with timer.stage("load"):
+                img = cv2.imread(image_path)
             if img is None:
                 raise ValueError(f"Could not load image: {image_path}")
             
@@ -181,90 +287,14 @@ class PaddleOCRProcessor:
             logger.info(f"[OCR] Processing image: {os.path.basename(image_path)}")
             logger.info(f"[OCR] Image dimensions: {result.image_dimensions}")
             
-            # Run PaddleOCR v3.3+ (cls parameter removed - angle classification is automatic)
-            # Suppress any connectivity check messages during OCR processing
-            import sys
-            from io import StringIO
-            
-            ocr = get_paddle_ocr()
-            
-            # Suppress output from ocr.ocr() call to prevent connectivity check messages
-            old_stdout = sys.stdout
-            old_stderr = sys.stderr
-            sys.stdout = StringIO()
-            sys.stderr = StringIO()
-            
-            try:
-                ocr_output = ocr.ocr(image_path)
-            finally:
-                sys.stdout = old_stdout
-                sys.stderr = old_stderr
-            
-            print(f"[DEBUG] OCR raw output type: {type(ocr_output)}, has data: {bool(ocr_output)}")
-            
-            # Extract results from OCRResult object (dict-like structure in PaddleX 3.x)
-            ocr_results = []
-            if ocr_output and len(ocr_output) > 0:
-                page_result = ocr_output[0]
-                print(f"[DEBUG] ocr_output[0] type: {type(page_result)}")
-                
-                # OCRResult is dict-like - use bracket access, not getattr
-                # Keys: rec_texts, rec_scores, dt_polys, rec_polys, etc.
-                try:
-                    # Try dict-style access (PaddleX 3.x OCRResult is dict-like)
-                    if hasattr(page_result, 'keys'):
-                        keys = list(page_result.keys())
-                        print(f"[DEBUG] OCRResult keys: {keys}")
-                        
-                        # Get the actual data using dict access
-                        rec_texts = page_result.get('rec_texts', [])
-                        rec_scores = page_result.get('rec_scores', [])
-                        dt_polys = page_result.get('dt_polys', [])
-                        
-                        print(f"[DEBUG] rec_texts ({len(rec_texts) if rec_texts else 0}): {rec_texts[:2] if rec_texts else 'empty'}...")
-                        print(f"[DEBUG] rec_scores ({len(rec_scores) if rec_scores else 0}): {rec_scores[:2] if rec_scores else 'empty'}...")
-                        print(f"[DEBUG] dt_polys ({len(dt_polys) if dt_polys else 0})")
-                        
-                        if rec_texts and dt_polys:
-                            # Build results from parallel arrays
-                            for i in range(len(rec_texts)):
-                                text = rec_texts[i] if i < len(rec_texts) else ""
-                                bbox = dt_polys[i] if i < len(dt_polys) else None
-                                score = rec_scores[i] if rec_scores and i < len(rec_scores) else 0.0
-                                if text and bbox is not None:
-                                    ocr_results.append({
-                                        'text': str(text).strip(),
-                                        'bbox': bbox,
-                                        'confidence': float(score) if score else 0.0
-                                    })
-                            print(f"[DEBUG] Built {len(ocr_results)} results from parallel arrays")
-                    else:
-                        print(f"[DEBUG] OCRResult has no 'keys' method, trying direct attribute access")
-                        # Fallback to attribute access
-                        rec_texts = getattr(page_result, 'rec_texts', None) or getattr(page_result, 'rec_text', [])
-                        rec_scores = getattr(page_result, 'rec_scores', None) or getattr(page_result, 'rec_score', [])
-                        dt_polys = getattr(page_result, 'dt_polys', [])
-                        
-                        if rec_texts and dt_polys:
-                            for i in range(len(rec_texts)):
-                                text = rec_texts[i] if i < len(rec_texts) else ""
-                                bbox = dt_polys[i] if i < len(dt_polys) else None
-                                score = rec_scores[i] if rec_scores and i < len(rec_scores) else 0.0
-                                if text and bbox is not None:
-                                    ocr_results.append({
-                                        'text': str(text).strip(),
-                                        'bbox': bbox,
-                                        'confidence': float(score) if score else 0.0
-                                    })
-                            print(f"[DEBUG] Built {len(ocr_results)} from attribute access")
-                except Exception as extract_err:
-                    print(f"[DEBUG] Extraction error: {extract_err}")
+            result.strategy = strategy
+            ocr_results = self._run_engines(img, strategy, timer)
             
             if not ocr_results:
                 logger.warning(f"[OCR] No text detected in image (empty or no extractable results)")
                 result.full_text = ""
                 result.derived_title = "Untitled Document"
-                result.processing_time_ms = (time.time() - start_time) * 1000
+                self._finish_profile(result, timer, image_path)
                 return result
             
             # Process OCR results
@@ -273,16 +303,17 @@ class PaddleOCRProcessor:
             total_confidence = 0.0
             skipped_entries = 0
             
-            for idx, line in enumerate(ocr_results):
-                parsed = self._parse_ocr_line(line)
-                if not parsed:
-                    print(f"[DEBUG] Entry {idx} skipped - raw type: {type(line)}, content: {str(line)[:100]}")
-                    skipped_entries += 1
-                    continue
+            with timer.stage("parse"):
+                for idx, line in enumerate(ocr_results):
+                    parsed = self._parse_ocr_line(line)
+                    if not parsed:
+                        print(f"[DEBUG] Entry {idx} skipped - raw type: {type(line)}, content: {str(line)[:100]}")
+                        skipped_entries += 1
+                        continue
 
-                raw_results.append(parsed)
-                all_text_parts.append(parsed["text"])
-                total_confidence += parsed["confidence"]
+                    raw_results.append(parsed)
+                    all_text_parts.append(parsed["text"])
+                    total_confidence += parsed["confidence"]
 
             if skipped_entries:
                 logger.info(f"[OCR] Skipped {skipped_entries} entries, processed {len(raw_results)} successfully")
@@ -297,15 +328,23 @@ class PaddleOCRProcessor:
             logger.info(f"[OCR] Average confidence: {result.confidence_avg:.2%}")
             
             # Sort results by reading order (top-to-bottom, left-to-right)
-            result.raw_results = self._sort_by_reading_order(result.raw_results)
-            
-            # Post-process with Ollama to structure text
-            result.structured_units = self._structure_with_ollama(result.raw_results)
+            with timer.stage("sort"):
+                result.raw_results = self._sort_by_reading_order(result.raw_results)
             
-            # Derive document title
-            result.derived_title = self._derive_title_with_ollama(result.full_text, result.raw_results)
+            if uses_llm(strategy):
+                # One Ollama round trip for units, title and filename
+                with timer.stage("llm"):
+                    analysis = self._analyze_with_ollama(result.raw_results, result.full_text)
+                result.structured_units = analysis["structured_units"]
+                result.derived_title = analysis["derived_title"]
+                result.suggested_filename = analysis["suggested_filename"]
+            else:
+                # Previews skip the LLM round trips entirely
+                with timer.stage("structure"):
+                    result.structured_units = self._fallback_structure(result.raw_results)
+                    result.derived_title = self._fallback_title(result.raw_results)
             
-            result.processing_time_ms = (time.time() - start_time) * 1000
+            self._finish_profile(result, timer, image_path)
             logger.info(f"[OCR] Processing complete in {result.processing_time_ms:.0f}ms")
             
             return result
@@ -313,10 +352,286 @@ class PaddleOCRProcessor:
         except Exception as e:
             logger.error(f"[OCR] Error processing image: {e}")
             traceback.print_exc()
-            result.processing_time_ms = (time.time() - start_time) * 1000
             result.derived_title = "Error Processing Document"
+            self._finish_profile(result, timer, image_path)
             return result
     
+    def _finish_profile(self, result: OCRResult, timer: StageTimer, image_path: str) -> None:
+        """Fill timings and confidence stats and feed the /ocr/metrics aggregate"""
+        result.timings = timer.as_dict()
+        result.processing_time_ms = result.timings["total"]
+        result.confidence_stats = confidence_stats(result.raw_results, result.image_dimensions)
+        ocr_metrics.record(
+            os.path.basename(image_path),
+            result.timings,
+            result.confidence_stats,
+            strategy=result.strategy,
+            image_dimensions=result.image_dimensions,
+        )
+        
+        stages = ", ".join(f"{name} {ms:.0f}ms" for name, ms in result.timings.items() if name != "total")
+        logger.info(f"[OCR] Stage timings: {stages}")
+    
+    def process_regions(
+        self,
+        image_path: str,
+        regions: Optional[List[Dict]] = None,
+        unit_ids: Optional[List[int]] = None,
+        strategy: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Re-run OCR on parts of a page only
+        
+        Regions covered by the saved OCR result reuse its detection boxes and
+        only run recognition on those lines; other regions get a detection
+        pass limited to the crop. Nothing is saved - callers decide what to
+        keep (interactive corrections, field extraction).
+        
+        Args:
+            image_path: Path to the image file
+            regions: Rectangles as {x, y, width, height} in page pixels
+            unit_ids: Indices into the saved result's structured_units
+            strategy: OCR strategy for regions without cached boxes
+            
+        Returns:
+            Dict with one entry per region: id, rect, text, confidence, lines, source
+        """
+        start_time = time.time()
+        
+        regions = list(regions or [])
+        unit_ids = list(unit_ids or [])
+        if not regions and not unit_ids:
+            raise ValueError("No regions or unit_ids given")
+        if len(regions) + len(unit_ids) > MAX_REGIONS:
+            raise ValueError(f"At most {MAX_REGIONS} regions per request")
+        
+        img = cv2.imread(image_path)
+        if img is None:
+            raise FileNotFoundError(f"Image not found: {image_path}")
+        image_size = (img.shape[1], img.shape[0])
+        
+        cached = self.load_result(os.path.basename(image_path), fields=["raw_results", "structured_units"]) or {}
+        raw_results = cached.get("raw_results") or []
+        units = cached.get("structured_units") or []
+        boxes = boxes_to_array(raw_results)
+        
+        # Resolve every request entry to a rect plus the cached lines it covers
+        jobs = []
+        for unit_id in unit_ids:
+            if not isinstance(unit_id, int) or not 0 <= unit_id < len(units):
+                raise ValueError(f"Unknown unit id: {unit_id}")
+            unit = units[unit_id]
+            indices = [i for i in unit.get("word_indices") or [] if 0 <= i < len(raw_results)]
+            rect = normalize_rect(unit.get("bbox"), image_size)
+            if rect is None:
+                raise ValueError(f"Unit {unit_id} has no usable bbox")
+            jobs.append({"id": f"unit-{unit_id}", "rect": rect, "indices": indices or boxes_in_rect(boxes, rect)})
+        
+        for i, region in enumerate(regions):
+            rect = normalize_rect(region, image_size)
+            if rect is None:
+                raise ValueError(f"Invalid region {i}: expected x, y, width, height inside the image")
+            region_id = region.get("id", f"region-{i}") if isinstance(region, dict) else f"region-{i}"
+            jobs.append({"id": region_id, "rect": rect, "indices": boxes_in_rect(boxes, rect)})
+        
+        # One batched recogniser call for all cached line boxes
+        line_refs = [(job_idx, i) for job_idx, job in enumerate(jobs) for i in job["indices"]]
+        line_crops = [crop(img, raw_results[i]["bbox"], DEFAULT_LINE_PADDING) for _, i in line_refs]
+        recognized = recognize_crops(line_crops)
+        
+        lines_by_job: Dict[int, List[Dict]] = {}
+        for (job_idx, i), (text, confidence) in zip(line_refs, recognized):
+            if text:
+                lines_by_job.setdefault(job_idx, []).append(
+                    {"text": text, "confidence": confidence, "bbox": raw_results[i]["bbox"], "index": i}
+                )
+        
+        output = []
+        for job_idx, job in enumerate(jobs):
+            rect = job["rect"]
+            if job["indices"]:
+                source = "cached_boxes"
+                lines = self._sort_by_reading_order(lines_by_job.get(job_idx, []))
+            else:
+                source = "detected"
+                lines = []
+                for line in self._run_engines(crop(img, rect), resolve_strategy(strategy)):
+                    parsed = self._parse_ocr_line(line)
+                    if parsed:
+                        parsed["bbox"] = offset_bbox(parsed["bbox"], rect["x"], rect["y"])
+                        lines.append(parsed)
+                lines = self._sort_by_reading_order(lines)
+            
+            output.append({
+                "id": job["id"],
+                "rect": rect,
+                "text": " ".join(line["text"] for line in lines),
+                "confidence": round(sum(line["confidence"] for line in lines) / len(lines), 4) if lines else 0.0,
+                "lines": lines,
+                "source": source,
+            })
+        
+        processing_time_ms = (time.time() - start_time) * 1000
+        logger.info(
+            f"[OCR] Re-read {len(output)} region(s) of {os.path.basename(image_path)} "
+            f"({len(line_crops)} cached lines) in {processing_time_ms:.0f}ms"
+        )
+        return {
+            "regions": output,
+            "cached_boxes": bool(raw_results),
+            "processing_time_ms": round(processing_time_ms, 2),
+        }
+    
+    def _run_engines(self, img: np.ndarray, strategy: str, timer: Optional[StageTimer] = None) -> List[Dict]:
+        """
+        Run exactly the engine pass(es) the strategy calls for
+        
+        Tesseract only runs under the fallback strategy when PaddleOCR is
+        unavailable or finds no text, so the default path is a single pass.
+        
+        Args:
+            img: Page image (BGR)
+            strategy: Resolved OCR strategy name
+            timer: Optional stage timer (prepare / inference)
+            
+        Returns:
+            List of {'text', 'bbox', 'confidence'} dicts in source coordinates
+        """
+        timer = timer or StageTimer()
+        
+        if strategy == OCR_STRATEGY_TESSERACT:
+            logger.info("[OCR] Engine: tesseract")
+            with timer.stage("inference"):
+                return run_tesseract(img)
+        
+        if strategy == OCR_STRATEGY_FAST_PREVIEW:
+            logger.info("[OCR] Engine: tesseract (fast preview)")
+            with timer.stage("inference"):
+                return run_tesseract(img, max_side=fast_preview_max_side())
+        
+        try:
+            logger.info("[OCR] Engine: paddle")
+            ocr_results = self._run_paddle(img, timer)
+        except Exception as e:
+            if strategy == OCR_STRATEGY_PADDLE:
+                raise
+            logger.warning(f"[OCR] PaddleOCR failed ({e}), falling back to Tesseract")
+            ocr_results = []
+        
+        if not ocr_results and strategy == OCR_STRATEGY_FALLBACK:
+            logger.info("[OCR] Engine: tesseract (fallback)")
+            with timer.stage("inference"):
+                return run_tesseract(img)
+        
+        return ocr_results
+    
+    def _run_paddle(self, img: np.ndarray, timer: Optional[StageTimer] = None) -> List[Dict]:
+        """
+        Run PaddleOCR on a loaded page and return line results in source coordinates
+        
+        Args:
+            img: Page image (BGR)
+            timer: Optional stage timer (prepare / inference / parse)
+            
+        Returns:
+            List of {'text', 'bbox', 'confidence'} dicts
+        """
+        timer = timer or StageTimer()
+        
+        # Rescale/crop so text reaches the recogniser's preferred height
+        with timer.stage("prepare"):
+            ocr_input, transform = prepare_ocr_input(img, load_resolution_config())
+        logger.info(
+            f"[OCR] Input {ocr_input.shape[1]}x{ocr_input.shape[0]} "
+            f"(text height: {transform['text_height']}, scale: {transform['scale']:.2f}, "
+            f"cropped: {transform['cropped']})"
+        )
+
+        # Run PaddleOCR v3.3+ (cls parameter removed - angle classification is automatic)
+        # Suppress any connectivity check messages during OCR processing
+        import sys
+        from io import StringIO
+
+        ocr = get_paddle_ocr()
+
+        # Suppress output from ocr.ocr() call to prevent connectivity check messages
+        old_stdout = sys.stdout
+        old_stderr = sys.stderr
+        sys.stdout = StringIO()
+        sys.stderr = StringIO()
+
+        try:
+            with timer.stage("inference"):
+                ocr_output = ocr.ocr(ocr_input)
+        finally:
+            sys.stdout = old_stdout
+            sys.stderr = old_stderr
+
+        print(f"[DEBUG] OCR raw output type: {type(ocr_output)}, has data: {bool(ocr_output)}")
+        extract_start = time.perf_counter()
+
+        # Extract results from OCRResult object (dict-like structure in PaddleX 3.x)
+        ocr_results = []
+        if ocr_output and len(ocr_output) > 0:
+            page_result = ocr_output[0]
+            print(f"[DEBUG] ocr_output[0] type: {type(page_result)}")
+
+            # OCRResult is dict-like - use bracket access, not getattr
+            # Keys: rec_texts, rec_scores, dt_polys, rec_polys, etc.
+            try:
+                # Try dict-style access (PaddleX 3.x OCRResult is dict-like)
+                if hasattr(page_result, 'keys'):
+                    keys = list(page_result.keys())
+                    print(f"[DEBUG] OCRResult keys: {keys}")
+
+                    # Get the actual data using dict access
+                    rec_texts = page_result.get('rec_texts', [])
+                    rec_scores = page_result.get('rec_scores', [])
+                    dt_polys = page_result.get('dt_polys', [])
+
+                    print(f"[DEBUG] rec_texts ({len(rec_texts) if rec_texts else 0}): {rec_texts[:2] if rec_texts else 'empty'}...")
+                    print(f"[DEBUG] rec_scores ({len(rec_scores) if rec_scores else 0}): {rec_scores[:2] if rec_scores else 'empty'}...")
+                    print(f"[DEBUG] dt_polys ({len(dt_polys) if dt_polys else 0})")
+
+                    if rec_texts and dt_polys:
+                        # Build results from parallel arrays
+                        for i in range(len(rec_texts)):
+                            text = rec_texts[i] if i < len(rec_texts) else ""
+                            bbox = dt_polys[i] if i < len(dt_polys) else None
+                            score = rec_scores[i] if rec_scores and i < len(rec_scores) else 0.0
+                            if text and bbox is not None:
+                                ocr_results.append({
+                                    'text': str(text).strip(),
+                                    'bbox': to_source_coordinates(bbox, transform),
+                                    'confidence': float(score) if score else 0.0
+                                })
+                        print(f"[DEBUG] Built {len(ocr_results)} results from parallel arrays")
+                else:
+                    print(f"[DEBUG] OCRResult has no 'keys' method, trying direct attribute access")
+                    # Fallback to attribute access
+                    rec_texts = getattr(page_result, 'rec_texts', None) or getattr(page_result, 'rec_text', [])
+                    rec_scores = getattr(page_result, 'rec_scores', None) or getattr(page_result, 'rec_score', [])
+                    dt_polys = getattr(page_result, 'dt_polys', [])
+
+                    if rec_texts and dt_polys:
+                        for i in range(len(rec_texts)):
+                            text = rec_texts[i] if i < len(rec_texts) else ""
+                            bbox = dt_polys[i] if i < len(dt_polys) else None
+                            score = rec_scores[i] if rec_scores and i < len(rec_scores) else 0.0
+                            if text and bbox is not None:
+                                ocr_results.append({
+                                    'text': str(text).strip(),
+                                    'bbox': to_source_coordinates(bbox, transform),
+                                    'confidence': float(score) if score else 0.0
+                                })
+                        print(f"[DEBUG] Built {len(ocr_results)} from attribute access")
+            except Exception as extract_err:
+                print(f"[DEBUG] Extraction error: {extract_err}")
+        
+        # Converting PaddleX output is part of parsing, not inference
+        timer.add("parse", (time.perf_counter() - extract_start) * 1000)
+        return ocr_results
+    
     def _parse_ocr_line(self, line: Any) -> Optional[Dict]:
         """Safely parse a PaddleOCR line into text, confidence, and bbox.
         
@@ -445,44 +760,13 @@ class PaddleOCRProcessor:
     def _sort_by_reading_order(self, results: List[Dict]) -> List[Dict]:
         """
         Sort OCR results by reading order (top-to-bottom, left-to-right)
-        Groups text into lines based on vertical proximity
+        Groups text into lines with a vectorized sweep over box centres
         """
         if not results:
             return results
         
-        # Sort by Y first (top to bottom), then X (left to right)
-        # Use a tolerance for Y to group items on the same line
-        line_tolerance = 20  # pixels
-        
-        # Group by approximate Y position
-        lines = []
-        current_line = []
-        current_y = None
-        
-        # Sort by Y position first
-        sorted_by_y = sorted(results, key=lambda r: r["bbox"]["y"])
-        
-        for item in sorted_by_y:
-            item_y = item["bbox"]["y"]
-            
-            if current_y is None:
-                current_y = item_y
-                current_line = [item]
-            elif abs(item_y - current_y) <= line_tolerance:
-                current_line.append(item)
-            else:
-                # Sort current line by X and add to lines
-                current_line.sort(key=lambda r: r["bbox"]["x"])
-                lines.extend(current_line)
-                current_line = [item]
-                current_y = item_y
-        
-        # Don't forget the last line
-        if current_line:
-            current_line.sort(key=lambda r: r["bbox"]["x"])
-            lines.extend(current_line)
-        
-        return lines
+        order = reading_order(boxes_to_array(results))
+        return [results[i] for i in order]
     
     def _structure_with_ollama(self, raw_results: List[Dict]) -> List[Dict]:
         """
@@ -492,6 +776,13 @@ class PaddleOCRProcessor:
         if not raw_results:
             return []
         
+        fragments = self._fragments_key(raw_results)
+        cached_units = self._cache_get("structure", fragments)
+        if cached_units is not None:
+            structured = self._units_from_llm(cached_units, raw_results)
+            if structured:
+                return structured
+        
         # Build text with position info for Ollama
         text_with_positions = []
         for i, item in enumerate(raw_results):
@@ -516,55 +807,30 @@ Respond in JSON format only:
 ]}}"""
 
         try:
-            response = requests.post(
+            # Stream and stop as soon as the JSON object closes
+            response_text = get_llm_client().stream_generate(
                 self.OLLAMA_URL,
-                json={
+                {
                     "model": self.OLLAMA_MODEL,
                     "prompt": prompt,
-                    "stream": False,
                     "options": {
                         "temperature": 0.1,
-                        "num_predict": 2000,
+                        "num_predict": _num_predict("structure"),
                     }
                 },
-                timeout=30
+                name="ocr.structure",
+                timeout=30,
+                stop=stop_after_json_object(),
             )
             
-            if response.status_code == 200:
-                result = response.json()
-                response_text = result.get("response", "")
-                
-                # Extract JSON from response
-                json_match = re.search(r'\{[\s\S]*\}', response_text)
-                if json_match:
-                    parsed = json.loads(json_match.group())
-                    units = parsed.get("units", [])
-                    
-                    # Enrich units with bbox info
-                    structured = []
-                    for unit in units:
-                        indices = unit.get("indices", [])
-                        if indices:
-                            # Calculate combined bounding box
-                            boxes = [raw_results[i]["bbox"] for i in indices if i < len(raw_results)]
-                            if boxes:
-                                combined_bbox = {
-                                    "x": min(b["x"] for b in boxes),
-                                    "y": min(b["y"] for b in boxes),
-                                    "width": max(b["x"] + b["width"] for b in boxes) - min(b["x"] for b in boxes),
-                                    "height": max(b["y"] + b["height"] for b in boxes) - min(b["y"] for b in boxes),
-                                }
-                                avg_confidence = sum(raw_results[i]["confidence"] for i in indices if i < len(raw_results)) / len(indices)
-                                
-                                structured.append({
-                                    "text": unit.get("text", ""),
-                                    "type": unit.get("type", "paragraph"),
-                                    "bbox": combined_bbox,
-                                    "confidence": round(avg_confidence, 4),
-                                    "word_indices": indices,
-                                })
-                    
-                    return structured if structured else self._fallback_structure(raw_results)
+            json_text = extract_json_object(response_text)
+            if json_text:
+                parsed = json.loads(json_text)
+                structured = self._units_from_llm(parsed.get("units", []), raw_results)
+                if structured:
+                    self._cache_put("structure", fragments, parsed.get("units"))
+                    return structured
+                return self._fallback_structure(raw_results)
             
             logger.warning("[OCR] Ollama structuring failed, using fallback")
             return self._fallback_structure(raw_results)
@@ -573,48 +839,161 @@ Respond in JSON format only:
             logger.debug(f"[DEBUG] Ollama structuring unavailable (Ollama not running?): {type(e).__name__}, using fallback")
             return self._fallback_structure(raw_results)
     
+    def _analyze_with_ollama(self, raw_results: List[Dict], full_text: str) -> Dict[str, Any]:
+        """
+        Structure units, derive a title and suggest a filename in a single Ollama call
+        
+        The request carries a JSON schema in Ollama's "format" field so the
+        reply is constrained to {"units", "title", "filename"}. Each field is
+        validated on its own; an invalid or missing field falls back to the
+        local heuristic without discarding the fields that did parse.
+        
+        Args:
+            raw_results: OCR results in reading order
+            full_text: Joined OCR text
+            
+        Returns:
+            Dict with 'structured_units', 'derived_title' and 'suggested_filename'
+        """
+        units: List[Dict] = []
+        title = ""
+        filename = ""
+        
+        fragments = self._fragments_key(raw_results)
+        cached = self._cache_get("analyze", fragments) if full_text.strip() else None
+        if cached is not None:
+            units = self._units_from_llm(cached.get("units"), raw_results)
+            title = self._clean_title(cached.get("title"))
+            filename = self._clean_filename(cached.get("filename"))
+        elif raw_results and full_text.strip():
+            text_with_positions = "\n".join(
+                f"{i}: \"{item['text']}\" (y={item['bbox']['y']})" for i, item in enumerate(raw_results)
+            )
+            prompt = f"""Analyze these OCR text fragments from a scanned document.
+Each fragment has an index, text, and Y-position.
+
+Text fragments:
+{text_with_positions}
+
+Return JSON with:
+- "units": the fragments grouped into logical lines/sentences/paragraphs, each with the combined "text", the fragment "indices" it contains, and a "type" ({", ".join(UNIT_TYPES)})
+- "title": a concise, descriptive document title (3-8 words)
+- "filename": a SHORT filename (2-5 words, lowercase, underscores, no extension), e.g. invoice_march_2024, student_id_card, electricity_bill"""
+
+            try:
+                response_text = get_llm_client().stream_generate(
+                    self.OLLAMA_URL,
+                    {
+                        "model": self.OLLAMA_MODEL,
+                        "prompt": prompt,
+                        "format": ANALYSIS_SCHEMA,
+                        "options": {
+                            "temperature": 0.1,
+                            "num_predict": _num_predict("analyze"),
+                        }
+                    },
+                    name="ocr.analyze",
+                    timeout=30,
+                    stop=stop_after_json_object(),
+                )
+                
+                json_text = extract_json_object(response_text)
+                parsed = json.loads(json_text) if json_text else {}
+                if isinstance(parsed, dict):
+                    units = self._units_from_llm(parsed.get("units"), raw_results)
+                    title = self._clean_title(parsed.get("title"))
+                    filename = self._clean_filename(parsed.get("filename"))
+                    if units or title or filename:
+                        self._cache_put("analyze", fragments, {
+                            "units": parsed.get("units") if units else None,
+                            "title": title,
+                            "filename": filename,
+                        })
+            except Exception as e:
+                logger.debug(f"[DEBUG] Ollama analysis unavailable (Ollama not running?): {type(e).__name__}, using fallbacks")
+        
+        if not units:
+            units = self._fallback_structure(raw_results)
+        if not title:
+            title = self._fallback_title(raw_results)
+        if filename:
+            logger.info(f"[OCR] Ollama generated filename: {filename}")
+        
+        return {
+            "structured_units": units,
+            "derived_title": title,
+            "suggested_filename": filename,
+        }
+    
+    def _units_from_llm(self, units: Any, raw_results: List[Dict]) -> List[Dict]:
+        """
+        Validate LLM-proposed units and enrich them with bbox/confidence
+        
+        Units whose indices are missing or out of range are dropped.
+        """
+        if not isinstance(units, list):
+            return []
+        
+        boxes = boxes_to_array(raw_results)
+        confidences = np.array([item["confidence"] for item in raw_results], dtype=np.float32)
+        
+        structured = []
+        for unit in units:
+            if not isinstance(unit, dict):
+                continue
+            indices = [
+                i for i in unit.get("indices") or []
+                if isinstance(i, int) and not isinstance(i, bool) and 0 <= i < len(raw_results)
+            ]
+            if not indices:
+                continue
+            text = unit.get("text")
+            if not isinstance(text, str) or not text.strip():
+                text = " ".join(raw_results[i]["text"] for i in indices)
+            unit_type = unit.get("type")
+            structured.append({
+                "text": text.strip(),
+                "type": unit_type if unit_type in UNIT_TYPES else "paragraph",
+                "bbox": combine_boxes(boxes[indices]),
+                "confidence": round(float(confidences[indices].mean()), 4),
+                "word_indices": indices,
+            })
+        return structured
+    
+    def _clean_title(self, title: Any) -> str:
+        """Normalise an LLM title; empty string if unusable"""
+        if not isinstance(title, str):
+            return ""
+        title = title.strip().strip('"\'')
+        title = re.sub(r'^(title:|document title:)\s*', '', title, flags=re.IGNORECASE)
+        return title if title and len(title) <= 100 else ""
+    
+    def _clean_filename(self, filename: Any) -> str:
+        """Normalise an LLM filename; empty string if unusable"""
+        if not isinstance(filename, str):
+            return ""
+        filename = filename.strip().lower()
+        filename = re.sub(r'[^a-z0-9_]', '_', filename)
+        filename = re.sub(r'_+', '_', filename)
+        filename = filename.strip('_')
+        return filename if 3 <= len(filename) <= 50 else ""
+    
     def _fallback_structure(self, raw_results: List[Dict]) -> List[Dict]:
         """
         Fallback structuring when Ollama is unavailable
-        Groups text by vertical proximity
+        Groups text into lines and blocks with the vectorized layout engine
         """
         if not raw_results:
             return []
         
-        line_tolerance = 25
-        lines = []
-        current_line = []
-        current_y = None
-        
-        for item in raw_results:
-            item_y = item["bbox"]["y"]
-            
-            if current_y is None or abs(item_y - current_y) <= line_tolerance:
-                current_line.append(item)
-                if current_y is None:
-                    current_y = item_y
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = [item]
-                current_y = item_y
-        
-        if current_line:
-            lines.append(current_line)
+        layout = analyze_layout(raw_results)
+        boxes = boxes_to_array(raw_results)
+        confidences = np.array([item["confidence"] for item in raw_results], dtype=np.float32)
         
         # Convert to structured units
         structured = []
-        for i, line in enumerate(lines):
-            text = " ".join(item["text"] for item in line)
-            boxes = [item["bbox"] for item in line]
-            avg_confidence = sum(item["confidence"] for item in line) / len(line)
-            
-            combined_bbox = {
-                "x": min(b["x"] for b in boxes),
-                "y": min(b["y"] for b in boxes),
-                "width": max(b["x"] + b["width"] for b in boxes) - min(b["x"] for b in boxes),
-                "height": max(b["y"] + b["height"] for b in boxes) - min(b["y"] for b in boxes),
-            }
+        for i, line in enumerate(layout["lines"]):
+            text = " ".join(raw_results[j]["text"] for j in line)
             
             # Guess type based on position and text
             unit_type = "paragraph"
@@ -626,9 +1005,10 @@ Respond in JSON format only:
             structured.append({
                 "text": text,
                 "type": unit_type,
-                "bbox": combined_bbox,
-                "confidence": round(avg_confidence, 4),
-                "word_indices": list(range(len(line))),
+                "bbox": combine_boxes(boxes[line]),
+                "confidence": round(float(confidences[line].mean()), 4),
+                "word_indices": line,
+                "block": layout["line_blocks"][i],
             })
         
         return structured
@@ -642,6 +1022,9 @@ Respond in JSON format only:
         
         # Get first few lines for context
         first_lines = full_text[:500]
+        cached_title = self._cache_get("title", first_lines)
+        if cached_title:
+            return cached_title
         
         prompt = f"""Based on this document text, derive a concise, descriptive title (3-8 words).
 The title should capture the main subject/purpose of the document.
@@ -652,28 +1035,26 @@ Document text:
 Respond with ONLY the title, no explanation or quotes."""
 
         try:
-            response = requests.post(
+            # Only the first line is used, so stop generating once it ends
+            response_text = get_llm_client().stream_generate(
                 self.OLLAMA_URL,
-                json={
+                {
                     "model": self.OLLAMA_MODEL,
                     "prompt": prompt,
-                    "stream": False,
                     "options": {
                         "temperature": 0.3,
-                        "num_predict": 50,
+                        "num_predict": _num_predict("title"),
                     }
                 },
-                timeout=15
+                name="ocr.title",
+                timeout=15,
+                stop=stop_after_first_line(),
             )
             
-            if response.status_code == 200:
-                result = response.json()
-                title = result.get("response", "").strip()
-                # Clean up title
-                title = title.strip('"\'')
-                title = re.sub(r'^(title:|document title:)\s*', '', title, flags=re.IGNORECASE)
-                if title and len(title) <= 100:
-                    return title
+            title = self._clean_title(first_line(response_text))
+            if title:
+                self._cache_put("title", first_lines, title)
+                return title
             
             # Fallback: use first text as title
             return self._fallback_title(raw_results)
@@ -710,8 +1091,10 @@ Respond with ONLY the title, no explanation or quotes."""
         if not result.full_text.strip():
             return f"scan_{timestamp}" if timestamp else "scan_untitled"
         
-        # Use derived_title if available, or derive one
-        title = result.derived_title if result.derived_title and result.derived_title != "Untitled Document" else None
+        # Prefer the filename from the combined analysis call, then the title
+        title = result.suggested_filename or None
+        if not title and result.derived_title and result.derived_title != "Untitled Document":
+            title = result.derived_title
         
         if not title:
             title = self._derive_filename_with_ollama(result.full_text)
@@ -731,6 +1114,9 @@ Respond with ONLY the title, no explanation or quotes."""
         """
         # Get first portion of text
         first_text = full_text[:500]
+        cached_filename = self._cache_get("filename", first_text)
+        if cached_filename:
+            return cached_filename
         
         prompt = f"""Based on this document text, generate a SHORT filename (2-5 words, no spaces use underscores).
 The filename should describe the document's content/purpose.
@@ -742,30 +1128,26 @@ Document text:
 Respond with ONLY the filename (lowercase, underscores, no extension)."""
 
         try:
-            response = requests.post(
+            response_text = get_llm_client().stream_generate(
                 self.OLLAMA_URL,
-                json={
+                {
                     "model": self.OLLAMA_MODEL,
                     "prompt": prompt,
-                    "stream": False,
                     "options": {
                         "temperature": 0.3,
-                        "num_predict": 30,
+                        "num_predict": _num_predict("filename"),
                     }
                 },
-                timeout=15
+                name="ocr.filename",
+                timeout=15,
+                stop=stop_after_first_line(),
             )
             
-            if response.status_code == 200:
-                result = response.json()
-                filename = result.get("response", "").strip().lower()
-                # Clean up
-                filename = re.sub(r'[^a-z0-9_]', '_', filename)
-                filename = re.sub(r'_+', '_', filename)
-                filename = filename.strip('_')
-                if filename and 3 <= len(filename) <= 50:
-                    logger.info(f"[OCR] Ollama generated filename: {filename}")
-                    return filename
+            filename = self._clean_filename(first_line(response_text))
+            if filename:
+                self._cache_put("filename", first_text, filename)
+                logger.info(f"[OCR] Ollama generated filename: {filename}")
+                return filename
             
             return self._fallback_filename_from_text(first_text)
             
@@ -773,6 +1155,36 @@ Respond with ONLY the filename (lowercase, underscores, no extension)."""
             logger.warning(f"[OCR] Ollama filename generation error: {e}")
             return self._fallback_filename_from_text(first_text)
     
+    @staticmethod
+    def _fragments_key(raw_results: List[Dict]) -> str:
+        """
+        Cache input for the fragment prompts (structure, analyze)
+
+        A JSON list of [text, y] per fragment: cached answers hold fragment
+        indices, so the key has to keep fragment boundaries, which the
+        cache's whitespace folding would erase from newline-joined text.
+        y is part of the prompt and steers the grouping, so it is keyed too.
+        """
+        return json.dumps([[item["text"], item["bbox"]["y"]] for item in raw_results], ensure_ascii=False)
+    
+    def _cache_get(self, template: str, text: str) -> Any:
+        """Cached LLM answer for this prompt template and input text (None on miss)"""
+        if not self._llm_cache:
+            return None
+        try:
+            return self._llm_cache.get(self.OLLAMA_MODEL, template, PROMPT_VERSIONS[template], text)
+        except Exception as e:
+            logger.debug(f"[DEBUG] LLM cache read failed: {e}")
+            return None
+    
+    def _cache_put(self, template: str, text: str, value: Any) -> None:
+        if not self._llm_cache:
+            return
+        try:
+            self._llm_cache.put(self.OLLAMA_MODEL, template, PROMPT_VERSIONS[template], text, value)
+        except Exception as e:
+            logger.debug(f"[DEBUG] LLM cache write failed: {e}")
+    
     def _fallback_filename_from_text(self, text: str) -> str:
         """Fallback filename generation from first words"""
         words = re.findall(r'[a-zA-Z]+', text)[:3]
@@ -794,55 +1206,135 @@ Respond with ONLY the filename (lowercase, underscores, no extension)."""
             filename = filename[:50].rsplit('_', 1)[0]
         return filename or "untitled"
     
+    def _result_paths(self, filename: str) -> Tuple[str, str]:
+        """Compact store path and legacy JSON path for an image filename"""
+        base_name = os.path.splitext(filename)[0]
+        return (
+            os.path.join(self.ocr_data_dir, f"{base_name}{OCR_STORE_SUFFIX}"),
+            os.path.join(self.ocr_data_dir, f"{base_name}{LEGACY_JSON_SUFFIX}"),
+        )
+    
+    def _result_index(self) -> set:
+        """
+        Base names that have OCR results, rebuilt only when the directory changes
+        
+        One stat of the results directory replaces a stat per file on
+        /files and OCR-status calls.
+        """
+        try:
+            mtime = os.stat(self.ocr_data_dir).st_mtime_ns
+        except OSError:
+            return set()
+        
+        with self._index_lock:
+            if self._index is None or mtime != self._index_mtime:
+                names = set()
+                with os.scandir(self.ocr_data_dir) as entries:
+                    for entry in entries:
+                        for suffix in (OCR_STORE_SUFFIX, LEGACY_JSON_SUFFIX):
+                            if entry.name.endswith(suffix):
+                                names.add(entry.name[:-len(suffix)])
+                self._index = names
+                self._index_mtime = mtime
+            return self._index
+    
     def save_result(self, filename: str, result: OCRResult) -> str:
         """
-        Save OCR result to JSON file
+        Save OCR result to the compact store (see result_store)
         
         Args:
             filename: Original image filename
             result: OCR result to save
             
         Returns:
-            Path to saved JSON file
+            Path to saved result file
         """
-        # Create filename for OCR result
-        base_name = os.path.splitext(filename)[0]
-        json_filename = f"{base_name}_ocr.json"
-        json_path = os.path.join(self.ocr_data_dir, json_filename)
+        store_path, legacy_path = self._result_paths(filename)
+        write_result(store_path, result.to_dict())
+        
+        # The compact file supersedes any earlier JSON result
+        if os.path.exists(legacy_path):
+            os.remove(legacy_path)
         
-        # Save result
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(result.to_dict(), f, indent=2, ensure_ascii=False)
+        if self.search_index:
+            try:
+                self.search_index.upsert(filename, result.derived_title, result.full_text)
+            except Exception as e:
+                logger.warning(f"[WARN] Search index update failed for {filename}: {e}")
         
-        logger.info(f"[OCR] Result saved to: {json_path}")
-        return json_path
+        logger.info(f"[OCR] Result saved to: {store_path}")
+        return store_path
     
-    def load_result(self, filename: str) -> Optional[Dict]:
+    def load_result(self, filename: str, fields: Optional[List[str]] = None) -> Optional[Dict]:
         """
         Load existing OCR result for a file
         
         Args:
             filename: Original image filename
+            fields: Only decode these fields (e.g. ["full_text"]); None loads everything.
+                Names outside RESULT_FIELDS are ignored, whichever format is on disk
             
         Returns:
             OCR result dict or None if not found
         """
-        base_name = os.path.splitext(filename)[0]
-        json_filename = f"{base_name}_ocr.json"
-        json_path = os.path.join(self.ocr_data_dir, json_filename)
+        store_path, legacy_path = self._result_paths(filename)
+        if fields is not None:
+            fields = [field for field in fields if field in RESULT_FIELDS]
+        
+        if os.path.exists(store_path):
+            return read_result(store_path, fields)
         
-        if os.path.exists(json_path):
-            with open(json_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        if os.path.exists(legacy_path):
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if fields is not None:
+                return {field: data.get(field) for field in fields}
+            return data
         
         return None
     
+    def load_header(self, filename: str) -> Optional[Dict]:
+        """Load only the OCR header (title, word count, confidence, timing)"""
+        store_path, _ = self._result_paths(filename)
+        if os.path.exists(store_path):
+            return read_header(store_path)
+        return self.load_result(filename, fields=list(HEADER_FIELDS))
+    
     def has_ocr_result(self, filename: str) -> bool:
         """Check if OCR result exists for a file"""
-        base_name = os.path.splitext(filename)[0]
-        json_filename = f"{base_name}_ocr.json"
-        json_path = os.path.join(self.ocr_data_dir, json_filename)
-        return os.path.exists(json_path)
+        return os.path.splitext(filename)[0] in self._result_index()
+    
+    def delete_result(self, filename: str) -> bool:
+        """Delete stored OCR result (compact and legacy) for a file"""
+        deleted = False
+        for path in self._result_paths(filename):
+            if os.path.exists(path):
+                os.remove(path)
+                deleted = True
+        if self.search_index:
+            try:
+                self.search_index.delete(filename)
+            except Exception as e:
+                logger.warning(f"[WARN] Search index delete failed for {filename}: {e}")
+        return deleted
+    
+    def _backfill_search_index(self) -> None:
+        """Index OCR results saved before the search index existed"""
+        try:
+            missing = self._result_index() - self.search_index.indexed_ids()
+            if not missing:
+                return
+            
+            def documents():
+                for base_name in sorted(missing):
+                    # Base name plus a dummy extension so splitext keeps dotted names intact
+                    data = self.load_result(f"{base_name}.img", fields=["derived_title", "full_text"]) or {}
+                    yield base_name, None, data.get("derived_title"), data.get("full_text")
+            
+            added = self.search_index.backfill(documents())
+            logger.info(f"[OCR] Search index backfilled with {added} existing result(s)")
+        except Exception as e:
+            logger.warning(f"[WARN] Search index backfill failed: {e}")
 
 
 # Global processor instance
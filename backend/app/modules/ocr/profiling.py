@@ -0,0 +1,204 @@
+"""
+OCR Profiling
+Per-stage timings and per-region confidence statistics for OCR results, plus a
+process-wide aggregate so /ocr/metrics can show which stage dominates latency.
+
+Stages recorded by PaddleOCRProcessor.process_image:
+    load       - image decode
+    prepare    - resolution estimate, rescale and crop (PaddleOCR only)
+    inference  - OCR engine call; PaddleOCR runs detection and recognition
+                 as one pipeline call, so they are timed together
+    parse      - conversion of engine output into OCR regions
+    sort       - reading-order sort
+    llm        - Ollama structuring, title and filename (full strategies)
+    structure  - local layout structuring (preview strategies)
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+STAGES = ("load", "prepare", "inference", "parse", "sort", "llm", "structure")
+# Regions below this confidence count as low confidence
+LOW_CONFIDENCE_THRESHOLD = 0.6
+# Heatmap grid (columns, rows) laid over the page
+HEATMAP_GRID = (8, 8)
+HISTOGRAM_BINS = 10
+# Results kept for the aggregate metrics window
+METRICS_WINDOW = 500
+
+
+class StageTimer:
+    """Accumulates wall time per named stage"""
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+    def add(self, name: str, ms: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + ms
+
+    def as_dict(self) -> Dict[str, float]:
+        """Stage timings in ms plus the total since the timer was created"""
+        timings = {name: round(ms, 2) for name, ms in self.stages.items()}
+        timings["total"] = round((time.perf_counter() - self._start) * 1000, 2)
+        return timings
+
+
+def confidence_stats(
+    raw_results: Sequence[Dict[str, Any]],
+    image_dimensions: Tuple[int, int],
+    grid: Tuple[int, int] = HEATMAP_GRID,
+) -> Dict[str, Any]:
+    """
+    Summarise region confidences and build a coarse confidence heatmap
+
+    Args:
+        raw_results: OCR regions with 'confidence' and a 'bbox' dict
+        image_dimensions: (width, height) of the page
+        grid: Heatmap (columns, rows)
+
+    Returns:
+        Dict with count, mean/min/max/median/p10/p90/std, low-confidence
+        count and ratio, a histogram over [0, 1] and a rows x columns grid
+        of mean confidence per cell (None where a cell has no text)
+    """
+    count = len(raw_results)
+    if not count:
+        return {"count": 0}
+
+    confidences = np.array([r.get("confidence", 0.0) for r in raw_results], dtype=np.float32)
+    boxes = np.array(
+        [
+            (r["bbox"]["x"], r["bbox"]["y"], r["bbox"]["width"], r["bbox"]["height"])
+            for r in raw_results
+        ],
+        dtype=np.float32,
+    )
+    p10, median, p90 = np.percentile(confidences, [10, 50, 90])
+    low = int(np.count_nonzero(confidences < LOW_CONFIDENCE_THRESHOLD))
+    histogram, _ = np.histogram(confidences, bins=HISTOGRAM_BINS, range=(0.0, 1.0))
+
+    # Heatmap: mean confidence of the regions whose centre falls in each cell
+    cols, rows = grid
+    width, height = (max(1, int(v)) for v in image_dimensions)
+    cx = np.clip(((boxes[:, 0] + boxes[:, 2] / 2) / width * cols).astype(np.int64), 0, cols - 1)
+    cy = np.clip(((boxes[:, 1] + boxes[:, 3] / 2) / height * rows).astype(np.int64), 0, rows - 1)
+    cells = cy * cols + cx
+    sums = np.bincount(cells, weights=confidences, minlength=rows * cols)
+    hits = np.bincount(cells, minlength=rows * cols)
+    means = np.divide(sums, hits, out=np.zeros_like(sums), where=hits > 0)
+    heatmap = [
+        [round(float(means[r * cols + c]), 3) if hits[r * cols + c] else None for c in range(cols)]
+        for r in range(rows)
+    ]
+
+    return {
+        "count": count,
+        "mean": round(float(confidences.mean()), 4),
+        "min": round(float(confidences.min()), 4),
+        "max": round(float(confidences.max()), 4),
+        "median": round(float(median), 4),
+        "p10": round(float(p10), 4),
+        "p90": round(float(p90), 4),
+        "std": round(float(confidences.std()), 4),
+        "low_confidence_count": low,
+        "low_confidence_ratio": round(low / count, 4),
+        "low_confidence_threshold": LOW_CONFIDENCE_THRESHOLD,
+        "histogram": histogram.tolist(),
+        "heatmap": heatmap,
+    }
+
+
+def dominant_stage(timings: Dict[str, float]) -> Optional[str]:
+    """Name of the slowest stage, ignoring the total"""
+    stages = {name: ms for name, ms in (timings or {}).items() if name != "total"}
+    return max(stages, key=stages.get) if stages else None
+
+
+class OCRMetrics:
+    """Rolling window of recent OCR timings for the /ocr/metrics endpoint"""
+
+    def __init__(self, window: int = METRICS_WINDOW):
+        self._lock = threading.Lock()
+        self._records: Deque[Dict[str, Any]] = deque(maxlen=window)
+        self.total_processed = 0
+
+    def record(
+        self,
+        filename: str,
+        timings: Dict[str, float],
+        stats: Dict[str, Any],
+        strategy: str = "",
+        image_dimensions: Tuple[int, int] = (0, 0),
+    ) -> None:
+        with self._lock:
+            self.total_processed += 1
+            self._records.append({
+                "filename": filename,
+                "strategy": strategy,
+                "timings": dict(timings or {}),
+                "regions": (stats or {}).get("count", 0),
+                "confidence_mean": (stats or {}).get("mean"),
+                "low_confidence_ratio": (stats or {}).get("low_confidence_ratio"),
+                "image_dimensions": list(image_dimensions),
+                "dominant_stage": dominant_stage(timings),
+                "recorded_at": time.time(),
+            })
+
+    def snapshot(self, slowest: int = 10) -> Dict[str, Any]:
+        """
+        Aggregate the window: per-stage mean/p50/p95/max and share of total
+        time, how often each stage dominated, and the slowest documents
+        """
+        with self._lock:
+            records: List[Dict[str, Any]] = list(self._records)
+            total_processed = self.total_processed
+
+        stage_names = sorted({name for r in records for name in r["timings"]})
+        grand_total = sum(r["timings"].get("total", 0.0) for r in records) or 1.0
+        stages = {}
+        for name in stage_names:
+            values = np.array([r["timings"][name] for r in records if name in r["timings"]], dtype=np.float64)
+            p50, p95 = np.percentile(values, [50, 95])
+            stages[name] = {
+                "count": int(values.size),
+                "mean_ms": round(float(values.mean()), 2),
+                "p50_ms": round(float(p50), 2),
+                "p95_ms": round(float(p95), 2),
+                "max_ms": round(float(values.max()), 2),
+                "share": round(float(values.sum()) / grand_total, 4) if name != "total" else 1.0,
+            }
+
+        dominant: Dict[str, int] = {}
+        by_strategy: Dict[str, int] = {}
+        for r in records:
+            if r["dominant_stage"]:
+                dominant[r["dominant_stage"]] = dominant.get(r["dominant_stage"], 0) + 1
+            by_strategy[r["strategy"] or "unknown"] = by_strategy.get(r["strategy"] or "unknown", 0) + 1
+
+        slowest_records = sorted(records, key=lambda r: r["timings"].get("total", 0.0), reverse=True)[:slowest]
+        return {
+            "window": len(records),
+            "total_processed": total_processed,
+            "stages": stages,
+            "dominant_stage_counts": dominant,
+            "strategies": by_strategy,
+            "slowest": slowest_records,
+        }
+
+
+# Process-wide aggregate shared by app.py and the OCR blueprint
+ocr_metrics = OCRMetrics()
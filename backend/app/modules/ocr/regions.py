@@ -0,0 +1,164 @@
+"""
+Region-of-Interest OCR
+Re-reads selected rectangles of a page instead of the whole image. Regions
+covered by a previous OCR result reuse its cached detection boxes and only
+run the recogniser on those line crops; uncovered regions get a detection
+pass limited to the crop.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Pixels added around cached line boxes before recognition
+DEFAULT_LINE_PADDING = 4
+# A cached box belongs to a region when at least this share of it lies inside
+DEFAULT_MIN_OVERLAP = 0.5
+# Region requests larger than this are rejected (use the full-page endpoint)
+MAX_REGIONS = 50
+
+_text_recognizer = None
+_text_recognizer_failed = False
+
+
+def normalize_rect(rect: Any, image_size: Tuple[int, int]) -> Optional[Dict[str, int]]:
+    """
+    Validate a {x, y, width, height} rectangle and clip it to the image
+
+    Args:
+        rect: Rectangle dict from a request or an OCR bbox
+        image_size: (width, height) of the page
+
+    Returns:
+        Clipped rectangle, or None if it is malformed or empty
+    """
+    if not isinstance(rect, dict):
+        return None
+    try:
+        x, y = float(rect["x"]), float(rect["y"])
+        w, h = float(rect["width"]), float(rect["height"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    img_w, img_h = image_size
+    x0, y0 = max(0, int(x)), max(0, int(y))
+    x1, y1 = min(img_w, int(x + w)), min(img_h, int(y + h))
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return {"x": x0, "y": y0, "width": x1 - x0, "height": y1 - y0}
+
+
+def boxes_in_rect(boxes: np.ndarray, rect: Dict[str, int], min_overlap: float = DEFAULT_MIN_OVERLAP) -> List[int]:
+    """
+    Indices of (N, 4) x/y/width/height boxes lying mostly inside rect
+
+    Args:
+        boxes: Box array from layout.boxes_to_array
+        rect: Region rectangle
+        min_overlap: Minimum share of a box's area inside the region
+
+    Returns:
+        Matching indices in input order
+    """
+    if not len(boxes):
+        return []
+    x0 = np.maximum(boxes[:, 0], rect["x"])
+    y0 = np.maximum(boxes[:, 1], rect["y"])
+    x1 = np.minimum(boxes[:, 0] + boxes[:, 2], rect["x"] + rect["width"])
+    y1 = np.minimum(boxes[:, 1] + boxes[:, 3], rect["y"] + rect["height"])
+    inter = np.clip(x1 - x0, 0, None) * np.clip(y1 - y0, 0, None)
+    area = np.maximum(boxes[:, 2] * boxes[:, 3], 1.0)
+    return np.nonzero(inter / area >= min_overlap)[0].tolist()
+
+
+def crop(img: np.ndarray, rect: Dict[str, int], padding: int = 0) -> np.ndarray:
+    """Crop rect (plus padding, clipped to the image) from img"""
+    h, w = img.shape[:2]
+    x0 = max(0, rect["x"] - padding)
+    y0 = max(0, rect["y"] - padding)
+    x1 = min(w, rect["x"] + rect["width"] + padding)
+    y1 = min(h, rect["y"] + rect["height"] + padding)
+    return img[y0:y1, x0:x1]
+
+
+def get_text_recognizer():
+    """
+    Lazy load a recognition-only PaddleOCR model (no detection stage)
+
+    Returns:
+        paddleocr.TextRecognition instance, or None when unavailable
+    """
+    global _text_recognizer, _text_recognizer_failed
+    if _text_recognizer is None and not _text_recognizer_failed:
+        try:
+            from paddleocr import TextRecognition
+
+            _text_recognizer = TextRecognition()
+            logger.info("[OK] PaddleOCR text recogniser initialized for region OCR")
+        except Exception as e:
+            _text_recognizer_failed = True
+            logger.warning(f"[WARN] Recognition-only PaddleOCR unavailable ({e}), regions use Tesseract")
+    return _text_recognizer
+
+
+def _read_prediction(prediction: Any) -> Tuple[str, float]:
+    # PaddleX results are dict-like; older builds expose attributes
+    if hasattr(prediction, "get"):
+        text, score = prediction.get("rec_text", ""), prediction.get("rec_score", 0.0)
+    else:
+        text, score = getattr(prediction, "rec_text", ""), getattr(prediction, "rec_score", 0.0)
+    try:
+        score = float(score or 0.0)
+    except (TypeError, ValueError):
+        score = 0.0
+    return str(text or "").strip(), round(max(0.0, min(1.0, score)), 4)
+
+
+def recognize_crops(crops: Sequence[np.ndarray]) -> List[Tuple[str, float]]:
+    """
+    Recognise single text lines
+
+    All crops go to the recogniser in one batched call; without PaddleOCR each
+    crop is read by Tesseract in single-line mode.
+
+    Args:
+        crops: Line images (BGR)
+
+    Returns:
+        (text, confidence) per crop, in input order
+    """
+    if not crops:
+        return []
+
+    recognizer = get_text_recognizer()
+    if recognizer is not None:
+        try:
+            predictions = list(recognizer.predict(input=list(crops), batch_size=min(len(crops), 16)))
+            if len(predictions) == len(crops):
+                return [_read_prediction(p) for p in predictions]
+            logger.warning(f"[WARN] Recogniser returned {len(predictions)} results for {len(crops)} crops")
+        except Exception as e:
+            logger.warning(f"[WARN] Region recognition failed ({e}), falling back to Tesseract")
+
+    from .strategy import run_tesseract
+
+    results = []
+    for line_img in crops:
+        if line_img.size == 0:
+            results.append(("", 0.0))
+            continue
+        lines = run_tesseract(line_img, config="--oem 3 --psm 7")
+        text = " ".join(line["text"] for line in lines)
+        confidence = float(np.mean([line["confidence"] for line in lines])) if lines else 0.0
+        results.append((text, round(confidence, 4)))
+    return results
+
+
+def offset_bbox(bbox: Dict[str, Any], dx: int, dy: int) -> Dict[str, Any]:
+    """Shift a crop-relative OCR bbox back into page coordinates"""
+    shifted = dict(bbox, x=bbox["x"] + dx, y=bbox["y"] + dy)
+    if "points" in bbox:
+        shifted["points"] = [[px + dx, py + dy] for px, py in bbox["points"]]
+    return shifted
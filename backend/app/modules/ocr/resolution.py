@@ -0,0 +1,191 @@
+"""
+Adaptive OCR Input Resolution
+Estimates the typical text height on a page and rescales/crops the image so the
+recogniser sees glyphs at the size it was trained on
+"""
+
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Defaults mirror OCR_CONFIG["input_resolution"] in app/config/settings.py
+DEFAULT_RESOLUTION_CONFIG = {
+    "enabled": True,
+    "target_text_height": 32,
+    "min_scale": 0.25,
+    "max_scale": 2.0,
+    "max_side": 4000,
+    "crop_to_text": True,
+}
+
+# Connected-component analysis runs on a copy no larger than this
+ANALYSIS_MAX_SIDE = 2000
+# Fewer glyph-like components than this and the estimate is not trusted
+MIN_GLYPH_COMPONENTS = 20
+# Rescaling by less than this fraction is not worth the resize cost
+SCALE_DEADBAND = 0.1
+# Only crop when the text region is noticeably smaller than the page
+CROP_AREA_RATIO = 0.85
+
+
+def load_resolution_config() -> Dict[str, Any]:
+    """Read input resolution settings, falling back to module defaults"""
+    config = DEFAULT_RESOLUTION_CONFIG.copy()
+    try:
+        from app.config.settings import OCR_CONFIG
+
+        config.update(OCR_CONFIG.get("input_resolution", {}))
+    except Exception as e:
+        logger.debug(f"[OCR] Using default input resolution config: {e}")
+    return config
+
+
+def estimate_text_height(
+    image: np.ndarray,
+) -> Tuple[Optional[float], Optional[Tuple[int, int, int, int]]]:
+    """
+    Estimate the median glyph height and the bounding region of text
+
+    Uses connected components on an adaptively thresholded, downscaled copy
+    and keeps only components whose size and fill look like characters.
+
+    Args:
+        image: Input image (BGR or grayscale)
+
+    Returns:
+        Tuple of (text_height_px, (x, y, width, height)) in source pixels,
+        or (None, None) when too little text-like structure was found
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
+    h, w = gray.shape[:2]
+
+    factor = min(1.0, ANALYSIS_MAX_SIDE / float(max(h, w)))
+    if factor < 1.0:
+        small = cv2.resize(gray, (int(w * factor), int(h * factor)), interpolation=cv2.INTER_AREA)
+    else:
+        small = gray
+
+    binary = cv2.adaptiveThreshold(
+        small, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY_INV, 25, 15
+    )
+    count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    if count <= 1:
+        return None, None
+
+    stats = stats[1:]  # Drop background label
+    lefts = stats[:, cv2.CC_STAT_LEFT]
+    tops = stats[:, cv2.CC_STAT_TOP]
+    widths = stats[:, cv2.CC_STAT_WIDTH]
+    heights = stats[:, cv2.CC_STAT_HEIGHT]
+    fill = stats[:, cv2.CC_STAT_AREA] / np.maximum(widths * heights, 1)
+
+    glyphs = (
+        (heights >= 3)
+        & (heights <= small.shape[0] * 0.1)
+        & (widths >= 1)
+        & (widths <= heights * 4)
+        & (fill >= 0.1)
+        & (fill <= 0.95)
+    )
+    if int(np.count_nonzero(glyphs)) < MIN_GLYPH_COMPONENTS:
+        return None, None
+
+    text_height = float(np.median(heights[glyphs])) / factor
+
+    x0 = int(lefts[glyphs].min() / factor)
+    y0 = int(tops[glyphs].min() / factor)
+    x1 = int((lefts[glyphs] + widths[glyphs]).max() / factor)
+    y1 = int((tops[glyphs] + heights[glyphs]).max() / factor)
+
+    return text_height, (x0, y0, x1 - x0, y1 - y0)
+
+
+def prepare_ocr_input(
+    image: np.ndarray, config: Optional[Dict[str, Any]] = None
+) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """
+    Crop and rescale a page so its text matches the recogniser's input size
+
+    Args:
+        image: Full-resolution page (BGR or grayscale)
+        config: Resolution settings (see DEFAULT_RESOLUTION_CONFIG)
+
+    Returns:
+        Tuple of (ocr_image, transform) where transform holds the scale and
+        crop offset needed to map OCR coordinates back to the source image
+    """
+    cfg = DEFAULT_RESOLUTION_CONFIG.copy()
+    if config:
+        cfg.update(config)
+
+    transform: Dict[str, Any] = {
+        "scale": 1.0,
+        "offset": (0, 0),
+        "text_height": None,
+        "cropped": False,
+    }
+    if not cfg.get("enabled", True):
+        return image, transform
+
+    h, w = image.shape[:2]
+    try:
+        text_height, region = estimate_text_height(image)
+    except Exception as e:
+        logger.debug(f"[OCR] Text height estimation failed: {e}")
+        text_height, region = None, None
+
+    transform["text_height"] = round(text_height, 1) if text_height else None
+    work = image
+
+    # Crop to the text region (with a margin) when it saves real area
+    if region is not None and cfg.get("crop_to_text", True):
+        margin = int(max(text_height or 0, 8) * 2)
+        x, y, rw, rh = region
+        x0, y0 = max(0, x - margin), max(0, y - margin)
+        x1, y1 = min(w, x + rw + margin), min(h, y + rh + margin)
+        if (x1 - x0) * (y1 - y0) < CROP_AREA_RATIO * w * h:
+            work = image[y0:y1, x0:x1]
+            transform["offset"] = (x0, y0)
+            transform["cropped"] = True
+
+    scale = 1.0
+    if text_height:
+        scale = float(cfg["target_text_height"]) / text_height
+        scale = max(float(cfg["min_scale"]), min(float(cfg["max_scale"]), scale))
+
+    work_h, work_w = work.shape[:2]
+    max_side = int(cfg.get("max_side") or 0)
+    if max_side and max(work_h, work_w) * scale > max_side:
+        scale = max_side / float(max(work_h, work_w))
+
+    if abs(scale - 1.0) >= SCALE_DEADBAND:
+        interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_CUBIC
+        work = cv2.resize(
+            work,
+            (max(1, int(round(work_w * scale))), max(1, int(round(work_h * scale)))),
+            interpolation=interpolation,
+        )
+        transform["scale"] = scale
+
+    return work, transform
+
+
+def to_source_coordinates(points: Any, transform: Dict[str, Any]) -> np.ndarray:
+    """
+    Map polygon points from OCR input space back to source image pixels
+
+    Args:
+        points: Sequence of [x, y] points in OCR input coordinates
+        transform: Transform returned by prepare_ocr_input
+
+    Returns:
+        Float array of points in source image coordinates
+    """
+    pts = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+    scale = transform.get("scale", 1.0) or 1.0
+    offset = np.asarray(transform.get("offset", (0, 0)), dtype=np.float32)
+    return pts / scale + offset
@@ -0,0 +1,170 @@
+"""
+Compact OCR Result Storage
+Stores OCR results as a deflate-compressed zip container with one member per field:
+a small JSON header, the full text, structured units, and NumPy arrays for
+boxes, polygons and confidences. Readers open only the members they need, so
+title/status lookups never parse region data.
+"""
+
+import io
+import json
+import os
+import zipfile
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+OCR_STORE_SUFFIX = "_ocr.ocrz"
+LEGACY_JSON_SUFFIX = "_ocr.json"
+FORMAT_VERSION = 1
+
+# Fields kept in header.json (everything except the bulky ones)
+HEADER_FIELDS = (
+    "derived_title",
+    "suggested_filename",
+    "confidence_avg",
+    "word_count",
+    "timestamp",
+    "processing_time_ms",
+    "image_dimensions",
+    "strategy",
+    "timings",
+    "confidence_stats",
+)
+# Fields stored as their own members
+BODY_FIELDS = ("full_text", "structured_units", "raw_results")
+# Every field a stored result has (what ?fields= may ask for)
+RESULT_FIELDS = HEADER_FIELDS + BODY_FIELDS
+
+_HEADER = "header.json"
+_FULL_TEXT = "full_text.txt"
+_UNITS = "structured_units.json"
+_TEXTS = "texts.json"
+_BOXES = "boxes.npy"
+_POINTS = "points.npy"
+_CONFIDENCES = "confidences.npy"
+
+
+def _array_bytes(array: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    np.save(buffer, array, allow_pickle=False)
+    return buffer.getvalue()
+
+
+def _read_array(zf: zipfile.ZipFile, name: str) -> np.ndarray:
+    with zf.open(name) as member:
+        return np.load(io.BytesIO(member.read()), allow_pickle=False)
+
+
+def write_result(path: str, data: Dict[str, Any]) -> None:
+    """
+    Write an OCR result dict (OCRResult.to_dict()) to a compact store file
+
+    The file is written to a temp path and swapped in atomically, so readers
+    never see a partial result.
+
+    Args:
+        path: Destination path (normally ending in OCR_STORE_SUFFIX)
+        data: OCR result dictionary
+    """
+    raw_results = data.get("raw_results") or []
+    n = len(raw_results)
+
+    boxes = np.zeros((n, 4), dtype=np.int32)
+    points = np.zeros((n, 4, 2), dtype=np.int32)
+    confidences = np.zeros(n, dtype=np.float32)
+    texts: List[str] = []
+    for i, item in enumerate(raw_results):
+        bbox = item.get("bbox", {})
+        boxes[i] = (bbox.get("x", 0), bbox.get("y", 0), bbox.get("width", 0), bbox.get("height", 0))
+        item_points = bbox.get("points")
+        if item_points is not None and len(item_points) == 4:
+            points[i] = item_points
+        confidences[i] = item.get("confidence", 0.0)
+        texts.append(item.get("text", ""))
+
+    header = {field: data.get(field) for field in HEADER_FIELDS}
+    header["format_version"] = FORMAT_VERSION
+    header["region_count"] = n
+    header["unit_count"] = len(data.get("structured_units") or [])
+
+    tmp_path = f"{path}.tmp"
+    with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        # Header first so it sits at the front of the archive
+        zf.writestr(_HEADER, json.dumps(header, ensure_ascii=False))
+        zf.writestr(_FULL_TEXT, data.get("full_text") or "")
+        zf.writestr(
+            _UNITS,
+            json.dumps(data.get("structured_units") or [], ensure_ascii=False, separators=(",", ":")),
+        )
+        zf.writestr(_TEXTS, json.dumps(texts, ensure_ascii=False, separators=(",", ":")))
+        zf.writestr(_BOXES, _array_bytes(boxes))
+        zf.writestr(_POINTS, _array_bytes(points))
+        zf.writestr(_CONFIDENCES, _array_bytes(confidences))
+    os.replace(tmp_path, path)
+
+
+def read_header(path: str) -> Dict[str, Any]:
+    """Read only the small header member (title, counts, timing)"""
+    with zipfile.ZipFile(path) as zf:
+        return json.loads(zf.read(_HEADER).decode("utf-8"))
+
+
+def read_result(path: str, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Read an OCR result, decoding only the requested fields
+
+    Args:
+        path: Store file path
+        fields: Field names to return (None = everything, same shape as OCRResult.to_dict())
+
+    Returns:
+        Dict of the requested fields
+    """
+    wanted = set(fields) if fields is not None else set(HEADER_FIELDS) | set(BODY_FIELDS)
+    result: Dict[str, Any] = {}
+
+    with zipfile.ZipFile(path) as zf:
+        if wanted & set(HEADER_FIELDS):
+            header = json.loads(zf.read(_HEADER).decode("utf-8"))
+            for field in HEADER_FIELDS:
+                if field in wanted:
+                    result[field] = header.get(field)
+
+        if "full_text" in wanted:
+            result["full_text"] = zf.read(_FULL_TEXT).decode("utf-8")
+
+        if "structured_units" in wanted:
+            result["structured_units"] = json.loads(zf.read(_UNITS).decode("utf-8"))
+
+        if "raw_results" in wanted:
+            texts = json.loads(zf.read(_TEXTS).decode("utf-8"))
+            boxes = _read_array(zf, _BOXES)
+            points = _read_array(zf, _POINTS)
+            confidences = _read_array(zf, _CONFIDENCES)
+            result["raw_results"] = [
+                {
+                    "text": texts[i],
+                    "confidence": round(float(confidences[i]), 4),
+                    "bbox": {
+                        "x": int(boxes[i, 0]),
+                        "y": int(boxes[i, 1]),
+                        "width": int(boxes[i, 2]),
+                        "height": int(boxes[i, 3]),
+                        "points": points[i].tolist(),
+                    },
+                }
+                for i in range(len(texts))
+            ]
+
+    return result
+
+
+def read_arrays(path: str) -> Dict[str, np.ndarray]:
+    """Read region geometry as arrays (boxes (N,4), points (N,4,2), confidences (N,))"""
+    with zipfile.ZipFile(path) as zf:
+        return {
+            "boxes": _read_array(zf, _BOXES),
+            "points": _read_array(zf, _POINTS),
+            "confidences": _read_array(zf, _CONFIDENCES),
+        }
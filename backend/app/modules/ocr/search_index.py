@@ -0,0 +1,275 @@
+"""
+OCR Full-Text Search Index
+Incremental SQLite FTS5 index over OCR titles and text, fed by save_result, so
+documents can be found by content ("the electricity bill") with one indexed
+query instead of crawling processed_text/ and ocr_results/.
+
+Documents are keyed by the image base name (the same key the result store
+uses); the image filename is stored alongside when known. Builds of SQLite
+without FTS5 fall back to a plain table searched with LIKE.
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_FILE = "search_index.sqlite3"
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS ocr_search USING fts5(
+    doc_id UNINDEXED,
+    filename UNINDEXED,
+    title,
+    text,
+    updated UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+)
+"""
+
+_PLAIN_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ocr_search (
+    doc_id TEXT PRIMARY KEY,
+    filename TEXT,
+    title TEXT,
+    text TEXT,
+    updated REAL
+)
+"""
+
+# Title matches weigh more than body matches (bm25 weights per column)
+_BM25 = "bm25(ocr_search, 0.0, 0.0, 5.0, 1.0)"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def doc_id_for(filename: str) -> str:
+    """Index key for an image filename (base name without extension)"""
+    return os.path.splitext(os.path.basename(filename))[0]
+
+
+def query_tokens(query: str) -> List[str]:
+    """Split a free-text query into lowercase word tokens"""
+    return [token.lower() for token in _TOKEN_RE.findall(query or "")]
+
+
+def to_fts_query(query: str) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 MATCH expression
+
+    Every token is quoted (so user input can't inject FTS syntax) and
+    prefix-matched; all tokens must match.
+    """
+    tokens = query_tokens(query)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+class OCRSearchIndex:
+    """Full-text index of OCR results keyed by document base name"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self.fts_enabled = True
+        with self._connect() as conn:
+            try:
+                conn.execute(_FTS_SCHEMA)
+            except sqlite3.OperationalError as e:
+                logger.warning(f"[WARN] SQLite FTS5 unavailable ({e}), search falls back to LIKE")
+                self.fts_enabled = False
+                conn.execute(_PLAIN_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:  # commit / rollback
+                yield conn
+        finally:
+            conn.close()
+
+    def upsert(self, filename: Optional[str], title: Optional[str], text: Optional[str], doc_id: Optional[str] = None) -> None:
+        """
+        Index (or re-index) one document
+
+        Args:
+            filename: Image filename, or None when only the base name is known
+            title: OCR-derived title
+            text: Full OCR text
+            doc_id: Index key (default: base name of filename)
+        """
+        doc_id = doc_id or doc_id_for(filename or "")
+        if not doc_id:
+            return
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM ocr_search WHERE doc_id = ?", (doc_id,))
+            conn.execute(
+                "INSERT INTO ocr_search (doc_id, filename, title, text, updated) VALUES (?, ?, ?, ?, ?)",
+                (doc_id, filename, title or "", text or "", time.time()),
+            )
+
+    def delete(self, filename: str) -> bool:
+        """Remove a document from the index"""
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute("DELETE FROM ocr_search WHERE doc_id = ?", (doc_id_for(filename),))
+            return cursor.rowcount > 0
+
+    def indexed_ids(self) -> set:
+        with self._lock, self._connect() as conn:
+            return {row[0] for row in conn.execute("SELECT doc_id FROM ocr_search")}
+
+    def count(self) -> int:
+        with self._lock, self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM ocr_search").fetchone()[0]
+
+    def search(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Find documents whose title or OCR text matches all query words
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of hits (capped at MAX_SEARCH_LIMIT)
+            offset: Number of hits to skip
+
+        Returns:
+            Hits ordered by relevance: {doc_id, filename, title, snippet, score}
+        """
+        limit = max(1, min(int(limit), MAX_SEARCH_LIMIT))
+        offset = max(0, int(offset))
+        if self.fts_enabled:
+            return self._search_fts(query, limit, offset)
+        return self._search_like(query, limit, offset)
+
+    def _search_fts(self, query: str, limit: int, offset: int) -> List[Dict[str, Any]]:
+        match = to_fts_query(query)
+        if not match:
+            return []
+        sql = (
+            f"SELECT doc_id, filename, title, snippet(ocr_search, 3, '[', ']', '...', 12), {_BM25} AS score "
+            "FROM ocr_search WHERE ocr_search MATCH ? ORDER BY score LIMIT ? OFFSET ?"
+        )
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(sql, (match, limit, offset)).fetchall()
+        # bm25() is lower-is-better; flip it so callers can sort descending
+        return [
+            {"doc_id": doc_id, "filename": filename, "title": title, "snippet": snippet, "score": round(-score, 4)}
+            for doc_id, filename, title, snippet, score in rows
+        ]
+
+    def _search_like(self, query: str, limit: int, offset: int) -> List[Dict[str, Any]]:
+        tokens = query_tokens(query)
+        if not tokens:
+            return []
+        clauses = " AND ".join("(lower(title) LIKE ? OR lower(text) LIKE ?)" for _ in tokens)
+        params: List[Any] = []
+        for token in tokens:
+            params.extend([f"%{token}%", f"%{token}%"])
+        sql = (
+            f"SELECT doc_id, filename, title, text FROM ocr_search WHERE {clauses} "
+            "ORDER BY updated DESC LIMIT ? OFFSET ?"
+        )
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(sql, (*params, limit, offset)).fetchall()
+        return [
+            {"doc_id": doc_id, "filename": filename, "title": title, "snippet": _like_snippet(text, tokens[0]), "score": 0.0}
+            for doc_id, filename, title, text in rows
+        ]
+
+    def backfill(self, documents: Iterable[Tuple[str, Optional[str], Optional[str], Optional[str]]]) -> int:
+        """
+        Index documents that aren't indexed yet
+
+        Args:
+            documents: (doc_id, filename, title, text) tuples
+
+        Returns:
+            Number of documents added
+        """
+        known = self.indexed_ids()
+        added = 0
+        for doc_id, filename, title, text in documents:
+            if doc_id in known:
+                continue
+            self.upsert(filename, title, text, doc_id=doc_id)
+            known.add(doc_id)
+            added += 1
+        return added
+
+
+def _like_snippet(text: str, token: str, width: int = 60) -> str:
+    text = text or ""
+    pos = text.lower().find(token)
+    if pos < 0:
+        return text[:width * 2]
+    start = max(0, pos - width)
+    end = min(len(text), pos + len(token) + width)
+    return f"{'...' if start else ''}{text[start:end]}{'...' if end < len(text) else ''}"
+
+
+def resolve_hits(hits: List[Dict[str, Any]], processed_dir: str) -> List[Dict[str, Any]]:
+    """
+    Attach current image filenames to hits and drop documents that no longer exist
+
+    Hits whose filename is unknown (backfilled) or stale are matched by base
+    name against processed_dir with a single directory scan.
+    """
+    resolved, unresolved = [], []
+    for hit in hits:
+        filename = hit.get("filename")
+        if filename and os.path.exists(os.path.join(processed_dir, filename)):
+            resolved.append(hit)
+        else:
+            unresolved.append(hit)
+
+    if unresolved and os.path.isdir(processed_dir):
+        by_stem = {}
+        with os.scandir(processed_dir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    by_stem.setdefault(os.path.splitext(entry.name)[0], entry.name)
+        for hit in unresolved:
+            filename = by_stem.get(hit["doc_id"])
+            if filename:
+                resolved.append(dict(hit, filename=filename))
+
+    resolved.sort(key=lambda hit: hit["score"], reverse=True)
+    return resolved
+
+
+_indexes: Dict[str, OCRSearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_search_index(directory: str) -> Optional[OCRSearchIndex]:
+    """
+    Shared index stored in `directory` (one instance per database file)
+
+    Returns:
+        OCRSearchIndex, or None when the database cannot be opened
+    """
+    path = os.path.abspath(os.path.join(directory, SEARCH_INDEX_FILE))
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            try:
+                os.makedirs(directory, exist_ok=True)
+                index = OCRSearchIndex(path)
+            except Exception as e:
+                logger.warning(f"[WARN] OCR search index unavailable: {e}")
+                return None
+            _indexes[path] = index
+        return index
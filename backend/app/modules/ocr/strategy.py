@@ -0,0 +1,129 @@
+"""
+OCR Strategy Layer
+Selects which OCR engine runs for a page so each upload gets exactly one engine pass
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+OCR_STRATEGY_PADDLE = "paddle"
+OCR_STRATEGY_TESSERACT = "tesseract"
+OCR_STRATEGY_FALLBACK = "paddle-then-tesseract-fallback"
+OCR_STRATEGY_FAST_PREVIEW = "fast-preview"
+
+OCR_STRATEGIES = (
+    OCR_STRATEGY_PADDLE,
+    OCR_STRATEGY_TESSERACT,
+    OCR_STRATEGY_FALLBACK,
+    OCR_STRATEGY_FAST_PREVIEW,
+)
+DEFAULT_OCR_STRATEGY = OCR_STRATEGY_FALLBACK
+DEFAULT_FAST_PREVIEW_MAX_SIDE = 1280
+
+
+def _ocr_settings() -> Dict[str, Any]:
+    try:
+        from app.config.settings import OCR_CONFIG
+
+        return OCR_CONFIG
+    except Exception:
+        return {}
+
+
+def resolve_strategy(strategy: Optional[str] = None) -> str:
+    """
+    Normalise a strategy name, falling back to the configured default
+
+    Args:
+        strategy: Requested strategy (None uses OCR_CONFIG["strategy"])
+
+    Returns:
+        One of OCR_STRATEGIES
+    """
+    requested = (strategy or _ocr_settings().get("strategy") or DEFAULT_OCR_STRATEGY).strip().lower()
+    if requested not in OCR_STRATEGIES:
+        logger.warning(f"[OCR] Unknown OCR strategy '{requested}', using {DEFAULT_OCR_STRATEGY}")
+        return DEFAULT_OCR_STRATEGY
+    return requested
+
+
+def uses_llm(strategy: str) -> bool:
+    """Whether results from this strategy should be post-processed with Ollama"""
+    return strategy != OCR_STRATEGY_FAST_PREVIEW
+
+
+def fast_preview_max_side() -> int:
+    return int(_ocr_settings().get("fast_preview_max_side") or DEFAULT_FAST_PREVIEW_MAX_SIDE)
+
+
+def run_tesseract(
+    image: np.ndarray,
+    max_side: Optional[int] = None,
+    lang: str = "eng",
+    config: str = "--oem 3 --psm 3",
+) -> List[Dict]:
+    """
+    Run a single Tesseract pass and return line-level results
+
+    Words from image_to_data are grouped by (block, paragraph, line) so the
+    output has the same shape as PaddleOCR detections: one entry per line with
+    a 4-point polygon and a 0-1 confidence.
+
+    Args:
+        image: Page image (BGR or grayscale)
+        max_side: Downscale so the longest side is at most this (None = full size)
+        lang: Tesseract language code
+        config: Tesseract CLI config
+
+    Returns:
+        List of {'text', 'bbox', 'confidence'} dicts in source image coordinates
+    """
+    import pytesseract
+
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
+    h, w = gray.shape[:2]
+    scale = 1.0
+    if max_side and max(h, w) > max_side:
+        scale = max_side / float(max(h, w))
+        gray = cv2.resize(gray, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+
+    data = pytesseract.image_to_data(
+        gray, lang=lang, config=config, output_type=pytesseract.Output.DICT
+    )
+
+    lines: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+    for i, word in enumerate(data["text"]):
+        word = (word or "").strip()
+        if not word:
+            continue
+        key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        x, y = data["left"][i], data["top"][i]
+        x2, y2 = x + data["width"][i], y + data["height"][i]
+        line = lines.setdefault(key, {"words": [], "confs": [], "box": [x, y, x2, y2]})
+        line["words"].append(word)
+        try:
+            conf = float(data["conf"][i])
+        except (TypeError, ValueError):
+            conf = -1.0
+        if conf >= 0:
+            line["confs"].append(conf)
+        box = line["box"]
+        box[0], box[1] = min(box[0], x), min(box[1], y)
+        box[2], box[3] = max(box[2], x2), max(box[3], y2)
+
+    results = []
+    for line in lines.values():
+        x1, y1, x2, y2 = (v / scale for v in line["box"])
+        confidence = (sum(line["confs"]) / len(line["confs"]) / 100.0) if line["confs"] else 0.0
+        results.append({
+            "text": " ".join(line["words"]),
+            "bbox": [[x1, y1], [x2, y1], [x2, y2], [x1, y2]],
+            "confidence": confidence,
+        })
+    return results
@@ -224,6 +224,21 @@ class PrintScanOrchestrator:
                         parameters["document_position"] = "last"
                     break
             
+            # Content references like "print the electricity bill" go through the OCR search index
+            if "document_selection" not in parameters:
+                query_match = re.search(
+                    r"(?:print|printing)\s+(?:the|my|that)\s+(.+?)(?:\s+(?:in|with|on|as|using)\s+.*|\s+\d+\s*cop(?:y|ies).*)?$",
+                    user_input_lower,
+                )
+                if query_match:
+                    query_words = [
+                        word for word in query_match.group(1).split()
+                        if word not in ("document", "documents", "file", "files", "page", "one", "it")
+                    ]
+                    if query_words:
+                        parameters["document_selection"] = "query"
+                        parameters["document_query"] = " ".join(query_words)
+            
             # Extract parameters
             if "color" in user_input_lower or "black" in user_input_lower or "grayscale" in user_input_lower:
                 parameters["color_mode"] = "color"
@@ -387,6 +402,16 @@ class PrintScanOrchestrator:
             
             logger.info(f"[ORCHESTRATOR] Selected {len(selected_docs)} document(s): {[d['filename'] for d in selected_docs]}")
 
+        elif parameters.get("document_selection") == "query":
+            matches = self.get_documents_by_query(parameters["document_query"])
+            if matches:
+                self.selected_document = matches[0]
+                logger.info(
+                    f"[ORCHESTRATOR] '{parameters['document_query']}' matched {[d['filename'] for d in matches]}"
+                )
+            elif len(documents) == 1:
+                self.selected_document = documents[0]
+
         # If only one document available, select it automatically
         elif len(documents) == 1:
             self.selected_document = documents[0]
@@ -1015,8 +1040,41 @@ class PrintScanOrchestrator:
             count = int(first_match.group(1))
             return documents[-min(count, len(documents)):][::-1]  # Reverse to maintain chronological order
         
-        # Default: return empty if no match
-        return []
+        # Otherwise treat the description as a content query ("the electricity bill")
+        return self.get_documents_by_query(position_desc)
+    
+    def get_documents_by_query(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Get documents whose OCR title or text matches a free-text query
+        
+        Args:
+            query: Words to look for, e.g. 'electricity bill'
+            limit: Maximum number of documents
+        
+        Returns:
+            Matching documents, best match first, with title and snippet added
+        """
+        try:
+            from app.modules.ocr.search_index import get_search_index, resolve_hits
+        except ImportError as e:
+            logger.warning(f"[ORCHESTRATOR] OCR search index not available: {e}")
+            return []
+        
+        index = get_search_index(os.path.join(self.data_dir, "ocr_results", "cache"))
+        if index is None:
+            return []
+        
+        hits = resolve_hits(index.search(query, limit=limit), self.processed_dir)
+        if not hits:
+            return []
+        
+        documents = {doc["filename"]: doc for doc in self._get_available_documents()}
+        matches = []
+        for hit in hits:
+            doc = documents.get(hit["filename"])
+            if doc:
+                matches.append(dict(doc, title=hit["title"], snippet=hit["snippet"], score=hit["score"]))
+        return matches
 
     def _get_status_message(self) -> str:
         """Generate human-readable status message"""
@@ -490,6 +490,33 @@ class DocumentPipeline:
         else:
             print("No valid training images found")
 
+    def classify_images(self, image_paths: List[str], chunk_size: int = 32) -> Dict[str, Dict]:
+        """
+        Classify many scans with batched feature extraction and prediction
+
+        Args:
+            image_paths: Image files to classify
+            chunk_size: Images decoded and held in memory at once
+
+        Returns:
+            Dict mapping each path to {'document_type', 'confidence'} (or {'error'})
+        """
+        results = {}
+        for start in range(0, len(image_paths), chunk_size):
+            paths, images = [], []
+            for path in image_paths[start:start + chunk_size]:
+                img = cv2.imread(path)
+                if img is None:
+                    results[path] = {"error": "Could not load image"}
+                    continue
+                paths.append(path)
+                images.append(img)
+
+            for path, (doc_type, confidence) in zip(paths, self.classifier.predict_batch(images)):
+                results[path] = {"document_type": doc_type, "confidence": confidence}
+
+        return results
+
     def get_pipeline_info(self) -> Dict:
         """
         Get information about pipeline configuration
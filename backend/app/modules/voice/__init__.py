@@ -16,6 +16,7 @@ from datetime import datetime
 from typing import Any, Dict, Optional, TYPE_CHECKING
 
 from app.config.settings import AI_PROMPT_CONFIG, CONNECTION_CONFIG
+from app.modules.llm_client import LLMUnavailableError, get_llm_client
 
 if TYPE_CHECKING:
     from .voice_prompt import VoicePromptManager as VoicePromptManagerType
@@ -730,11 +731,10 @@ class VoiceChatService:
     def check_ollama_available(self) -> bool:
         """Check if Ollama is running and model is available"""
         try:
-            import requests
-
             timeout = min(5, self.api_timeout or OLLAMA_API_TIMEOUT)
-            response = requests.get(
+            response = get_llm_client().get(
                 self.ollama_tags_url,
+                name="voice.tags",
                 timeout=timeout,
                 verify=self.verify_ssl,
             )
@@ -752,6 +752,9 @@ class VoiceChatService:
                     self._logged_ollama_check = True
                 return has_model
             return False
+        except LLMUnavailableError:
+            # Circuit open - Ollama failed recently, don't wait on another timeout
+            return False
         except Exception as e:
             if not hasattr(self, "_logged_ollama_error"):
                 logger.error(f"Ollama check failed: {str(e)}")
@@ -1431,8 +1434,6 @@ class VoiceChatService:
             Dict with AI response and metadata
         """
         try:
-            import requests
-
             user_lower = user_message.lower().strip()
             
             logger.info(f"[AI] Processing: '{user_message}' | Pending: {self.pending_orchestration}")
@@ -1564,8 +1565,9 @@ class VoiceChatService:
                     },
                 }
             
-            response = requests.post(
+            response = get_llm_client().post(
                 self.ollama_chat_url,
+                name="voice.chat",
                 json=query,
                 timeout=self.api_timeout or OLLAMA_API_TIMEOUT,
                 verify=self.verify_ssl,
@@ -403,7 +403,7 @@ class VoicePromptManager:
             ...     {"role": "user", "content": "Print this document"}
             ... ]
             >>> query = VoicePromptManager.build_ollama_query("smollm2:135m", messages)
-            >>> response = requests.post("http://localhost:11434/api/chat", json=query, timeout=60)
+            >>> response = get_llm_client().post("/api/chat", name="voice.chat", json=query, timeout=60)
         """
         return {
             "model": model_name,
@@ -10,6 +10,9 @@ TEST_DIR = os.path.dirname(os.path.abspath(__file__))
 TESTS = [
     ("test_simple.py", "Simple Processing Test"),
     ("test_pipeline.py", "Pipeline Generation Test"),
+    ("test_catalog_sync.py", "Catalog Paging / Delta Sync Test"),
+    ("test_storage_lifecycle.py", "Storage Lifecycle Test"),
+    ("test_upload_dedupe.py", "Upload Deduplication Test"),
 ]
 
 
@@ -0,0 +1,138 @@
+"""
+Test document catalog paging and delta sync (/files?limit=&cursor=, /files?since=)
+Pages a temporary catalog, then adds, deletes and renames documents and checks
+that since= returns exactly those changes, and reset=true once tombstones are pruned
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Setup paths
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(TEST_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+from app.modules.document import catalog as catalog_module
+from app.modules.document.catalog import CatalogCursorError, DocumentCatalog
+
+failures = []
+
+
+def check(condition, message):
+    print(f"  {'✓' if condition else '✗'} {message}")
+    if not condition:
+        failures.append(message)
+
+
+def write_page(processed_dir, filename):
+    with open(os.path.join(processed_dir, filename), "wb") as f:
+        f.write(b"\xff\xd8\xff" + filename.encode())
+    # Distinct st_ctime per file on coarse-timestamp filesystems
+    time.sleep(0.01)
+
+
+def main():
+    print("=" * 60)
+    print("DOCUMENT CATALOG PAGING / DELTA SYNC TEST")
+    print("=" * 60)
+
+    root = tempfile.mkdtemp(prefix="catalog_test_")
+    try:
+        processed_dir = os.path.join(root, "processed")
+        text_dir = os.path.join(root, "processed_text")
+        ocr_dir = os.path.join(root, "ocr_results")
+        for directory in (processed_dir, text_dir, ocr_dir):
+            os.makedirs(directory)
+        for i in range(7):
+            write_page(processed_dir, f"processed_doc_{i}.jpg")
+
+        catalog = DocumentCatalog(os.path.join(root, "catalog.sqlite3"), processed_dir, text_dir, ocr_dir)
+
+        print("\n[1] Cursor paging")
+        expected = [doc["filename"] for doc in catalog.list_documents()]
+        check(len(expected) == 7, "reconcile catalogued all 7 pages")
+        seen, cursor, pages = [], None, 0
+        while True:
+            page = catalog.listing(limit=3, cursor=cursor)
+            seen.extend(doc["filename"] for doc in page["items"])
+            pages += 1
+            cursor = page["next_cursor"]
+            check(page["has_more"] == (cursor is not None), f"page {pages}: has_more matches next_cursor")
+            if cursor is None:
+                break
+        check(pages == 3, "7 documents in pages of 3 take 3 pages")
+        check(seen == expected, "pages return every document once, newest first")
+
+        created, filename = catalog_module.decode_cursor(catalog_module.encode_cursor(1700000000.5, "a b.jpg"))
+        check((created, filename) == (1700000000.5, "a b.jpg"), "cursor round-trips (created, filename)")
+        try:
+            catalog.listing(limit=3, cursor="not-a-cursor")
+            check(False, "malformed cursor raises CatalogCursorError")
+        except CatalogCursorError:
+            check(True, "malformed cursor raises CatalogCursorError")
+        try:
+            catalog.listing(since="abc")
+            check(False, "malformed since raises CatalogCursorError")
+        except CatalogCursorError:
+            check(True, "malformed since raises CatalogCursorError")
+
+        print("\n[2] Delta sync")
+        since = catalog.listing()["sync_cursor"]
+        write_page(processed_dir, "processed_doc_new.jpg")
+        catalog.add("processed_doc_new.jpg", has_text=False)
+        os.remove(os.path.join(processed_dir, "processed_doc_0.jpg"))
+        catalog.remove("processed_doc_0.jpg")
+        os.rename(
+            os.path.join(processed_dir, "processed_doc_1.jpg"), os.path.join(processed_dir, "invoice_march.jpg")
+        )
+        catalog.rename("processed_doc_1.jpg", "invoice_march.jpg")
+
+        delta = catalog.listing(since=str(since))
+        check(delta["delta"] is True and delta["reset"] is False, "since= returns a delta without reset")
+        check(
+            sorted(doc["filename"] for doc in delta["items"]) == ["invoice_march.jpg", "processed_doc_new.jpg"],
+            "items are exactly the added and renamed documents",
+        )
+        check(
+            sorted(delta["deleted"]) == ["processed_doc_0.jpg", "processed_doc_1.jpg"],
+            "deleted lists the removed document and the old name of the renamed one",
+        )
+        check(delta["sync_cursor"] > since, "sync_cursor advanced")
+
+        again = catalog.listing(since=str(delta["sync_cursor"]))
+        check(again["items"] == [] and again["deleted"] == [], "since=<latest> has no changes")
+
+        # Re-adding a deleted name clears its tombstone
+        write_page(processed_dir, "processed_doc_0.jpg")
+        catalog.add("processed_doc_0.jpg")
+        readded = catalog.listing(since=str(since))
+        check("processed_doc_0.jpg" not in readded["deleted"], "re-added document is no longer reported deleted")
+
+        print("\n[3] Tombstone pruning")
+        original_max = catalog_module.MAX_TOMBSTONES
+        catalog_module.MAX_TOMBSTONES = 2
+        try:
+            old_since = catalog.sync_cursor()
+            for i in range(2, 7):
+                os.remove(os.path.join(processed_dir, f"processed_doc_{i}.jpg"))
+                catalog.remove(f"processed_doc_{i}.jpg")
+        finally:
+            catalog_module.MAX_TOMBSTONES = original_max
+        stale = catalog.listing(since=str(old_since))
+        check(stale["reset"] is True and stale["items"] == [], "since= older than pruned tombstones returns reset=true")
+        fresh = catalog.listing(since=str(stale["sync_cursor"]))
+        check(fresh["reset"] is False, "since=<sync_cursor from the reset> is accepted")
+        future = catalog.listing(since=str(stale["sync_cursor"] + 100))
+        check(future["reset"] is True, "since= ahead of the catalog returns reset=true")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    return not failures
+
+
+if __name__ == "__main__":
+    success = main()
+    print(f"\nTest {'PASSED' if success else 'FAILED'}")
+    sys.exit(0 if success else 1)
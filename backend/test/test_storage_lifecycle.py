@@ -0,0 +1,215 @@
+"""
+Test the storage lifecycle job (app/modules/document/lifecycle.py) on a temporary DATA_DIR
+Covers a dry run, then real passes for expiry, orphans, dedupe (hardlinks keep their
+own age), stale thumbnails and quota eviction
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Setup paths
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(TEST_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+from PIL import Image
+
+from app.modules.document.lifecycle import ARTEFACT_DIRS, StorageLifecycle
+from app.modules.document.thumbnails import THUMBNAIL_DIR, ThumbnailStore
+
+DAY = 86400
+failures = []
+
+CONFIG = {
+    "min_age_minutes": 60,
+    "pause_ms": 0,
+    "dedupe": True,
+    "dedupe_artefacts": ("uploads", "converted", "pdfs"),
+    "quota_mb": 0,
+    "policies": {
+        "processed_text": {"orphans": True},
+        "ocr_results": {"orphans": True},
+        "converted_pages": {"orphans": True},
+        "pdfs": {"retention_days": 30},
+        "test_captures": {"retention_days": 1},
+        "thumbnails": {"orphans": True},
+    },
+}
+
+
+def check(condition, message):
+    print(f"  {'✓' if condition else '✗'} {message}")
+    if not condition:
+        failures.append(message)
+
+
+def write(data_dir, rel, data, age_seconds):
+    path = os.path.join(data_dir, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    stamp = time.time() - age_seconds
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def exists(data_dir, rel):
+    return os.path.exists(os.path.join(data_dir, rel))
+
+
+def build_tree(data_dir):
+    for folder in set(ARTEFACT_DIRS.values()):
+        os.makedirs(os.path.join(data_dir, folder), exist_ok=True)
+    old = 40 * DAY
+    pdf_bytes = os.urandom(200 * 1024)
+
+    # Documents and their sidecars
+    write(data_dir, "processed/processed_a.jpg", b"\xff\xd8\xff" + os.urandom(1000), old)
+    write(data_dir, "processed_text/processed_a.txt", b"text", old)
+    write(data_dir, "processed_text/processed_gone.txt", b"text", old)
+    # OCR run on an original in uploads/ (no processed_ twin)
+    write(data_dir, "uploads/doc_up.jpg", b"\xff\xd8\xff" + os.urandom(1000), old)
+    write(data_dir, "ocr_results/doc_up_ocr.ocrz", b"ocr", old)
+    write(data_dir, "ocr_results/missing_ocr.ocrz", b"ocr", old)
+    # Younger than min_age: never touched even though orphaned
+    write(data_dir, "ocr_results/young_ocr.ocrz", b"ocr", 60)
+    # *_pages folder without its converted file
+    write(data_dir, "converted/gone_pages/page_1.jpg", b"page", old)
+    os.utime(os.path.join(data_dir, "converted/gone_pages"), (time.time() - old, time.time() - old))
+
+    # Same export twice: 29.9 days old and 2 hours old
+    write(data_dir, "pdfs/export_old.pdf", pdf_bytes, 29.9 * DAY)
+    write(data_dir, "pdfs/export_new.pdf", pdf_bytes, 2 * 3600)
+
+    # Calibration captures
+    write(data_dir, "test_captures/old.jpg", b"capture", 2 * DAY)
+    write(data_dir, "test_captures/new.jpg", b"capture", 2 * 3600)
+    return pdf_bytes
+
+
+def write_image(data_dir, rel, color):
+    path = os.path.join(data_dir, rel)
+    Image.new("RGB", (400, 500), color).save(path, "JPEG")
+    return path
+
+
+def age_tree(root, age_seconds):
+    stamp = time.time() - age_seconds
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            os.utime(os.path.join(dirpath, name), (stamp, stamp))
+
+
+def snapshot(data_dir):
+    files = {}
+    for dirpath, _, filenames in os.walk(data_dir):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            stat = os.stat(path)
+            files[os.path.relpath(path, data_dir)] = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+    return files
+
+
+def main():
+    print("=" * 60)
+    print("STORAGE LIFECYCLE TEST")
+    print("=" * 60)
+
+    data_dir = tempfile.mkdtemp(prefix="lifecycle_test_")
+    try:
+        build_tree(data_dir)
+        removed = []
+        lifecycle = StorageLifecycle(data_dir, CONFIG, on_removed=removed.append)
+
+        print("\n[1] Dry run")
+        before = snapshot(data_dir)
+        dry = lifecycle.run(dry_run=True)
+        check(snapshot(data_dir) == before, "dry run changes nothing on disk")
+        check(dry["dry_run"] is True and removed == [], "dry run reports without calling on_removed")
+        check(dry["reclaimed_bytes"] > 0, "dry run reports reclaimable bytes")
+
+        print("\n[2] Real pass: expire, orphans, dedupe")
+        report = lifecycle.run()
+        actions = report["actions"]
+        check(report["errors"] == [], "no errors")
+        check(actions == dry["actions"], "real pass does what the dry run reported")
+        check(not exists(data_dir, "test_captures/old.jpg"), "expired test capture deleted")
+        check(exists(data_dir, "test_captures/new.jpg"), "recent test capture kept")
+        check(not exists(data_dir, "processed_text/processed_gone.txt"), "orphaned text deleted")
+        check(exists(data_dir, "processed_text/processed_a.txt"), "text of an existing document kept")
+        check(not exists(data_dir, "ocr_results/missing_ocr.ocrz"), "orphaned OCR result deleted")
+        check(exists(data_dir, "ocr_results/doc_up_ocr.ocrz"), "OCR result of an original in uploads/ kept")
+        check(exists(data_dir, "ocr_results/young_ocr.ocrz"), "orphan younger than min_age kept")
+        check(not exists(data_dir, "converted/gone_pages"), "orphaned *_pages folder deleted")
+        old_pdf = os.path.join(data_dir, "pdfs/export_old.pdf")
+        new_pdf = os.path.join(data_dir, "pdfs/export_new.pdf")
+        check(os.stat(old_pdf).st_ino == os.stat(new_pdf).st_ino, "identical exports hardlinked")
+        check(actions["deduplicated"]["files"] == 1, "one duplicate reported")
+        check(report["usage_after"] < report["usage_before"], "usage went down")
+        check(os.path.join(data_dir, "test_captures", "old.jpg") in removed, "on_removed called for deleted files")
+
+        again = lifecycle.run()
+        check(again["reclaimed_bytes"] == 0, "second pass has nothing left to do")
+
+        print("\n[3] Hardlinked duplicate keeps its own age")
+        # Shorter retention: the 29.9-day-old original expires, its 2-hour-old twin must not
+        aged = StorageLifecycle(
+            data_dir, dict(CONFIG, policies=dict(CONFIG["policies"], pdfs={"retention_days": 29.5}))
+        )
+        aged.run()
+        check(not os.path.exists(old_pdf), "original export expired")
+        check(os.path.exists(new_pdf), "recent duplicate kept despite sharing the old inode")
+
+        print("\n[4] Thumbnails")
+        cache_dir = os.path.join(data_dir, THUMBNAIL_DIR)
+        store = ThumbnailStore(cache_dir)
+        kept_src = write_image(data_dir, "processed/processed_thumb_kept.jpg", "white")
+        gone_src = write_image(data_dir, "processed/processed_thumb_gone.jpg", "gray")
+        replaced_src = write_image(data_dir, "processed/processed_thumb_replaced.jpg", "black")
+        for source in (kept_src, gone_src, replaced_src):
+            check(store.get(source) is not None, f"thumbnail cached for {os.path.basename(source)}")
+        old_replaced = store.lookup(replaced_src)[0]
+        old_gone = store.lookup(gone_src)[0]
+        # Deleted and replaced outside the app: the store is never called again for them
+        os.remove(gone_src)
+        time.sleep(0.01)
+        write_image(data_dir, "processed/processed_thumb_replaced.jpg", "red")
+        legacy = os.path.join(cache_dir, "ab", "abababababababababab_1_2_200x250q85.jpg")
+        os.makedirs(os.path.dirname(legacy), exist_ok=True)
+        with open(legacy, "wb") as f:
+            f.write(b"\xff\xd8\xff")
+        age_tree(cache_dir, 2 * 3600)
+
+        check(lifecycle.usage()["by_artefact"]["thumbnails"] > 0, "thumbnails count toward usage")
+        lifecycle.run()
+        check(store.lookup(kept_src) is not None, "thumbnail of an unchanged source kept")
+        check(not os.path.exists(old_gone), "thumbnail of a deleted source removed")
+        check(not os.path.exists(old_replaced), "thumbnail of a replaced source's old version removed")
+        check(not os.path.exists(legacy), "entry without a source record removed")
+        gone_record = os.path.join(os.path.dirname(old_gone), os.path.basename(old_gone).split("_")[0] + ".src")
+        check(not os.path.exists(gone_record), "source record of a deleted source removed")
+        check(store.get(replaced_src) is not None, "replaced source renders again on demand")
+
+        print("\n[5] Quota")
+        for i in range(4):
+            write(data_dir, f"uploads/bulk_{i}.jpg", os.urandom(256 * 1024), (10 - i) * DAY)
+        quota = StorageLifecycle(
+            data_dir, dict(CONFIG, dedupe=False, quota_mb=1, quota_evict_order=("test_captures", "uploads"))
+        )
+        report = quota.run()
+        check(report["usage_after"] <= 1024 * 1024, "usage brought under the quota")
+        check(not exists(data_dir, "uploads/bulk_0.jpg"), "oldest upload evicted first")
+        check(exists(data_dir, "uploads/bulk_3.jpg"), "newest upload kept")
+        check(exists(data_dir, "processed/processed_a.jpg"), "processed documents never evicted")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    return not failures
+
+
+if __name__ == "__main__":
+    success = main()
+    print(f"\nTest {'PASSED' if success else 'FAILED'}")
+    sys.exit(0 if success else 1)
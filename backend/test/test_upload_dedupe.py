@@ -0,0 +1,152 @@
+"""
+Test ingest-time upload deduplication (/upload + DocumentCatalog content hashes)
+Runs the document blueprint's /upload on a throwaway Flask app with a stand-in
+pipeline and checks repeat uploads, concurrent uploads of the same bytes, a failed
+pipeline releasing its claim, and deletion freeing the hash again
+"""
+import io
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+# Setup paths
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(TEST_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+from flask import Flask
+
+from app.api.document import document_bp
+from app.modules.document.catalog import DocumentCatalog
+
+failures = []
+
+
+def check(condition, message):
+    print(f"  {'✓' if condition else '✗'} {message}")
+    if not condition:
+        failures.append(message)
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def page_bytes():
+    """A distinct 'JPEG' (valid header, random body)"""
+    return b"\xff\xd8\xff\xe0" + os.urandom(4096)
+
+
+class StandInPipeline:
+    """process_document_image replacement: copies the upload, can block or fail"""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.gate.set()
+        self.fail = False
+        self.calls = 0
+
+    def __call__(self, input_path, output_path, filename=None):
+        self.calls += 1
+        self.gate.wait(10)
+        if self.fail:
+            return False, "pipeline failed", None
+        shutil.copyfile(input_path, output_path)
+        return True, "", None
+
+
+def main():
+    print("=" * 60)
+    print("UPLOAD DEDUPLICATION TEST")
+    print("=" * 60)
+
+    root = tempfile.mkdtemp(prefix="upload_dedupe_test_")
+    try:
+        dirs = {name: os.path.join(root, name) for name in ("uploads", "processed", "processed_text", "ocr_results")}
+        for directory in dirs.values():
+            os.makedirs(directory)
+        catalog = DocumentCatalog(
+            os.path.join(root, "catalog.sqlite3"), dirs["processed"], dirs["processed_text"], dirs["ocr_results"]
+        )
+        pipeline = StandInPipeline()
+
+        app = Flask(__name__)
+        app.config.update(
+            UPLOAD_DIR=dirs["uploads"],
+            PROCESSED_DIR=dirs["processed"],
+            TEXT_DIR=dirs["processed_text"],
+            document_catalog=catalog,
+            process_document_image=pipeline,
+        )
+        app.register_blueprint(document_bp)
+        client = app.test_client()
+
+        def upload(data):
+            response = client.post(
+                "/upload", data={"file": (io.BytesIO(data), "page.jpg")}, content_type="multipart/form-data"
+            )
+            return response.status_code, response.get_json()
+
+        def processed(filename):
+            return lambda: catalog.get(filename) is not None and not catalog._pending_hashes
+
+        print("\n[1] Repeat upload of the same bytes")
+        page_a = page_bytes()
+        status, first = upload(page_a)
+        check(status == 200 and first["status"] == "uploaded", "first upload is processed")
+        check(wait_for(processed(first["filename"])), "first upload catalogued with its hash")
+        status, repeat = upload(page_a)
+        check(status == 200 and repeat.get("duplicate") is True, "repeat upload reported as duplicate")
+        check(repeat["filename"] == first["filename"], "duplicate points at the existing document")
+        check(repeat["processing"] is False, "existing document is not processing")
+        check(len(os.listdir(dirs["uploads"])) == 1, "redundant upload file removed")
+        check(pipeline.calls == 1, "pipeline ran once")
+
+        print("\n[2] Concurrent uploads of the same bytes")
+        page_b = page_bytes()
+        pipeline.gate.clear()
+        status, running = upload(page_b)
+        check(running["status"] == "uploaded", "first of the pair starts processing")
+        status, second = upload(page_b)
+        check(second.get("duplicate") is True, "second of the pair is a duplicate")
+        check(second["processing"] is True, "second gets processing: true")
+        check(second["filename"] == running["filename"], "second points at the in-flight document")
+        pipeline.gate.set()
+        check(wait_for(processed(running["filename"])), "in-flight document finished")
+        check(pipeline.calls == 2, "pipeline ran once for the pair")
+
+        print("\n[3] Failed pipeline releases the claim")
+        page_c = page_bytes()
+        pipeline.fail = True
+        status, failed = upload(page_c)
+        check(failed["status"] == "uploaded", "upload accepted before the pipeline fails")
+        check(wait_for(lambda: not catalog._pending_hashes), "claim released after the failure")
+        pipeline.fail = False
+        status, retry = upload(page_c)
+        check(retry["status"] == "uploaded" and not retry.get("duplicate"), "retry of the same bytes is processed")
+        check(wait_for(processed(retry["filename"])), "retry catalogued")
+
+        print("\n[4] Deleting the original frees the hash")
+        os.remove(os.path.join(dirs["processed"], first["filename"]))
+        catalog.remove(first["filename"])
+        status, again = upload(page_a)
+        check(again["status"] == "uploaded" and not again.get("duplicate"), "same bytes processed again")
+        check(wait_for(processed(again["filename"])), "new document catalogued")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    return not failures
+
+
+if __name__ == "__main__":
+    success = main()
+    print(f"\nTest {'PASSED' if success else 'FAILED'}")
+    sys.exit(0 if success else 1)
@@ -76,11 +76,9 @@ export const getDefaultHeaders = () => {
 // Separate image base URL for better reliability
 export const getImageUrl = (endpoint: string, filename: string) => {
   const baseUrl = API_BASE_URL;
-  const fullUrl = `${baseUrl}${endpoint}/${filename}`;
-
-  // Add timestamp to bypass cache
-  const separator = fullUrl.includes('?') ? '&' : '?';
-  return `${fullUrl}${separator}_t=${Date.now()}`;
+  // No cache-busting timestamp: file routes send ETags and are revalidated,
+  // so a changed file is never served stale and an unchanged one costs a 304
+  return `${baseUrl}${endpoint}/${filename}`;
 };
 
 // Socket.IO specific configuration - handles both local and deployed
@@ -221,15 +221,16 @@ const useImageWithHeaders = (imageUrl: string, refreshToken?: number) => {
           headers['ngrok-skip-browser-warning'] = 'true';
         }
 
-        // Add cache-buster to force fresh fetch (timestamp + refresh token)
-        const cacheBuster = `_t=${Date.now()}_r=${refreshToken || 0}`;
-        const url = imageUrl.includes('?')
-          ? `${imageUrl}&${cacheBuster}`
-          : `${imageUrl}?${cacheBuster}`;
+        // The server sends an ETag for every file: 'no-cache' revalidates the
+        // browser copy (304, no body) instead of refetching the whole image.
+        // The refresh token still forces a new URL after an explicit refresh.
+        const url = refreshToken
+          ? `${imageUrl}${imageUrl.includes('?') ? '&' : '?'}_r=${refreshToken}`
+          : imageUrl;
 
         const response = await fetch(url, {
           headers,
-          cache: 'no-store',
+          cache: 'no-cache',
           mode: 'cors',
         });
 
@@ -280,8 +281,8 @@ interface SecureImageProps {
 }
 
 const SecureImage: React.FC<SecureImageProps> = ({ filename, alt, className, onClick, style, refreshToken }) => {
-  // Try /processed first, fallback to /thumbnail
-  const imageUrl = `${API_BASE_URL}${API_ENDPOINTS.processed}/${filename}`;
+  // Try /processed first (thumb rendition, sized for the 220px grid card), fallback to /thumbnail
+  const imageUrl = `${API_BASE_URL}${API_ENDPOINTS.processed}/${filename}?size=thumb`;
   const { blobUrl, loading, error } = useImageWithHeaders(imageUrl, refreshToken);
   const [thumbnailError, setThumbnailError] = useState(false);
   const [thumbnailLoaded, setThumbnailLoaded] = useState(false);
@@ -410,7 +411,8 @@ interface ModalImageWithHeadersProps {
 }
 
 const ModalImageWithHeaders: React.FC<ModalImageWithHeadersProps> = ({ filename, alt, refreshToken }) => {
-  const imageUrl = `${API_BASE_URL}${API_ENDPOINTS.processed}/${filename}`;
+  // Preview rendition (800px wide) is plenty for the modal; downloads still fetch the full page
+  const imageUrl = `${API_BASE_URL}${API_ENDPOINTS.processed}/${filename}?size=preview`;
   const { blobUrl, loading, error } = useImageWithHeaders(imageUrl, refreshToken);
 
   if (loading) {
@@ -3096,6 +3098,9 @@ const Dashboard: React.FC = () => {
         // Clear loading state
         setOcrLoading(prev => ({ ...prev, [data.filename]: false }));
 
+        // Background enrichment after upload completes silently
+        if (data.background) return;
+
         toast({
           title: '📄 OCR Complete',
           description: data.result.derived_title
@@ -3108,6 +3113,26 @@ const Dashboard: React.FC = () => {
     };
     socket.on('ocr_complete', ocrCompleteListener);
 
+    // OCR-based renaming happens after processing_complete (background enrichment)
+    const documentRenamedListener = (data: any) => {
+      console.log('Document renamed:', data);
+      if (!data?.original_filename || !data?.filename) return;
+      setFiles((prevFiles: FileInfo[]) =>
+        prevFiles.map(f =>
+          f.filename === data.original_filename
+            ? { ...f, filename: data.filename, has_text: data.has_text || f.has_text }
+            : f
+        )
+      );
+      setOcrResults(prev => {
+        if (!(data.original_filename in prev)) return prev;
+        const { [data.original_filename]: moved, ...rest } = prev;
+        return { ...rest, [data.filename]: moved };
+      });
+      setRefreshToken(prev => prev + 1);
+    };
+    socket.on('document_renamed', documentRenamedListener);
+
     loadFiles();
     loadConvertedFiles(); // Load converted files on component mount
 
@@ -3158,6 +3183,7 @@ const Dashboard: React.FC = () => {
       socket.off('orchestration_update', orchestrationUpdateListener);
       socket.off('auto_capture_state_changed', autoCaptureStateListener);
       socket.off('ocr_complete', ocrCompleteListener);
+      socket.off('document_renamed', documentRenamedListener);
       // -- startPolling cleaned up
     };
   }, [socket, toast]);
@@ -3205,6 +3231,8 @@ const Dashboard: React.FC = () => {
 
   const lastLoadFilesRunRef = React.useRef<number>(0);
   const minLoadFilesInterval = 200; // ms - reduced for faster real-time updates during capture
+  // sync_cursor from the last /files response; background refreshes only fetch changes since it
+  const filesSyncCursorRef = React.useRef<number | null>(null);
 
   const loadFiles = useCallback(async (showLoading = true) => {
     const now = Date.now();
@@ -3223,10 +3251,37 @@ const Dashboard: React.FC = () => {
       if (showLoading) {
         setLoading(true);
       }
-      const response = await apiClient.get(API_ENDPOINTS.files, {
-        timeout: 10000, // 10 second timeout
-      });
-      const filesData = Array.isArray(response.data) ? response.data : response.data.files || [];
+      const fetchFiles = (since: number | null) =>
+        apiClient.get(API_ENDPOINTS.files, {
+          timeout: 10000, // 10 second timeout
+          params: since !== null ? { since } : undefined,
+        });
+
+      // Background refreshes ask only for changes (delta), user-initiated loads get the full list
+      const canDelta =
+        !showLoading && filesSyncCursorRef.current !== null && filesCacheRef.current.data !== null;
+      let response = await fetchFiles(canDelta ? filesSyncCursorRef.current : null);
+      if (response.data?.reset) {
+        // Server no longer remembers every change since our cursor
+        response = await fetchFiles(null);
+      }
+      let filesData = Array.isArray(response.data) ? response.data : response.data.files || [];
+
+      if (response.data?.delta) {
+        // Delta holds changed documents plus every in-progress entry; merge into the cached list
+        const replaced = new Set<string>([
+          ...(response.data.deleted || []),
+          ...filesData.map((f: any) => f.filename),
+        ]);
+        const kept = (filesCacheRef.current.data || []).filter(
+          (f: any) => !f.processing && !replaced.has(f.filename)
+        );
+        filesData = [...filesData, ...kept].sort((a: any, b: any) =>
+          a.created < b.created ? 1 : a.created > b.created ? -1 : 0
+        );
+      }
+      filesSyncCursorRef.current =
+        typeof response.data?.sync_cursor === 'number' ? response.data.sync_cursor : null;
 
       // Smart cache: check if files actually changed (count OR content/processing status)
       const newCount = filesData.length;
@@ -5329,13 +5384,13 @@ const Dashboard: React.FC = () => {
                                             filename: doc.filename,
                                             thumbnailUrl:
                                               doc.thumbnailUrl ||
-                                              `${API_BASE_URL}${API_ENDPOINTS.processed}/${doc.filename}`,
+                                              `${API_BASE_URL}${API_ENDPOINTS.processed}/${doc.filename}?size=preview`,
                                             pages: doc.pages || [
                                               {
                                                 pageNumber: 1,
                                                 thumbnailUrl:
                                                   doc.thumbnailUrl ||
-                                                  `${API_BASE_URL}${API_ENDPOINTS.processed}/${doc.filename}`,
+                                                  `${API_BASE_URL}${API_ENDPOINTS.processed}/${doc.filename}?size=preview`,
                                               },
                                             ]
                                           }))
@@ -5997,13 +6052,13 @@ const Dashboard: React.FC = () => {
                                       filename: doc.filename,
                                       thumbnailUrl:
                                         doc.thumbnailUrl ||
-                                        `${API_BASE_URL}${API_ENDPOINTS.processed}/${doc.filename}`,
+                                        `${API_BASE_URL}${API_ENDPOINTS.processed}/${doc.filename}?size=preview`,
                                       pages: doc.pages || [
                                         {
                                           pageNumber: 1,
                                           thumbnailUrl:
                                             doc.thumbnailUrl ||
-                                            `${API_BASE_URL}${API_ENDPOINTS.processed}/${doc.filename}`,
+                                            `${API_BASE_URL}${API_ENDPOINTS.processed}/${doc.filename}?size=preview`,
                                         },
                                       ]
                                     }))
@@ -546,23 +546,24 @@ const Phone: React.FC = () => {
           formData.append('ai_enhance', item.options.aiEnhance.toString());
           formData.append('strict_quality', item.options.strictQuality.toString());
 
-          await apiClient.post(API_ENDPOINTS.upload, formData, {
+          const response = await apiClient.post(API_ENDPOINTS.upload, formData, {
             headers: { 'Content-Type': 'multipart/form-data' },
           });
+          const duplicate = Boolean(response.data?.duplicate);
           toast({
-            title: 'Upload complete',
-            description: `${item.filename} processed`,
+            title: duplicate ? 'Already uploaded' : 'Upload complete',
+            description: duplicate ? `Same page as ${response.data.filename}` : `${item.filename} processed`,
             status: 'success',
             duration: 2000,
             isClosable: true,
             position: 'top-right',
           });
         }
-      } catch (err) {
+      } catch (err: any) {
         console.error('Queue upload failed:', err);
         toast({
           title: 'Upload failed',
-          description: 'Failed to upload image',
+          description: err?.response?.data?.error || 'Failed to upload image',
           status: 'error',
           duration: 3000,
           position: 'top-right',